@@ -14,8 +14,10 @@ from werkzeug.exceptions import BadRequest
 
 # Import our modules
 from config import config
-from models import db, User, Band, Venue, Review, Genre
+from models import db, User, Band, Venue, Review, ReviewVote, Genre, RATING_DIMENSIONS
 from auth import token_required, band_required, venue_owner_required, get_current_user, validate_user_data, validate_review_data
+from review_ranking import apply_vote_change, vote_counts_dict
+from list_serializers import ListShape, isoformat
 from merchandise_api_simple import merchandise_bp, seed_merchandise_data
 from models_merchandise import (
     ProductCategory, Product, Cart, CartItem, 
@@ -226,6 +228,60 @@ def get_current_user_profile():
     
     return jsonify({'user': user.to_dict()})
 
+# List shapes: the same keys as Venue.to_dict() / Band.to_dict(), built from selected columns
+
+def _rating(value):
+    return round(value, 2) if value is not None else None
+
+VENUE_LIST = ListShape(
+    ('id', Venue.id),
+    ('name', Venue.name),
+    ('address', Venue.address),
+    ('city', Venue.city),
+    ('county', Venue.county),
+    ('eircode', Venue.eircode),
+    ('phone', Venue.phone),
+    ('email', Venue.email),
+    ('website', Venue.website),
+    ('capacity', Venue.capacity),
+    ('venue_type', Venue.venue_type),
+    ('primary_genres', Venue.primary_genres),
+    ('facilities', Venue.facilities),
+    ('description', Venue.description),
+    ('images', Venue.images),
+    ('tech_specs', Venue.tech_specs),
+    ('contact_info', Venue.contact_info),
+    ('latitude', Venue.latitude, lambda value: float(value) if value else None),
+    ('longitude', Venue.longitude, lambda value: float(value) if value else None),
+    ('claimed', Venue.claimed),
+    ('verified', Venue.verified),
+    ('average_rating', Venue.average_rating, lambda value: float(value) if value else 0.0),
+    ('review_count', Venue.review_count),
+    *[(f'rating_breakdown.{dimension}', Venue.dimension_average_expression(dimension), _rating)
+      for dimension in RATING_DIMENSIONS],
+    ('created_at', Venue.created_at, isoformat)
+)
+
+# Reviews are counted in SQL rather than loaded per band
+BAND_LIST = ListShape(
+    ('email', User.email),
+    ('user_type', User.user_type),
+    ('name', User.name),
+    ('phone', User.phone),
+    ('website', User.website),
+    ('bio', User.bio),
+    ('profile_image', User.profile_image),
+    ('verified', User.verified),
+    ('created_at', User.created_at, isoformat),
+    ('id', Band.id),
+    ('genre', Band.genre),
+    ('member_count', Band.member_count),
+    ('formation_year', Band.formation_year),
+    ('location', Band.location),
+    ('social_links', Band.social_links),
+    ('review_count', db.select(db.func.count(Review.id)).where(Review.band_id == Band.id).scalar_subquery())
+)
+
 # Venue Routes
 
 @app.route('/api/venues', methods=['GET'])
@@ -238,9 +294,13 @@ def get_venues():
         genre = request.args.get('genre')
         min_rating = request.args.get('min_rating', type=float)
         search = request.args.get('search')
+        sort_by = request.args.get('sort_by', 'overall_rating')
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 20, type=int), 100)
         
+        if sort_by not in RATING_DIMENSIONS:
+            return jsonify({'error': f'sort_by must be one of: {", ".join(RATING_DIMENSIONS)}'}), 400
+        
         # Build query
         query = Venue.query
         
@@ -256,13 +316,19 @@ def get_venues():
                 (Venue.description.ilike(f'%{search}%'))
             )
         
+        # Order by precomputed per-dimension averages (e.g. best sound in Dublin)
+        if sort_by == 'overall_rating':
+            order = Venue.average_rating.desc()
+        else:
+            order = Venue.dimension_average_expression(sort_by).desc()
+        
         # Execute query with pagination
-        venues = query.order_by(Venue.average_rating.desc()).paginate(
+        venues = VENUE_LIST.query(query).order_by(order, Venue.review_count.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
         
         return jsonify({
-            'venues': [venue.to_dict() for venue in venues.items],
+            'venues': VENUE_LIST.serialize_all(venues.items),
             'total': venues.total,
             'pages': venues.pages,
             'current_page': page,
@@ -360,13 +426,13 @@ def get_bands():
         query = query.order_by(User.created_at.desc())
         
         # Paginate
-        pagination = query.paginate(
+        pagination = BAND_LIST.query(query).paginate(
             page=page, 
             per_page=per_page, 
             error_out=False
         )
         
-        bands = [band.to_dict() for band in pagination.items]
+        bands = BAND_LIST.serialize_all(pagination.items)
         
         return jsonify({
             'bands': bands,
@@ -455,8 +521,8 @@ def create_review():
         
         db.session.add(review)
         
-        # Update venue rating
-        venue.update_rating()
+        # Update venue rating totals incrementally
+        venue.apply_rating_delta(new_scores=review.rating_scores())
         
         db.session.commit()
         
@@ -469,15 +535,100 @@ def create_review():
         db.session.rollback()
         return jsonify({'error': 'Failed to create review', 'message': str(e)}), 500
 
+@app.route('/api/reviews/<review_id>', methods=['PUT'])
+@band_required
+def update_review(review_id):
+    """Edit a venue review (authoring band only)"""
+    try:
+        data = request.get_json()
+        user = get_current_user()
+        
+        review = Review.query.get(review_id)
+        if not review:
+            return jsonify({'error': 'Review not found'}), 404
+        
+        band = Band.query.filter_by(user_id=user.id).first()
+        if not band or review.band_id != band.id:
+            return jsonify({'error': 'You can only edit your own reviews'}), 403
+        
+        old_scores = review.rating_scores()
+        
+        # Validate the merged review so partial updates keep required fields
+        merged = {**review.to_dict(), **data}
+        merged['venue_id'] = review.venue_id
+        errors = validate_review_data(merged)
+        if errors:
+            return jsonify({'errors': errors}), 400
+        
+        for dimension in RATING_DIMENSIONS:
+            if dimension in data:
+                setattr(review, dimension, int(data[dimension]))
+        
+        updateable_fields = [
+            'event_name', 'audience_size', 'title', 'review_text',
+            'pros', 'cons', 'would_return', 'recommended_for'
+        ]
+        for field in updateable_fields:
+            if field in data:
+                setattr(review, field, data[field])
+        
+        if 'performance_date' in data:
+            review.performance_date = datetime.strptime(data['performance_date'], '%Y-%m-%d').date()
+        
+        review.venue.apply_rating_delta(old_scores=old_scores, new_scores=review.rating_scores())
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Review updated successfully',
+            'review': review.to_dict()
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to update review', 'message': str(e)}), 500
+
+@app.route('/api/reviews/<review_id>', methods=['DELETE'])
+@band_required
+def delete_review(review_id):
+    """Delete a venue review (authoring band only)"""
+    try:
+        user = get_current_user()
+        
+        review = Review.query.get(review_id)
+        if not review:
+            return jsonify({'error': 'Review not found'}), 404
+        
+        band = Band.query.filter_by(user_id=user.id).first()
+        if not band or review.band_id != band.id:
+            return jsonify({'error': 'You can only delete your own reviews'}), 403
+        
+        review.venue.apply_rating_delta(old_scores=review.rating_scores())
+        
+        db.session.delete(review)
+        db.session.commit()
+        
+        return jsonify({'message': 'Review deleted successfully'})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to delete review', 'message': str(e)}), 500
+
 @app.route('/api/venues/<venue_id>/reviews', methods=['GET'])
 def get_venue_reviews(venue_id):
     """Get all reviews for a venue"""
     try:
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 50)
+        sort = request.args.get('sort', 'recent')
+        
+        if sort == 'helpful':
+            order = (Review.helpfulness_score.desc(), Review.created_at.desc())
+        else:
+            order = (Review.created_at.desc(),)
         
         reviews = Review.query.filter_by(venue_id=venue_id)\
-                             .order_by(Review.created_at.desc())\
+                             .order_by(*order)\
                              .paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
@@ -490,6 +641,65 @@ def get_venue_reviews(venue_id):
     except Exception as e:
         return jsonify({'error': 'Failed to fetch reviews', 'message': str(e)}), 500
 
+@app.route('/api/reviews/<review_id>/vote', methods=['POST'])
+@token_required
+def vote_on_review(review_id):
+    """Vote a venue review helpful or unhelpful (one vote per user, re-voting changes it)"""
+    try:
+        data = request.get_json() or {}
+        if not isinstance(data.get('is_helpful'), bool):
+            return jsonify({'error': 'is_helpful (true/false) is required'}), 400
+        
+        user = get_current_user()
+        
+        # Lock the review row so concurrent votes update the counters in order
+        review = Review.query.filter_by(id=review_id).with_for_update().first()
+        if not review:
+            return jsonify({'error': 'Review not found'}), 404
+        
+        vote = ReviewVote.query.filter_by(review_id=review.id, voter_id=user.id).first()
+        old_is_helpful = vote.is_helpful if vote else None
+        
+        if vote:
+            vote.is_helpful = data['is_helpful']
+        else:
+            vote = ReviewVote(review_id=review.id, voter_id=user.id, is_helpful=data['is_helpful'])
+            db.session.add(vote)
+        
+        apply_vote_change(review, old_is_helpful, data['is_helpful'])
+        db.session.commit()
+        
+        return jsonify({'message': 'Vote recorded', 'review_id': review.id, **vote_counts_dict(review)})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to record vote', 'message': str(e)}), 500
+
+@app.route('/api/reviews/<review_id>/vote', methods=['DELETE'])
+@token_required
+def retract_review_vote(review_id):
+    """Remove the current user's helpfulness vote from a venue review"""
+    try:
+        user = get_current_user()
+        
+        review = Review.query.filter_by(id=review_id).with_for_update().first()
+        if not review:
+            return jsonify({'error': 'Review not found'}), 404
+        
+        vote = ReviewVote.query.filter_by(review_id=review.id, voter_id=user.id).first()
+        if not vote:
+            return jsonify({'error': 'You have not voted on this review'}), 400
+        
+        apply_vote_change(review, vote.is_helpful, None)
+        db.session.delete(vote)
+        db.session.commit()
+        
+        return jsonify({'message': 'Vote removed', 'review_id': review.id, **vote_counts_dict(review)})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to remove vote', 'message': str(e)}), 500
+
 # Utility Routes
 
 @app.route('/api/seed', methods=['POST'])
@@ -16,6 +16,8 @@ from models_bands_production import db
 from auth_firebase import initialize_firebase
 from bands_api import bands_bp
 from venues_api import venues_bp
+from batch_api import batch_bp
+from response_cache import cache_metrics
 
 def create_app(config_name=None):
     """Application factory pattern"""
@@ -50,6 +52,7 @@ def create_app(config_name=None):
     print(f"Venues blueprint: {venues_bp}")
     app.register_blueprint(bands_bp)
     app.register_blueprint(venues_bp)
+    app.register_blueprint(batch_bp)
     print("✅ Blueprints registered")
     
     # Global error handlers
@@ -105,6 +108,7 @@ def create_app(config_name=None):
             'timestamp': datetime.utcnow().isoformat(),
             'version': '2.0.0',
             'database': db_status,
+            'response_cache': cache_metrics(),
             'features': [
                 'bands_discovery',
                 'gigs_management', 
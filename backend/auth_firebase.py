@@ -6,8 +6,9 @@ Handles Firebase token verification and user synchronization
 import firebase_admin
 from firebase_admin import credentials, auth
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, g
 from models_bands_sqlite import db, User
+from response_cache import invalidate_now
 import os
 
 # Initialize Firebase Admin SDK
@@ -37,13 +38,21 @@ def initialize_firebase():
         return True
 
 def verify_firebase_token(token):
-    """Verify Firebase ID token and return user info"""
+    """Verify Firebase ID token and return user info
+
+    Results are kept for the app context, so the sub-requests of a
+    POST /api/batch (which share it) verify the token once.
+    """
+    verified = g.setdefault('firebase_tokens', {})
+    if token in verified:
+        return verified[token]
     try:
         decoded_token = auth.verify_id_token(token)
-        return decoded_token
     except Exception as e:
         current_app.logger.error(f"Firebase token verification failed: {str(e)}")
-        return None
+        decoded_token = None
+    verified[token] = decoded_token
+    return decoded_token
 
 def sync_firebase_user(firebase_user_data):
     """Sync Firebase user with local database"""
@@ -56,8 +65,10 @@ def sync_firebase_user(firebase_user_data):
         # Check if user already exists
         user = User.query.filter_by(firebase_uid=firebase_uid).first()
         
+        profile_changed = False
         if user:
             # Update existing user
+            profile_changed = (user.display_name, user.photo_url) != (display_name, photo_url)
             user.email = email
             user.display_name = display_name
             user.photo_url = photo_url
@@ -73,6 +84,9 @@ def sync_firebase_user(firebase_user_data):
             db.session.add(user)
         
         db.session.commit()
+        if profile_changed:
+            # Cached pages showing the user as a band member or reviewer
+            invalidate_now(f'user:{user.id}')
         return user
         
     except Exception as e:
@@ -80,6 +94,30 @@ def sync_firebase_user(firebase_user_data):
         db.session.rollback()
         return None
 
+def authenticate_firebase_user(firebase_user_data):
+    """Local user for verified token data, synced once per app context"""
+    synced = g.setdefault('firebase_users', {})
+    firebase_uid = firebase_user_data.get('uid')
+    if synced.get(firebase_uid) is None:
+        synced[firebase_uid] = sync_firebase_user(firebase_user_data)
+    return synced[firebase_uid]
+
+def firebase_auth_state():
+    """Tokens verified and users synced in this app context, for another thread's context"""
+    return dict(g.get('firebase_tokens', {})), dict(g.get('firebase_users', {}))
+
+def adopt_firebase_auth_state(state):
+    """Reuse another app context's verified tokens and synced users
+
+    The users are attached to this context's session without a query or a
+    re-sync; failed syncs (None) are left out so they're retried.
+    """
+    tokens, users = state
+    g.firebase_tokens = dict(tokens)
+    g.firebase_users = {
+        uid: db.session.merge(user, load=False) for uid, user in users.items() if user is not None
+    }
+
 def firebase_auth_required(f):
     """Decorator to require Firebase authentication"""
     @wraps(f)
@@ -97,7 +135,7 @@ def firebase_auth_required(f):
             return jsonify({'error': 'Invalid or expired token'}), 401
         
         # Sync user with database
-        user = sync_firebase_user(firebase_user)
+        user = authenticate_firebase_user(firebase_user)
         if not user:
             return jsonify({'error': 'User synchronization failed'}), 500
         
@@ -123,7 +161,7 @@ def firebase_auth_optional(f):
             firebase_user = verify_firebase_token(token)
             
             if firebase_user:
-                user = sync_firebase_user(firebase_user)
+                user = authenticate_firebase_user(firebase_user)
                 if user:
                     request.current_user = user
                     request.firebase_user = firebase_user
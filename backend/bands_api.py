@@ -4,24 +4,142 @@ REST API endpoints for the comprehensive bands system
 """
 
 from flask import Blueprint, request, jsonify, current_app
-from sqlalchemy import and_, or_, desc, asc, func
+from sqlalchemy import and_, or_, desc, asc, func, case
 from sqlalchemy.orm import joinedload
 from datetime import datetime, date, timedelta
 from models_bands_production import (
     db, User, Band, Venue, Gig, BandMember, BandReview, 
-    VenueReviewByBand, BandFollower, Setlist, GigSupportingBand, ReviewVote
+    VenueReviewByBand, BandFollower, Setlist, GigSupportingBand
 )
 from auth_firebase import (
     firebase_auth_required, firebase_auth_optional, band_member_required,
     band_access_required, get_current_user, validate_band_data, 
     validate_gig_data, validate_review_data
 )
+from review_ranking import vote_counts_dict
+from review_votes import REVIEW_VOTE_TARGETS, cast_vote, retract_vote, helpful_order
+from follower_feed import (
+    fan_out_gig, fan_out_gigs, backfill_feed, remove_band_from_feed,
+    get_feed_page, serialize_feed_gigs, decode_cursor
+)
+from gig_notifications import enqueue_gig_event, queue_delivery
+from gig_scheduling import INACTIVE_STATUSES, load_booking_index, parse_time, reject_double_bookings
+from slug_cache import resolve_slug, save_with_slug
+from list_serializers import (
+    ListShape, isoformat, json_list, json_object, requested_shape, requested_includes,
+    requested_lookup, bulk_lookup
+)
+from response_cache import cached, add_cache_tags, invalidate_cache
 import uuid
 
 # Create Blueprint
 bands_bp = Blueprint('bands', __name__, url_prefix='/api')
 
+# Most gigs accepted by one POST /api/gigs/batch
+MAX_BATCH_GIGS = 100
+
+# Upcoming gigs shown with each band in GET /api/bands
+LIST_UPCOMING_GIGS = 3
+
+# Every band attribute ?fields= can select (the keys of Band.to_dict())
+BAND_FIELDS = ListShape(
+    ('id', Band.id),
+    ('name', Band.name),
+    ('slug', Band.slug),
+    ('bio', Band.bio),
+    ('formed_year', Band.formed_year),
+    ('genres', Band.genres, json_list),
+    ('hometown', Band.hometown),
+    ('county', Band.county),
+    ('country', Band.country),
+    ('member_count', Band.member_count),
+    ('contact_email', Band.contact_email),
+    ('contact_phone', Band.contact_phone),
+    ('website', Band.website),
+    ('social_links', Band.social_links, json_object),
+    ('profile_image_url', Band.profile_image_url),
+    ('banner_image_url', Band.banner_image_url),
+    ('photo_gallery_urls', Band.photo_gallery_urls, json_list),
+    ('is_active', Band.is_active),
+    ('is_verified', Band.is_verified),
+    ('verification_level', Band.verification_level),
+    ('follower_count', Band.follower_count),
+    ('created_at', Band.created_at, isoformat),
+    ('updated_at', Band.updated_at, isoformat)
+)
+
+# Columns of a band in GET /api/bands when no ?fields= is given
+BAND_LIST = BAND_FIELDS.subset((
+    'id', 'name', 'slug', 'bio', 'formed_year', 'genres', 'hometown', 'county',
+    'profile_image_url', 'social_links', 'is_verified', 'verification_level', 'follower_count'
+))
+
+# Sections ?include= can add to a band
+BAND_INCLUDES = ('upcoming_gigs', 'members', 'stats')
+
+# Upcoming gigs shown by GET /api/bands/:slug?include=upcoming_gigs
+DETAIL_UPCOMING_GIGS = 10
+
+UPCOMING_GIG_LIST = ListShape(
+    ('id', Gig.id),
+    ('band_id', Gig.band_id),
+    ('gig_date', Gig.gig_date, isoformat),
+    ('doors_time', Gig.doors_time, isoformat),
+    ('start_time', Gig.start_time, isoformat),
+    ('ticket_price', Gig.ticket_price),
+    ('ticket_url', Gig.ticket_url),
+    ('status', Gig.status),
+    ('venue.id', Venue.id),
+    ('venue.name', Venue.name),
+    ('venue.slug', Venue.slug),
+    ('venue.city', Venue.city),
+    ('venue.county', Venue.county)
+)
+
+MEMBER_LIST = ListShape(
+    ('band_id', BandMember.band_id),
+    ('user_id', BandMember.user_id),
+    ('display_name', User.display_name),
+    ('role', BandMember.role),
+    ('instrument', BandMember.instrument),
+    ('joined_date', BandMember.joined_date, isoformat)
+)
+
+# Every gig attribute ?fields= can select on GET /api/gigs
+GIG_FIELDS = ListShape(
+    ('id', Gig.id),
+    ('gig_date', Gig.gig_date, isoformat),
+    ('doors_time', Gig.doors_time, isoformat),
+    ('start_time', Gig.start_time, isoformat),
+    ('end_time', Gig.end_time, isoformat),
+    ('ticket_price', Gig.ticket_price),
+    ('ticket_url', Gig.ticket_url),
+    ('status', Gig.status),
+    ('created_at', Gig.created_at, isoformat),
+    ('band.id', Band.id),
+    ('band.name', Band.name),
+    ('band.slug', Band.slug),
+    ('venue.id', Venue.id),
+    ('venue.name', Venue.name),
+    ('venue.slug', Venue.slug),
+    ('venue.city', Venue.city),
+    ('venue.county', Venue.county)
+)
+
+GIG_INCLUDES = ('supporting_bands',)
+
+SUPPORTING_BAND_LIST = ListShape(
+    ('gig_id', GigSupportingBand.gig_id),
+    ('id', Band.id),
+    ('name', Band.name),
+    ('slug', Band.slug),
+    ('performance_order', GigSupportingBand.performance_order)
+)
+
 # Utility functions
+def _optional_float(value):
+    return float(value) if value not in (None, '') else None
+
 def paginate_query(query, page=1, per_page=20, max_per_page=100):
     """Helper function to paginate queries"""
     per_page = min(per_page, max_per_page)
@@ -32,6 +150,121 @@ def paginate_query(query, page=1, per_page=20, max_per_page=100):
     )
     return pagination
 
+def upcoming_gigs_by_band(band_ids, limit=LIST_UPCOMING_GIGS):
+    """Next scheduled gigs of each band, with one windowed query for the whole page"""
+    if not band_ids:
+        return {}
+
+    position = func.row_number().over(
+        partition_by=Gig.band_id, order_by=(Gig.gig_date, Gig.id)
+    ).label('position')
+    upcoming = db.session.query(*UPCOMING_GIG_LIST.columns, position).join(
+        Venue, Venue.id == Gig.venue_id
+    ).filter(
+        Gig.band_id.in_(band_ids),
+        Gig.gig_date >= date.today(),
+        Gig.status.in_(['scheduled', 'confirmed'])
+    ).subquery()
+
+    gigs = {band_id: [] for band_id in band_ids}
+    rows = db.session.query(*[column for column in upcoming.c if column.name != 'position']).filter(
+        upcoming.c.position <= limit
+    ).order_by(upcoming.c.band_id, upcoming.c.position)
+    for gig in UPCOMING_GIG_LIST.serialize_all(rows):
+        gigs[gig['band_id']].append(gig)
+    return gigs
+
+def band_members_by_band(band_ids):
+    """Active members of each band, with one query for the whole page"""
+    members = {band_id: [] for band_id in band_ids}
+    if not band_ids:
+        return members
+
+    rows = db.session.query(*MEMBER_LIST.columns).join(
+        User, User.id == BandMember.user_id
+    ).filter(
+        BandMember.band_id.in_(band_ids),
+        BandMember.is_active == True
+    ).order_by(BandMember.band_id, BandMember.joined_date, BandMember.id)
+    for member in MEMBER_LIST.serialize_all(rows):
+        members[member['band_id']].append(member)
+    return members
+
+def band_stats_by_band(band_ids):
+    """Gig and review totals of each band, with one grouped query per table"""
+    stats = {band_id: {'total_gigs': 0, 'upcoming_gigs': 0, 'review_count': 0, 'average_rating': None}
+             for band_id in band_ids}
+    if not band_ids:
+        return stats
+
+    gig_totals = db.session.query(
+        Gig.band_id,
+        func.count(Gig.id),
+        func.sum(case((Gig.gig_date >= date.today(), 1), else_=0))
+    ).filter(
+        Gig.band_id.in_(band_ids),
+        Gig.status.notin_(INACTIVE_STATUSES)
+    ).group_by(Gig.band_id)
+    for band_id, total, upcoming in gig_totals:
+        stats[band_id].update(total_gigs=total, upcoming_gigs=int(upcoming or 0))
+
+    review_totals = db.session.query(
+        BandReview.band_id, func.count(BandReview.id), func.avg(BandReview.rating)
+    ).filter(BandReview.band_id.in_(band_ids)).group_by(BandReview.band_id)
+    for band_id, count, average in review_totals:
+        stats[band_id].update(review_count=count,
+                              average_rating=round(float(average), 2) if average is not None else None)
+    return stats
+
+def expand_bands(bands, includes, upcoming_limit=LIST_UPCOMING_GIGS):
+    """Add the requested ?include= sections to serialized bands (one query per section)"""
+    band_ids = [band['id'] for band in bands]
+    sections = {}
+    if 'upcoming_gigs' in includes:
+        sections['upcoming_gigs'] = upcoming_gigs_by_band(band_ids, upcoming_limit)
+    if 'members' in includes:
+        sections['members'] = band_members_by_band(band_ids)
+    if 'stats' in includes:
+        sections['stats'] = band_stats_by_band(band_ids)
+
+    for band in bands:
+        for name, values in sections.items():
+            band[name] = values[band['id']]
+    return bands
+
+def band_page_cache_tags(band):
+    """Response cache tags of a serialized band: the band itself and the gigs,
+    venues and member users its ?include= sections show"""
+    tags = {f"band:{band['id']}"}
+    for gig in band.get('upcoming_gigs', ()):
+        tags.update((f"gig:{gig['id']}", f"venue:{gig['venue']['id']}"))
+    for member in band.get('members', ()):
+        tags.add(f"user:{member['user_id']}")
+    return tags
+
+def supporting_bands_by_gig(gig_ids):
+    """Supporting bands of each gig in running order, with one query for the whole page"""
+    supporting = {gig_id: [] for gig_id in gig_ids}
+    if not gig_ids:
+        return supporting
+
+    rows = db.session.query(*SUPPORTING_BAND_LIST.columns).join(
+        Band, Band.id == GigSupportingBand.band_id
+    ).filter(
+        GigSupportingBand.gig_id.in_(gig_ids)
+    ).order_by(GigSupportingBand.gig_id, GigSupportingBand.performance_order)
+    for band in SUPPORTING_BAND_LIST.serialize_all(rows):
+        supporting[band['gig_id']].append(band)
+    return supporting
+
+def expand_gigs(gigs, includes):
+    """Add the requested ?include= sections to serialized gigs"""
+    if 'supporting_bands' in includes:
+        supporting = supporting_bands_by_gig([gig['id'] for gig in gigs])
+        for gig in gigs:
+            gig['supporting_bands'] = supporting[gig['id']]
+    return gigs
+
 def build_band_filters(args):
     """Build SQLAlchemy filters from query parameters"""
     filters = []
@@ -73,11 +306,18 @@ def build_band_filters(args):
 # ============================================================================
 
 @bands_bp.route('/bands', methods=['GET'])
+@cached(tags=('bands', 'venues', 'gigs', 'reviews'), public=True)
 @firebase_auth_optional
 def list_bands():
     """
     GET /api/bands
     List bands with filtering, searching, and pagination
+    
+    ?fields=name,slug,... selects band attributes; ?include= adds
+    upcoming_gigs (the default), members and/or stats.
+    
+    ?ids=1,2,3 or ?slugs=a,b,c fetch those bands in that order, with the
+    keys not found under 'missing', instead of a filtered page.
     """
     try:
         # Get query parameters
@@ -86,9 +326,23 @@ def list_bands():
         sort_by = request.args.get('sort_by', 'name')
         sort_order = request.args.get('sort_order', 'asc')
         
+        try:
+            lookup = requested_lookup(request.args)
+            shape = requested_shape(request.args, BAND_FIELDS, BAND_LIST,
+                                    required=('id', lookup[0]) if lookup else ('id',))
+            includes = requested_includes(request.args, BAND_INCLUDES, default=('upcoming_gigs',))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Build base query
         query = Band.query.filter(Band.is_active == True)
         
+        # Bulk lookup: one IN query, results in request order
+        if lookup:
+            key, values = lookup
+            bands, missing = bulk_lookup(shape, query, getattr(Band, key), key, values)
+            return jsonify({'bands': expand_bands(bands, includes), 'missing': missing}), 200
+        
         # Apply filters
         filters = build_band_filters(request.args)
         if filters:
@@ -101,25 +355,11 @@ def list_bands():
         else:
             query = query.order_by(asc(sort_column))
         
-        # Paginate results
-        pagination = paginate_query(query, page, per_page)
+        # Paginate results, selecting only the requested columns
+        pagination = paginate_query(shape.query(query), page, per_page)
         
-        # Serialize results
-        bands = []
-        for band in pagination.items:
-            band_data = band.to_dict(include_stats=True)
-            
-            # Add upcoming gigs preview
-            upcoming_gigs = Gig.query.filter(
-                and_(
-                    Gig.band_id == band.id,
-                    Gig.gig_date >= date.today(),
-                    Gig.status.in_(['scheduled', 'confirmed'])
-                )
-            ).order_by(Gig.gig_date).limit(3).all()
-            
-            band_data['upcoming_gigs'] = [gig.to_dict(include_venue=True, include_band=False) for gig in upcoming_gigs]
-            bands.append(band_data)
+        # Serialize results with the requested sections (upcoming gigs by default)
+        bands = expand_bands(shape.serialize_all(pagination.items), includes)
         
         return jsonify({
             'bands': bands,
@@ -138,17 +378,37 @@ def list_bands():
         return jsonify({'error': 'Internal server error'}), 500
 
 @bands_bp.route('/bands/<slug>', methods=['GET'])
+@cached()
 @firebase_auth_optional
 def get_band(slug):
     """
     GET /api/bands/:slug
     Get detailed band information
+    
+    With ?fields= and/or ?include= (upcoming_gigs, members, stats) only
+    the requested attributes and sections are loaded.
     """
     try:
+        if 'fields' in request.args or 'include' in request.args:
+            try:
+                shape = requested_shape(request.args, BAND_FIELDS)
+                includes = requested_includes(request.args, BAND_INCLUDES)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            row = shape.query(Band.query.filter_by(slug=slug, is_active=True)).first()
+            if not row:
+                return jsonify({'error': 'Band not found'}), 404
+            
+            band_data = expand_bands([shape.serialize(row)], includes, upcoming_limit=DETAIL_UPCOMING_GIGS)[0]
+            add_cache_tags(*band_page_cache_tags(band_data))
+            return jsonify(band_data), 200
+        
         # Find band by slug
         band = Band.query.filter_by(slug=slug, is_active=True).first()
         if not band:
             return jsonify({'error': 'Band not found'}), 404
+        add_cache_tags(f'band:{band.id}')
         
         # Get detailed band info
         band_data = band.to_dict(include_stats=True, include_members=True)
@@ -194,6 +454,14 @@ def get_band(slug):
             for review in venue_reviews
         ]
         
+        # Tag the page with everything embedded in it, not just the band
+        add_cache_tags(
+            *{f'gig:{gig.id}' for gig in upcoming_gigs},
+            *{f'venue:{gig.venue_id}' for gig in upcoming_gigs},
+            *{f'user:{review.reviewer_id}' for review in recent_reviews},
+            *{f'venue:{review.venue_id}' for review in venue_reviews}
+        )
+        
         # Check if current user follows this band
         current_user = get_current_user()
         if current_user:
@@ -230,19 +498,10 @@ def create_band():
         
         current_user = get_current_user()
         
-        # Generate unique slug
-        base_slug = Band.generate_slug(data['name'])
-        slug = base_slug
-        counter = 1
-        while Band.query.filter_by(slug=slug).first():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-        
         # Create band
         band = Band(
             id=uuid.uuid4(),
             name=data['name'],
-            slug=slug,
             bio=data.get('bio'),
             formed_year=data.get('formed_year'),
             genres=data['genres'],
@@ -259,7 +518,8 @@ def create_band():
             created_by=current_user.id
         )
         
-        db.session.add(band)
+        # Insert with a unique slug (retried if a concurrent request takes it)
+        save_with_slug(band, data['name'])
         
         # Add creator as primary contact member
         member = BandMember(
@@ -270,6 +530,7 @@ def create_band():
         )
         
         db.session.add(member)
+        invalidate_cache('bands')
         db.session.commit()
         
         return jsonify({
@@ -304,6 +565,8 @@ def update_band(slug):
         if errors:
             return jsonify({'errors': errors}), 400
         
+        name_changed = 'name' in data and data['name'] != band.name
+        
         # Update fields
         updateable_fields = [
             'name', 'bio', 'formed_year', 'genres', 'hometown', 'county',
@@ -317,15 +580,10 @@ def update_band(slug):
                 setattr(band, field, data[field])
         
         # Update slug if name changed
-        if 'name' in data and data['name'] != band.name:
-            base_slug = Band.generate_slug(data['name'])
-            slug = base_slug
-            counter = 1
-            while Band.query.filter_by(slug=slug).filter(Band.id != band.id).first():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            band.slug = slug
+        if name_changed:
+            save_with_slug(band, data['name'])
         
+        invalidate_cache('bands', f'band:{band.id}')
         db.session.commit()
         
         return jsonify({
@@ -343,11 +601,17 @@ def update_band(slug):
 # ============================================================================
 
 @bands_bp.route('/gigs', methods=['GET'])
+@cached(tags=('gigs', 'bands', 'venues'), public=True)
 @firebase_auth_optional
 def list_gigs():
     """
     GET /api/gigs
     List gigs with filtering and pagination
+    
+    ?fields= selects gig attributes ('band' / 'venue' select all of theirs,
+    'venue.city' just one); ?include=supporting_bands is the default.
+    ?ids=1,2,3 fetches those gigs in that order, with the ids not found
+    under 'missing'.
     """
     try:
         # Get query parameters
@@ -360,21 +624,37 @@ def list_gigs():
         status = request.args.get('status')
         county = request.args.get('county')
         
-        # Build base query
-        query = Gig.query.filter(Gig.is_public == True)
+        try:
+            lookup = requested_lookup(request.args, params=('ids',))
+            shape = requested_shape(request.args, GIG_FIELDS)
+            includes = requested_includes(request.args, GIG_INCLUDES, default=GIG_INCLUDES)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Build base query, joining bands/venues only when their columns are needed
+        query = Gig.query
+        if any(key.startswith('band.') for key in shape.keys):
+            query = query.join(Band, Band.id == Gig.band_id)
+        if county or any(key.startswith('venue.') for key in shape.keys):
+            query = query.join(Venue, Venue.id == Gig.venue_id)
+        
+        # Bulk lookup: one IN query, results in request order
+        if lookup:
+            gigs, missing = bulk_lookup(shape, query, Gig.id, 'id', lookup[1])
+            return jsonify({'gigs': expand_gigs(gigs, includes), 'missing': missing}), 200
         
         # Apply filters
         filters = []
         
         if band_slug:
-            band = Band.query.filter_by(slug=band_slug).first()
-            if band:
-                filters.append(Gig.band_id == band.id)
+            band_id = resolve_slug(Band, band_slug)
+            if band_id:
+                filters.append(Gig.band_id == band_id)
         
         if venue_slug:
-            venue = Venue.query.filter_by(slug=venue_slug).first()
-            if venue:
-                filters.append(Gig.venue_id == venue.id)
+            venue_id = resolve_slug(Venue, venue_slug)
+            if venue_id:
+                filters.append(Gig.venue_id == venue_id)
         
         if date_from:
             try:
@@ -395,8 +675,7 @@ def list_gigs():
             filters.append(Gig.status.in_(statuses))
         
         if county:
-            # Join with venues to filter by county
-            query = query.join(Venue).filter(Venue.county.ilike(f"%{county}%"))
+            filters.append(Venue.county.ilike(f"%{county}%"))
         
         if filters:
             query = query.filter(and_(*filters))
@@ -404,12 +683,11 @@ def list_gigs():
         # Order by date
         query = query.order_by(desc(Gig.gig_date))
         
-        # Paginate results
-        pagination = paginate_query(query, page, per_page)
+        # Paginate results, selecting only the requested columns
+        pagination = paginate_query(shape.query(query), page, per_page)
         
         # Serialize results
-        gigs = [gig.to_dict(include_venue=True, include_band=True, include_supporting=True) 
-                for gig in pagination.items]
+        gigs = expand_gigs(shape.serialize_all(pagination.items), includes)
         
         return jsonify({
             'gigs': gigs,
@@ -481,6 +759,15 @@ def create_gig():
         )
         
         db.session.add(gig)
+        db.session.flush()
+        
+        # Push the gig into followers' feeds (large bands are merged on read)
+        fan_out_gig(gig, Band.query.get(gig.band_id))
+        
+        # Follower emails are sent by a background job, not in the request;
+        # the dedup key folds a burst of new gigs into one queued delivery run
+        enqueue_gig_event(gig)
+        queue_delivery()
         
         # Add supporting bands if provided
         if data.get('supporting_bands'):
@@ -492,6 +779,7 @@ def create_gig():
                 )
                 db.session.add(support)
         
+        invalidate_cache('gigs', f'band:{gig.band_id}', f'venue:{gig.venue_id}')
         db.session.commit()
         
         return jsonify({
@@ -504,6 +792,150 @@ def create_gig():
         current_app.logger.error(f"Error creating gig: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@bands_bp.route('/gigs/batch', methods=['POST'])
+@band_member_required
+def create_gigs_batch():
+    """
+    POST /api/gigs/batch
+    Create many gigs at once, e.g. a tour (band members only)
+
+    Body: {"gigs": [{band_id, venue_id, gig_date, doors_time, start_time,
+    end_time, ticket_price, ticket_url, status, supporting_bands}, ...],
+    "atomic": true}
+
+    Memberships, venues and supporting bands are checked with one query
+    each, and double bookings of a venue or band against existing gigs and
+    the rest of the batch with an interval index. With atomic (default)
+    any row error rejects the whole batch; otherwise the valid rows are
+    created. Gigs and supporting bands are inserted in one transaction.
+    """
+    try:
+        data = request.get_json()
+        if not data or not isinstance(data.get('gigs'), list) or not data['gigs']:
+            return jsonify({'error': 'gigs list required'}), 400
+
+        rows = data['gigs']
+        if len(rows) > MAX_BATCH_GIGS:
+            return jsonify({'error': f'At most {MAX_BATCH_GIGS} gigs per batch'}), 400
+        atomic = data.get('atomic', True)
+
+        current_user = get_current_user()
+        errors = {}
+        parsed = {}
+
+        # Per-row field validation and parsing
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors[index] = ['Gig must be an object']
+                continue
+
+            row_errors = validate_gig_data(row)
+            if not row_errors:
+                try:
+                    supporting = [int(band_id) for band_id in row.get('supporting_bands') or []]
+                    parsed[index] = {
+                        'band_id': int(row['band_id']),
+                        'venue_id': int(row['venue_id']),
+                        'gig_date': datetime.fromisoformat(row['gig_date'].replace('Z', '+00:00')).date(),
+                        'doors_time': parse_time(row.get('doors_time')),
+                        'start_time': parse_time(row.get('start_time')),
+                        'end_time': parse_time(row.get('end_time')),
+                        'ticket_price': _optional_float(row.get('ticket_price', row.get('door_price'))),
+                        'ticket_url': row.get('ticket_url'),
+                        'status': row.get('status', 'scheduled'),
+                        'supporting_bands': list(dict.fromkeys(supporting))
+                    }
+                except (TypeError, ValueError) as e:
+                    row_errors.append(f'Invalid value: {e}')
+            if row_errors:
+                errors[index] = row_errors
+
+        # Set-based lookups: one query per kind of reference
+        band_ids = {gig['band_id'] for gig in parsed.values()}
+        venue_ids = {gig['venue_id'] for gig in parsed.values()}
+        supporting_ids = {band_id for gig in parsed.values() for band_id in gig['supporting_bands']}
+
+        member_of = {row.band_id for row in db.session.query(BandMember.band_id).filter(
+            BandMember.user_id == current_user.id,
+            BandMember.is_active == True,
+            BandMember.band_id.in_(band_ids)
+        )} if band_ids else set()
+        active_venues = {row.id for row in db.session.query(Venue.id).filter(
+            Venue.id.in_(venue_ids), Venue.is_active == True
+        )} if venue_ids else set()
+        known_bands = {row.id for row in db.session.query(Band.id).filter(
+            Band.id.in_(supporting_ids)
+        )} if supporting_ids else set()
+
+        for index, gig in list(parsed.items()):
+            row_errors = []
+            if gig['band_id'] not in member_of:
+                row_errors.append('Not authorized to create gigs for this band')
+            if gig['venue_id'] not in active_venues:
+                row_errors.append('Venue not found')
+            unknown = [band_id for band_id in gig['supporting_bands'] if band_id not in known_bands]
+            if unknown:
+                row_errors.append(f'Supporting bands not found: {unknown}')
+            if gig['band_id'] in gig['supporting_bands']:
+                row_errors.append('A band cannot support its own gig')
+            if row_errors:
+                errors[index] = row_errors
+                del parsed[index]
+
+        # Double-booking: existing gigs first, then earlier rows of this batch
+        booked = load_booking_index(
+            {gig['gig_date'] for gig in parsed.values()},
+            venue_ids,
+            band_ids | supporting_ids
+        )
+        errors.update(reject_double_bookings(parsed, booked))
+
+        error_list = [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
+        if error_list and (atomic or not parsed):
+            return jsonify({'error': 'No gigs created', 'errors': error_list}), 400
+
+        # Insert everything in one transaction
+        order = sorted(parsed)
+        gigs = [Gig(**{key: value for key, value in parsed[index].items() if key != 'supporting_bands'})
+                for index in order]
+        db.session.add_all(gigs)
+        db.session.flush()
+
+        supporting_rows = [
+            {'gig_id': gig.id, 'band_id': band_id, 'performance_order': position + 1}
+            for index, gig in zip(order, gigs)
+            for position, band_id in enumerate(parsed[index]['supporting_bands'])
+        ]
+        if supporting_rows:
+            db.session.execute(GigSupportingBand.__table__.insert(), supporting_rows)
+
+        # Feeds and notifications, once per band rather than once per gig
+        gigs_by_band = {}
+        for gig in gigs:
+            gigs_by_band.setdefault(gig.band_id, []).append(gig)
+        bands = {band.id: band for band in Band.query.filter(Band.id.in_(list(gigs_by_band)))}
+        for band_id, band_gigs in gigs_by_band.items():
+            fan_out_gigs(band_gigs, bands[band_id])
+        for gig in gigs:
+            enqueue_gig_event(gig)
+        queue_delivery()
+
+        gig_ids = [gig.id for gig in gigs]  # Read before commit expires the objects
+        invalidate_cache('gigs', *{f'band:{gig.band_id}' for gig in gigs}, *{f'venue:{gig.venue_id}' for gig in gigs})
+        db.session.commit()
+
+        serialized = serialize_feed_gigs(gig_ids)
+        return jsonify({
+            'message': f'{len(gig_ids)} gigs created successfully',
+            'gigs': [{'index': index, 'gig': gig} for index, gig in zip(order, serialized)],
+            'errors': error_list
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error creating gig batch: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 # ============================================================================
 # REVIEWS ENDPOINTS
 # ============================================================================
@@ -527,17 +959,20 @@ def list_band_reviews():
         
         # Apply filters
         if band_slug:
-            band = Band.query.filter_by(slug=band_slug).first()
-            if band:
-                query = query.filter(BandReview.band_id == band.id)
+            band_id = resolve_slug(Band, band_slug)
+            if band_id:
+                query = query.filter(BandReview.band_id == band_id)
             else:
                 return jsonify({'error': 'Band not found'}), 404
         
         if reviewer_id:
             query = query.filter(BandReview.reviewer_id == reviewer_id)
         
-        # Order by creation date
-        query = query.order_by(desc(BandReview.created_at))
+        # Order by helpfulness (precomputed Wilson score) or creation date
+        if request.args.get('sort') == 'helpful':
+            query = query.order_by(*helpful_order(BandReview))
+        else:
+            query = query.order_by(desc(BandReview.created_at))
         
         # Paginate results
         pagination = paginate_query(query, page, per_page)
@@ -614,6 +1049,7 @@ def create_band_review():
         )
         
         db.session.add(review)
+        invalidate_cache('reviews', f'band:{band.id}')
         db.session.commit()
         
         return jsonify({
@@ -645,21 +1081,24 @@ def list_venue_reviews_by_bands():
         
         # Apply filters
         if venue_slug:
-            venue = Venue.query.filter_by(slug=venue_slug).first()
-            if venue:
-                query = query.filter(VenueReviewByBand.venue_id == venue.id)
+            venue_id = resolve_slug(Venue, venue_slug)
+            if venue_id:
+                query = query.filter(VenueReviewByBand.venue_id == venue_id)
             else:
                 return jsonify({'error': 'Venue not found'}), 404
         
         if band_slug:
-            band = Band.query.filter_by(slug=band_slug).first()
-            if band:
-                query = query.filter(VenueReviewByBand.band_id == band.id)
+            band_id = resolve_slug(Band, band_slug)
+            if band_id:
+                query = query.filter(VenueReviewByBand.band_id == band_id)
             else:
                 return jsonify({'error': 'Band not found'}), 404
         
-        # Order by creation date
-        query = query.order_by(desc(VenueReviewByBand.created_at))
+        # Order by helpfulness (precomputed Wilson score) or creation date
+        if request.args.get('sort') == 'helpful':
+            query = query.order_by(*helpful_order(VenueReviewByBand))
+        else:
+            query = query.order_by(desc(VenueReviewByBand.created_at))
         
         # Paginate results
         pagination = paginate_query(query, page, per_page)
@@ -748,6 +1187,7 @@ def create_venue_review_by_band():
         )
         
         db.session.add(review)
+        invalidate_cache('reviews', f'band:{review.band_id}', f'venue:{venue.id}')
         db.session.commit()
         
         return jsonify({
@@ -760,6 +1200,87 @@ def create_venue_review_by_band():
         current_app.logger.error(f"Error creating venue review by band: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+def review_cache_tags(review):
+    """Response cache tags of the pages showing a band or venue review"""
+    tags = ['reviews', f'band:{review.band_id}']
+    if isinstance(review, VenueReviewByBand):
+        tags.append(f'venue:{review.venue_id}')
+    return tags
+
+@bands_bp.route('/reviews/<review_kind>/<int:review_id>/vote', methods=['POST'])
+@firebase_auth_required
+def vote_on_review(review_kind, review_id):
+    """
+    POST /api/reviews/:kind/:id/vote
+    Mark a band or venue review helpful or not ({"is_helpful": bool});
+    counters and Wilson score are updated in the same transaction as the vote row
+    """
+    try:
+        if review_kind not in REVIEW_VOTE_TARGETS:
+            return jsonify({'error': 'Review type must be bands or venues'}), 404
+        
+        data = request.get_json() or {}
+        if not isinstance(data.get('is_helpful'), bool):
+            return jsonify({'error': 'is_helpful (true/false) is required'}), 400
+        
+        model, review_type = REVIEW_VOTE_TARGETS[review_kind]
+        current_user = get_current_user()
+        
+        # Lock the review row so concurrent votes cannot lose counter updates
+        review = model.query.filter_by(id=review_id).with_for_update().first()
+        if not review:
+            return jsonify({'error': 'Review not found'}), 404
+        
+        cast_vote(review, review_type, current_user.id, data['is_helpful'])
+        invalidate_cache(*review_cache_tags(review))
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Vote recorded',
+            'review_id': review_id,
+            **vote_counts_dict(review)
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error voting on {review_kind} review {review_id}: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@bands_bp.route('/reviews/<review_kind>/<int:review_id>/vote', methods=['DELETE'])
+@firebase_auth_required
+def retract_review_vote(review_kind, review_id):
+    """
+    DELETE /api/reviews/:kind/:id/vote
+    Retract the current user's vote on a band or venue review
+    """
+    try:
+        if review_kind not in REVIEW_VOTE_TARGETS:
+            return jsonify({'error': 'Review type must be bands or venues'}), 404
+        
+        model, review_type = REVIEW_VOTE_TARGETS[review_kind]
+        current_user = get_current_user()
+        
+        review = model.query.filter_by(id=review_id).with_for_update().first()
+        if not review:
+            return jsonify({'error': 'Review not found'}), 404
+        
+        if not retract_vote(review, review_type, current_user.id):
+            return jsonify({'error': 'You have not voted on this review'}), 400
+        
+        invalidate_cache(*review_cache_tags(review))
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Vote removed',
+            'review_id': review_id,
+            **vote_counts_dict(review)
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error removing vote on {review_kind} review {review_id}: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 # ============================================================================
 # BAND FOLLOWERS ENDPOINTS
 # ============================================================================
@@ -782,7 +1303,7 @@ def follow_band(slug):
         # Check if already following
         existing = BandFollower.query.filter_by(
             band_id=band.id,
-            follower_id=current_user.id
+            user_id=current_user.id
         ).first()
         
         if existing:
@@ -791,10 +1312,15 @@ def follow_band(slug):
         # Create follow relationship
         follow = BandFollower(
             band_id=band.id,
-            follower_id=current_user.id
+            user_id=current_user.id
         )
         
         db.session.add(follow)
+        Band.query.filter_by(id=band.id).update(
+            {Band.follower_count: Band.follower_count + 1}, synchronize_session=False
+        )
+        backfill_feed(current_user.id, band.id)
+        invalidate_cache('bands', f'band:{band.id}')
         db.session.commit()
         
         return jsonify({
@@ -825,7 +1351,7 @@ def unfollow_band(slug):
         # Find follow relationship
         follow = BandFollower.query.filter_by(
             band_id=band.id,
-            follower_id=current_user.id
+            user_id=current_user.id
         ).first()
         
         if not follow:
@@ -833,6 +1359,11 @@ def unfollow_band(slug):
         
         # Remove follow relationship
         db.session.delete(follow)
+        Band.query.filter_by(id=band.id).update(
+            {Band.follower_count: Band.follower_count - 1}, synchronize_session=False
+        )
+        remove_band_from_feed(current_user.id, band.id)
+        invalidate_cache('bands', f'band:{band.id}')
         db.session.commit()
         
         return jsonify({
@@ -845,11 +1376,45 @@ def unfollow_band(slug):
         current_app.logger.error(f"Error unfollowing band {slug}: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@bands_bp.route('/me/feed', methods=['GET'])
+@firebase_auth_required
+def get_my_feed():
+    """
+    GET /api/me/feed
+    Upcoming gigs from followed bands, soonest first, with cursor pagination
+    """
+    try:
+        current_user = get_current_user()
+        limit = min(int(request.args.get('limit', 20)), 100)
+        if limit < 1:
+            return jsonify({'error': 'limit must be positive'}), 400
+        
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                cursor = decode_cursor(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        
+        gig_ids, next_cursor = get_feed_page(current_user.id, cursor, limit)
+        
+        return jsonify({
+            'gigs': serialize_feed_gigs(gig_ids),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error loading feed: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 # ============================================================================
 # STATISTICS AND SEARCH ENDPOINTS
 # ============================================================================
 
 @bands_bp.route('/stats', methods=['GET'])
+@cached(tags=('bands', 'venues', 'gigs', 'reviews'), public=True)
 @firebase_auth_optional
 def get_platform_stats():
     """
@@ -893,6 +1458,7 @@ def get_platform_stats():
         return jsonify({'error': 'Internal server error'}), 500
 
 @bands_bp.route('/search', methods=['GET'])
+@cached(tags=('bands', 'venues', 'gigs'), public=True)
 @firebase_auth_optional
 def search_all():
     """
@@ -0,0 +1,125 @@
+"""
+BandVenueReview.ie - Batch API
+POST /api/batch: several GET requests in one round trip
+
+A page that needs /api/stats, /api/bands and /api/gigs can send them as
+one batch. Sub-requests are dispatched through the app itself (same
+routes, decorators and error handlers) and share the batch's auth: the
+bearer token is verified and its user synced once. On SQLite, or for a
+single sub-request, they run in order inside the batch's app context and
+DB session; otherwise they run side by side in a small thread pool, each
+thread with its own app context and pooled connection, since a session
+can't be shared between threads.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from flask import Blueprint, request, jsonify, current_app
+from werkzeug.test import EnvironBuilder
+
+from models_bands_production import db
+from auth_firebase import adopt_firebase_auth_state, firebase_auth_optional, firebase_auth_state
+
+# Create Blueprint
+batch_bp = Blueprint('batch', __name__, url_prefix='/api')
+
+# Most sub-requests one POST /api/batch accepts
+MAX_BATCH_REQUESTS = 20
+
+# Threads running sub-requests side by side (1 runs them in order)
+BATCH_WORKERS = 4
+
+# Batch request headers passed on to every sub-request
+FORWARDED_HEADERS = ('Authorization', 'Accept-Language')
+
+def _sub_request_environ(path):
+    headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+    return EnvironBuilder(path=path, method='GET', base_url=request.host_url, headers=headers).get_environ()
+
+def _dispatch(app, environ):
+    """Status and body of one sub-request run through the app"""
+    with app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Error in batch sub-request {environ.get('PATH_INFO')}: {str(e)}")
+            return {'status': 500, 'body': {'error': 'Internal server error'}}
+
+    body = response.get_json(silent=True)
+    return {'status': response.status_code, 'body': body if body is not None else response.get_data(as_text=True)}
+
+def _dispatch_in_thread(app, environ, auth_state):
+    """_dispatch in a worker thread's own app context, reusing the batch's
+    verified tokens and synced users"""
+    with app.app_context():
+        adopt_firebase_auth_state(auth_state)
+        return _dispatch(app, environ)
+
+def validate_sub_request(sub):
+    """Path of a sub-request, or an error message"""
+    if not isinstance(sub, dict):
+        return None, 'Sub-request must be an object'
+    path = sub.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/'):
+        return None, 'path must start with /api/'
+    if urlsplit(path).path.rstrip('/') == '/api/batch':
+        return None, 'Batches cannot be nested'
+    if (sub.get('method') or 'GET').upper() != 'GET':
+        return None, 'Only GET sub-requests are supported'
+    return path, None
+
+@batch_bp.route('/batch', methods=['POST'])
+@firebase_auth_optional
+def run_batch():
+    """
+    POST /api/batch
+    Run several GET requests in one round trip
+
+    Body: {"requests": [{"id": "stats", "path": "/api/stats"},
+    {"id": "bands", "path": "/api/bands?per_page=6&fields=name,slug"}]}
+
+    Returns {"responses": [{"id", "status", "body"}, ...]} in request
+    order; a failing sub-request doesn't fail the batch.
+    """
+    try:
+        data = request.get_json(silent=True)
+        subs = data.get('requests') if isinstance(data, dict) else None
+        if not isinstance(subs, list) or not subs:
+            return jsonify({'error': 'requests list required'}), 400
+        if len(subs) > MAX_BATCH_REQUESTS:
+            return jsonify({'error': f'At most {MAX_BATCH_REQUESTS} requests per batch'}), 400
+
+        paths = []
+        errors = []
+        for index, sub in enumerate(subs):
+            path, error = validate_sub_request(sub)
+            if error:
+                errors.append({'index': index, 'error': error})
+            paths.append(path)
+        if errors:
+            return jsonify({'error': 'Invalid sub-requests', 'errors': errors}), 400
+
+        app = current_app._get_current_object()
+        environs = [_sub_request_environ(path) for path in paths]
+        workers = min(BATCH_WORKERS, len(environs))
+
+        if workers > 1 and db.engine.dialect.name != 'sqlite':
+            auth_state = firebase_auth_state()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda environ: _dispatch_in_thread(app, environ, auth_state), environs))
+        else:
+            results = [_dispatch(app, environ) for environ in environs]
+
+        return jsonify({
+            'responses': [
+                {'id': sub.get('id', index), **result}
+                for index, (sub, result) in enumerate(zip(subs, results))
+            ]
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error running batch: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
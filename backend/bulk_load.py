@@ -0,0 +1,288 @@
+"""
+BandVenueReview.ie - Bulk NDJSON Loader
+Loads the importer outputs (Sanity-shaped NDJSON: bands_import.ndjson,
+venues_import.ndjson, ...) into the bands and venues tables
+
+Documents are streamed from the file, mapped onto models_bands_production
+rows and upserted by their Sanity _id (stored as source_id) in large
+batches inside one transaction: multi-row INSERT ... ON CONFLICT
+(source_id) DO UPDATE on PostgreSQL, executemany of INSERT ... ON CONFLICT
+on SQLite. Rows created through the API have no source_id, so a load never
+updates them. Slugs are allocated in memory against the slugs already in
+the table (one query per table, none per row): a document keeps the slug it
+got on an earlier load whatever its position in the file, and slugs of
+other rows are never reused. Once the load commits, the response cache
+tags of every written row ('band:<id>', 'venue:<id>') and of the listings
+('bands', 'venues') are stamped, as the API does for its own writes.
+
+Usage:
+    python bulk_load.py ../bands_import.ndjson
+    python bulk_load.py ../scripts/venues_import.ndjson --batch-size 5000
+    python bulk_load.py ../bands_import.ndjson --dry-run
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from sqlalchemy import Text, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from config import config
+from models_bands_production import db, Band, Venue
+from response_cache import invalidate_cache
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns an upsert must not overwrite on an existing row
+PRESERVED_COLUMNS = {'id', 'slug', 'source_id', 'created_at', 'created_by', 'follower_count', 'is_verified'}
+
+def create_loader_app(config_name=None):
+    """Database-only app: the loader needs models and config, not the API"""
+    app = Flask(__name__)
+    config_name = config_name or os.environ.get('FLASK_CONFIG', 'development')
+    app.config.from_object(config[config_name])
+    db.init_app(app)
+    return app
+
+def slugify(text):
+    slug = re.sub(r'[^\w\s-]', '', (text or '').lower())
+    return re.sub(r'[\s_-]+', '-', slug).strip('-')
+
+def iter_documents(path):
+    """Documents from an NDJSON file, one line at a time (blank and bad lines are skipped)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                print(f"⚠️  Skipping line {line_number}: {e}")
+
+def _first(*values):
+    return next((value for value in values if value not in (None, '', [], {})), None)
+
+def map_band(doc):
+    """Band columns from a Sanity band document (scraper or CMS shape)"""
+    location = doc.get('location') or {}
+    music = doc.get('musicDetails') or {}
+    contact = doc.get('contact') or {}
+    socials = {**(doc.get('socialMedia') or {}), **(doc.get('streaming') or {}), **(doc.get('socialLinks') or {})}
+    for network in ('facebook', 'instagram', 'twitter'):
+        if contact.get(network):
+            socials.setdefault(network, contact[network])
+    socials.pop('_type', None)
+    website = socials.pop('website', None)
+
+    return {
+        'name': doc['name'],
+        'bio': _first(doc.get('bio'), doc.get('description')),
+        'formed_year': _first(music.get('formedYear'), doc.get('formedYear')),
+        'genres': _first(music.get('genres'), doc.get('genres')) or [],
+        'hometown': _first(location.get('city'), doc.get('locationText')),
+        'county': location.get('county'),
+        'country': location.get('country') or 'Ireland',
+        'member_count': music.get('memberCount'),
+        'contact_email': contact.get('email'),
+        'website': _first(contact.get('website'), website),
+        'social_links': socials,
+        'is_active': doc.get('isActive', True)
+    }
+
+def map_venue(doc):
+    """Venue columns from a Sanity venue document (scraper or CMS shape)"""
+    address = doc.get('address') or {}
+    location = doc.get('location') or {}
+    contact = doc.get('contact') or {}
+    details = doc.get('venueDetails') or {}
+    socials = {network: contact[network] for network in ('facebook', 'instagram', 'twitter') if contact.get(network)}
+
+    return {
+        'name': doc['name'],
+        'address': address.get('street'),
+        'city': address.get('city'),
+        'county': address.get('county'),
+        'country': address.get('country') or 'Ireland',
+        'eircode': address.get('eircode'),
+        'latitude': location.get('lat'),
+        'longitude': location.get('lng'),
+        'capacity': _first(details.get('capacity'), doc.get('capacity')),
+        'venue_type': _first(details.get('venueType'), doc.get('venueType')) or 'live_music_venue',
+        'primary_genres': _first(doc.get('primaryGenres'), doc.get('musicGenres')) or [],
+        'contact_email': contact.get('email'),
+        'contact_phone': contact.get('phone'),
+        'website': contact.get('website'),
+        'social_links': socials,
+        'is_active': True
+    }
+
+# Sanity _type -> (model, mapper)
+DOCUMENT_TYPES = {
+    'band': (Band, map_band),
+    'venue': (Venue, map_venue)
+}
+
+class SlugAllocator:
+    """Unique slugs for one table, decided in memory
+
+    Seeded with the (slug, source_id) pairs already in the table. A source
+    document (_id) always keeps its slug, in this load and on reloads; any
+    other document wanting a slug that is taken, by a loaded document or by
+    a row created through the API, gets the next free -2, -3, ... suffix.
+    """
+
+    def __init__(self, existing=()):
+        self.owners = {}
+        self.slugs = {}
+        self.next_suffix = {}
+        for slug, owner in existing:
+            self.owners[slug] = owner
+            if owner is not None:
+                self.slugs[owner] = slug
+
+    @classmethod
+    def for_table(cls, session, model):
+        return cls(session.query(model.slug, model.source_id).all())
+
+    def allocate(self, wanted, owner):
+        if owner in self.slugs:
+            return self.slugs[owner]
+        base = wanted or 'item'
+        slug = base
+        while slug in self.owners:
+            suffix = self.next_suffix.get(base, 2)
+            self.next_suffix[base] = suffix + 1
+            slug = f"{base}-{suffix}"
+        self.owners[slug] = owner
+        self.slugs[owner] = slug
+        return slug
+
+class BulkLoader:
+    """Batched upserts by source_id into one table"""
+
+    def __init__(self, session, model, batch_size=DEFAULT_BATCH_SIZE):
+        self.session = session
+        self.table = model.__table__
+        self.batch_size = batch_size
+        self.dialect = session.get_bind().dialect.name
+        self.json_columns = [column.name for column in self.table.columns
+                             if column.name in ('genres', 'social_links', 'photo_gallery_urls', 'primary_genres')]
+        self.text_json = all(isinstance(self.table.c[name].type, Text) for name in self.json_columns)
+        self.batch = {}
+        self.written = 0
+        self.ids = set()
+
+    def _statement(self):
+        insert = postgresql.insert if self.dialect == 'postgresql' else sqlite.insert
+        stmt = insert(self.table)
+        columns = next(iter(self.batch.values())).keys()
+        return stmt.on_conflict_do_update(
+            index_elements=['source_id'],
+            set_={name: stmt.excluded[name] for name in columns if name not in PRESERVED_COLUMNS}
+        )
+
+    def add(self, row):
+        now = datetime.utcnow()
+        row = {**row, 'created_at': now, 'updated_at': now}
+        if self.text_json:
+            for name in self.json_columns:
+                if name in row:
+                    row[name] = json.dumps(row[name])
+        # A repeated document replaces its earlier row: ON CONFLICT can't touch a row twice per statement
+        self.batch[row['source_id']] = row
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        rows = list(self.batch.values())
+        if self.dialect == 'postgresql':
+            # One multi-row INSERT ... VALUES (...), (...) ON CONFLICT per batch
+            self.session.execute(self._statement().values(rows))
+        else:
+            # executemany of one prepared statement; SQLite has no multi-row fast path to gain
+            self.session.execute(self._statement(), rows)
+        self.written += len(rows)
+        # Row ids for the cache tags; an upsert doesn't say which rows it inserted or updated
+        self.ids.update(self.session.execute(
+            select(self.table.c.id).where(self.table.c.source_id.in_(list(self.batch)))
+        ).scalars())
+        self.batch = {}
+
+def load_ndjson(path, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Upsert every band and venue document in path; returns per-type row counts"""
+    loaders = {}
+    allocators = {}
+    counts = {'read': 0, 'skipped': 0}
+
+    for doc in iter_documents(path):
+        counts['read'] += 1
+        doc_type = doc.get('_type')
+        if doc_type not in DOCUMENT_TYPES or not doc.get('name'):
+            counts['skipped'] += 1
+            continue
+
+        model, mapper = DOCUMENT_TYPES[doc_type]
+        row = mapper(doc)
+        wanted = (doc.get('slug') or {}).get('current') or slugify(doc['name'])
+        if doc_type not in allocators:
+            allocators[doc_type] = SlugAllocator.for_table(db.session, model)
+        row['source_id'] = doc.get('_id') or f"{doc_type}:{wanted}"
+        row['slug'] = allocators[doc_type].allocate(wanted, row['source_id'])
+
+        if dry_run:
+            counts[doc_type] = counts.get(doc_type, 0) + 1
+            continue
+        if doc_type not in loaders:
+            loaders[doc_type] = BulkLoader(db.session, model, batch_size)
+        loaders[doc_type].add(row)
+
+    for doc_type, loader in loaders.items():
+        loader.flush()
+        counts[doc_type] = loader.written
+        invalidate_cache(f'{doc_type}s', *(f'{doc_type}:{row_id}' for row_id in loader.ids))
+
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk load Sanity NDJSON exports into the bands/venues tables')
+    parser.add_argument('files', nargs='+', help='NDJSON files (bands_import.ndjson, venues_import.ndjson, ...)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per INSERT batch')
+    parser.add_argument('--dry-run', action='store_true', help='Map and count documents without writing')
+    args = parser.parse_args()
+
+    app = create_loader_app()
+    with app.app_context():
+        db.create_all()
+        for path in args.files:
+            print(f"📥 Loading {path}...")
+            started = time.perf_counter()
+            try:
+                counts = load_ndjson(path, args.batch_size, args.dry_run)
+                if not args.dry_run:
+                    db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Load of {path} failed and was rolled back: {e}")
+                sys.exit(1)
+
+            elapsed = time.perf_counter() - started
+            rows = sum(count for key, count in counts.items() if key in DOCUMENT_TYPES)
+            written = ', '.join(f"{counts[key]} {key}s" for key in DOCUMENT_TYPES if key in counts) or 'nothing'
+            verb = 'Mapped' if args.dry_run else 'Upserted'
+            print(f"✅ {verb} {written} from {counts['read']} documents ({counts['skipped']} skipped) "
+                  f"in {elapsed:.2f}s — {rows / elapsed if elapsed else 0:,.0f} rows/s")
+
+if __name__ == '__main__':
+    main()
@@ -51,6 +51,18 @@ class Config:
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER') or 'gigs@bandvenuereview.ie'
+    
+    # Gig notification delivery (file, smtp or memory)
+    NOTIFICATION_SINK = os.environ.get('NOTIFICATION_SINK', 'file')
+    NOTIFICATION_FILE = os.environ.get('NOTIFICATION_FILE') or 'notifications.ndjson'
+    
+    # Response cache for read endpoints: per-worker LRU in front of a shared
+    # tier (a SQLite file path, default in the temp dir, or a redis:// URL)
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() in ['true', 'on', '1']
+    RESPONSE_CACHE_URL = os.environ.get('RESPONSE_CACHE_URL')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 300)
+    RESPONSE_CACHE_L1_ENTRIES = int(os.environ.get('RESPONSE_CACHE_L1_ENTRIES') or 1024)
     
     # Pagination
     REVIEWS_PER_PAGE = 10
@@ -85,6 +97,8 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    NOTIFICATION_SINK = 'memory'
+    RESPONSE_CACHE_ENABLED = False
 
 # Configuration dictionary
 config = {
@@ -0,0 +1,210 @@
+"""
+BandVenueReview.ie - Follower Feed
+Hybrid fan-out feed of upcoming gigs from followed bands
+
+Gigs from bands with a modest following are written into each follower's
+feed_entries rows when the gig is created (fan-out on write). Gigs from bands
+above FANOUT_MAX_FOLLOWERS are left on the gigs table and merged into the
+feed when it is read, so announcing a gig never writes hundreds of thousands
+of rows. Every gig records which path it took (Gig.fanned_out), and reads
+merge the non-fanned-out gigs of every followed band whatever its current
+size, so a band crossing the threshold either way never drops or duplicates
+gigs.
+
+Stored feeds are kept to FEED_MAX_ENTRIES by background jobs queued by the
+writes that grow them (trim_user_feed, trim_follower_feeds), not by reads.
+"""
+
+import base64
+import heapq
+from datetime import date
+
+from sqlalchemy import and_, func, or_
+
+from models_bands_production import db, Band, Venue, Gig, BandFollower, FeedEntry
+from job_queue import enqueue_job
+
+# Bands with more followers than this are merged on read instead of fanned out
+FANOUT_MAX_FOLLOWERS = 2000
+
+# Upper bound on stored feed entries per user (nearest gigs are kept)
+FEED_MAX_ENTRIES = 500
+
+# Follower ids inserted per INSERT statement during fan-out
+FANOUT_BATCH_SIZE = 1000
+
+def encode_cursor(gig_date, gig_id):
+    """Opaque keyset cursor for the (gig_date, gig_id) feed ordering"""
+    raw = f"{gig_date.isoformat()}:{gig_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor, raises ValueError on a malformed cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        gig_date, gig_id = base64.urlsafe_b64decode(padded).decode().split(':')
+        return date.fromisoformat(gig_date), int(gig_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def _after_cursor(date_column, id_column, cursor):
+    """Keyset predicate: rows strictly after the cursor position"""
+    cursor_date, cursor_id = cursor
+    return or_(
+        date_column > cursor_date,
+        and_(date_column == cursor_date, id_column > cursor_id)
+    )
+
+def fan_out_gig(gig, band):
+    """Write feed entries for every follower of the gig's band
+
+    Returns the number of entries written, or 0 when the band is large enough
+    to be merged on read instead. Runs inside the caller's transaction.
+    """
+    return fan_out_gigs([gig], band)
+
+def fan_out_gigs(gigs, band):
+    """fan_out_gig for several new gigs of one band, loading its followers once"""
+    if (band.follower_count or 0) > FANOUT_MAX_FOLLOWERS:
+        for gig in gigs:
+            gig.fanned_out = False
+        return 0
+
+    follower_ids = [row.user_id for row in
+                    db.session.query(BandFollower.user_id).filter(BandFollower.band_id == band.id)]
+
+    entries = [
+        {
+            'user_id': user_id,
+            'gig_id': gig.id,
+            'band_id': band.id,
+            'gig_date': gig.gig_date
+        }
+        for gig in gigs
+        for user_id in follower_ids
+    ]
+    for start in range(0, len(entries), FANOUT_BATCH_SIZE):
+        db.session.execute(FeedEntry.__table__.insert(), entries[start:start + FANOUT_BATCH_SIZE])
+
+    for gig in gigs:
+        gig.fanned_out = True
+    if entries:
+        enqueue_job('trim_follower_feeds', {'band_id': band.id},
+                    dedup_key=f'trim_follower_feeds:{band.id}', commit=False)
+    return len(entries)
+
+def backfill_feed(user_id, band_id, today=None):
+    """Copy a newly followed band's already fanned-out upcoming gigs into a user's feed"""
+    today = today or date.today()
+    gigs = db.session.query(Gig.id, Gig.gig_date).filter(
+        Gig.band_id == band_id,
+        Gig.fanned_out == True,
+        Gig.gig_date >= today
+    ).order_by(Gig.gig_date, Gig.id).limit(FEED_MAX_ENTRIES).all()
+
+    if gigs:
+        db.session.execute(FeedEntry.__table__.insert(), [
+            {'user_id': user_id, 'gig_id': gig_id, 'band_id': band_id, 'gig_date': gig_date}
+            for gig_id, gig_date in gigs
+        ])
+        enqueue_job('trim_user_feed', {'user_id': user_id},
+                    dedup_key=f'trim_user_feed:{user_id}', commit=False)
+    return len(gigs)
+
+def remove_band_from_feed(user_id, band_id):
+    """Drop a band's entries from a user's feed after an unfollow"""
+    return FeedEntry.query.filter_by(user_id=user_id, band_id=band_id).delete(synchronize_session=False)
+
+def trim_feed(user_id, today=None):
+    """Delete past gigs and anything beyond FEED_MAX_ENTRIES from a user's feed"""
+    today = today or date.today()
+    removed = FeedEntry.query.filter(
+        FeedEntry.user_id == user_id,
+        FeedEntry.gig_date < today
+    ).delete(synchronize_session=False)
+
+    boundary = db.session.query(FeedEntry.gig_date, FeedEntry.gig_id).filter(
+        FeedEntry.user_id == user_id
+    ).order_by(FeedEntry.gig_date, FeedEntry.gig_id).offset(FEED_MAX_ENTRIES - 1).first()
+
+    if boundary:
+        removed += FeedEntry.query.filter(
+            FeedEntry.user_id == user_id,
+            _after_cursor(FeedEntry.gig_date, FeedEntry.gig_id, boundary)
+        ).delete(synchronize_session=False)
+    return removed
+
+def overfull_feeds(band_id):
+    """Ids of the band's followers whose stored feed holds more than FEED_MAX_ENTRIES entries"""
+    followers = db.session.query(BandFollower.user_id).filter(BandFollower.band_id == band_id)
+    return [row.user_id for row in db.session.query(FeedEntry.user_id).filter(
+        FeedEntry.user_id.in_(followers.scalar_subquery())
+    ).group_by(FeedEntry.user_id).having(func.count(FeedEntry.id) > FEED_MAX_ENTRIES)]
+
+def get_feed_page(user_id, cursor=None, limit=20, today=None):
+    """Return (gig_ids, next_cursor) for one page of a user's upcoming gig feed
+
+    Reads at most limit + 1 rows from each source: the user's fanned-out
+    entries and the non-fanned-out gigs of the bands they follow. The
+    second source covers every followed band, not just those above the
+    threshold now, so gigs announced while a band was large stay in the
+    feed after unfollows bring it back under.
+    """
+    today = today or date.today()
+
+    stored = db.session.query(FeedEntry.gig_date, FeedEntry.gig_id).filter(
+        FeedEntry.user_id == user_id,
+        FeedEntry.gig_date >= today
+    )
+    if cursor:
+        stored = stored.filter(_after_cursor(FeedEntry.gig_date, FeedEntry.gig_id, cursor))
+    stored = stored.order_by(FeedEntry.gig_date, FeedEntry.gig_id).limit(limit + 1).all()
+
+    followed_band_ids = db.session.query(BandFollower.band_id).filter(BandFollower.user_id == user_id)
+    merged = db.session.query(Gig.gig_date, Gig.id).filter(
+        Gig.band_id.in_(followed_band_ids.scalar_subquery()),
+        Gig.fanned_out == False,
+        Gig.gig_date >= today
+    )
+    if cursor:
+        merged = merged.filter(_after_cursor(Gig.gig_date, Gig.id, cursor))
+    merged = merged.order_by(Gig.gig_date, Gig.id).limit(limit + 1).all()
+
+    page = []
+    for key in heapq.merge(map(tuple, stored), map(tuple, merged)):
+        if page and page[-1] == key:
+            continue
+        page.append(key)
+        if len(page) > limit:
+            break
+
+    next_cursor = encode_cursor(*page[limit - 1]) if len(page) > limit else None
+    return [gig_id for _, gig_id in page[:limit]], next_cursor
+
+def serialize_feed_gigs(gig_ids):
+    """Load the feed's gigs with their band and venue in one query, keeping feed order"""
+    if not gig_ids:
+        return []
+
+    rows = db.session.query(Gig, Band, Venue).join(
+        Band, Band.id == Gig.band_id
+    ).join(
+        Venue, Venue.id == Gig.venue_id
+    ).filter(Gig.id.in_(gig_ids)).all()
+
+    by_id = {
+        gig.id: {
+            'id': gig.id,
+            'gig_date': gig.gig_date.isoformat(),
+            'doors_time': gig.doors_time.isoformat() if gig.doors_time else None,
+            'start_time': gig.start_time.isoformat() if gig.start_time else None,
+            'ticket_price': gig.ticket_price,
+            'ticket_url': gig.ticket_url,
+            'status': gig.status,
+            'band': {'id': band.id, 'name': band.name, 'slug': band.slug},
+            'venue': {'id': venue.id, 'name': venue.name, 'slug': venue.slug,
+                      'city': venue.city, 'county': venue.county}
+        }
+        for gig, band, venue in rows
+    }
+    return [by_id[gig_id] for gig_id in gig_ids if gig_id in by_id]
@@ -0,0 +1,333 @@
+"""
+BandVenueReview.ie - Gig Notifications
+Out-of-request delivery of new gig announcements to band followers
+
+create_gig only records a NotificationEvent row, so the request cost does not
+depend on how many followers a band has. The deliver_gig_notifications job
+claims pending events, walks the followers of the affected bands in keyset
+chunks ordered by user, drops anyone whose notification_preferences turn
+new_gigs off, and hands one digest per user to a sink in batches.
+
+A claim is a lease: events left 'processing' past EVENT_LEASE (the worker
+died) go back to 'pending'. After each batch the sink accepts, every event
+records the last user it covered (delivered_through), so a retry resumes
+after the followers already emailed. A failed delivery returns its events
+to 'pending' and only gives up after MAX_EVENT_ATTEMPTS; the job that hit
+the error fails with it, so the job queue retries the delivery.
+"""
+
+import json
+import smtplib
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from sqlalchemy import and_, case, or_
+
+from models_bands_production import db, User, Band, Venue, Gig, BandFollower, NotificationEvent
+from job_queue import enqueue_job
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_BATCH_SIZE = 100
+
+# Events claimed longer ago than this belong to a dead worker and are reclaimed
+EVENT_LEASE = timedelta(minutes=15)
+
+# Failed deliveries before an event is marked 'failed' for good
+MAX_EVENT_ATTEMPTS = 5
+
+# ============================================================================
+# SINKS
+# ============================================================================
+
+class FileSink:
+    """Append digests as JSON lines to a local file (development default)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send_batch(self, digests):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for digest in digests:
+                f.write(json.dumps(digest) + '\n')
+
+class SmtpSink:
+    """Send each digest as an email, reusing one SMTP connection per batch"""
+
+    def __init__(self, host, port=587, use_tls=True, username=None, password=None,
+                 sender='gigs@bandvenuereview.ie'):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.sender = sender
+
+    def send_batch(self, digests):
+        with smtplib.SMTP(self.host, self.port) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for digest in digests:
+                smtp.send_message(build_digest_email(digest, self.sender))
+
+class MemorySink:
+    """Collect batches in memory; stands in for SMTP in tests"""
+
+    def __init__(self):
+        self.batches = []
+
+    def send_batch(self, digests):
+        self.batches.append(list(digests))
+
+def build_sink(config):
+    """Create the sink named by NOTIFICATION_SINK (file, smtp or memory)"""
+    kind = config.get('NOTIFICATION_SINK', 'file')
+    if kind == 'smtp':
+        return SmtpSink(
+            config['MAIL_SERVER'],
+            config.get('MAIL_PORT', 587),
+            config.get('MAIL_USE_TLS', True),
+            config.get('MAIL_USERNAME'),
+            config.get('MAIL_PASSWORD'),
+            config.get('MAIL_DEFAULT_SENDER') or 'gigs@bandvenuereview.ie'
+        )
+    if kind == 'memory':
+        return MemorySink()
+    if kind == 'file':
+        return FileSink(config.get('NOTIFICATION_FILE') or 'notifications.ndjson')
+    raise ValueError(f"Unknown NOTIFICATION_SINK: {kind}")
+
+def build_digest_email(digest, sender):
+    """Plain-text email for one user's digest"""
+    message = EmailMessage()
+    message['From'] = sender
+    message['To'] = digest['email']
+    count = len(digest['gigs'])
+    message['Subject'] = f"{count} new gig{'s' if count != 1 else ''} from bands you follow"
+
+    lines = [f"Hi {digest.get('display_name') or 'there'},", '']
+    for gig in digest['gigs']:
+        lines.append(f"- {gig['band_name']} at {gig['venue_name']}, {gig['venue_city'] or ''} on {gig['gig_date']}")
+    message.set_content('\n'.join(lines))
+    return message
+
+# ============================================================================
+# EVENTS
+# ============================================================================
+
+def enqueue_gig_event(gig):
+    """Record a new-gig event in the caller's transaction (one insert)"""
+    event = NotificationEvent(
+        event_type='new_gig',
+        band_id=gig.band_id,
+        gig_id=gig.id
+    )
+    db.session.add(event)
+    return event
+
+def queue_delivery(payload=None, run_at=None, commit=False):
+    """Queue a deliver_gig_notifications run; a burst of calls shares one queued job"""
+    run_at = run_at or datetime.utcnow()
+    job = enqueue_job(
+        'deliver_gig_notifications', payload,
+        dedup_key='deliver_gig_notifications',
+        max_attempts=MAX_EVENT_ATTEMPTS,
+        run_at=run_at,
+        commit=False
+    )
+    # A queued follow-up waiting out a lease mustn't delay new gigs
+    if job.run_at > run_at:
+        job.run_at = run_at
+    if commit:
+        db.session.commit()
+    return job
+
+def wants_new_gig_emails(preferences):
+    """Read the new_gigs flag from JSONB (dict) or SQLite text preferences"""
+    if not preferences:
+        return True
+    if isinstance(preferences, str):
+        try:
+            preferences = json.loads(preferences)
+        except ValueError:
+            return True
+    return bool(preferences.get('new_gigs', True))
+
+def _ordered_user_id():
+    """BandFollower.user_id in byte order, so SQL keysets agree with Python string comparisons"""
+    if db.engine.dialect.name == 'postgresql':
+        return BandFollower.user_id.collate('C')
+    return BandFollower.user_id
+
+def requeue_stale_events(lease=EVENT_LEASE):
+    """Return events whose lease expired to 'pending', counting it as a failed attempt"""
+    cutoff = datetime.utcnow() - lease
+    count = NotificationEvent.query.filter(
+        NotificationEvent.status == 'processing',
+        NotificationEvent.claimed_at < cutoff
+    ).update({
+        NotificationEvent.status: case(
+            (NotificationEvent.attempts + 1 >= MAX_EVENT_ATTEMPTS, 'failed'), else_='pending'
+        ),
+        NotificationEvent.attempts: NotificationEvent.attempts + 1,
+        NotificationEvent.claimed_at: None,
+        NotificationEvent.error_message: 'Lease expired before delivery finished'
+    }, synchronize_session=False)
+    db.session.commit()
+    return count
+
+def claim_pending_events(limit):
+    """Lease up to limit pending events (marked processing) and return them"""
+    requeue_stale_events()
+
+    query = NotificationEvent.query.filter_by(status='pending').order_by(NotificationEvent.id).limit(limit)
+    if db.engine.dialect.name == 'postgresql':
+        # Let several workers run side by side without claiming the same events
+        query = query.with_for_update(skip_locked=True)
+
+    now = datetime.utcnow()
+    events = query.all()
+    for event in events:
+        event.status = 'processing'
+        event.claimed_at = now
+    db.session.commit()
+    return events
+
+def _load_gigs_by_band(events):
+    """band_id -> list of (event, gig summary) for the claimed events"""
+    events_by_gig = {event.gig_id: event for event in events}
+    rows = db.session.query(Gig, Band, Venue).join(
+        Band, Band.id == Gig.band_id
+    ).join(
+        Venue, Venue.id == Gig.venue_id
+    ).filter(Gig.id.in_(list(events_by_gig))).all()
+
+    gigs_by_band = {}
+    for gig, band, venue in rows:
+        gigs_by_band.setdefault(band.id, []).append((events_by_gig[gig.id], {
+            'gig_id': gig.id,
+            'gig_date': gig.gig_date.isoformat(),
+            'band_name': band.name,
+            'band_slug': band.slug,
+            'venue_name': venue.name,
+            'venue_city': venue.city
+        }))
+    return gigs_by_band
+
+def _record_progress(events, user_id):
+    """Every follower up to user_id has been sent this batch's gigs"""
+    for event in events:
+        if event.delivered_through is None or user_id > event.delivered_through:
+            event.delivered_through = user_id
+    db.session.commit()
+
+def deliver_events(events, sink, chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+    """Expand events to opted-in followers and write one digest per user
+
+    Followers are read chunk_size rows at a time ordered by (user_id, id), so
+    a user's follows of several announcing bands arrive together and merge
+    into a single digest. Followers at or before an event's
+    delivered_through already have its gig and are skipped. Progress is
+    committed after each batch. Returns the number of digests written.
+    """
+    gigs_by_band = _load_gigs_by_band(events)
+    if not gigs_by_band:
+        return 0
+
+    user_id_key = _ordered_user_id()
+    base_query = db.session.query(
+        BandFollower.id, BandFollower.user_id, BandFollower.band_id,
+        BandFollower.notification_preferences, User.email, User.display_name
+    ).join(
+        User, User.id == BandFollower.user_id
+    ).filter(
+        BandFollower.band_id.in_(list(gigs_by_band))
+    ).order_by(user_id_key, BandFollower.id)
+
+    # Resume after the followers every event has already covered
+    cursors = [event.delivered_through for event in events]
+    if None not in cursors:
+        base_query = base_query.filter(user_id_key > min(cursors))
+
+    def send(digests):
+        sink.send_batch(digests)
+        _record_progress(events, digests[-1]['user_id'])
+
+    pending = []
+    sent = 0
+    current = None
+    last_key = None
+
+    while True:
+        query = base_query
+        if last_key:
+            query = query.filter(or_(
+                user_id_key > last_key[0],
+                and_(BandFollower.user_id == last_key[0], BandFollower.id > last_key[1])
+            ))
+        rows = query.limit(chunk_size).all()
+        if not rows:
+            break
+
+        for follow_id, user_id, band_id, preferences, email, display_name in rows:
+            if current and current['user_id'] != user_id:
+                pending.append(current)
+                current = None
+            if not wants_new_gig_emails(preferences):
+                continue
+            gigs = [gig for event, gig in gigs_by_band[band_id]
+                    if event.delivered_through is None or user_id > event.delivered_through]
+            if not gigs:
+                continue
+            if current is None:
+                current = {'user_id': user_id, 'email': email, 'display_name': display_name, 'gigs': []}
+            current['gigs'].extend(gigs)
+
+        while len(pending) >= batch_size:
+            send(pending[:batch_size])
+            sent += batch_size
+            pending = pending[batch_size:]
+
+        last_key = (rows[-1][1], rows[-1][0])
+
+    if current:
+        pending.append(current)
+    for start in range(0, len(pending), batch_size):
+        send(pending[start:start + batch_size])
+    return sent + len(pending)
+
+def release_failed_events(events, error):
+    """Put events back to 'pending' after a failed delivery ('failed' once out of attempts)"""
+    for event in events:
+        event.attempts += 1
+        event.status = 'failed' if event.attempts >= MAX_EVENT_ATTEMPTS else 'pending'
+        event.claimed_at = None
+        event.error_message = str(error)[:500]
+    db.session.commit()
+
+def process_pending_events(sink, limit=50, chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+    """Claim and deliver one batch of events; returns (events, digests)
+
+    On error the events go back to 'pending' (keeping the progress of the
+    batches already sent) and the exception is re-raised for the caller's
+    retry.
+    """
+    events = claim_pending_events(limit)
+    if not events:
+        return 0, 0
+
+    try:
+        digests = deliver_events(events, sink, chunk_size, batch_size)
+    except Exception as e:
+        db.session.rollback()
+        release_failed_events(events, e)
+        raise
+
+    now = datetime.utcnow()
+    for event in events:
+        event.status = 'sent'
+        event.claimed_at = None
+        event.processed_at = now
+    db.session.commit()
+    return len(events), digests
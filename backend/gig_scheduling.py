@@ -0,0 +1,161 @@
+"""
+BandVenueReview.ie - Gig Scheduling
+Double-booking checks for venues and bands
+
+Booked time is kept in an interval index: one sorted list of (start, end)
+minute intervals per (venue or band, date). A gig running past midnight is
+split at midnight, the rest held on the next day. Existing gigs for every
+date, venue and band in an upload (and the days either side, for overnight
+gigs) are loaded with two queries, and each new gig only has to be compared
+with the bookings that start before it ends on that day.
+"""
+
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import or_
+
+from models_bands_production import db, Gig, GigSupportingBand
+
+MINUTES_PER_DAY = 24 * 60
+
+# Assumed length of a gig with a start but no end time
+DEFAULT_GIG_MINUTES = 180
+
+# Gigs in these states don't hold the venue or the band
+INACTIVE_STATUSES = ('cancelled',)
+
+def parse_time(value):
+    """Time from 'HH:MM[:SS]' or a full ISO datetime; None for empty values"""
+    if not value:
+        return None
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).time()
+
+def gig_interval(doors_time=None, start_time=None, end_time=None):
+    """(start, end) in minutes after midnight; a gig without times holds the whole day"""
+    begin = doors_time or start_time
+    if begin is None:
+        return 0, MINUTES_PER_DAY
+
+    start = begin.hour * 60 + begin.minute
+    if end_time is None:
+        return start, start + DEFAULT_GIG_MINUTES
+
+    end = end_time.hour * 60 + end_time.minute
+    if end <= start:
+        end += MINUTES_PER_DAY  # Runs past midnight
+    return start, end
+
+def day_portions(gig_date, interval):
+    """(date, interval) pairs for interval split at midnight"""
+    start, end = interval
+    if end <= MINUTES_PER_DAY:
+        return [(gig_date, interval)]
+    return [(gig_date, (start, MINUTES_PER_DAY)),
+            (gig_date + timedelta(days=1), (max(start - MINUTES_PER_DAY, 0), end - MINUTES_PER_DAY))]
+
+class IntervalIndex:
+    """Booked intervals per (resource, date), sorted by start; overnight gigs are held on both days"""
+
+    def __init__(self):
+        self.starts = {}
+        self.bookings = {}
+
+    def add(self, resource, gig_date, interval, gig_ref):
+        for day, portion in day_portions(gig_date, interval):
+            key = (resource, day)
+            starts = self.starts.setdefault(key, [])
+            position = bisect_left(starts, portion[0])
+            starts.insert(position, portion[0])
+            self.bookings.setdefault(key, []).insert(position, (portion, gig_ref))
+
+    def conflicts(self, resource, gig_date, interval):
+        """References of bookings overlapping interval"""
+        clashes = []
+        for day, (start, end) in day_portions(gig_date, interval):
+            key = (resource, day)
+            starts = self.starts.get(key)
+            if not starts:
+                continue
+            # Only bookings starting before this one ends can overlap it
+            candidates = self.bookings[key][:bisect_left(starts, end)]
+            for (other_start, other_end), gig_ref in candidates:
+                if other_end > start and gig_ref not in clashes:
+                    clashes.append(gig_ref)
+        return clashes
+
+def load_booking_index(gig_dates, venue_ids, band_ids):
+    """IntervalIndex of existing active gigs around gig_dates for the venues and bands
+
+    Bands are booked both as headliners and as supporting acts. Gigs on the
+    day before and after each date are loaded too: the night before can run
+    into the date, and a gig on the date can run into the next morning.
+    """
+    index = IntervalIndex()
+    if not gig_dates:
+        return index
+    gig_dates = {day + timedelta(days=offset) for day in gig_dates for offset in (-1, 0, 1)}
+
+    gigs = db.session.query(
+        Gig.id, Gig.band_id, Gig.venue_id, Gig.gig_date, Gig.doors_time, Gig.start_time, Gig.end_time
+    ).filter(
+        Gig.gig_date.in_(gig_dates),
+        Gig.status.notin_(INACTIVE_STATUSES),
+        or_(Gig.venue_id.in_(venue_ids), Gig.band_id.in_(band_ids))
+    ).all()
+
+    supporting = db.session.query(
+        GigSupportingBand.band_id, Gig.id, Gig.gig_date, Gig.doors_time, Gig.start_time, Gig.end_time
+    ).join(Gig, Gig.id == GigSupportingBand.gig_id).filter(
+        Gig.gig_date.in_(gig_dates),
+        Gig.status.notin_(INACTIVE_STATUSES),
+        GigSupportingBand.band_id.in_(band_ids)
+    ).all() if band_ids else []
+
+    for gig in gigs:
+        interval = gig_interval(gig.doors_time, gig.start_time, gig.end_time)
+        ref = f"gig {gig.id}"
+        if gig.venue_id in venue_ids:
+            index.add(('venue', gig.venue_id), gig.gig_date, interval, ref)
+        if gig.band_id in band_ids:
+            index.add(('band', gig.band_id), gig.gig_date, interval, ref)
+
+    for row in supporting:
+        interval = gig_interval(row.doors_time, row.start_time, row.end_time)
+        index.add(('band', row.band_id), row.gig_date, interval, f"gig {row.id}")
+
+    return index
+
+def reject_double_bookings(gigs, index):
+    """Check parsed gigs (row number -> fields) against index and each other
+
+    Rows are checked in order against existing gigs and the earlier rows
+    accepted; the venue, headliner and supporting bands must all be free.
+    Clashing rows are removed from gigs, accepted ones are added to index.
+    Returns {row number: errors} for the rejected rows.
+    """
+    errors = {}
+    for row in sorted(gigs):
+        gig = gigs[row]
+        if gig['status'] in INACTIVE_STATUSES:
+            continue
+        interval = gig_interval(gig['doors_time'], gig['start_time'], gig['end_time'])
+        resources = [('venue', gig['venue_id'])] + [('band', band_id) for band_id in
+                                                    [gig['band_id']] + gig['supporting_bands']]
+        row_errors = []
+        for resource in resources:
+            clashes = index.conflicts(resource, gig['gig_date'], interval)
+            if clashes:
+                kind, resource_id = resource
+                row_errors.append(f"{kind.title()} {resource_id} is already booked on "
+                                  f"{gig['gig_date'].isoformat()} ({', '.join(clashes)})")
+        if row_errors:
+            errors[row] = row_errors
+            del gigs[row]
+            continue
+        for resource in resources:
+            index.add(resource, gig['gig_date'], interval, f'batch row {row}')
+    return errors
@@ -0,0 +1,243 @@
+"""
+BandVenueReview.ie - Background Job Queue
+Durable job queue stored in the application database (no external broker)
+
+Jobs are rows in the jobs table. Workers claim them with SELECT ... FOR
+UPDATE SKIP LOCKED on PostgreSQL; on SQLite, which serialises writers, a
+conditional UPDATE ... WHERE status = 'queued' decides which worker wins.
+Failed jobs are retried with exponential backoff until max_attempts, and a
+dedup_key keeps at most one queued copy of the same job.
+
+A claim sets a deadline from the task's timeout. Workers periodically
+retry (or fail) jobs running past their deadline, whether their worker
+crashed or the task hung, and a worker that finishes after its deadline
+can't overwrite the outcome of the retry: completion is a conditional
+UPDATE on the claim it made. Tasks should therefore be safe to run twice.
+"""
+
+import os
+import random
+import socket
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from models_bands_production import db, Job
+
+# Registered task name -> callable(**payload)
+TASKS = {}
+
+# Registered task name -> seconds a run may take before it's retried
+TASK_TIMEOUTS = {}
+
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+# Timeout for tasks registered without one
+DEFAULT_JOB_TIMEOUT = 30 * 60
+
+def job_task(name, timeout=DEFAULT_JOB_TIMEOUT):
+    """Register a function as a job handler under name, allowed timeout seconds per run"""
+    def decorator(func):
+        TASKS[name] = func
+        TASK_TIMEOUTS[name] = timeout
+        return func
+    return decorator
+
+def job_deadline(task, start):
+    return start + timedelta(seconds=TASK_TIMEOUTS.get(task, DEFAULT_JOB_TIMEOUT))
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def enqueue_job(task, payload=None, dedup_key=None, queue='default', priority=0,
+                max_attempts=3, run_at=None, commit=True):
+    """Add a job to the queue and return it
+
+    When dedup_key matches a job that is still queued, that job is returned
+    instead of inserting a duplicate. Pass commit=False to enqueue inside the
+    caller's transaction.
+    """
+    if dedup_key:
+        existing = Job.query.filter_by(dedup_key=dedup_key, status='queued').first()
+        if existing:
+            return existing
+
+    job = Job(
+        task=task,
+        queue=queue,
+        dedup_key=dedup_key,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=run_at or datetime.utcnow()
+    )
+    job.set_payload(payload or {})
+
+    if not dedup_key:
+        db.session.add(job)
+        if commit:
+            db.session.commit()
+        return job
+
+    # A concurrent enqueue may win the partial unique index on dedup_key
+    try:
+        with db.session.begin_nested():
+            db.session.add(job)
+    except IntegrityError:
+        return Job.query.filter_by(dedup_key=dedup_key, status='queued').first()
+
+    if commit:
+        db.session.commit()
+    return job
+
+def claim_job(queues=('default',), worker=None):
+    """Atomically move the next due job to running and return it (or None)"""
+    now = datetime.utcnow()
+    query = Job.query.filter(
+        Job.status == 'queued',
+        Job.queue.in_(queues),
+        Job.run_at <= now
+    ).order_by(Job.priority.desc(), Job.run_at, Job.id)
+
+    if db.engine.dialect.name == 'postgresql':
+        job = query.with_for_update(skip_locked=True).first()
+        if not job:
+            db.session.rollback()
+            return None
+        job.status = 'running'
+        job.attempts += 1
+        job.locked_by = worker or worker_id()
+        job.started_at = now
+        job.deadline = job_deadline(job.task, now)
+        db.session.commit()
+        return job
+
+    # SQLite: try candidates until a conditional update wins
+    for candidate_id, task in query.with_entities(Job.id, Job.task).limit(5).all():
+        claimed = Job.query.filter(
+            Job.id == candidate_id,
+            Job.status == 'queued',
+            Job.run_at <= now
+        ).update({
+            Job.status: 'running',
+            Job.attempts: Job.attempts + 1,
+            Job.locked_by: worker or worker_id(),
+            Job.started_at: now,
+            Job.deadline: job_deadline(task, now)
+        }, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, candidate_id)
+    return None
+
+def backoff_delay(attempts):
+    """Exponential backoff with jitter for the given attempt count"""
+    delay = min(BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+def _outcome(job, attempts, error, finished_at):
+    """Column values recording a finished (or timed-out) attempt"""
+    if error is None:
+        return {Job.status: 'succeeded', Job.last_error: None}
+    values = {Job.last_error: f"{type(error).__name__}: {error}"[:1000]}
+    # A copy enqueued while this one ran holds the dedup_key and does the same work
+    duplicate = job.dedup_key and Job.query.filter(
+        Job.dedup_key == job.dedup_key, Job.status == 'queued', Job.id != job.id
+    ).first()
+    if attempts < job.max_attempts and not duplicate:
+        values[Job.status] = 'queued'
+        values[Job.run_at] = finished_at + backoff_delay(attempts)
+    else:
+        values[Job.status] = 'failed'
+        if duplicate:
+            values[Job.last_error] = f"{values[Job.last_error]} (retry left to queued job #{duplicate.id})"[:1000]
+    return values
+
+def run_job(job):
+    """Execute a claimed job and record its outcome and timing
+
+    Returns True when the task succeeded and its outcome was recorded. An
+    outcome arriving after the job was timed out and requeued is dropped.
+    """
+    handler = TASKS.get(job.task)
+    claim = {'id': job.id, 'locked_by': job.locked_by, 'attempts': job.attempts}
+    run_at, started_at = job.run_at, job.started_at
+    started = time.perf_counter()
+    error = None
+
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for task '{job.task}'")
+        result = handler(**job.get_payload())
+    except Exception as e:
+        db.session.rollback()
+        error = e
+        result = None
+
+    finished_at = datetime.utcnow()
+    values = _outcome(job, claim['attempts'], error, finished_at)
+    values.update({
+        Job.duration_ms: int((time.perf_counter() - started) * 1000),
+        Job.wait_ms: int((started_at - run_at).total_seconds() * 1000),
+        Job.finished_at: finished_at,
+        Job.locked_by: None,
+        Job.deadline: None
+    })
+    if error is None:
+        values[Job.result] = None if result is None else str(result)[:500]
+
+    recorded = Job.query.filter(
+        Job.id == claim['id'],
+        Job.status == 'running',
+        Job.locked_by == claim['locked_by'],
+        Job.attempts == claim['attempts']
+    ).update(values, synchronize_session=False)
+    db.session.commit()
+    db.session.refresh(job)
+    return error is None and recorded == 1
+
+def requeue_stale_jobs(now=None):
+    """Retry (or fail, when out of attempts) running jobs past their deadline
+
+    Covers workers that crashed and tasks that hang; returns how many jobs
+    were requeued or failed.
+    """
+    now = now or datetime.utcnow()
+    stale = Job.query.filter(Job.status == 'running', Job.deadline < now).all()
+
+    count = 0
+    for job in stale:
+        values = _outcome(job, job.attempts, TimeoutError(f"No result by the deadline ({job.locked_by})"), now)
+        values.update({Job.locked_by: None, Job.deadline: None, Job.finished_at: now})
+        count += Job.query.filter(
+            Job.id == job.id,
+            Job.status == 'running',
+            Job.attempts == job.attempts
+        ).update(values, synchronize_session=False)
+    db.session.commit()
+    return count
+
+def job_stats():
+    """Per-task counts and timing, for the worker's stats command"""
+    rows = db.session.query(
+        Job.task,
+        Job.status,
+        func.count(Job.id),
+        func.avg(Job.duration_ms),
+        func.max(Job.duration_ms),
+        func.avg(Job.wait_ms)
+    ).group_by(Job.task, Job.status).order_by(Job.task, Job.status).all()
+
+    return [
+        {
+            'task': task,
+            'status': status,
+            'count': count,
+            'avg_duration_ms': round(avg_duration, 1) if avg_duration is not None else None,
+            'max_duration_ms': max_duration,
+            'avg_wait_ms': round(avg_wait, 1) if avg_wait is not None else None
+        }
+        for task, status, count, avg_duration, max_duration, avg_wait in rows
+    ]
@@ -0,0 +1,109 @@
+"""
+BandVenueReview.ie - Background Job Handlers
+Tasks the job worker can run; enqueue them with job_queue.enqueue_job(name, payload)
+"""
+
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+
+from sqlalchemy import func
+
+from models_bands_production import db, FeedEntry, Job, NotificationEvent
+from job_queue import job_task
+from gig_notifications import (
+    build_sink, process_pending_events, queue_delivery, EVENT_LEASE, DEFAULT_CHUNK_SIZE, DEFAULT_BATCH_SIZE
+)
+from follower_feed import overfull_feeds, trim_feed
+from bulk_load import DEFAULT_BATCH_SIZE as DEFAULT_LOAD_BATCH_SIZE, load_ndjson
+
+@job_task('deliver_gig_notifications', timeout=int(EVENT_LEASE.total_seconds()))
+def deliver_gig_notifications(limit=50, chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+    """Drain pending new-gig events through the configured sink
+
+    A failed batch puts its events back to 'pending' and fails the job, so
+    the queue retries it. Stops claiming after half a lease (a follow-up run
+    carries on), and when other claims are still open, queues a run for when
+    their lease expires in case their worker died.
+    """
+    sink = build_sink(current_app.config)
+    stop_at = datetime.utcnow() + EVENT_LEASE / 2
+    total_events = total_digests = 0
+
+    while True:
+        if datetime.utcnow() >= stop_at:
+            queue_delivery({'limit': limit, 'chunk_size': chunk_size, 'batch_size': batch_size}, commit=True)
+            break
+        events, digests = process_pending_events(sink, limit, chunk_size, batch_size)
+        if not events:
+            break
+        total_events += events
+        total_digests += digests
+
+    oldest_claim = db.session.query(func.min(NotificationEvent.claimed_at)).filter(
+        NotificationEvent.status == 'processing'
+    ).scalar()
+    if oldest_claim:
+        queue_delivery(run_at=oldest_claim + EVENT_LEASE + timedelta(seconds=1), commit=True)
+
+    return f"{total_events} events, {total_digests} digests"
+
+@job_task('trim_user_feed')
+def trim_user_feed(user_id):
+    """Bound one user's stored feed"""
+    removed = trim_feed(user_id)
+    db.session.commit()
+    return f"{removed} entries removed"
+
+@job_task('trim_follower_feeds')
+def trim_follower_feeds(band_id):
+    """Bound the feeds of a band's followers after a fan-out grew them"""
+    user_ids = overfull_feeds(band_id)
+    removed = sum(trim_feed(user_id) for user_id in user_ids)
+    db.session.commit()
+    return f"{removed} entries removed from {len(user_ids)} feeds"
+
+@job_task('prune_feed_entries')
+def prune_feed_entries():
+    """Delete feed entries for gigs that have already happened, for every user"""
+    removed = FeedEntry.query.filter(
+        FeedEntry.gig_date < date.today()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return f"{removed} entries removed"
+
+@job_task('purge_finished_jobs')
+def purge_finished_jobs(days=14):
+    """Remove succeeded jobs older than days so the jobs table stays small"""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    removed = Job.query.filter(
+        Job.status == 'succeeded',
+        Job.finished_at < cutoff
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return f"{removed} jobs removed"
+
+@job_task('recompute_venue_ratings')
+def recompute_venue_ratings_job():
+    """Rebuild every venue's rating totals from the reviews table
+
+    Venue ratings live in the main site's models (models.db), so this runs
+    recompute_venue_ratings.py in an app from app.py rather than the worker's.
+    """
+    from recompute_venue_ratings import create_app, recompute_venue_ratings
+
+    with create_app().app_context():
+        updated, drifted = recompute_venue_ratings()
+    return f"{updated} venues recomputed, {drifted} had drifted"
+
+@job_task('bulk_load', timeout=60 * 60)
+def bulk_load_file(path, batch_size=DEFAULT_LOAD_BATCH_SIZE):
+    """Upsert the bands and venues of an NDJSON export (see bulk_load.py)
+
+    The file must be readable by the worker; the load is one transaction, so
+    a failed attempt leaves nothing behind for the retry to trip over.
+    """
+    counts = load_ndjson(path, batch_size)
+    db.session.commit()
+    written = ', '.join(f"{count} {key}s" for key, count in counts.items() if key not in ('read', 'skipped'))
+    return f"{written or 'nothing'} from {counts['read']} documents ({counts['skipped']} skipped)"
@@ -0,0 +1,140 @@
+"""
+BandVenueReview.ie - Job Worker
+Runs queued background jobs outside the gunicorn request path
+
+Usage:
+    python job_worker.py run --concurrency 4        # poll until stopped
+    python job_worker.py run --once                 # drain due jobs and exit
+    python job_worker.py enqueue prune_feed_entries --payload '{}'
+    python job_worker.py stats
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+
+from config import config
+from models_bands_production import db
+from job_queue import TASKS, claim_job, enqueue_job, job_stats, requeue_stale_jobs, run_job, worker_id
+import job_tasks  # registers handlers
+
+# Seconds between sweeps for jobs running past their deadline
+STALE_CHECK_INTERVAL = 60
+
+def create_worker_app(config_name=None):
+    """Database-only app: the worker needs models and config, not the API"""
+    app = Flask(__name__)
+    config_name = config_name or os.environ.get('FLASK_CONFIG', 'development')
+    app.config.from_object(config[config_name])
+    db.init_app(app)
+    return app
+
+def worker_loop(app, name, queues, once, poll_interval, stop_event):
+    """One worker thread: claim, run, repeat"""
+    with app.app_context():
+        while not stop_event.is_set():
+            try:
+                job = claim_job(queues, name)
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ [{name}] Claim failed: {e}")
+                job = None
+
+            if job is None:
+                if once:
+                    return
+                stop_event.wait(poll_interval)
+                continue
+
+            ok = run_job(job)
+            status = '✅' if ok else ('🔁' if job.status == 'queued' else '❌')
+            print(f"{status} [{name}] {job.task}#{job.id} attempt {job.attempts} "
+                  f"in {job.duration_ms}ms (waited {job.wait_ms}ms)")
+
+def sweep_stale_jobs(app):
+    """Retry or fail jobs past their deadline (crashed workers, hung tasks)"""
+    with app.app_context():
+        try:
+            requeued = requeue_stale_jobs()
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Stale job sweep failed: {e}")
+            return
+        if requeued:
+            print(f"♻️  Requeued {requeued} timed-out jobs")
+
+def run_workers(concurrency=1, queues=('default',), once=False, poll_interval=2):
+    app = create_worker_app()
+    sweep_stale_jobs(app)
+    next_sweep = time.monotonic() + STALE_CHECK_INTERVAL
+
+    print(f"🚀 Starting {concurrency} workers on queues: {', '.join(queues)}")
+    stop_event = threading.Event()
+    threads = [
+        threading.Thread(
+            target=worker_loop,
+            args=(app, f"{worker_id()}-{i}", queues, once, poll_interval, stop_event),
+            daemon=True
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(0.5)
+            if time.monotonic() >= next_sweep:
+                sweep_stale_jobs(app)
+                next_sweep = time.monotonic() + STALE_CHECK_INTERVAL
+    except KeyboardInterrupt:
+        print("🛑 Stopping workers after their current job...")
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+def main():
+    parser = argparse.ArgumentParser(description='Background job worker')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run jobs')
+    run_parser.add_argument('--concurrency', type=int, default=1, help='Worker threads')
+    run_parser.add_argument('--queue', action='append', dest='queues', help='Queue to consume (repeatable)')
+    run_parser.add_argument('--once', action='store_true', help='Exit when no jobs are due')
+    run_parser.add_argument('--poll-interval', type=float, default=2, help='Seconds between polls when idle')
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Queue a job')
+    enqueue_parser.add_argument('task', choices=sorted(TASKS))
+    enqueue_parser.add_argument('--payload', default='{}', help='JSON object of task arguments')
+    enqueue_parser.add_argument('--dedup-key', default=None)
+    enqueue_parser.add_argument('--queue', default='default')
+
+    subparsers.add_parser('stats', help='Show per-task timing metrics')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        run_workers(args.concurrency, tuple(args.queues or ['default']), args.once, args.poll_interval)
+        return
+
+    app = create_worker_app()
+    with app.app_context():
+        if args.command == 'enqueue':
+            job = enqueue_job(args.task, json.loads(args.payload), args.dedup_key, args.queue)
+            print(f"📥 Queued {job.task}#{job.id}")
+        else:
+            for row in job_stats():
+                print(f"📊 {row['task']:<28} {row['status']:<10} {row['count']:>6} jobs  "
+                      f"avg {row['avg_duration_ms']}ms  max {row['max_duration_ms']}ms  "
+                      f"avg wait {row['avg_wait_ms']}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+BandVenueReview.ie - List Serializers
+Column-projection serializers for list endpoints
+
+A ListShape names the columns a listing returns. Its queries select just
+those columns as plain rows (no ORM objects are built), and each row is
+turned into a dict by a function compiled once per shape, instead of a
+to_dict() call that formats every column of a hydrated model. Detail
+endpoints keep using the models' to_dict().
+
+Keys with a dot ('venue.name') are grouped into a nested dict.
+
+Clients can narrow a shape with ?fields=name,slug (a dotted group such
+as 'venue' selects all its keys) and opt into extra sections with
+?include=...; unrequested columns are never selected. ?ids= / ?slugs=
+fetch up to MAX_LOOKUP_KEYS rows with one IN query, in request order.
+"""
+
+import json
+
+# Narrowed shapes kept per ListShape before the cache starts over
+MAX_SUBSETS = 256
+
+# Most keys one ?ids= / ?slugs= lookup accepts
+MAX_LOOKUP_KEYS = 100
+
+# Lookup parameter -> key it matches
+LOOKUP_PARAMS = {'ids': 'id', 'slugs': 'slug'}
+
+def isoformat(value):
+    return value.isoformat() if value is not None else None
+
+def json_list(value):
+    """JSON array column as a list (JSONB value or SQLite Text)"""
+    if not value:
+        return []
+    return json.loads(value) if isinstance(value, str) else value
+
+def json_object(value):
+    """JSON object column as a dict (JSONB value or SQLite Text)"""
+    if not value:
+        return {}
+    return json.loads(value) if isinstance(value, str) else value
+
+def optional_float(value):
+    return float(value) if value is not None else None
+
+class ListShape:
+    """Columns of a listing and the compiled row -> dict function for them
+
+    fields are (key, column) or (key, column, converter) tuples.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.keys = tuple(field[0] for field in fields)
+        self.subsets = {}
+        self.columns = [field[1].label(field[0].replace('.', '_')) for field in fields]
+        self.serialize = self._compile(fields)
+
+    def _compile(self, fields):
+        namespace = {}
+        groups = {}
+        for position, field in enumerate(fields):
+            key = field[0]
+            value = f"row[{position}]"
+            if len(field) > 2 and field[2] is not None:
+                namespace[f"convert_{position}"] = field[2]
+                value = f"convert_{position}({value})"
+            parent, _, child = key.rpartition('.')
+            groups.setdefault(parent, []).append(f"{child!r}: {value}")
+
+        items = groups.pop('', [])
+        items += [f"{parent!r}: {{{', '.join(children)}}}" for parent, children in groups.items()]
+        source = f"def serialize(row):\n    return {{{', '.join(items)}}}\n"
+        exec(compile(source, f"<list shape {', '.join(self.keys)}>", 'exec'), namespace)
+        return namespace['serialize']
+
+    def subset(self, keys):
+        """Shape with only keys (in this shape's order), compiled once per set of keys"""
+        keys = frozenset(keys)
+        shape = self.subsets.get(keys)
+        if shape is None:
+            if len(self.subsets) >= MAX_SUBSETS:
+                self.subsets.clear()
+            shape = ListShape(*[field for field in self.fields if field[0] in keys])
+            self.subsets[keys] = shape
+        return shape
+
+    def query(self, query):
+        """query restricted to this shape's columns (filters and order are kept)"""
+        return query.with_entities(*self.columns)
+
+    def serialize_all(self, rows):
+        return list(map(self.serialize, rows))
+
+def _names(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+def requested_shape(args, shape, default=None, required=('id',)):
+    """shape narrowed to ?fields= (default, else shape, when absent)
+
+    required keys are always kept; raises ValueError naming unknown fields.
+    """
+    value = args.get('fields')
+    if not value:
+        return default or shape
+
+    keys = set(required)
+    unknown = []
+    for name in _names(value):
+        matched = [key for key in shape.keys if key == name or key.startswith(name + '.')]
+        if not matched:
+            unknown.append(name)
+        keys.update(matched)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(shape.keys)}")
+    return shape.subset(keys)
+
+def requested_includes(args, allowed, default=()):
+    """Sections named in ?include= (default when absent); raises ValueError on unknown ones"""
+    value = args.get('include')
+    if value is None:
+        return set(default)
+
+    names = _names(value)
+    unknown = names - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}")
+    return names
+
+def requested_lookup(args, params=tuple(LOOKUP_PARAMS)):
+    """(key, values) from ?ids= or ?slugs= (duplicates dropped, order kept); None when neither is given
+
+    Raises ValueError for empty, oversized or non-integer lookups.
+    """
+    given = [param for param in LOOKUP_PARAMS if param in args]
+    if not given:
+        return None
+    param = given[0]
+    if len(given) > 1 or param not in params:
+        raise ValueError(f"Look up by one of: {', '.join(params)}")
+
+    values = list(dict.fromkeys(value.strip() for value in args[param].split(',') if value.strip()))
+    if not values:
+        raise ValueError(f"{param} is empty")
+    if len(values) > MAX_LOOKUP_KEYS:
+        raise ValueError(f"At most {MAX_LOOKUP_KEYS} {param} per request")
+    if param == 'ids':
+        try:
+            values = [int(value) for value in values]
+        except ValueError:
+            raise ValueError('ids must be integers')
+    return LOOKUP_PARAMS[param], values
+
+def bulk_lookup(shape, query, column, key, values):
+    """Serialized rows of query whose column is in values, in values' order, and the values not found"""
+    found = {item[key]: item for item in shape.serialize_all(shape.query(query.filter(column.in_(values))))}
+    return [found[value] for value in values if value in found], [value for value in values if value not in found]
@@ -0,0 +1,484 @@
+"""
+BandVenueReview.ie - SQLite to PostgreSQL Data Migration
+Copies the rows that landed in the SQLite fallback database
+(bandvenuereview_prod.db) into the PostgreSQL database
+
+- Source tables are read in keyset-ordered chunks (WHERE pk > last ORDER BY
+  pk LIMIT n), so memory stays flat and no chunk re-scans earlier rows
+- Chunks are written with COPY ... FROM STDIN on PostgreSQL (bulk INSERT
+  on other targets), one transaction per chunk
+- Tables run in parallel as soon as every table they reference is done,
+  so foreign keys hold throughout
+- Progress is checkpointed per table after every chunk, in a
+  _migration_checkpoints table written in the chunk's own transaction, so
+  the checkpoint always names the last source key the target committed;
+  --resume carries on from it (no chunk is copied twice or skipped)
+- Text columns holding JSON are parsed and written to JSON/JSONB columns
+- Every table is verified afterwards: row counts and an order-independent
+  checksum of the normalised rows must match on both sides
+- Once rows are copied the API response cache (RESPONSE_CACHE_URL of the
+  FLASK_CONFIG config) is emptied, slug lookups included, since the web
+  workers never saw these writes
+
+The target schema must already exist (the app creates it with db.create_all()).
+
+Usage:
+    python migrate_sqlite_to_postgres.py --source sqlite:///bandvenuereview_prod.db --target $DATABASE_URL
+    python migrate_sqlite_to_postgres.py --resume --workers 4 --chunk-size 5000
+    python migrate_sqlite_to_postgres.py --verify-only
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal
+
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, Column, DateTime, MetaData, String, Table, Text, create_engine, func, literal_column,
+    select, tuple_
+)
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Config
+
+from config import config
+from response_cache import ALL_TAG, stamp_tags
+from slug_cache import slug_tag
+
+DEFAULT_SOURCE = 'sqlite:///bandvenuereview_prod.db'
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_WORKERS = 4
+DEFAULT_STATE_FILE = '.sqlite_to_postgres_state.json'
+
+CHECKSUM_MODULUS = 2 ** 64
+
+# Last source key committed per table, kept in the target next to the copied rows
+CHECKPOINTS = Table(
+    '_migration_checkpoints', MetaData(),
+    Column('table_name', String(200), primary_key=True),
+    Column('last_key', Text, nullable=False),
+    Column('rows', BigInteger, nullable=False)
+)
+
+def normalise_url(url):
+    """Heroku/Render style postgres:// URLs -> postgresql://"""
+    if url and url.startswith('postgres://'):
+        return url.replace('postgres://', 'postgresql://', 1)
+    return url
+
+def is_json_column(column):
+    return isinstance(column.type, (JSON, postgresql.JSON, postgresql.JSONB))
+
+def _python_type_name(column_type):
+    try:
+        return column_type.python_type.__name__.lower()
+    except (NotImplementedError, AttributeError):
+        return ''
+
+def convert_value(value, column):
+    """Source value -> value for the target column (Text JSON -> Python object for JSON/JSONB)"""
+    if value is None:
+        return None
+    if is_json_column(column) and isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value  # Not JSON after all: keep the text as a JSON string
+    if isinstance(column.type, Boolean) and not isinstance(value, bool):
+        return bool(value)
+    if isinstance(column.type, DateTime) and isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(column.type, DateTime) and column.type.timezone and isinstance(value, datetime) \
+            and value.tzinfo is None:
+        # The app stores naive UTC (datetime.utcnow()); don't let timestamptz read it as server-local time
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+def canonical(value, column):
+    """Type-independent text for a value, identical on SQLite and PostgreSQL"""
+    value = convert_value(value, column)
+    if value is None:
+        return '\\N'
+    if is_json_column(column):
+        return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # timestamptz comes back aware, in the session's time zone; compare as naive UTC
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return value.hex
+    if isinstance(value, (float, Decimal)):
+        return repr(float(value))
+    if isinstance(value, str) and _python_type_name(column.type) == 'uuid':
+        return value.replace('-', '').lower()
+    return str(value)
+
+def row_digest(row, columns):
+    text = '\x1f'.join(canonical(row[column.name], column) for column in columns)
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def copy_text(value, column):
+    """Value in PostgreSQL COPY text format"""
+    value = convert_value(value, column)
+    if value is None:
+        return '\\N'
+    if is_json_column(column):
+        text = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, bool):
+        text = 't' if value else 'f'
+    elif isinstance(value, (datetime, date, dt_time)):
+        text = value.isoformat()
+    elif isinstance(value, bytes):
+        text = '\\x' + value.hex()
+    else:
+        text = str(value)
+    return (text.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+
+class MigrationState:
+    """Per-table progress in a JSON file: {table: {last_key, rows, done}}
+
+    For resuming, the last_key and rows committed in the target
+    (_migration_checkpoints) win over the file, which may lag a chunk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tables = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.tables = json.load(f)
+
+    def get(self, table_name):
+        return dict(self.tables.get(table_name) or {'last_key': None, 'rows': 0, 'done': False})
+
+    def update(self, table_name, **fields):
+        with self.lock:
+            self.tables[table_name] = {**self.get(table_name), **fields}
+            if not self.path:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.tables, f, indent=2, default=str)
+            os.replace(tmp_path, self.path)
+
+class TableCopier:
+    """Keyset-chunked copy of one table from source to target"""
+
+    def __init__(self, source_engine, target_engine, source_table, target_table, state, chunk_size):
+        self.source_engine = source_engine
+        self.target_engine = target_engine
+        self.source_table = source_table
+        self.target_table = target_table
+        self.state = state
+        self.chunk_size = chunk_size
+
+        # Only columns present on both sides are copied
+        self.columns = [column for column in target_table.columns if column.name in source_table.c]
+        for column in self.columns:
+            if is_json_column(column):
+                column.type.none_as_null = True  # NULL stays SQL NULL, not JSON 'null'
+        self.key_columns = [source_table.c[column.name] for column in source_table.primary_key.columns] \
+            or [literal_column('rowid')]
+        self.use_copy = target_engine.dialect.name == 'postgresql' and target_engine.dialect.driver == 'psycopg2'
+
+    @property
+    def name(self):
+        return self.target_table.name
+
+    def iter_chunks(self, last_key):
+        """Source rows in key order, chunk_size at a time, after last_key"""
+        key = tuple_(*self.key_columns) if len(self.key_columns) > 1 else self.key_columns[0]
+        while True:
+            query = select(*[self.source_table.c[column.name] for column in self.columns],
+                           *[column.label(f"_key{i}") for i, column in enumerate(self.key_columns)])
+            if last_key is not None:
+                query = query.where(key > (tuple_(*last_key) if len(last_key) > 1 else last_key[0]))
+            query = query.order_by(*self.key_columns).limit(self.chunk_size)
+
+            with self.source_engine.connect() as conn:
+                rows = [row._mapping for row in conn.execute(query)]
+            if not rows:
+                return
+            last_key = [rows[-1][f"_key{i}"] for i in range(len(self.key_columns))]
+            yield rows, last_key
+
+    def checkpoint_values(self, last_key, rows_copied):
+        return {'table_name': self.name, 'last_key': json.dumps(last_key, default=str), 'rows': rows_copied}
+
+    def committed_progress(self):
+        """(last_key, rows) the target committed for this table, or None"""
+        with self.target_engine.connect() as conn:
+            row = conn.execute(select(CHECKPOINTS.c.last_key, CHECKPOINTS.c.rows)
+                               .where(CHECKPOINTS.c.table_name == self.name)).first()
+        return (json.loads(row.last_key), row.rows) if row else None
+
+    def write_copy(self, rows, checkpoint):
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(copy_text(row[column.name], column) for column in self.columns))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        column_list = ', '.join(f'"{column.name}"' for column in self.columns)
+        raw = self.target_engine.raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                cursor.copy_expert(f'COPY "{self.name}" ({column_list}) FROM STDIN', buffer)
+                cursor.execute(
+                    f'INSERT INTO "{CHECKPOINTS.name}" (table_name, last_key, rows) VALUES (%s, %s, %s) '
+                    'ON CONFLICT (table_name) DO UPDATE SET last_key = EXCLUDED.last_key, rows = EXCLUDED.rows',
+                    (checkpoint['table_name'], checkpoint['last_key'], checkpoint['rows'])
+                )
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+    def write_insert(self, rows, checkpoint):
+        values = [{column.name: convert_value(row[column.name], column) for column in self.columns} for row in rows]
+        insert = postgresql.insert if self.target_engine.dialect.name == 'postgresql' else sqlite.insert
+        save = insert(CHECKPOINTS).values(checkpoint)
+        save = save.on_conflict_do_update(
+            index_elements=['table_name'],
+            set_={'last_key': save.excluded.last_key, 'rows': save.excluded.rows}
+        )
+        with self.target_engine.begin() as conn:
+            conn.execute(self.target_table.insert(), values)
+            conn.execute(save)
+
+    def reset_sequences(self):
+        """Move serial sequences past the copied ids (COPY bypasses them)"""
+        if self.target_engine.dialect.name != 'postgresql':
+            return
+        with self.target_engine.begin() as conn:
+            for column in self.target_table.primary_key.columns:
+                if _python_type_name(column.type) != 'int':
+                    continue
+                conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('\"{self.name}\"', '{column.name}'), "
+                    f"COALESCE(MAX(\"{column.name}\"), 1), MAX(\"{column.name}\") IS NOT NULL) "
+                    f"FROM \"{self.name}\" WHERE pg_get_serial_sequence('\"{self.name}\"', '{column.name}') IS NOT NULL"
+                )
+
+    def run(self):
+        progress = self.state.get(self.name)
+        if progress['done']:
+            print(f"⏭️  {self.name}: already copied ({progress['rows']} rows)")
+            return progress['rows']
+
+        started = time.perf_counter()
+        last_key, rows_copied = progress['last_key'], progress['rows']
+        # The file may lag the target by the chunk committed just before a crash
+        committed = self.committed_progress()
+        if committed:
+            last_key, rows_copied = committed
+
+        for rows, last_key in self.iter_chunks(last_key):
+            rows_copied += len(rows)
+            checkpoint = self.checkpoint_values(last_key, rows_copied)
+            if self.use_copy:
+                self.write_copy(rows, checkpoint)
+            else:
+                self.write_insert(rows, checkpoint)
+            self.state.update(self.name, last_key=last_key, rows=rows_copied)
+
+        self.reset_sequences()
+        self.state.update(self.name, done=True, rows=rows_copied)
+        elapsed = time.perf_counter() - started
+        print(f"✅ {self.name}: {rows_copied} rows in {elapsed:.2f}s")
+        return rows_copied
+
+def table_checksum(engine, table, columns, key_columns, chunk_size):
+    """(row count, order-independent checksum) over columns, read in keyset chunks"""
+    count = 0
+    checksum = 0
+    key = tuple_(*key_columns) if len(key_columns) > 1 else key_columns[0]
+    last_key = None
+    with engine.connect() as conn:
+        while True:
+            query = select(*[table.c[column.name] for column in columns],
+                           *[column.label(f"_key{i}") for i, column in enumerate(key_columns)])
+            if last_key is not None:
+                query = query.where(key > (tuple_(*last_key) if len(key_columns) > 1 else last_key[0]))
+            rows = [row._mapping for row in conn.execute(query.order_by(*key_columns).limit(chunk_size))]
+            if not rows:
+                return count, checksum
+            for row in rows:
+                checksum = (checksum + row_digest(row, columns)) % CHECKSUM_MODULUS
+            count += len(rows)
+            last_key = tuple(rows[-1][f"_key{i}"] for i in range(len(key_columns)))
+
+def verify_table(copier, chunk_size):
+    """True when source and target hold the same rows"""
+    columns = copier.columns
+    target_keys = [copier.target_table.c[column.name] for column in copier.target_table.primary_key.columns]
+    if not target_keys:
+        # No primary key to page on: compare counts only
+        with copier.source_engine.connect() as conn:
+            source_count = conn.execute(select(func.count()).select_from(copier.source_table)).scalar()
+        with copier.target_engine.connect() as conn:
+            target_count = conn.execute(select(func.count()).select_from(copier.target_table)).scalar()
+        ok = source_count == target_count
+        print(f"{'✅' if ok else '❌'} {copier.name}: {source_count} -> {target_count} rows (no primary key, count only)")
+        return ok
+
+    source = table_checksum(copier.source_engine, copier.source_table, columns, copier.key_columns, chunk_size)
+    target = table_checksum(copier.target_engine, copier.target_table, columns, target_keys, chunk_size)
+    ok = source == target
+    print(f"{'✅' if ok else '❌'} {copier.name}: {source[0]} -> {target[0]} rows, "
+          f"checksum {source[1]:016x} {'==' if ok else '!='} {target[1]:016x}")
+    return ok
+
+def dependency_order(tables):
+    """{table name: names of other copied tables it references}"""
+    names = {table.name for table in tables}
+    return {
+        table.name: {fk.column.table.name for fk in table.foreign_keys
+                     if fk.column.table.name in names and fk.column.table.name != table.name}
+        for table in tables
+    }
+
+def run_parallel(copiers, workers):
+    """Run copiers in FK-dependency order, independent tables concurrently"""
+    by_name = {copier.name: copier for copier in copiers}
+    pending = dependency_order([copier.target_table for copier in copiers])
+    done = set()
+    failed = set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for name in [name for name, parents in pending.items() if parents <= done]:
+                del pending[name]
+                running[executor.submit(by_name[name].run)] = name
+
+            blocked = [name for name, parents in pending.items() if parents & failed]
+            while blocked:
+                for name in blocked:
+                    print(f"⏭️  {name}: skipped, a referenced table failed")
+                    failed.add(name)
+                    del pending[name]
+                blocked = [name for name, parents in pending.items() if parents & failed]
+
+            if not running:
+                if pending:
+                    raise RuntimeError(f"Circular foreign keys between: {', '.join(sorted(pending))}")
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    future.result()
+                    done.add(name)
+                except Exception as e:
+                    print(f"❌ {name}: {e}")
+                    failed.add(name)
+
+    return done, failed
+
+def build_copiers(source_engine, target_engine, state, chunk_size, only=None):
+    source_meta = MetaData()
+    source_meta.reflect(bind=source_engine)
+    target_meta = MetaData()
+    target_meta.reflect(bind=target_engine)
+
+    copiers = []
+    for name, source_table in source_meta.tables.items():
+        if only and name not in only:
+            continue
+        if name not in target_meta.tables:
+            print(f"⚠️  {name}: not in the target schema, skipped")
+            continue
+        copiers.append(TableCopier(source_engine, target_engine, source_table,
+                                   target_meta.tables[name], state, chunk_size))
+    return copiers
+
+def target_has_rows(copier):
+    with copier.target_engine.connect() as conn:
+        return conn.execute(select(copier.target_table.c[copier.columns[0].name]).limit(1)).first() is not None
+
+def invalidate_response_cache(tables):
+    """Stamp the whole response cache and the copied tables' slug tags"""
+    settings = Config(os.path.dirname(os.path.abspath(__file__)))
+    settings.from_object(config[os.environ.get('FLASK_CONFIG', 'development')])
+    stamp_tags(settings, ALL_TAG, *(slug_tag(table) for table in tables))
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate the SQLite fallback database into PostgreSQL')
+    parser.add_argument('--source', default=os.environ.get('SQLITE_SOURCE_URL', DEFAULT_SOURCE), help='Source SQLite URL')
+    parser.add_argument('--target', default=os.environ.get('DATABASE_URL'), help='Target database URL (DATABASE_URL)')
+    parser.add_argument('--tables', nargs='*', help='Only these tables')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per chunk')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Tables copied in parallel')
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE, help='Checkpoint file')
+    parser.add_argument('--resume', action='store_true', help='Continue from the checkpoint file')
+    parser.add_argument('--verify-only', action='store_true', help='Only compare row counts and checksums')
+    args = parser.parse_args()
+
+    if not args.target:
+        parser.error('--target or DATABASE_URL is required')
+
+    source_engine = create_engine(normalise_url(args.source))
+    target_engine = create_engine(normalise_url(args.target), pool_size=args.workers + 1, pool_pre_ping=True) \
+        if not args.target.startswith('sqlite') else create_engine(args.target)
+
+    state = MigrationState(args.state_file if args.resume or args.verify_only else None)
+    copiers = build_copiers(source_engine, target_engine, state, args.chunk_size, set(args.tables or []))
+
+    if not args.verify_only:
+        if not args.resume:
+            non_empty = [copier.name for copier in copiers if copier.columns and target_has_rows(copier)]
+            if non_empty:
+                print(f"❌ Target tables already hold rows: {', '.join(non_empty)}")
+                print("   Empty them first, or pass --resume to continue an interrupted migration")
+                sys.exit(1)
+            state.path = args.state_file  # fresh checkpoints replace the old file
+
+        CHECKPOINTS.create(target_engine, checkfirst=True)
+        if not args.resume:
+            with target_engine.begin() as conn:
+                conn.execute(CHECKPOINTS.delete().where(CHECKPOINTS.c.table_name.in_([copier.name for copier in copiers])))
+
+        print(f"🚚 Migrating {len(copiers)} tables with {args.workers} workers...")
+        started = time.perf_counter()
+        done, failed = run_parallel(copiers, args.workers)
+        print(f"📦 Copied {len(done)} tables in {time.perf_counter() - started:.2f}s"
+              + (f", {len(failed)} failed" if failed else ''))
+        try:
+            invalidate_response_cache([copier.name for copier in copiers])
+        except Exception as e:
+            print(f"⚠️  Could not clear the response cache ({e}); cached responses expire within RESPONSE_CACHE_TTL")
+        if failed:
+            sys.exit(1)
+
+    print("🔍 Verifying row counts and checksums...")
+    results = [verify_table(copier, args.chunk_size) for copier in copiers if copier.columns]
+    if not all(results):
+        print("❌ Verification failed")
+        sys.exit(1)
+    print("✅ All tables verified")
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,12 @@ import uuid
 
 db = SQLAlchemy()
 
+# Per-dimension ratings on Review that venues keep running totals for
+RATING_DIMENSIONS = (
+    'sound_quality', 'hospitality', 'payment_promptness',
+    'crowd_engagement', 'facilities_rating', 'overall_rating'
+)
+
 class User(db.Model):
     """Base user model for both bands and venue owners"""
     __tablename__ = 'users'
@@ -108,6 +114,14 @@ class Venue(db.Model):
     verified = db.Column(db.Boolean, default=False)
     average_rating = db.Column(db.Numeric(3,1), default=0.0)
     review_count = db.Column(db.Integer, default=0)
+    
+    # Running rating totals, one per Review dimension (averages = sum / review_count)
+    sound_quality_sum = db.Column(db.Integer, default=0, nullable=False)
+    hospitality_sum = db.Column(db.Integer, default=0, nullable=False)
+    payment_promptness_sum = db.Column(db.Integer, default=0, nullable=False)
+    crowd_engagement_sum = db.Column(db.Integer, default=0, nullable=False)
+    facilities_rating_sum = db.Column(db.Integer, default=0, nullable=False)
+    overall_rating_sum = db.Column(db.Integer, default=0, nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
     updated_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -115,15 +129,68 @@ class Venue(db.Model):
     user = db.relationship('User', backref='venue_profile')
     reviews = db.relationship('Review', backref='venue', lazy=True, cascade='all, delete-orphan')
 
+    def apply_rating_delta(self, old_scores=None, new_scores=None):
+        """Adjust running rating totals in O(1) for a review insert, edit or delete
+        
+        Pass new_scores for an insert, old_scores for a delete and both for an
+        edit. Scores are dicts as returned by Review.rating_scores(). The
+        columns are incremented in SQL (sum = sum + delta) rather than read and
+        written back, so concurrent reviews of one venue can't lose an update.
+        """
+        count_delta = (1 if new_scores else 0) - (1 if old_scores else 0)
+        count = db.func.coalesce(Venue.review_count, 0) + count_delta
+        values = {Venue.review_count: count}
+        for dimension in RATING_DIMENSIONS:
+            delta = (new_scores or {}).get(dimension, 0) - (old_scores or {}).get(dimension, 0)
+            total = getattr(Venue, f'{dimension}_sum')
+            values[total] = total + delta
+            if dimension == 'overall_rating':
+                overall = total + delta
+        
+        # Right-hand sides read the row's values before this UPDATE
+        values[Venue.average_rating] = db.case(
+            (count > 0, db.func.round(db.cast(overall, db.Numeric) / count, 1)),
+            else_=0
+        )
+        Venue.query.filter_by(id=self.id).update(values, synchronize_session=False)
+        db.session.expire(self, ['review_count', 'average_rating'] + [f'{d}_sum' for d in RATING_DIMENSIONS])
+
+    def recompute_ratings(self):
+        """Rebuild running rating totals from this venue's reviews (repair path)"""
+        totals = db.session.query(
+            db.func.count(Review.id),
+            *[db.func.coalesce(db.func.sum(getattr(Review, dimension)), 0) for dimension in RATING_DIMENSIONS]
+        ).filter(Review.venue_id == self.id).one()
+        
+        self.review_count = totals[0]
+        for dimension, total in zip(RATING_DIMENSIONS, totals[1:]):
+            setattr(self, f'{dimension}_sum', int(total))
+        self._refresh_average_rating()
+
     def update_rating(self):
         """Calculate and update average rating from reviews"""
-        if self.reviews:
-            total_rating = sum(review.overall_rating for review in self.reviews)
-            self.average_rating = round(total_rating / len(self.reviews), 1)
-            self.review_count = len(self.reviews)
+        self.recompute_ratings()
+
+    def _refresh_average_rating(self):
+        if self.review_count:
+            self.average_rating = round((self.overall_rating_sum or 0) / self.review_count, 1)
         else:
             self.average_rating = 0.0
-            self.review_count = 0
+
+    def get_dimension_averages(self):
+        """Average score per rating dimension, read from the running totals"""
+        if not self.review_count:
+            return {dimension: None for dimension in RATING_DIMENSIONS}
+        return {
+            dimension: round((getattr(self, f'{dimension}_sum') or 0) / self.review_count, 2)
+            for dimension in RATING_DIMENSIONS
+        }
+
+    @classmethod
+    def dimension_average_expression(cls, dimension):
+        """SQL expression for a dimension's average, for "best sound in Dublin" style sorts"""
+        total = getattr(cls, f'{dimension}_sum')
+        return db.cast(total, db.Float) / db.func.nullif(cls.review_count, 0)
 
     def to_dict(self):
         return {
@@ -150,6 +217,7 @@ class Venue(db.Model):
             'verified': self.verified,
             'average_rating': float(self.average_rating) if self.average_rating else 0.0,
             'review_count': self.review_count,
+            'rating_breakdown': self.get_dimension_averages(),
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
@@ -187,8 +255,19 @@ class Review(db.Model):
     # Metadata
     verified_performance = db.Column(db.Boolean, default=False)  # Admin verified
     helpful_votes = db.Column(db.Integer, default=0)
+    unhelpful_votes = db.Column(db.Integer, default=0)
+    helpfulness_score = db.Column(db.Float, default=0.0, nullable=False)  # Wilson lower bound
     created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
     updated_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # sort=helpful on a venue's reviews is an index scan
+    __table_args__ = (
+        db.Index('idx_reviews_venue_helpfulness', 'venue_id', 'helpfulness_score', 'created_at'),
+    )
+
+    def rating_scores(self):
+        """Snapshot of this review's per-dimension scores for venue rating deltas"""
+        return {dimension: int(getattr(self, dimension)) for dimension in RATING_DIMENSIONS}
 
     def to_dict(self):
         return {
@@ -211,11 +290,35 @@ class Review(db.Model):
             'would_return': self.would_return,
             'recommended_for': self.recommended_for,
             'verified_performance': self.verified_performance,
-            'helpful_votes': self.helpful_votes,
+            'helpful_votes': self.helpful_votes or 0,
+            'unhelpful_votes': self.unhelpful_votes or 0,
+            'helpfulness_score': round(self.helpfulness_score or 0.0, 4),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'band_name': self.band.user.name if self.band and self.band.user else None
         }
 
+class ReviewVote(db.Model):
+    """Helpfulness votes on venue reviews (one per user per review)"""
+    __tablename__ = 'review_votes'
+    
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    review_id = db.Column(UUID(as_uuid=True), db.ForeignKey('reviews.id', ondelete='CASCADE'), nullable=False)
+    voter_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=False)
+    is_helpful = db.Column(db.Boolean, nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (db.UniqueConstraint('review_id', 'voter_id', name='unique_review_vote'),)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'review_id': self.review_id,
+            'voter_id': self.voter_id,
+            'is_helpful': self.is_helpful,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
 # Association table for many-to-many relationship between venues and genres
 venue_genres = db.Table('venue_genres',
     db.Column('venue_id', UUID(as_uuid=True), db.ForeignKey('venues.id'), primary_key=True),
@@ -45,6 +45,7 @@ class Band(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False, index=True)
     slug = db.Column(db.String(200), unique=True, nullable=False, index=True)
+    source_id = db.Column(db.String(200), unique=True, nullable=True)  # Sanity _id of rows made by bulk_load.py
     bio = db.Column(db.Text, nullable=True)
     formed_year = db.Column(db.Integer, nullable=True)
     
@@ -68,6 +69,7 @@ class Band(db.Model):
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     is_verified = db.Column(db.Boolean, default=False, nullable=False)
     verification_level = db.Column(db.String(20), default='none')
+    follower_count = db.Column(db.Integer, default=0, nullable=False)  # Maintained by follow/unfollow
     
     created_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -143,6 +145,7 @@ class Venue(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False, index=True)
     slug = db.Column(db.String(200), unique=True, nullable=False, index=True)
+    source_id = db.Column(db.String(200), unique=True, nullable=True)  # Sanity _id of rows made by bulk_load.py
     address = db.Column(db.String(500), nullable=True)
     city = db.Column(db.String(100), nullable=True, index=True)
     county = db.Column(db.String(50), nullable=True, index=True)
@@ -227,9 +230,11 @@ class Gig(db.Model):
     ticket_url = db.Column(db.String(500), nullable=True)
     
     status = db.Column(db.String(20), default='scheduled', nullable=False)
+    fanned_out = db.Column(db.Boolean, default=False, nullable=False)  # Written to follower feeds on create
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (db.Index('idx_gigs_band_fanout', 'band_id', 'fanned_out', 'gig_date'),)
 
 # Minimal other models for API compatibility
 class BandMember(db.Model):
@@ -256,8 +261,12 @@ class BandReview(db.Model):
     content = db.Column(db.Text, nullable=False)
     gig_id = db.Column(db.Integer, db.ForeignKey('gigs.id'), nullable=True)
     is_verified = db.Column(db.Boolean, default=False, nullable=False)
+    helpful_votes = db.Column(db.Integer, default=0, nullable=False)
+    unhelpful_votes = db.Column(db.Integer, default=0, nullable=False)
+    helpfulness_score = db.Column(db.Float, default=0.0, nullable=False)  # Wilson lower bound
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (db.Index('idx_band_reviews_helpfulness', 'band_id', 'helpfulness_score', 'created_at'),)
 
 class VenueReviewByBand(db.Model):
     __tablename__ = 'venue_reviews_by_bands'
@@ -270,8 +279,12 @@ class VenueReviewByBand(db.Model):
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
     gig_id = db.Column(db.Integer, db.ForeignKey('gigs.id'), nullable=True)
+    helpful_votes = db.Column(db.Integer, default=0, nullable=False)
+    unhelpful_votes = db.Column(db.Integer, default=0, nullable=False)
+    helpfulness_score = db.Column(db.Float, default=0.0, nullable=False)  # Wilson lower bound
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (db.Index('idx_venue_reviews_by_bands_helpfulness', 'venue_id', 'helpfulness_score', 'created_at'),)
 
 class BandFollower(db.Model):
     __tablename__ = 'band_followers'
@@ -283,6 +296,77 @@ class BandFollower(db.Model):
     followed_at = db.Column(db.DateTime, default=datetime.utcnow)
     __table_args__ = (db.UniqueConstraint('band_id', 'user_id', name='unique_band_follower'),)
 
+class FeedEntry(db.Model):
+    __tablename__ = 'feed_entries'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    gig_id = db.Column(db.Integer, db.ForeignKey('gigs.id', ondelete='CASCADE'), nullable=False)
+    band_id = db.Column(db.Integer, db.ForeignKey('bands.id'), nullable=False)
+    gig_date = db.Column(db.Date, nullable=False)  # Copied from the gig for keyset paging
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'gig_id', name='unique_feed_entry'),
+        db.Index('idx_feed_entries_user_date', 'user_id', 'gig_date', 'gig_id'),
+    )
+
+class NotificationEvent(db.Model):
+    __tablename__ = 'notification_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(30), nullable=False)  # new_gig
+    band_id = db.Column(db.Integer, db.ForeignKey('bands.id'), nullable=False)
+    gig_id = db.Column(db.Integer, db.ForeignKey('gigs.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, processing, sent, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)  # Failed deliveries so far
+    claimed_at = db.Column(db.DateTime, nullable=True)  # Start of the current worker's lease
+    delivered_through = db.Column(db.String(36), nullable=True)  # Followers up to this user_id have their digest
+    error_message = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    __table_args__ = (db.Index('idx_notification_events_status', 'status', 'id'),)
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(100), nullable=False)
+    queue = db.Column(db.String(50), default='default', nullable=False)
+    payload = db.Column(JsonType, nullable=True)  # Handler kwargs
+    dedup_key = db.Column(db.String(200), nullable=True)
+    priority = db.Column(db.Integer, default=0, nullable=False)
+    status = db.Column(db.String(20), default='queued', nullable=False)  # queued, running, succeeded, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=3, nullable=False)
+    run_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = db.Column(db.String(100), nullable=True)
+    deadline = db.Column(db.DateTime, nullable=True)  # Set on claim; running past it means retry
+    last_error = db.Column(db.Text, nullable=True)
+    result = db.Column(db.String(500), nullable=True)
+    # Timing metrics for the last attempt
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+    wait_ms = db.Column(db.Integer, nullable=True)  # run_at -> claimed
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('idx_jobs_claim', 'status', 'queue', 'run_at'),
+        db.Index('uq_jobs_queued_dedup', 'dedup_key', unique=True,
+                 postgresql_where=text("status = 'queued'"), sqlite_where=text("status = 'queued'")),
+    )
+    
+    def get_payload(self):
+        if IS_POSTGRESQL:
+            return self.payload if self.payload else {}
+        else:
+            return json.loads(self.payload) if self.payload else {}
+    
+    def set_payload(self, payload_dict):
+        if IS_POSTGRESQL:
+            self.payload = payload_dict
+        else:
+            self.payload = json.dumps(payload_dict)
+
 class Setlist(db.Model):
     __tablename__ = 'setlists'
     
@@ -311,9 +395,8 @@ class ReviewVote(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     review_id = db.Column(db.Integer, nullable=False)
-    review_type = db.Column(db.String(20), nullable=False)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    vote_type = db.Column(db.String(10), nullable=False)
+    review_type = db.Column(db.String(20), nullable=False)  # 'band_review' or 'venue_review', as in schema.sql
+    voter_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    is_helpful = db.Column(db.Boolean, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    __table_args__ = (db.UniqueConstraint('review_id', 'review_type', 'user_id', name='unique_review_vote'),)
+    __table_args__ = (db.UniqueConstraint('review_id', 'review_type', 'voter_id', name='unique_review_vote'),)
@@ -0,0 +1,44 @@
+"""
+BandVenueReview.ie - Gig Notification Worker
+Delivers queued new-gig events to band followers outside the request cycle
+
+Delivery runs as the deliver_gig_notifications job; this script queues a
+run with the given options and starts the job worker to process it.
+
+Usage:
+    python notification_worker.py            # poll until stopped
+    python notification_worker.py --once     # drain pending events and exit
+"""
+
+import argparse
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gig_notifications import queue_delivery, DEFAULT_CHUNK_SIZE, DEFAULT_BATCH_SIZE
+from job_worker import create_worker_app, run_workers
+
+def run_worker(once=False, interval=5, limit=50, chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+    app = create_worker_app()
+
+    with app.app_context():
+        job = queue_delivery({'limit': limit, 'chunk_size': chunk_size, 'batch_size': batch_size}, commit=True)
+        print(f"📬 Queued deliver_gig_notifications#{job.id}")
+
+    run_workers(once=once, poll_interval=interval)
+
+def main():
+    parser = argparse.ArgumentParser(description='Deliver queued gig notifications')
+    parser.add_argument('--once', action='store_true', help='Exit when no jobs are due')
+    parser.add_argument('--interval', type=float, default=5, help='Seconds between polls when idle')
+    parser.add_argument('--limit', type=int, default=50, help='Events claimed per pass')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Followers read per query')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Digests per sink write')
+    args = parser.parse_args()
+
+    run_worker(args.once, args.interval, args.limit, args.chunk_size, args.batch_size)
+
+if __name__ == '__main__':
+    main()
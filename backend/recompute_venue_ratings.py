@@ -0,0 +1,58 @@
+"""
+BandVenueReview.ie - Venue Rating Repair
+Rebuilds the running per-dimension rating totals on every venue from the reviews table
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from models import db, Venue, Review, RATING_DIMENSIONS
+
+def recompute_venue_ratings():
+    """Recompute rating totals for all venues with one grouped aggregate query
+    
+    Runs in the current app context (models.db) and commits; returns the
+    number of venues updated and how many of them had drifted totals.
+    """
+    rows = db.session.query(
+        Review.venue_id,
+        db.func.count(Review.id),
+        *[db.func.sum(getattr(Review, dimension)) for dimension in RATING_DIMENSIONS]
+    ).group_by(Review.venue_id).all()
+    
+    totals_by_venue = {row[0]: row[1:] for row in rows}
+    
+    updated = 0
+    drifted = 0
+    for venue in Venue.query.all():
+        count, *sums = totals_by_venue.get(venue.id, (0,) + (0,) * len(RATING_DIMENSIONS))
+        
+        before = (venue.review_count or 0, *[getattr(venue, f'{d}_sum') or 0 for d in RATING_DIMENSIONS])
+        after = (count, *[int(total or 0) for total in sums])
+        if before != after:
+            drifted += 1
+        
+        venue.review_count = count
+        for dimension, total in zip(RATING_DIMENSIONS, after[1:]):
+            setattr(venue, f'{dimension}_sum', total)
+        venue._refresh_average_rating()
+        updated += 1
+    
+    db.session.commit()
+    return updated, drifted
+
+def recompute_all_venue_ratings():
+    """Recompute rating totals for all venues in the configured database"""
+    app = create_app(os.environ.get('FLASK_CONFIG', 'development'))
+    
+    with app.app_context():
+        print("🔢 Aggregating reviews per venue...")
+        updated, drifted = recompute_venue_ratings()
+        print(f"✅ Recomputed ratings for {updated} venues ({drifted} had drifted totals)")
+
+if __name__ == '__main__':
+    recompute_all_venue_ratings()
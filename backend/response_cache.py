@@ -0,0 +1,350 @@
+"""
+BandVenueReview.ie - Response Cache
+Two-level cache for read endpoints with tag-based invalidation
+
+    @bands_bp.route('/stats', methods=['GET'])
+    @cached(tags=('bands', 'venues', 'gigs', 'reviews'))
+    @firebase_auth_optional
+    def get_platform_stats(): ...
+
+Responses are kept in a per-worker LRU (L1) in front of a tier shared by
+every worker (L2): a SQLite file on this host, or Redis when
+RESPONSE_CACHE_URL is a redis:// URL. Keys are the path plus the sorted
+query arguments.
+
+Each entry carries tags ('bands', 'band:12', ...). Writes call
+invalidate_cache(*tags) before committing; once the transaction commits
+the tags are stamped with the next value of a shared sequence. An entry
+records the sequence value read before its view touched the database,
+and is served only while none of its tags has been stamped later, so a
+response is never served from before a commit that touched it, in any
+worker. Rolled-back writes invalidate nothing.
+
+Every entry also carries ALL_TAG, so stamping it drops everything at once
+(migrate_sqlite_to_postgres.py does after a copy). Scripts without an
+app context stamp tags with stamp_tags(config, *tags); code committing
+through a session other than db.session uses invalidate_now(*tags).
+
+Requests with an Authorization header bypass the cache unless the route
+is marked public (its response doesn't depend on the user).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, has_app_context, make_response, request
+from sqlalchemy import event
+
+from models_bands_production import db
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for a redis:// RESPONSE_CACHE_URL
+    redis = None
+
+DEFAULT_TTL = 300
+DEFAULT_L1_ENTRIES = 1024
+
+# Stores between sweeps of expired entries from the SQLite tier
+SWEEP_EVERY = 500
+
+# Tag carried by every entry
+ALL_TAG = 'all'
+
+class SQLiteTier:
+    """Shared tier in a SQLite file (WAL), one connection per thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.stores = 0
+
+    @property
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript('''
+                CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS tags (tag TEXT PRIMARY KEY, seq INTEGER NOT NULL);
+                CREATE TABLE IF NOT EXISTS sequence (id INTEGER PRIMARY KEY CHECK (id = 1), seq INTEGER NOT NULL);
+                INSERT OR IGNORE INTO sequence (id, seq) VALUES (1, 0);
+            ''')
+            self.local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = self.connection.execute(
+            'SELECT value FROM entries WHERE key = ? AND expires > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        connection = self.connection
+        connection.execute('INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)',
+                           (key, value, time.time() + ttl))
+        self.stores += 1
+        if self.stores % SWEEP_EVERY == 0:
+            connection.execute('DELETE FROM entries WHERE expires <= ?', (time.time(),))
+
+    def sequence(self):
+        return self.connection.execute('SELECT seq FROM sequence WHERE id = 1').fetchone()[0]
+
+    def latest_stamp(self, tags):
+        if not tags:
+            return 0
+        placeholders = ','.join('?' * len(tags))
+        row = self.connection.execute(f'SELECT MAX(seq) FROM tags WHERE tag IN ({placeholders})', list(tags)).fetchone()
+        return row[0] or 0
+
+    def stamp(self, tags):
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('UPDATE sequence SET seq = seq + 1 WHERE id = 1')
+            seq = connection.execute('SELECT seq FROM sequence WHERE id = 1').fetchone()[0]
+            connection.executemany('INSERT OR REPLACE INTO tags (tag, seq) VALUES (?, ?)', [(tag, seq) for tag in tags])
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+class RedisTier:
+    """Shared tier in Redis: entries with SETEX, tag stamps in one hash"""
+
+    PREFIX = 'bvr:cache:'
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self.client.get(self.PREFIX + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.setex(self.PREFIX + key, ttl, value)
+
+    def sequence(self):
+        return int(self.client.get(self.PREFIX + 'sequence') or 0)
+
+    def latest_stamp(self, tags):
+        if not tags:
+            return 0
+        return max(int(seq or 0) for seq in self.client.hmget(self.PREFIX + 'tags', list(tags)))
+
+    def stamp(self, tags):
+        seq = self.client.incr(self.PREFIX + 'sequence')
+        self.client.hset(self.PREFIX + 'tags', mapping={tag: seq for tag in tags})
+
+class ResponseCache:
+    """L1 LRU per worker in front of a shared tier, with hit/miss counters"""
+
+    def __init__(self, tier, ttl=DEFAULT_TTL, l1_entries=DEFAULT_L1_ENTRIES):
+        self.tier = tier
+        self.ttl = ttl
+        self.l1_entries = l1_entries
+        self.l1 = OrderedDict()
+        self.lock = threading.Lock()
+        self.metrics = dict.fromkeys(
+            ('l1_hits', 'l2_hits', 'misses', 'stale', 'stores', 'bypassed', 'invalidations', 'errors'), 0
+        )
+
+    def count(self, name):
+        with self.lock:
+            self.metrics[name] += 1
+
+    def _l1_get(self, key):
+        with self.lock:
+            entry = self.l1.get(key)
+            if entry is not None:
+                self.l1.move_to_end(key)
+            return entry
+
+    def _l1_put(self, key, entry):
+        with self.lock:
+            self.l1[key] = entry
+            self.l1.move_to_end(key)
+            while len(self.l1) > self.l1_entries:
+                self.l1.popitem(last=False)
+
+    def _fresh(self, entry):
+        return entry['expires'] > time.time() and self.tier.latest_stamp(entry['tags']) <= entry['seq']
+
+    def lookup(self, key):
+        """Fresh entry for key from L1, else L2 (promoted to L1), else None"""
+        entry = self._l1_get(key)
+        if entry is not None:
+            if self._fresh(entry):
+                self.count('l1_hits')
+                return entry
+            with self.lock:
+                self.l1.pop(key, None)
+            self.count('stale')
+
+        value = self.tier.get(key)
+        if value is not None:
+            entry = json.loads(value)
+            if self._fresh(entry):
+                self._l1_put(key, entry)
+                self.count('l2_hits')
+                return entry
+            self.count('stale')
+
+        self.count('misses')
+        return None
+
+    def store(self, key, entry):
+        self._l1_put(key, entry)
+        self.tier.set(key, json.dumps(entry), self.ttl)
+        self.count('stores')
+
+    def invalidate(self, tags):
+        self.tier.stamp(sorted(tags))
+        with self.lock:
+            self.metrics['invalidations'] += len(tags)
+
+    def snapshot(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+            metrics['l1_entries'] = len(self.l1)
+        lookups = metrics['l1_hits'] + metrics['l2_hits'] + metrics['misses']
+        metrics['hit_rate'] = round((metrics['l1_hits'] + metrics['l2_hits']) / lookups, 3) if lookups else None
+        return metrics
+
+def create_cache(config):
+    """ResponseCache from app config, or None when the cache is disabled"""
+    if not config.get('RESPONSE_CACHE_ENABLED', True):
+        return None
+    url = config.get('RESPONSE_CACHE_URL') or os.path.join(tempfile.gettempdir(), 'bandvenuereview_cache.sqlite3')
+    if url.startswith(('redis://', 'rediss://')):
+        if redis is None:
+            raise RuntimeError('RESPONSE_CACHE_URL is a Redis URL but the redis package is not installed')
+        tier = RedisTier(url)
+    else:
+        tier = SQLiteTier(url)
+    return ResponseCache(
+        tier,
+        ttl=config.get('RESPONSE_CACHE_TTL', DEFAULT_TTL),
+        l1_entries=config.get('RESPONSE_CACHE_L1_ENTRIES', DEFAULT_L1_ENTRIES)
+    )
+
+def get_cache():
+    """The current app's ResponseCache (created on first use), or None when disabled"""
+    extensions = current_app.extensions
+    if 'response_cache' not in extensions:
+        extensions['response_cache'] = create_cache(current_app.config)
+    return extensions['response_cache']
+
+def cache_key():
+    args = urlencode(sorted(request.args.items(multi=True)))
+    return hashlib.blake2b(f"{request.path}?{args}".encode('utf-8'), digest_size=16).hexdigest()
+
+def add_cache_tags(*tags):
+    """Tag the response being built by a @cached view (e.g. with an id found by its query)"""
+    tagged = getattr(request, 'cache_tags', None)
+    if tagged is not None:
+        tagged.update(tags)
+
+def cached(tags=(), public=False):
+    """Cache a GET view's 200 responses under tags
+
+    tags may use the view's arguments ('venue:{venue_id}'). public routes
+    are cached for authenticated requests too.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            cache = get_cache()
+            if cache is None or request.method != 'GET':
+                return f(*args, **kwargs)
+            if not public and 'Authorization' in request.headers:
+                cache.count('bypassed')
+                return f(*args, **kwargs)
+
+            key = cache_key()
+            try:
+                entry = cache.lookup(key)
+                # Read before the view touches the database; see the module docstring
+                seq = cache.tier.sequence() if entry is None else None
+            except Exception as e:
+                cache.count('errors')
+                current_app.logger.error(f"Response cache read failed: {str(e)}")
+                return f(*args, **kwargs)
+
+            if entry is not None:
+                response = current_app.response_class(entry['body'], status=entry['status'], mimetype=entry['mimetype'])
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            request.cache_tags = {ALL_TAG} | {tag.format(**kwargs) for tag in tags}
+            response = make_response(f(*args, **kwargs))
+            response.headers['X-Cache'] = 'MISS'
+            if response.status_code == 200 and not response.direct_passthrough and 'Set-Cookie' not in response.headers:
+                try:
+                    cache.store(key, {
+                        'body': response.get_data(as_text=True),
+                        'status': response.status_code,
+                        'mimetype': response.mimetype,
+                        'tags': sorted(request.cache_tags),
+                        'seq': seq,
+                        'expires': time.time() + cache.ttl
+                    })
+                except Exception as e:
+                    cache.count('errors')
+                    current_app.logger.error(f"Response cache write failed: {str(e)}")
+            return response
+
+        return decorated_function
+    return decorator
+
+def invalidate_cache(*tags):
+    """Invalidate tags once the current transaction commits (nothing on rollback)"""
+    db.session.info.setdefault('cache_tags', set()).update(tags)
+
+def stamp_tags(config, *tags):
+    """Invalidate tags right away, outside any app context or transaction
+
+    For scripts that write with their own engine (migrate_sqlite_to_postgres.py);
+    config is a Flask config (or dict) naming the cache, as create_cache() reads it.
+    """
+    cache = create_cache(config)
+    if cache is not None and tags:
+        cache.invalidate(tags)
+
+def cache_metrics():
+    """Hit/miss counters of this worker's cache, or None when disabled"""
+    cache = get_cache()
+    return cache.snapshot() if cache is not None else None
+
+def invalidate_now(*tags):
+    """Invalidate tags in the current app's cache at once, for writes
+    committed through a session other than db.session"""
+    cache = get_cache()
+    if cache is None or not tags:
+        return
+    try:
+        cache.invalidate(set(tags))
+    except Exception as e:
+        cache.count('errors')
+        current_app.logger.error(f"Response cache invalidation of {sorted(tags)} failed: {str(e)}")
+
+def _stamp_committed_tags(session):
+    tags = session.info.pop('cache_tags', None)
+    if tags and has_app_context():
+        invalidate_now(*tags)
+
+def _drop_rolled_back_tags(session):
+    session.info.pop('cache_tags', None)
+
+event.listen(db.session, 'after_commit', _stamp_committed_tags)
+event.listen(db.session, 'after_rollback', _drop_rolled_back_tags)
@@ -0,0 +1,58 @@
+"""
+BandVenueReview.ie - Review Helpfulness Ranking
+Wilson score helpers shared by the venue review and bands review APIs
+"""
+
+import math
+
+# 95% confidence
+WILSON_Z = 1.96
+
+def wilson_lower_bound(helpful, unhelpful, z=WILSON_Z):
+    """Lower bound of the Wilson score interval for the share of helpful votes
+    
+    Ranks a review with 40/45 helpful votes above one with 2/2, which a plain
+    ratio or net count would get wrong.
+    """
+    total = helpful + unhelpful
+    if total == 0:
+        return 0.0
+    
+    phat = helpful / total
+    z2 = z * z
+    centre = phat + z2 / (2 * total)
+    margin = z * math.sqrt((phat * (1 - phat) + z2 / (4 * total)) / total)
+    return (centre - margin) / (1 + z2 / total)
+
+def apply_vote_change(review, old_is_helpful=None, new_is_helpful=None):
+    """Move a review's vote counters by one vote and refresh its Wilson score
+    
+    old_is_helpful is the voter's previous vote (None if they had not voted),
+    new_is_helpful their new vote (None when the vote is retracted). The review
+    must expose helpful_votes, unhelpful_votes and helpfulness_score columns and
+    should be loaded with a row lock so concurrent votes cannot be lost.
+    """
+    helpful = review.helpful_votes or 0
+    unhelpful = review.unhelpful_votes or 0
+    
+    if old_is_helpful is True:
+        helpful -= 1
+    elif old_is_helpful is False:
+        unhelpful -= 1
+    
+    if new_is_helpful is True:
+        helpful += 1
+    elif new_is_helpful is False:
+        unhelpful += 1
+    
+    review.helpful_votes = max(helpful, 0)
+    review.unhelpful_votes = max(unhelpful, 0)
+    review.helpfulness_score = wilson_lower_bound(review.helpful_votes, review.unhelpful_votes)
+
+def vote_counts_dict(review):
+    """Precomputed vote counters for API responses (no COUNT query needed)"""
+    return {
+        'helpful_votes': review.helpful_votes or 0,
+        'unhelpful_votes': review.unhelpful_votes or 0,
+        'helpfulness_score': round(review.helpfulness_score or 0.0, 4)
+    }
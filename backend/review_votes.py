@@ -0,0 +1,62 @@
+"""
+BandVenueReview.ie - Review Votes
+Helpfulness votes on band and venue reviews for the bands API, stored the way
+database/schema.sql defines review_votes: review_type 'band_review' or
+'venue_review', voter_id and is_helpful
+"""
+
+from sqlalchemy import desc
+from models_bands_production import db, BandReview, VenueReviewByBand, ReviewVote
+from review_ranking import apply_vote_change
+
+# Review vote routes: URL segment -> (model, ReviewVote.review_type)
+REVIEW_VOTE_TARGETS = {
+    'bands': (BandReview, 'band_review'),
+    'venues': (VenueReviewByBand, 'venue_review')
+}
+
+def find_vote(review_type, review_id, voter_id):
+    return ReviewVote.query.filter_by(
+        review_id=review_id,
+        review_type=review_type,
+        voter_id=voter_id
+    ).first()
+
+def cast_vote(review, review_type, voter_id, is_helpful):
+    """Record or change a user's vote and move the review's counters to match
+
+    The review should be loaded with a row lock; the caller commits.
+    """
+    vote = find_vote(review_type, review.id, voter_id)
+    old_is_helpful = vote.is_helpful if vote else None
+
+    if vote:
+        vote.is_helpful = is_helpful
+    else:
+        vote = ReviewVote(
+            review_id=review.id,
+            review_type=review_type,
+            voter_id=voter_id,
+            is_helpful=is_helpful
+        )
+        db.session.add(vote)
+
+    apply_vote_change(review, old_is_helpful, is_helpful)
+    return vote
+
+def retract_vote(review, review_type, voter_id):
+    """Delete a user's vote and take it off the review's counters
+
+    Returns False if the user had not voted. The caller commits.
+    """
+    vote = find_vote(review_type, review.id, voter_id)
+    if not vote:
+        return False
+
+    apply_vote_change(review, vote.is_helpful, None)
+    db.session.delete(vote)
+    return True
+
+def helpful_order(model):
+    """ORDER BY for sort=helpful: precomputed Wilson score, newest first on ties"""
+    return (desc(model.helpfulness_score), desc(model.created_at))
@@ -0,0 +1,160 @@
+"""
+BandVenueReview.ie - Slug Resolution
+Per-worker slug-to-ID cache for band/venue filters and slug allocation
+
+Listing filters (?band=, ?venue=) only need the ID behind a slug, which
+rarely changes, so it's kept in memory instead of being queried on every
+request. The version of each table lives in the response cache's shared
+tier (response_cache.py) as the stamp of its 'slugs:<table>' tag: renaming
+or deleting a band or venue stamps the tag when the transaction commits,
+and every worker checks the stamp on each lookup, so no worker serves a
+slug from before the change. Unknown slugs aren't cached, so a new band
+resolves straight away. With the response cache disabled slugs are always
+looked up.
+
+New slugs are allocated with one prefix query: every existing "name" and
+"name-N" slug is read at once and the lowest free suffix is used.
+save_with_slug() writes the row in a savepoint and moves on to the next
+suffix when a concurrent request took the slug in between.
+"""
+
+import re
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, inspect, or_
+from sqlalchemy.exc import IntegrityError
+
+from models_bands_production import db, Band, Venue
+from response_cache import get_cache, invalidate_cache
+
+# Seconds a cached slug is trusted before it's looked up again
+SLUG_CACHE_TTL = 300
+
+# Entries per table before the cache starts over
+SLUG_CACHE_MAX_ENTRIES = 10000
+
+# Slugs tried by save_with_slug() before the unique violation is raised
+SLUG_ATTEMPTS = 5
+
+def slugify(name):
+    """URL-friendly slug from a band or venue name"""
+    slug = re.sub(r'[^a-zA-Z0-9\s\-]', '', (name or '').lower())
+    slug = re.sub(r'\s+', '-', slug)
+    return re.sub(r'\-+', '-', slug).strip('-')
+
+def slug_tag(table):
+    """Response cache tag stamped when a slug of table changes"""
+    return f"slugs:{table}"
+
+class SlugCache:
+    """slug -> id per table, each entry tagged with the shared sequence it was read at"""
+
+    def __init__(self, ttl=SLUG_CACHE_TTL, max_entries=SLUG_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, tier, table, slug):
+        """Cached id, if it hasn't expired and the table wasn't stamped since it was read"""
+        entry = self.entries.get(table, {}).get(slug)
+        if not entry or entry[1] <= time.monotonic():
+            return None
+        if tier.latest_stamp([slug_tag(table)]) > entry[2]:
+            with self.lock:
+                self.entries.get(table, {}).pop(slug, None)
+            return None
+        return entry[0]
+
+    def put(self, table, slug, object_id, seq):
+        """Cache a lookup made after the shared sequence read seq"""
+        with self.lock:
+            entries = self.entries.setdefault(table, {})
+            if len(entries) >= self.max_entries:
+                entries.clear()
+            entries[slug] = (object_id, time.monotonic() + self.ttl, seq)
+
+slug_ids = SlugCache()
+
+def resolve_slug(model, slug):
+    """ID of the row of model with slug, or None"""
+    table = model.__tablename__
+    query = db.session.query(model.id).filter(model.slug == slug)
+    cache = get_cache()
+    if cache is None:
+        return query.scalar()
+
+    try:
+        object_id = slug_ids.get(cache.tier, table, slug)
+        if object_id is not None:
+            return object_id
+        # Read before the query, as the response cache does
+        seq = cache.tier.sequence()
+    except Exception as e:
+        cache.count('errors')
+        current_app.logger.error(f"Slug cache read failed: {str(e)}")
+        return query.scalar()
+
+    object_id = query.scalar()
+    if object_id is not None:
+        slug_ids.put(table, slug, object_id, seq)
+    return object_id
+
+def allocate_slug(model, name, exclude_id=None, skip=()):
+    """Free slug for name: the bare slug, else the lowest free "-N" suffix
+
+    exclude_id keeps a row's own slug available to it when it's renamed;
+    slugs in skip are treated as taken.
+    """
+    base = slugify(name) or model.__tablename__.rstrip('s')
+    pattern = base.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '-%'
+    query = db.session.query(model.slug).filter(or_(model.slug == base, model.slug.like(pattern, escape='\\')))
+    if exclude_id is not None:
+        query = query.filter(model.id != exclude_id)
+
+    taken = {row.slug for row in query} | set(skip)
+    if base not in taken:
+        return base
+    suffixes = {int(slug[len(base) + 1:]) for slug in taken if slug[len(base) + 1:].isdigit()}
+    counter = 1
+    while counter in suffixes:
+        counter += 1
+    return f"{base}-{counter}"
+
+def save_with_slug(obj, name, attempts=SLUG_ATTEMPTS):
+    """Give a new or renamed band/venue a free slug for name and flush it
+
+    Call instead of db.session.add(obj). The slug is written in a savepoint;
+    if a concurrent request took it after allocate_slug() looked, the next
+    suffix is tried. Returns the slug.
+    """
+    model = type(obj)
+    exclude_id = obj.id if inspect(obj).persistent else None
+    # Flush the caller's other changes first: a failed savepoint expires what it flushed
+    db.session.flush()
+
+    tried = []
+    for _ in range(attempts):
+        slug = allocate_slug(model, name, exclude_id, skip=tried)
+        try:
+            with db.session.begin_nested():
+                obj.slug = slug
+                db.session.add(obj)
+        except IntegrityError:
+            tried.append(slug)
+            continue
+        return slug
+    raise IntegrityError(f"No free slug for {name!r} after trying {tried}", None, None)
+
+def _slug_changed(mapper, connection, target):
+    if inspect(target).attrs.slug.history.has_changes():
+        invalidate_cache(slug_tag(target.__tablename__))
+
+def _row_deleted(mapper, connection, target):
+    invalidate_cache(slug_tag(target.__tablename__))
+
+for _model in (Band, Venue):
+    event.listen(_model, 'after_update', _slug_changed)
+    event.listen(_model, 'after_delete', _row_deleted)
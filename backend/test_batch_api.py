@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test Batch API
+POST /api/batch against a small test blueprint: response order, per-item
+status, request limits, and one token verification and user sync per batch
+(also in the thread pool), on a throwaway SQLite file with Firebase faked
+"""
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Flask, jsonify, request
+from werkzeug.test import EnvironBuilder
+from models_bands_production import db, User
+import auth_firebase
+from auth_firebase import (
+    firebase_auth_required, verify_firebase_token, authenticate_firebase_user, firebase_auth_state
+)
+from batch_api import batch_bp, MAX_BATCH_REQUESTS, _dispatch_in_thread
+
+TOKEN = 'token-fan-1'
+
+test_bp = Blueprint('batch_test', __name__, url_prefix='/api')
+
+@test_bp.route('/echo/<int:n>')
+def echo(n):
+    return jsonify({'n': n})
+
+@test_bp.route('/broken')
+def broken():
+    raise RuntimeError('always fails')
+
+@test_bp.route('/me')
+@firebase_auth_required
+def me():
+    return jsonify({'user_id': request.current_user.id, 'email': request.current_user.email})
+
+class FakeFirebase:
+    """Counts token verifications and user syncs (into the app's models: an app
+    registers one SQLAlchemy instance, so auth_firebase's is swapped for it)"""
+
+    def __init__(self):
+        self.verified = 0
+        self.synced = 0
+
+    def verify_id_token(self, token):
+        self.verified += 1
+        return {'uid': 'fan-1', 'email': 'fan-1@example.ie'} if token == TOKEN else None
+
+    def sync_firebase_user(self, data):
+        self.synced += 1
+        user = db.session.get(User, data['uid'])
+        if user is None:
+            user = User(id=data['uid'], email=data['email'])
+            db.session.add(user)
+        db.session.commit()
+        return user
+
+def create_test_app():
+    """Flask app on a fresh SQLite file with the batch and test blueprints"""
+    app = Flask(__name__)
+    path = os.path.join(tempfile.mkdtemp(), 'batch.sqlite3')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(test_bp)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def fake_firebase(test):
+    """Run test(firebase) with token verification and user sync faked"""
+    firebase = FakeFirebase()
+    saved = auth_firebase.auth.verify_id_token, auth_firebase.sync_firebase_user, auth_firebase.db
+    auth_firebase.auth.verify_id_token = firebase.verify_id_token
+    auth_firebase.sync_firebase_user = firebase.sync_firebase_user
+    auth_firebase.db = db
+    try:
+        test(firebase)
+    finally:
+        auth_firebase.auth.verify_id_token, auth_firebase.sync_firebase_user, auth_firebase.db = saved
+
+def post_batch(app, subs, headers=None):
+    response = app.test_client().post('/api/batch', json={'requests': subs}, headers=headers or {})
+    return response.status_code, response.get_json()
+
+def test_order_and_status():
+    """Responses come back in request order, each with its own status"""
+    print("\n1. Order and per-item status...")
+    app = create_test_app()
+
+    status, body = post_batch(app, [
+        {'id': 'first', 'path': '/api/echo/1'},
+        {'id': 'missing', 'path': '/api/nothing-here'},
+        {'path': '/api/echo/2'},
+        {'id': 'broken', 'path': '/api/broken'}
+    ])
+
+    responses = body['responses']
+    print(f"   {[(item['id'], item['status']) for item in responses]}")
+    assert status == 200
+    assert [item['id'] for item in responses] == ['first', 'missing', 2, 'broken']
+    assert [item['status'] for item in responses] == [200, 404, 200, 500]
+    assert responses[0]['body'] == {'n': 1} and responses[2]['body'] == {'n': 2}
+    assert responses[3]['body'] == {'error': 'Internal server error'}
+
+    print("   ✅ A failing sub-request doesn't fail the others")
+
+def test_limits():
+    """Empty, oversized and invalid batches are rejected before anything runs"""
+    print("\n2. Batch limits...")
+    app = create_test_app()
+
+    assert post_batch(app, [])[0] == 400
+    status, body = post_batch(app, [{'path': '/api/echo/1'}] * (MAX_BATCH_REQUESTS + 1))
+    assert status == 400 and str(MAX_BATCH_REQUESTS) in body['error']
+    assert post_batch(app, [{'path': '/api/echo/1'}] * MAX_BATCH_REQUESTS)[0] == 200
+
+    status, body = post_batch(app, [
+        {'path': '/api/echo/1'},
+        {'path': '/api/batch'},
+        {'path': '/api/echo/2', 'method': 'DELETE'},
+        {'path': 'https://example.com/'}
+    ])
+    print(f"   Invalid: {body['errors']}")
+    assert status == 400
+    assert [error['index'] for error in body['errors']] == [1, 2, 3]
+
+    print(f"   ✅ At most {MAX_BATCH_REQUESTS} GET sub-requests under /api/")
+
+def test_auth_shared_in_order():
+    """Sub-requests run in order verify the token and sync the user once"""
+    print("\n3. Shared auth, sub-requests in order...")
+    app = create_test_app()
+
+    def run(firebase):
+        status, body = post_batch(app, [{'path': '/api/me'}] * 3 + [{'path': '/api/echo/3'}],
+                                  headers={'Authorization': f'Bearer {TOKEN}'})
+        print(f"   {firebase.verified} verification(s), {firebase.synced} sync(s) for 3 authenticated sub-requests")
+        assert status == 200
+        assert [item['status'] for item in body['responses']] == [200, 200, 200, 200]
+        assert {item['body']['user_id'] for item in body['responses'][:3]} == {'fan-1'}
+        assert (firebase.verified, firebase.synced) == (1, 1)
+
+    fake_firebase(run)
+    print("   ✅ One verification and one sync per batch")
+
+def test_auth_shared_in_threads():
+    """Pool threads reuse the batch's verified token and synced user"""
+    print("\n4. Shared auth, sub-requests in the thread pool...")
+    app = create_test_app()
+
+    def run(firebase):
+        headers = {'Authorization': f'Bearer {TOKEN}'}
+        with app.test_request_context('/api/batch', method='POST', headers=headers):
+            authenticate_firebase_user(verify_firebase_token(TOKEN))
+            state = firebase_auth_state()
+            environs = [EnvironBuilder(path='/api/me', headers=headers).get_environ() for _ in range(4)]
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(lambda environ: _dispatch_in_thread(app, environ, state), environs))
+
+        print(f"   {firebase.verified} verification(s), {firebase.synced} sync(s) across 4 threads")
+        assert [result['status'] for result in results] == [200] * 4
+        assert {result['body']['email'] for result in results} == {'fan-1@example.ie'}
+        assert (firebase.verified, firebase.synced) == (1, 1)
+
+    fake_firebase(run)
+    print("   ✅ Threads neither re-verify nor re-sync")
+
+def main():
+    print("🧪 Testing Batch API")
+    print("=" * 50)
+    test_order_and_status()
+    test_limits()
+    test_auth_shared_in_order()
+    test_auth_shared_in_threads()
+    print("\n🎉 All batch API tests passed")
+
+if __name__ == '__main__':
+    main()
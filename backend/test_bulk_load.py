@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Load
+Reloading NDJSON exports with colliding slugs into a throwaway SQLite
+database: rows are matched by source document, not by file position
+"""
+
+import json
+import os
+import tempfile
+from flask import Flask
+from models_bands_production import db, Band
+from bulk_load import load_ndjson
+
+def create_test_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    return app
+
+def write_ndjson(docs):
+    fd, path = tempfile.mkstemp(suffix='.ndjson')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for doc in docs:
+            f.write(json.dumps(doc) + '\n')
+    return path
+
+def band_doc(doc_id, name, hometown):
+    return {'_id': doc_id, '_type': 'band', 'name': name, 'location': {'city': hometown}}
+
+def load(docs):
+    path = write_ndjson(docs)
+    try:
+        counts = load_ndjson(path, batch_size=2)
+    finally:
+        os.remove(path)
+    db.session.commit()
+    return counts
+
+def slugs_by_hometown():
+    return {band.hometown: band.slug for band in Band.query.all()}
+
+def test_reload_in_reverse_order():
+    """Documents sharing a slug keep their rows when the file order changes"""
+    print("\n1. Reload with colliding slugs in reverse order...")
+    app = create_test_app()
+    docs = [
+        band_doc('band-cork', 'The Mighty Stef', 'Cork'),
+        band_doc('band-dublin', 'The Mighty Stef', 'Dublin'),
+        band_doc('band-galway', 'The Mighty Stef', 'Galway')
+    ]
+
+    with app.app_context():
+        db.create_all()
+        load(docs)
+        first = slugs_by_hometown()
+        print(f"   First load: {first}")
+        assert sorted(first.values()) == ['the-mighty-stef', 'the-mighty-stef-2', 'the-mighty-stef-3']
+
+        docs[1]['bio'] = 'Reformed'
+        load(list(reversed(docs)))
+        print(f"   Reversed reload: {slugs_by_hometown()}")
+        assert slugs_by_hometown() == first
+        assert Band.query.count() == 3
+        assert Band.query.filter_by(source_id='band-dublin').one().bio == 'Reformed'
+
+    print("   ✅ Every document updated its own row")
+
+def test_rows_from_the_api_untouched():
+    """A loaded document never overwrites a row the loader didn't create"""
+    print("\n2. Slug already used by a band created through the API...")
+    app = create_test_app()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Band(name='Lankum', slug='lankum', hometown='Dublin', bio='Signed up on the site'))
+        db.session.commit()
+
+        for _ in range(2):
+            load([band_doc('band-lankum', 'Lankum', 'Galway')])
+
+        bands = {band.slug: (band.source_id, band.hometown, band.bio) for band in Band.query.all()}
+        print(f"   Bands: {bands}")
+        assert bands == {
+            'lankum': (None, 'Dublin', 'Signed up on the site'),
+            'lankum-2': ('band-lankum', 'Galway', None)
+        }
+
+    print("   ✅ Site row kept, loaded document got its own slug")
+
+def main():
+    print("🧪 Testing Bulk Load")
+    print("=" * 50)
+    test_reload_in_reverse_order()
+    test_rows_from_the_api_untouched()
+    print("\n🎉 All bulk load tests passed")
+
+if __name__ == '__main__':
+    main()
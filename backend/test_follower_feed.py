@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Follower Feed
+Feed pagination across the fan-out threshold and the feed trimming jobs,
+on a throwaway SQLite database with a tiny threshold
+"""
+
+import json
+from datetime import date, timedelta
+from flask import Flask
+from models_bands_production import db, User, Band, Venue, Gig, BandFollower, FeedEntry, Job
+import follower_feed
+from follower_feed import fan_out_gigs, backfill_feed, remove_band_from_feed, get_feed_page
+from job_queue import claim_job, run_job
+import job_tasks  # registers handlers
+
+PREFERENCES = json.dumps({'new_gigs': True})
+
+def create_test_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    return app
+
+def seed():
+    """Three fans, one band and one venue"""
+    db.create_all()
+    users = [User(id=f'user-{i}', email=f'fan{i}@example.ie') for i in range(3)]
+    band = Band(name='The Frames', slug='the-frames', follower_count=0)
+    venue = Venue(name='Whelans', slug='whelans')
+    db.session.add_all(users + [band, venue])
+    db.session.commit()
+    return [user.id for user in users], band, venue
+
+def follow(user_id, band):
+    db.session.add(BandFollower(band_id=band.id, user_id=user_id, notification_preferences=PREFERENCES))
+    band.follower_count += 1
+    backfill_feed(user_id, band.id)
+    db.session.commit()
+
+def unfollow(user_id, band):
+    BandFollower.query.filter_by(band_id=band.id, user_id=user_id).delete()
+    band.follower_count -= 1
+    remove_band_from_feed(user_id, band.id)
+    db.session.commit()
+
+def announce(band, venue, days_ahead):
+    """Create gigs days_ahead days from now and fan them out; returns their ids"""
+    gigs = [Gig(band_id=band.id, venue_id=venue.id, gig_date=date.today() + timedelta(days=days))
+            for days in days_ahead]
+    db.session.add_all(gigs)
+    db.session.flush()
+    fan_out_gigs(gigs, band)
+    db.session.commit()
+    return [gig.id for gig in gigs]
+
+def read_feed(user_id, limit):
+    pages = []
+    cursor = None
+    while True:
+        gig_ids, next_cursor = get_feed_page(user_id, cursor, limit)
+        pages.append(gig_ids)
+        if not next_cursor:
+            return pages
+        cursor = follower_feed.decode_cursor(next_cursor)
+
+def test_band_drops_below_threshold():
+    """Gigs announced while a band was large stay in the feed after it shrinks"""
+    print("\n1. Band drops below the fan-out threshold...")
+    app = create_test_app()
+    follower_feed.FANOUT_MAX_FOLLOWERS = 2
+
+    try:
+        with app.app_context():
+            user_ids, band, venue = seed()
+            for user_id in user_ids:
+                follow(user_id, band)
+
+            large_gigs = announce(band, venue, [1, 2])
+            assert not any(db.session.get(Gig, gig_id).fanned_out for gig_id in large_gigs)
+
+            unfollow(user_ids[1], band)
+            unfollow(user_ids[2], band)
+            small_gigs = announce(band, venue, [3, 4])
+            assert all(db.session.get(Gig, gig_id).fanned_out for gig_id in small_gigs)
+
+            pages = read_feed(user_ids[0], limit=2)
+            print(f"   Pages: {pages}")
+            assert pages == [large_gigs, small_gigs], pages
+
+            # A fan who follows again sees both kinds without duplicates
+            follow(user_ids[1], band)
+            pages = read_feed(user_ids[1], limit=3)
+            print(f"   Refollowed fan's pages: {pages}")
+            assert [gig for page in pages for gig in page] == large_gigs + small_gigs
+    finally:
+        follower_feed.FANOUT_MAX_FOLLOWERS = 2000
+
+    print("   ✅ No gigs dropped or duplicated")
+
+def test_trim_jobs():
+    """Fan-out and backfill queue trim jobs; reading the feed writes nothing"""
+    print("\n2. Feed trimming runs in jobs...")
+    app = create_test_app()
+    follower_feed.FEED_MAX_ENTRIES = 2
+
+    try:
+        with app.app_context():
+            user_ids, band, venue = seed()
+            follow(user_ids[0], band)
+            announce(band, venue, [1, 2, 3])
+            assert FeedEntry.query.filter_by(user_id=user_ids[0]).count() == 3
+
+            get_feed_page(user_ids[0], None, 20)
+            assert FeedEntry.query.filter_by(user_id=user_ids[0]).count() == 3
+
+            queued = [job.task for job in Job.query.filter_by(status='queued')]
+            print(f"   Queued: {queued}")
+            assert 'trim_follower_feeds' in queued
+
+            while True:
+                job = claim_job()
+                if job is None:
+                    break
+                assert run_job(job), job.last_error
+                print(f"   {job.task}: {job.result}")
+
+            remaining = FeedEntry.query.filter_by(user_id=user_ids[0]).count()
+            assert remaining == 2, remaining
+
+            follow(user_ids[1], band)
+            assert Job.query.filter_by(task='trim_user_feed', status='queued').count() == 1
+    finally:
+        follower_feed.FEED_MAX_ENTRIES = 500
+
+    print("   ✅ Feeds trimmed by background jobs")
+
+def main():
+    print("🧪 Testing Follower Feed")
+    print("=" * 50)
+    test_band_drops_below_threshold()
+    test_trim_jobs()
+    print("\n🎉 All follower feed tests passed")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test Gig Notifications
+Claiming, failing and retrying new-gig notification events on a throwaway
+SQLite database, with sinks that fail part way through a delivery
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from flask import Flask
+from models_bands_production import db, User, Band, Venue, Gig, BandFollower, NotificationEvent
+from gig_notifications import (
+    MemorySink, MAX_EVENT_ATTEMPTS, EVENT_LEASE, enqueue_gig_event, claim_pending_events,
+    process_pending_events
+)
+
+PREFERENCES = json.dumps({'new_gigs': True})
+
+class FlakySink(MemorySink):
+    """MemorySink whose nth send_batch call raises"""
+
+    def __init__(self, fail_on):
+        super().__init__()
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def send_batch(self, digests):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise ConnectionError('SMTP connection dropped')
+        super().send_batch(digests)
+
+def create_test_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    return app
+
+def seed(band_names=('The Frames',), fans=('user-a', 'user-b', 'user-c')):
+    """Bands followed by every fan, one venue; returns the bands"""
+    db.create_all()
+    venue = Venue(name='Whelans', slug='whelans', city='Dublin')
+    bands = [Band(name=name, slug=name.lower().replace(' ', '-')) for name in band_names]
+    db.session.add_all([User(id=fan, email=f'{fan}@example.ie') for fan in fans] + bands + [venue])
+    db.session.flush()
+    db.session.add_all([
+        BandFollower(band_id=band.id, user_id=fan, notification_preferences=PREFERENCES)
+        for band in bands for fan in fans
+    ])
+    db.session.commit()
+    return bands, venue
+
+def announce(band, venue):
+    gig = Gig(band_id=band.id, venue_id=venue.id, gig_date=date.today() + timedelta(days=7))
+    db.session.add(gig)
+    db.session.flush()
+    event = enqueue_gig_event(gig)
+    db.session.commit()
+    return event.id
+
+def recipients(sink):
+    return [(digest['user_id'], len(digest['gigs'])) for batch in sink.batches for digest in batch]
+
+def test_retry_resumes_after_sent_digests():
+    """A failed delivery goes back to pending and the retry skips fans already emailed"""
+    print("\n1. Failure part way through a delivery...")
+    app = create_test_app()
+
+    with app.app_context():
+        bands, venue = seed()
+        event_id = announce(bands[0], venue)
+
+        sink = FlakySink(fail_on=2)
+        try:
+            process_pending_events(sink, batch_size=1)
+            raise AssertionError('delivery should have failed')
+        except ConnectionError:
+            pass
+
+        event = db.session.get(NotificationEvent, event_id)
+        print(f"   After failure: status={event.status} attempts={event.attempts} "
+              f"delivered_through={event.delivered_through}")
+        assert (event.status, event.attempts, event.delivered_through) == ('pending', 1, 'user-a')
+        assert recipients(sink) == [('user-a', 1)]
+
+        retry = MemorySink()
+        assert process_pending_events(retry, batch_size=1) == (1, 2)
+        print(f"   Retry sent to: {recipients(retry)}")
+        assert recipients(retry) == [('user-b', 1), ('user-c', 1)]
+        assert db.session.get(NotificationEvent, event_id).status == 'sent'
+
+    print("   ✅ Each fan emailed exactly once")
+
+def test_partial_progress_across_events():
+    """Events claimed together with different progress only add their own unsent gigs"""
+    print("\n2. Events with different progress in one claim...")
+    app = create_test_app()
+
+    with app.app_context():
+        bands, venue = seed(band_names=('The Frames', 'Lankum'))
+        first = announce(bands[0], venue)
+        db.session.get(NotificationEvent, first).delivered_through = 'user-b'
+        db.session.commit()
+        announce(bands[1], venue)
+
+        sink = MemorySink()
+        process_pending_events(sink)
+        print(f"   Digests: {recipients(sink)}")
+        assert recipients(sink) == [('user-a', 1), ('user-b', 1), ('user-c', 2)]
+
+    print("   ✅ Digests merge only undelivered gigs")
+
+def test_expired_lease_and_attempt_limit():
+    """Claims of a dead worker are reclaimed; an event failing every attempt ends 'failed'"""
+    print("\n3. Lease expiry and attempt limit...")
+    app = create_test_app()
+
+    with app.app_context():
+        bands, venue = seed()
+        event_id = announce(bands[0], venue)
+
+        assert [event.id for event in claim_pending_events(10)] == [event_id]
+        assert claim_pending_events(10) == []
+
+        # The worker holding the claim died; age its lease
+        event = db.session.get(NotificationEvent, event_id)
+        event.claimed_at = datetime.utcnow() - EVENT_LEASE - timedelta(seconds=1)
+        db.session.commit()
+
+        reclaimed = claim_pending_events(10)
+        print(f"   Reclaimed: {[(event.id, event.attempts) for event in reclaimed]}")
+        assert [(event.id, event.attempts) for event in reclaimed] == [(event_id, 1)]
+        reclaimed[0].status = 'pending'
+        db.session.commit()
+
+        for _ in range(MAX_EVENT_ATTEMPTS - 1):
+            try:
+                process_pending_events(FlakySink(fail_on=1))
+            except ConnectionError:
+                pass
+
+        event = db.session.get(NotificationEvent, event_id)
+        print(f"   After {event.attempts} attempts: {event.status} ({event.error_message})")
+        assert (event.status, event.attempts) == ('failed', MAX_EVENT_ATTEMPTS)
+
+    print("   ✅ Stuck claims recovered, poison events parked")
+
+def main():
+    print("🧪 Testing Gig Notifications")
+    print("=" * 50)
+    test_retry_resumes_after_sent_digests()
+    test_partial_progress_across_events()
+    test_expired_lease_and_attempt_limit()
+    print("\n🎉 All gig notification tests passed")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test Gig Scheduling
+Double-booking checks used by the batch gig upload, against existing gigs
+and earlier rows of the same batch, on a throwaway SQLite database
+"""
+
+from datetime import date, time, timedelta
+from flask import Flask
+from models_bands_production import db, Band, Venue, Gig, GigSupportingBand
+from gig_scheduling import gig_interval, load_booking_index, reject_double_bookings
+
+GIG_DATE = date(2026, 11, 14)
+
+def create_test_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    return app
+
+def seed():
+    """Four bands, two venues; band 1 headlines venue 1 at 20:00 with band 2 supporting"""
+    db.create_all()
+    bands = [Band(name=f'Band {i}', slug=f'band-{i}') for i in range(1, 5)]
+    venues = [Venue(name=f'Venue {i}', slug=f'venue-{i}') for i in range(1, 3)]
+    db.session.add_all(bands + venues)
+    db.session.flush()
+
+    gig = Gig(band_id=bands[0].id, venue_id=venues[0].id, gig_date=GIG_DATE,
+              start_time=time(20, 0), end_time=time(23, 0))
+    cancelled = Gig(band_id=bands[3].id, venue_id=venues[1].id, gig_date=GIG_DATE, status='cancelled')
+    db.session.add_all([gig, cancelled])
+    db.session.flush()
+    db.session.add(GigSupportingBand(gig_id=gig.id, band_id=bands[1].id, performance_order=1))
+    db.session.commit()
+    return [band.id for band in bands], [venue.id for venue in venues], gig.id
+
+def row(band_id, venue_id, start=None, end=None, supporting=(), status='scheduled', gig_date=GIG_DATE):
+    return {'band_id': band_id, 'venue_id': venue_id, 'gig_date': gig_date,
+            'doors_time': None, 'start_time': start, 'end_time': end,
+            'supporting_bands': list(supporting), 'status': status}
+
+def check(rows, band_ids, venue_ids):
+    gigs = dict(enumerate(rows))
+    index = load_booking_index({gig['gig_date'] for gig in rows}, set(venue_ids), set(band_ids))
+    return gigs, reject_double_bookings(gigs, index)
+
+def test_intervals():
+    """Gig times become minute intervals"""
+    print("\n1. Gig intervals...")
+    assert gig_interval(None, time(20, 0), time(23, 0)) == (1200, 1380)
+    assert gig_interval(time(19, 30), time(20, 0)) == (1170, 1350)
+    assert gig_interval(None, time(22, 0), time(1, 0)) == (1320, 1500)
+    assert gig_interval() == (0, 24 * 60)
+    print("   ✅ Doors, default length, past midnight and all-day gigs")
+
+def test_batch_against_existing_gigs():
+    """Rows clashing with stored gigs are rejected, including supporting slots"""
+    print("\n2. Batch rows against existing gigs...")
+    app = create_test_app()
+
+    with app.app_context():
+        band_ids, venue_ids, gig_id = seed()
+        gigs, errors = check([
+            row(band_ids[2], venue_ids[0], time(22, 0)),           # venue 1 is taken until 23:00
+            row(band_ids[1], venue_ids[1], time(21, 0)),           # band 2 is supporting at venue 1
+            row(band_ids[2], venue_ids[0], time(23, 0)),           # starts as the stored gig ends
+            row(band_ids[3], venue_ids[1], time(12, 0), time(13, 0)),  # the stored gig there is cancelled
+            row(band_ids[3], venue_ids[1], time(21, 0), supporting=[band_ids[0]])  # band 1 is at venue 1
+        ], band_ids, venue_ids)
+
+        print(f"   Rejected: {errors}")
+        assert sorted(errors) == [0, 1, 4]
+        assert errors[0] == [f"Venue {venue_ids[0]} is already booked on {GIG_DATE.isoformat()} (gig {gig_id})"]
+        assert errors[1] == [f"Band {band_ids[1]} is already booked on {GIG_DATE.isoformat()} (gig {gig_id})"]
+        assert errors[4] == [f"Band {band_ids[0]} is already booked on {GIG_DATE.isoformat()} (gig {gig_id})"]
+        assert sorted(gigs) == [2, 3]
+
+    print("   ✅ Venue, headliner and supporting clashes detected")
+
+def test_batch_against_itself():
+    """A row clashing with an earlier accepted row is rejected; cancelled rows hold nothing"""
+    print("\n3. Batch rows against each other...")
+    app = create_test_app()
+
+    with app.app_context():
+        band_ids, venue_ids, _ = seed()
+        gigs, errors = check([
+            row(band_ids[2], venue_ids[1], time(18, 0), time(19, 30)),
+            row(band_ids[3], venue_ids[1], time(19, 0)),                    # overlaps row 0 at venue 2
+            row(band_ids[3], venue_ids[1], time(19, 0), status='cancelled'),
+            row(band_ids[3], venue_ids[1], time(19, 30))                    # starts as row 0 ends
+        ], band_ids, venue_ids)
+
+        print(f"   Rejected: {errors}")
+        assert errors == {1: [f"Venue {venue_ids[1]} is already booked on {GIG_DATE.isoformat()} (batch row 0)"]}
+        assert sorted(gigs) == [0, 2, 3]
+
+    print("   ✅ Earlier rows of the batch count as bookings")
+
+def test_overnight_gigs():
+    """Gigs running past midnight hold the venue and bands into the next day"""
+    print("\n4. Gigs past midnight...")
+    app = create_test_app()
+    next_day = GIG_DATE + timedelta(days=1)
+
+    with app.app_context():
+        band_ids, venue_ids, _ = seed()
+        late = Gig(band_id=band_ids[2], venue_id=venue_ids[1], gig_date=GIG_DATE,
+                   start_time=time(22, 0), end_time=time(2, 0))
+        db.session.add(late)
+        db.session.commit()
+
+        gigs, errors = check([
+            row(band_ids[3], venue_ids[1], time(1, 0), gig_date=next_day),   # venue 2 is taken until 02:00
+            row(band_ids[2], venue_ids[0], time(0, 30), gig_date=next_day),  # so is band 3
+            row(band_ids[3], venue_ids[1], time(2, 0), gig_date=next_day),   # starts as the stored gig ends
+            row(band_ids[0], venue_ids[0], time(23, 30), time(1, 0)),        # after band 1's stored gig
+            row(band_ids[3], venue_ids[0], time(0, 30), time(1, 30), gig_date=next_day)  # venue 1 is row 3's
+        ], band_ids, venue_ids)
+
+        print(f"   Rejected: {errors}")
+        assert sorted(errors) == [0, 1, 4]
+        assert errors[0] == [f"Venue {venue_ids[1]} is already booked on {next_day.isoformat()} (gig {late.id})"]
+        assert errors[1] == [f"Band {band_ids[2]} is already booked on {next_day.isoformat()} (gig {late.id})"]
+        assert errors[4] == [f"Venue {venue_ids[0]} is already booked on {next_day.isoformat()} (batch row 3)"]
+        assert sorted(gigs) == [2, 3]
+
+    print("   ✅ The hours after midnight count on the next day")
+
+def main():
+    print("🧪 Testing Gig Scheduling")
+    print("=" * 50)
+    test_intervals()
+    test_batch_against_existing_gigs()
+    test_batch_against_itself()
+    test_overnight_gigs()
+    print("\n🎉 All gig scheduling tests passed")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Test Job Queue
+Claiming, failing, retrying and timing out background jobs, including the
+deliver_gig_notifications job, on a throwaway SQLite database
+"""
+
+import json
+import os
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta
+from flask import Flask
+from models_bands_production import db, User, Band, Venue, Gig, BandFollower, NotificationEvent, Job
+from gig_notifications import MemorySink, enqueue_gig_event, queue_delivery
+from job_queue import job_task, claim_job, run_job, enqueue_job, requeue_stale_jobs
+import job_tasks  # registers handlers
+import models
+import recompute_venue_ratings
+
+PREFERENCES = json.dumps({'new_gigs': True})
+
+@job_task('test_echo', timeout=60)
+def echo(value=None):
+    return value
+
+@job_task('test_broken')
+def broken():
+    raise RuntimeError('always fails')
+
+class FlakySink(MemorySink):
+    """MemorySink whose first send_batch call raises"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def send_batch(self, digests):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError('SMTP connection dropped')
+        super().send_batch(digests)
+
+def create_test_app():
+    """Flask app on a fresh SQLite file (a file, so app contexts get separate connections)"""
+    app = Flask(__name__)
+    path = os.path.join(tempfile.mkdtemp(), 'job_queue.sqlite3')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def make_due(job_id):
+    """Skip a retry's backoff"""
+    db.session.get(Job, job_id).run_at = datetime.utcnow()
+    db.session.commit()
+
+def test_delivery_job_retry():
+    """A delivery job that fails leaves its events pending and the retry sends them"""
+    print("\n1. Failed deliver_gig_notifications job is retried...")
+    app = create_test_app()
+    sink = FlakySink()
+    build_sink = job_tasks.build_sink
+    job_tasks.build_sink = lambda config: sink
+
+    try:
+        with app.app_context():
+            fans = ['user-a', 'user-b']
+            band = Band(name='Lankum', slug='lankum')
+            venue = Venue(name='Whelans', slug='whelans', city='Dublin')
+            db.session.add_all([User(id=fan, email=f'{fan}@example.ie') for fan in fans] + [band, venue])
+            db.session.flush()
+            db.session.add_all([
+                BandFollower(band_id=band.id, user_id=fan, notification_preferences=PREFERENCES) for fan in fans
+            ])
+            gig = Gig(band_id=band.id, venue_id=venue.id, gig_date=date.today() + timedelta(days=7))
+            db.session.add(gig)
+            db.session.flush()
+            event = enqueue_gig_event(gig)
+            queue_delivery()
+            db.session.commit()
+
+            job = claim_job()
+            assert not run_job(job)
+            print(f"   After failure: job {job.status}, event {db.session.get(NotificationEvent, event.id).status}")
+            assert job.status == 'queued' and 'SMTP' in job.last_error
+            assert db.session.get(NotificationEvent, event.id).status == 'pending'
+
+            make_due(job.id)
+            job = claim_job()
+            assert run_job(job), job.last_error
+            print(f"   Retry: {job.result}")
+            assert (job.status, job.attempts) == ('succeeded', 2)
+            assert db.session.get(NotificationEvent, event.id).status == 'sent'
+            assert [digest['user_id'] for batch in sink.batches for digest in batch] == fans
+    finally:
+        job_tasks.build_sink = build_sink
+
+    print("   ✅ Events delivered by the retried job")
+
+def test_timeout_and_late_finish():
+    """A job past its deadline is requeued; the late worker's result is dropped"""
+    print("\n2. Job running past its deadline...")
+    app = create_test_app()
+
+    with app.app_context():
+        job_id = enqueue_job('test_echo', {'value': 'first'}).id
+        late = claim_job(worker='worker-1')
+        assert (late.locked_by, late.attempts) == ('worker-1', 1)
+        assert late.deadline - late.started_at == timedelta(seconds=60)
+
+        # Meanwhile another worker sweeps and runs the retry
+        with app.app_context():
+            assert requeue_stale_jobs(now=datetime.utcnow()) == 0
+            assert requeue_stale_jobs(now=datetime.utcnow() + timedelta(seconds=61)) == 1
+            stale = db.session.get(Job, job_id)
+            print(f"   After sweep: {stale.status} ({stale.last_error})")
+            assert stale.status == 'queued' and 'deadline' in stale.last_error
+            make_due(job_id)
+            retry = claim_job(worker='worker-2')
+            assert (retry.id, retry.attempts) == (job_id, 2)
+            assert run_job(retry)
+
+        # The first worker finally finishes
+        assert not run_job(late)
+        print(f"   Late finish dropped: {late.status} (attempt {late.attempts})")
+        assert (late.status, late.attempts, late.last_error) == ('succeeded', 2, None)
+
+    print("   ✅ Timed-out jobs retried once, fenced against late results")
+
+def test_attempt_limit_and_duplicates():
+    """Jobs fail for good after max_attempts; a retry defers to a queued duplicate"""
+    print("\n3. Attempt limit and queued duplicates...")
+    app = create_test_app()
+
+    with app.app_context():
+        job_id = enqueue_job('test_broken', max_attempts=2).id
+        for _ in range(2):
+            make_due(job_id)
+            run_job(claim_job())
+        job = db.session.get(Job, job_id)
+        print(f"   After {job.attempts} attempts: {job.status}")
+        assert (job.status, job.attempts) == ('failed', 2)
+
+        first = enqueue_job('test_broken', dedup_key='broken')
+        claimed = claim_job()
+        assert claimed.id == first.id
+        second = enqueue_job('test_broken', dedup_key='broken')
+        assert second.id != first.id
+        run_job(claimed)
+        print(f"   Running copy: {claimed.status} ({claimed.last_error})")
+        assert claimed.status == 'failed' and f'#{second.id}' in claimed.last_error
+        assert db.session.get(Job, second.id).status == 'queued'
+
+    print("   ✅ Poison jobs parked, no duplicate queued copies")
+
+def create_site_app():
+    """App on the main site's models (models.db), as recompute_venue_ratings.py uses"""
+    app = Flask(__name__)
+    path = os.path.join(tempfile.mkdtemp(), 'site.sqlite3')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    models.db.init_app(app)
+    return app
+
+def test_import_and_recompute_jobs():
+    """NDJSON imports and venue rating recomputes run as queued jobs"""
+    print("\n4. Bulk import and rating recompute jobs...")
+    app = create_test_app()
+    site_app = create_site_app()
+    fd, path = tempfile.mkstemp(suffix='.ndjson')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'_id': 'band-lankum', '_type': 'band', 'name': 'Lankum'}) + '\n')
+        f.write(json.dumps({'_id': 'venue-whelans', '_type': 'venue', 'name': 'Whelans'}) + '\n')
+
+    with site_app.app_context():
+        models.db.create_all()
+        user = models.User(email=f'{uuid.uuid4()}@example.ie', password_hash='x', user_type='band', name='Lankum')
+        models.db.session.add(user)
+        models.db.session.flush()
+        venue = models.Venue(name='Whelans', address='25 Wexford St', city='Dublin', county='Dublin',
+                             review_count=7)  # drifted: there are no reviews
+        models.db.session.add_all([models.Band(id=user.id, user_id=user.id, genre='folk'), venue])
+        models.db.session.commit()
+        venue_id = venue.id
+
+    create_app = recompute_venue_ratings.create_app
+    recompute_venue_ratings.create_app = lambda config_name=None: site_app
+    try:
+        with app.app_context():
+            enqueue_job('bulk_load', {'path': path, 'batch_size': 10})
+            enqueue_job('recompute_venue_ratings')
+            results = []
+            for _ in range(2):
+                job = claim_job()
+                assert run_job(job), job.last_error
+                results.append(job.result)
+            print(f"   Results: {results}")
+            assert results == ['1 bands, 1 venues from 2 documents (0 skipped)', '1 venues recomputed, 1 had drifted']
+            assert Band.query.filter_by(source_id='band-lankum').count() == 1
+    finally:
+        recompute_venue_ratings.create_app = create_app
+        os.remove(path)
+
+    with site_app.app_context():
+        assert models.db.session.get(models.Venue, venue_id).review_count == 0
+
+    print("   ✅ Import loaded, drifted totals rebuilt")
+
+def main():
+    print("🧪 Testing Job Queue")
+    print("=" * 50)
+    test_delivery_job_retry()
+    test_timeout_and_late_finish()
+    test_attempt_limit_and_duplicates()
+    test_import_and_recompute_jobs()
+    print("\n🎉 All job queue tests passed")
+
+if __name__ == '__main__':
+    main()
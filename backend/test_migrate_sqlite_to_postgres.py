@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test SQLite to PostgreSQL Migration
+Value normalisation for the checksums, keyset chunking and resuming after a
+crash, copying between two throwaway SQLite files (the INSERT path; COPY
+needs a PostgreSQL target)
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, select
+)
+from migrate_sqlite_to_postgres import (
+    CHECKPOINTS, MigrationState, build_copiers, canonical, verify_table
+)
+
+ROWS = 7
+CHUNK_SIZE = 3
+
+def band_table(metadata, target):
+    """bands as the SQLite fallback stores it, or as the PostgreSQL models define it"""
+    return Table(
+        'bands', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(200), nullable=False),
+        Column('genres', JSON if target else Text),
+        Column('is_active', Boolean),
+        Column('created_at', DateTime(timezone=target))
+    )
+
+def create_databases():
+    """Source with ROWS bands and an empty target, as (source, target) engines"""
+    directory = tempfile.mkdtemp()
+    source = create_engine(f"sqlite:///{os.path.join(directory, 'source.sqlite3')}")
+    target = create_engine(f"sqlite:///{os.path.join(directory, 'target.sqlite3')}")
+
+    source_meta, target_meta = MetaData(), MetaData()
+    bands = band_table(source_meta, target=False)
+    band_table(target_meta, target=True)
+    source_meta.create_all(source)
+    target_meta.create_all(target)
+    CHECKPOINTS.create(target, checkfirst=True)
+
+    started = datetime(2026, 3, 1, 20, 0)
+    with source.begin() as conn:
+        conn.execute(bands.insert(), [
+            {'id': i, 'name': f'Band {i}', 'genres': json.dumps(['folk', 'trad']), 'is_active': i % 2,
+             'created_at': started + timedelta(days=i)}
+            for i in range(1, ROWS + 1)
+        ])
+    return source, target, directory
+
+def target_ids(target):
+    with target.connect() as conn:
+        return [row[0] for row in conn.execute(select(Table('bands', MetaData(), autoload_with=target).c.id))]
+
+def test_canonical():
+    """Values read back from either side hash the same"""
+    print("\n1. Canonical values...")
+    created_at = band_table(MetaData(), target=True).c.created_at
+    naive = datetime(2026, 3, 1, 20, 0)
+
+    assert canonical(naive, created_at) == canonical(naive.replace(tzinfo=timezone.utc), created_at)
+    assert canonical('2026-03-01 20:00:00', created_at) == canonical(naive.replace(tzinfo=timezone.utc), created_at)
+    utc_plus_one = timezone(timedelta(hours=1))
+    assert canonical(datetime(2026, 3, 1, 21, 0, tzinfo=utc_plus_one), created_at) == canonical(naive, created_at)
+    assert canonical(datetime(2026, 3, 1, 21, 0), created_at) != canonical(naive, created_at)
+
+    target = band_table(MetaData(), target=True)
+    assert canonical('["folk", "trad"]', target.c.genres) == canonical(['folk', 'trad'], target.c.genres)
+    assert canonical(1, target.c.is_active) == canonical(True, target.c.is_active) == 't'
+    assert canonical(None, target.c.name) == '\\N'
+    print(f"   {canonical(naive, created_at)}")
+
+    print("   ✅ Naive and aware timestamps, JSON text and booleans normalised")
+
+def test_chunked_copy():
+    """Rows are copied CHUNK_SIZE at a time and verify against the source"""
+    print("\n2. Chunked copy...")
+    source, target, _ = create_databases()
+    copier = build_copiers(source, target, MigrationState(None), CHUNK_SIZE)[0]
+    chunks = []
+    write_insert = copier.write_insert
+
+    def counting_write(rows, checkpoint):
+        chunks.append((len(rows), checkpoint['rows'], json.loads(checkpoint['last_key'])))
+        write_insert(rows, checkpoint)
+
+    copier.write_insert = counting_write
+    assert copier.run() == ROWS
+    print(f"   Chunks (rows, total, last key): {chunks}")
+    assert chunks == [(3, 3, [3]), (3, 6, [6]), (1, 7, [7])]
+    assert copier.committed_progress() == ([7], ROWS)
+    assert verify_table(copier, CHUNK_SIZE)
+
+    print("   ✅ Keyset chunks with the checkpoint in each chunk's transaction")
+
+def test_resume_after_crash():
+    """A crash after a chunk commits resumes from the target's checkpoint"""
+    print("\n3. Resume after a crash...")
+    source, target, directory = create_databases()
+    state_file = os.path.join(directory, 'state.json')
+    state = MigrationState(state_file)
+    copier = build_copiers(source, target, state, CHUNK_SIZE)[0]
+    update = state.update
+    calls = []
+
+    def crash_on_second_chunk(table_name, **fields):
+        calls.append(fields)
+        if len(calls) == 2:
+            raise KeyboardInterrupt('killed after the chunk committed, before the state file was written')
+        update(table_name, **fields)
+
+    state.update = crash_on_second_chunk
+    try:
+        copier.run()
+    except KeyboardInterrupt:
+        pass
+    print(f"   After the crash: file says {MigrationState(state_file).get('bands')['rows']} rows, "
+          f"target committed {copier.committed_progress()}")
+    assert MigrationState(state_file).get('bands')['rows'] == 3
+    assert copier.committed_progress() == ([6], 6)
+    assert target_ids(target) == list(range(1, 7))
+
+    resumed = build_copiers(source, target, MigrationState(state_file), CHUNK_SIZE)[0]
+    assert resumed.run() == ROWS
+    assert target_ids(target) == list(range(1, ROWS + 1))
+    assert verify_table(resumed, CHUNK_SIZE)
+
+    print("   ✅ No chunk copied twice or skipped")
+
+def main():
+    print("🧪 Testing SQLite to PostgreSQL Migration")
+    print("=" * 50)
+    test_canonical()
+    test_chunked_copy()
+    test_resume_after_crash()
+    print("\n🎉 All migration tests passed")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test Response Cache
+Per-worker (L1) and shared (L2) hits, and invalidation seen by every worker
+after API-style writes, bulk loads and script stamps, with two Flask apps
+sharing one SQLite database and one cache file
+"""
+
+import json
+import os
+import tempfile
+from flask import Flask, jsonify
+from models_bands_production import db, Band
+from response_cache import ALL_TAG, cached, get_cache, invalidate_cache, stamp_tags
+from bulk_load import load_ndjson
+
+def create_worker(directory):
+    """One 'worker': a Flask app on the shared database and cache files in directory"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(directory, 'bands.sqlite3')}"
+    app.config['RESPONSE_CACHE_URL'] = os.path.join(directory, 'cache.sqlite3')
+    db.init_app(app)
+
+    @app.route('/bands/<int:band_id>')
+    @cached(tags=('band:{band_id}',))
+    def get_band(band_id):
+        band = db.session.get(Band, band_id)
+        return jsonify({'name': band.name, 'bio': band.bio})
+
+    @app.route('/bands')
+    @cached(tags=('bands',))
+    def list_bands():
+        return jsonify([band.name for band in Band.query.order_by(Band.name)])
+
+    with app.app_context():
+        db.create_all()
+    return app
+
+def fetch(app, path):
+    response = app.test_client().get(path)
+    assert response.status_code == 200
+    return response.headers['X-Cache'], response.get_json()
+
+def metrics(app):
+    with app.app_context():
+        return get_cache().snapshot()
+
+def add_band(app, name, bio=None):
+    with app.app_context():
+        band = Band(name=name, slug=name.lower(), bio=bio)
+        db.session.add(band)
+        invalidate_cache('bands')
+        db.session.commit()
+        return band.id
+
+def test_l1_and_shared_tier():
+    """A response cached by one worker is served from its L1, and from L2 by the other"""
+    print("\n1. L1 and shared tier hits...")
+    directory = tempfile.mkdtemp()
+    worker_a, worker_b = create_worker(directory), create_worker(directory)
+    band_id = add_band(worker_a, 'Lankum', 'Drone folk')
+
+    assert fetch(worker_a, f'/bands/{band_id}') == ('MISS', {'name': 'Lankum', 'bio': 'Drone folk'})
+    assert fetch(worker_a, f'/bands/{band_id}')[0] == 'HIT'
+    assert fetch(worker_b, f'/bands/{band_id}')[0] == 'HIT'
+    assert fetch(worker_b, f'/bands/{band_id}')[0] == 'HIT'
+
+    a, b = metrics(worker_a), metrics(worker_b)
+    print(f"   Worker A: {a['l1_hits']} L1 / {a['misses']} misses, worker B: {b['l2_hits']} L2 / {b['l1_hits']} L1")
+    assert (a['l1_hits'], a['l2_hits'], a['misses']) == (1, 0, 1)
+    assert (b['l1_hits'], b['l2_hits'], b['misses']) == (1, 1, 0)
+
+    print("   ✅ One query served three cached responses")
+
+def test_invalidation_across_workers():
+    """A commit in one worker makes the other worker's L1 entry stale; a rollback doesn't"""
+    print("\n2. Write in another worker...")
+    directory = tempfile.mkdtemp()
+    worker_a, worker_b = create_worker(directory), create_worker(directory)
+    band_id = add_band(worker_a, 'Lankum', 'Drone folk')
+    other_id = add_band(worker_a, 'Ye Vagabonds')
+    for path in (f'/bands/{band_id}', f'/bands/{other_id}', '/bands'):
+        fetch(worker_a, path)
+
+    with worker_b.app_context():
+        db.session.get(Band, band_id).bio = 'Rolled back'
+        invalidate_cache(f'band:{band_id}')
+        db.session.rollback()
+    assert fetch(worker_a, f'/bands/{band_id}') == ('HIT', {'name': 'Lankum', 'bio': 'Drone folk'})
+
+    with worker_b.app_context():
+        db.session.get(Band, band_id).bio = 'Reissued'
+        invalidate_cache(f'band:{band_id}')
+        db.session.commit()
+
+    after = fetch(worker_a, f'/bands/{band_id}')
+    print(f"   Worker A after the commit: {after}")
+    assert after == ('MISS', {'name': 'Lankum', 'bio': 'Reissued'})
+    assert fetch(worker_a, f'/bands/{other_id}')[0] == 'HIT'
+    assert fetch(worker_a, '/bands')[0] == 'HIT'
+    assert metrics(worker_a)['stale'] == 2  # The L1 copy and the shared one
+
+    print("   ✅ Only the entry tagged with the written band was dropped")
+
+def test_bulk_load_and_script_stamps():
+    """Bulk loads stamp the rows and listings they wrote; stamp_tags(ALL_TAG) drops everything"""
+    print("\n3. Bulk load and migration-style stamps...")
+    directory = tempfile.mkdtemp()
+    worker_a, worker_b = create_worker(directory), create_worker(directory)
+    band_id = add_band(worker_a, 'Lankum', 'Drone folk')
+    fd, path = tempfile.mkstemp(suffix='.ndjson')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'_id': 'band-lisa', '_type': 'band', 'name': 'Lisa Hannigan', 'bio': 'Sea sew'}) + '\n')
+
+    try:
+        with worker_b.app_context():
+            load_ndjson(path)
+            db.session.commit()
+            loaded_id = Band.query.filter_by(source_id='band-lisa').one().id
+        assert fetch(worker_a, '/bands') == ('MISS', ['Lankum', 'Lisa Hannigan'])
+        assert fetch(worker_a, f'/bands/{loaded_id}')[0] == 'MISS'
+        fetch(worker_a, f'/bands/{band_id}')
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'_id': 'band-lisa', '_type': 'band', 'name': 'Lisa Hannigan', 'bio': 'Passenger'}) + '\n')
+        with worker_b.app_context():
+            load_ndjson(path)
+            db.session.commit()
+    finally:
+        os.remove(path)
+
+    reloaded = fetch(worker_a, f'/bands/{loaded_id}')
+    print(f"   Loaded band after a reload: {reloaded}")
+    assert reloaded == ('MISS', {'name': 'Lisa Hannigan', 'bio': 'Passenger'})
+    assert fetch(worker_a, f'/bands/{band_id}')[0] == 'HIT'
+
+    stamp_tags(worker_b.config, ALL_TAG)
+    assert fetch(worker_a, f'/bands/{band_id}')[0] == 'MISS'
+    assert fetch(worker_a, '/bands')[0] == 'MISS'
+
+    print("   ✅ Loaded rows refreshed, untouched rows still cached, ALL_TAG empties the cache")
+
+def main():
+    print("🧪 Testing Response Cache")
+    print("=" * 50)
+    test_l1_and_shared_tier()
+    test_invalidation_across_workers()
+    test_bulk_load_and_script_stamps()
+    print("\n🎉 All response cache tests passed")
+
+if __name__ == '__main__':
+    main()
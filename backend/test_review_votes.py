@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test Review Votes
+Voting, re-voting and retracting votes on band and venue reviews, and the
+sort=helpful order, on a throwaway SQLite database
+"""
+
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import text
+from models_bands_production import db, User, Band, Venue, BandReview, VenueReviewByBand, ReviewVote
+from review_votes import REVIEW_VOTE_TARGETS, cast_vote, retract_vote, helpful_order
+
+def create_test_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    return app
+
+def seed(voters=4):
+    db.create_all()
+    users = [User(id=f'user-{i}', email=f'user-{i}@example.ie') for i in range(voters)]
+    band = Band(name='Lankum', slug='lankum')
+    venue = Venue(name='Whelans', slug='whelans')
+    db.session.add_all(users + [band, venue])
+    db.session.commit()
+    return [user.id for user in users], band, venue
+
+def band_review(band, title, age_days=0):
+    review = BandReview(band_id=band.id, reviewer_id='user-0', rating=4, title=title, content='...',
+                        created_at=datetime.utcnow() - timedelta(days=age_days))
+    db.session.add(review)
+    db.session.commit()
+    return review
+
+def counters(review):
+    return review.helpful_votes, review.unhelpful_votes
+
+def backfill_counts(review_type, review_id):
+    """The counts Migration 008 backfills from review_votes for one review"""
+    row = db.session.execute(text(
+        "SELECT COALESCE(SUM(CASE WHEN is_helpful THEN 1 ELSE 0 END), 0), "
+        "COALESCE(SUM(CASE WHEN is_helpful THEN 0 ELSE 1 END), 0) "
+        "FROM review_votes WHERE review_type = :type AND review_id = :id"
+    ), {'type': review_type, 'id': review_id}).one()
+    return tuple(row)
+
+def test_vote_revote_unvote():
+    """Counters follow a vote, a changed vote and a retracted vote"""
+    print("\n1. Vote, re-vote and unvote...")
+    app = create_test_app()
+    _, review_type = REVIEW_VOTE_TARGETS['bands']
+    assert review_type == 'band_review'
+
+    with app.app_context():
+        (alice, bob, *_), band, _ = seed()
+        review = band_review(band, 'Great night')
+
+        cast_vote(review, review_type, alice, True)
+        cast_vote(review, review_type, bob, True)
+        db.session.commit()
+        assert counters(review) == (2, 0)
+
+        cast_vote(review, review_type, bob, False)
+        db.session.commit()
+        assert counters(review) == (1, 1)
+        assert ReviewVote.query.count() == 2
+
+        assert retract_vote(review, review_type, alice)
+        db.session.commit()
+        assert not retract_vote(review, review_type, alice)
+        print(f"   After vote, re-vote and unvote: {counters(review)}, score {review.helpfulness_score}")
+        assert counters(review) == (0, 1)
+        assert review.helpfulness_score == 0.0
+        assert backfill_counts('band_review', review.id) == counters(review)
+
+    print("   ✅ Counters match the stored votes")
+
+def test_band_and_venue_votes_kept_apart():
+    """A band review and a venue review sharing an id keep separate votes"""
+    print("\n2. Band and venue reviews with the same id...")
+    app = create_test_app()
+
+    with app.app_context():
+        (alice, *_), band, venue = seed()
+        review = band_review(band, 'Great night')
+        venue_review = VenueReviewByBand(id=review.id, venue_id=venue.id, band_id=band.id,
+                                         reviewer_id=alice, rating=5, title='Good sound', content='...')
+        db.session.add(venue_review)
+        db.session.commit()
+
+        cast_vote(review, 'band_review', alice, True)
+        cast_vote(venue_review, REVIEW_VOTE_TARGETS['venues'][1], alice, False)
+        db.session.commit()
+
+        print(f"   Band review {counters(review)}, venue review {counters(venue_review)}")
+        assert counters(review) == backfill_counts('band_review', review.id) == (1, 0)
+        assert counters(venue_review) == backfill_counts('venue_review', venue_review.id) == (0, 1)
+
+    print("   ✅ Votes stored under the review types the migration counts")
+
+def test_sort_helpful():
+    """sort=helpful ranks by Wilson score, newest first among equal scores"""
+    print("\n3. sort=helpful order...")
+    app = create_test_app()
+
+    with app.app_context():
+        voters, band, _ = seed()
+        one_of_one = band_review(band, 'One of one', age_days=4)
+        three_of_three = band_review(band, 'Three of three', age_days=3)
+        one_of_three = band_review(band, 'One of three', age_days=2)
+        unvoted_old = band_review(band, 'Unvoted, older', age_days=5)
+        unvoted_new = band_review(band, 'Unvoted, newer', age_days=1)
+
+        cast_vote(one_of_one, 'band_review', voters[0], True)
+        for voter in voters[:3]:
+            cast_vote(three_of_three, 'band_review', voter, True)
+        for voter, helpful in zip(voters, (True, False, False)):
+            cast_vote(one_of_three, 'band_review', voter, helpful)
+        db.session.commit()
+
+        titles = [review.title for review in BandReview.query.order_by(*helpful_order(BandReview))]
+        print(f"   Order: {titles}")
+        assert titles == ['Three of three', 'One of one', 'One of three', 'Unvoted, newer', 'Unvoted, older']
+
+    print("   ✅ Most reliably helpful reviews first")
+
+def main():
+    print("🧪 Testing Review Votes")
+    print("=" * 50)
+    test_vote_revote_unvote()
+    test_band_and_venue_votes_kept_apart()
+    test_sort_helpful()
+    print("\n🎉 All review vote tests passed")
+
+if __name__ == '__main__':
+    main()
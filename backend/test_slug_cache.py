@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test Slug Cache
+Slug lookups cached per worker but invalidated through the shared response
+cache tier, and slug allocation racing a concurrent insert, on throwaway
+SQLite files
+"""
+
+import os
+import tempfile
+from flask import Flask
+from sqlalchemy import text
+from models_bands_production import db, Band
+import slug_cache
+from slug_cache import SlugCache, resolve_slug, save_with_slug
+
+def create_test_app(directory):
+    """Flask app on the SQLite database and cache files in directory"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(directory, 'bands.sqlite3')}"
+    app.config['RESPONSE_CACHE_URL'] = os.path.join(directory, 'cache.sqlite3')
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def add_band(name, slug):
+    band = Band(name=name, slug=slug)
+    db.session.add(band)
+    db.session.commit()
+    return band.id
+
+def test_rename_seen_by_other_workers():
+    """A rename committed in one worker invalidates the slug in every worker"""
+    print("\n1. Rename in another worker...")
+    directory = tempfile.mkdtemp()
+    worker_a, worker_b = create_test_app(directory), create_test_app(directory)
+    cache_a, cache_b = SlugCache(), SlugCache()
+    original = slug_cache.slug_ids
+
+    try:
+        with worker_a.app_context():
+            slug_cache.slug_ids = cache_a
+            band_id = add_band('Lankum', 'lankum')
+            assert resolve_slug(Band, 'lankum') == band_id
+
+            # Cached: a change that bypasses the ORM isn't seen
+            db.session.execute(text("UPDATE bands SET slug = 'moved' WHERE id = :id"), {'id': band_id})
+            db.session.commit()
+            assert resolve_slug(Band, 'lankum') == band_id
+            db.session.execute(text("UPDATE bands SET slug = 'lankum' WHERE id = :id"), {'id': band_id})
+            db.session.commit()
+
+        with worker_b.app_context():
+            slug_cache.slug_ids = cache_b
+            band = db.session.get(Band, band_id)
+            band.slug = 'lankum-band'
+            db.session.commit()
+
+        with worker_a.app_context():
+            slug_cache.slug_ids = cache_a
+            print(f"   Worker A after the rename: lankum -> {resolve_slug(Band, 'lankum')}, "
+                  f"lankum-band -> {resolve_slug(Band, 'lankum-band')}")
+            assert resolve_slug(Band, 'lankum') is None
+            assert resolve_slug(Band, 'lankum-band') == band_id
+    finally:
+        slug_cache.slug_ids = original
+
+    print("   ✅ Stale slug dropped on the next lookup")
+
+def test_concurrent_slug_allocation():
+    """A slug taken between allocation and insert moves on to the next suffix"""
+    print("\n2. Concurrent request takes the slug first...")
+    app = create_test_app(tempfile.mkdtemp())
+    allocate_slug = slug_cache.allocate_slug
+    calls = []
+
+    def racing_allocate(*args, **kwargs):
+        slug = allocate_slug(*args, **kwargs)
+        calls.append(slug)
+        if len(calls) == 1:
+            with app.app_context():
+                add_band('Lankum', slug)
+        return slug
+
+    try:
+        slug_cache.allocate_slug = racing_allocate
+        with app.app_context():
+            band = Band(name='Lankum')
+            slug = save_with_slug(band, 'Lankum')
+            db.session.commit()
+            print(f"   Tried {calls}, saved as {slug}")
+            assert calls == ['lankum', 'lankum-1'] and slug == 'lankum-1'
+            assert sorted(band.slug for band in Band.query) == ['lankum', 'lankum-1']
+    finally:
+        slug_cache.allocate_slug = allocate_slug
+
+    print("   ✅ Insert retried with the next suffix")
+
+def test_rename_keeps_other_changes():
+    """A rename retried after a collision keeps the row's other edits"""
+    print("\n3. Rename onto a slug that was free when it was read...")
+    app = create_test_app(tempfile.mkdtemp())
+    allocate_slug = slug_cache.allocate_slug
+    calls = []
+
+    def stale_allocate(*args, **kwargs):
+        # SQLite has one writer, so the race is replayed as a read from before the other insert
+        slug = 'lisa-hannigan' if not calls else allocate_slug(*args, **kwargs)
+        calls.append(slug)
+        return slug
+
+    with app.app_context():
+        add_band('Lisa Hannigan', 'lisa-hannigan')
+        band_id = add_band('Hannigan', 'hannigan')
+
+    try:
+        slug_cache.allocate_slug = stale_allocate
+        with app.app_context():
+            band = db.session.get(Band, band_id)
+            band.name = 'Lisa Hannigan'
+            band.bio = 'Solo now'
+            save_with_slug(band, band.name)
+            db.session.commit()
+            band = db.session.get(Band, band_id)
+            print(f"   Tried {calls}, renamed to {band.slug}")
+            assert (band.slug, band.name, band.bio) == ('lisa-hannigan-1', 'Lisa Hannigan', 'Solo now')
+    finally:
+        slug_cache.allocate_slug = allocate_slug
+
+    print("   ✅ Other fields survive the retry")
+
+def main():
+    print("🧪 Testing Slug Cache")
+    print("=" * 50)
+    test_rename_seen_by_other_workers()
+    test_concurrent_slug_allocation()
+    test_rename_keeps_other_changes()
+    print("\n🎉 All slug cache tests passed")
+
+if __name__ == '__main__':
+    main()
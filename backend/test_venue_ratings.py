@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test Venue Rating Totals
+Check the incremental rating deltas applied on review create, edit and
+delete against a full Venue.recompute_ratings(), on a throwaway SQLite DB
+"""
+
+import os
+import tempfile
+import uuid
+from datetime import date
+from flask import Flask
+from models import db, User, Band, Venue, Review, RATING_DIMENSIONS
+
+def create_test_app():
+    """Flask app on a fresh SQLite file (a file, so app contexts get separate connections)"""
+    app = Flask(__name__)
+    path = os.path.join(tempfile.mkdtemp(), 'venue_ratings.sqlite3')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def seed(app):
+    """Band and venue ids for the reviews"""
+    with app.app_context():
+        user = User(email=f'{uuid.uuid4()}@example.ie', password_hash='x', user_type='band', name='Test Band')
+        db.session.add(user)
+        db.session.flush()
+        band = Band(id=user.id, user_id=user.id, genre='rock')
+        venue = Venue(name='Test Venue', address='1 Main St', city='Galway', county='Galway')
+        db.session.add_all([band, venue])
+        db.session.commit()
+        return band.id, venue.id
+
+def add_review(band_id, venue_id, score):
+    review = Review(
+        band_id=band_id, venue_id=venue_id, performance_date=date(2024, 5, 1),
+        title='Gig', review_text='Grand night', would_return=True,
+        **{dimension: score for dimension in RATING_DIMENSIONS}
+    )
+    db.session.add(review)
+    db.session.get(Venue, venue_id).apply_rating_delta(new_scores=review.rating_scores())
+    db.session.commit()
+    return review.id
+
+def totals(venue):
+    return (venue.review_count, float(venue.average_rating),
+            *[getattr(venue, f'{dimension}_sum') for dimension in RATING_DIMENSIONS])
+
+def assert_matches_recompute(venue_id):
+    """Incremental totals equal a rebuild from the reviews table"""
+    venue = db.session.get(Venue, venue_id)
+    incremental = totals(venue)
+    venue.recompute_ratings()
+    rebuilt = totals(venue)
+    db.session.rollback()
+    assert incremental == rebuilt, f"incremental {incremental} != recomputed {rebuilt}"
+    return incremental
+
+def test_create_edit_delete():
+    """Deltas for insert, edit and delete keep the totals exact"""
+    print("\n1. Create, edit and delete reviews...")
+    app = create_test_app()
+    band_id, venue_id = seed(app)
+
+    with app.app_context():
+        first = add_review(band_id, venue_id, 4)
+        add_review(band_id, venue_id, 5)
+        print(f"   After two reviews: {assert_matches_recompute(venue_id)}")
+
+        review = db.session.get(Review, first)
+        old_scores = review.rating_scores()
+        review.sound_quality = 1
+        review.overall_rating = 2
+        review.venue.apply_rating_delta(old_scores=old_scores, new_scores=review.rating_scores())
+        db.session.commit()
+        print(f"   After an edit: {assert_matches_recompute(venue_id)}")
+
+        review = db.session.get(Review, first)
+        review.venue.apply_rating_delta(old_scores=review.rating_scores())
+        db.session.delete(review)
+        db.session.commit()
+        result = assert_matches_recompute(venue_id)
+        print(f"   After a delete: {result}")
+        assert result[0] == 1 and result[1] == 5.0
+
+    print("   ✅ Incremental totals match recompute_ratings()")
+
+def test_concurrent_reviews():
+    """A stale Venue object in another session doesn't overwrite a newer total"""
+    print("\n2. Two sessions reviewing one venue...")
+    app = create_test_app()
+    band_id, venue_id = seed(app)
+
+    with app.app_context():
+        stale = db.session.get(Venue, venue_id)
+        assert stale.review_count == 0
+
+        # Another request commits a review while this one holds the venue
+        with app.app_context():
+            add_review(band_id, venue_id, 3)
+
+        review = Review(
+            band_id=band_id, venue_id=venue_id, performance_date=date(2024, 6, 1),
+            title='Gig', review_text='Loud', would_return=True,
+            **{dimension: 5 for dimension in RATING_DIMENSIONS}
+        )
+        db.session.add(review)
+        stale.apply_rating_delta(new_scores=review.rating_scores())
+        db.session.commit()
+
+        result = assert_matches_recompute(venue_id)
+        print(f"   Totals: {result}")
+        assert result[0] == 2 and result[1] == 4.0
+
+    print("   ✅ No lost update")
+
+def main():
+    print("🧪 Testing Venue Rating Totals")
+    print("=" * 50)
+    test_create_edit_delete()
+    test_concurrent_reviews()
+    print("\n🎉 All venue rating tests passed")
+
+if __name__ == '__main__':
+    main()
@@ -8,12 +8,50 @@ from sqlalchemy import and_, or_, desc, asc, func
 from datetime import datetime, date
 from models_bands_production import db, Venue, User
 from auth_firebase import firebase_auth_optional
+from list_serializers import (
+    ListShape, isoformat, json_list, json_object, requested_shape, requested_lookup, bulk_lookup
+)
+from response_cache import cached
 import logging
 
 # Create venues blueprint
 venues_bp = Blueprint('venues', __name__, url_prefix='/api/venues')
 
+# Every venue attribute ?fields= can select (the keys of Venue.to_dict())
+VENUE_FIELDS = ListShape(
+    ('id', Venue.id),
+    ('name', Venue.name),
+    ('slug', Venue.slug),
+    ('address', Venue.address),
+    ('city', Venue.city),
+    ('county', Venue.county),
+    ('country', Venue.country),
+    ('eircode', Venue.eircode),
+    ('latitude', Venue.latitude),
+    ('longitude', Venue.longitude),
+    ('capacity', Venue.capacity),
+    ('venue_type', Venue.venue_type),
+    ('primary_genres', Venue.primary_genres, json_list),
+    ('contact_email', Venue.contact_email),
+    ('contact_phone', Venue.contact_phone),
+    ('website', Venue.website),
+    ('social_links', Venue.social_links, json_object),
+    ('profile_image_url', Venue.profile_image_url),
+    ('photo_gallery_urls', Venue.photo_gallery_urls, json_list),
+    ('is_active', Venue.is_active),
+    ('is_verified', Venue.is_verified),
+    ('created_at', Venue.created_at, isoformat),
+    ('updated_at', Venue.updated_at, isoformat)
+)
+
+# Columns of a venue in listings and search when no ?fields= is given
+VENUE_LIST = VENUE_FIELDS.subset((
+    'id', 'name', 'slug', 'address', 'city', 'county', 'eircode', 'latitude', 'longitude',
+    'capacity', 'venue_type', 'primary_genres', 'website', 'profile_image_url', 'is_verified'
+))
+
 @venues_bp.route('', methods=['GET'])
+@cached(tags=('venues',), public=True)
 @firebase_auth_optional
 def get_venues():
     """
@@ -29,15 +67,31 @@ def get_venues():
     - capacity_max: Maximum capacity
     - search: Search term for name or description
     - verified_only: Show only verified venues (true/false)
+    - fields: Comma-separated venue attributes to return
+    - ids / slugs: Fetch these venues in this order (keys not found are
+      listed under 'missing') instead of a filtered page
     """
     try:
         # Pagination parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 20, type=int), 100)
         
+        try:
+            lookup = requested_lookup(request.args)
+            shape = requested_shape(request.args, VENUE_FIELDS, VENUE_LIST,
+                                    required=('id', lookup[0]) if lookup else ('id',))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Build query
         query = Venue.query.filter(Venue.is_active == True)
         
+        # Bulk lookup: one IN query, results in request order
+        if lookup:
+            key, values = lookup
+            venues, missing = bulk_lookup(shape, query, getattr(Venue, key), key, values)
+            return jsonify({'venues': venues, 'missing': missing}), 200
+        
         # Apply filters
         county = request.args.get('county')
         if county:
@@ -91,14 +145,14 @@ def get_venues():
         else:
             query = query.order_by(asc(order_field))
         
-        # Execute paginated query
-        venues_pagination = query.paginate(
+        # Execute paginated query, selecting only the requested columns
+        venues_pagination = shape.query(query).paginate(
             page=page, 
             per_page=per_page,
             error_out=False
         )
         
-        venues = [venue.to_dict() for venue in venues_pagination.items]
+        venues = shape.serialize_all(venues_pagination.items)
         
         return jsonify({
             'venues': venues,
@@ -126,10 +180,22 @@ def get_venues():
         return jsonify({'error': 'Failed to fetch venues', 'message': str(e)}), 500
 
 @venues_bp.route('/<int:venue_id>', methods=['GET'])
+@cached(tags=('venues', 'venue:{venue_id}'), public=True)
 @firebase_auth_optional
 def get_venue(venue_id):
-    """Get detailed information about a specific venue"""
+    """Get detailed information about a specific venue (?fields= to select attributes)"""
     try:
+        if 'fields' in request.args:
+            try:
+                shape = requested_shape(request.args, VENUE_FIELDS)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            row = shape.query(Venue.query.filter_by(id=venue_id, is_active=True)).first()
+            if not row:
+                return jsonify({'error': 'Venue not found'}), 404
+            return jsonify({'venue': shape.serialize(row)}), 200
+        
         venue = Venue.query.filter_by(id=venue_id, is_active=True).first()
         
         if not venue:
@@ -144,20 +210,26 @@ def get_venue(venue_id):
         return jsonify({'error': 'Failed to fetch venue', 'message': str(e)}), 500
 
 @venues_bp.route('/search', methods=['GET'])
+@cached(tags=('venues',), public=True)
 @firebase_auth_optional
 def search_venues():
     """
-    Advanced venue search endpoint
+    Advanced venue search endpoint (?fields= to select attributes)
     """
     try:
         query_term = request.args.get('q', '').strip()
         
+        try:
+            shape = requested_shape(request.args, VENUE_FIELDS, VENUE_LIST)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         if not query_term:
             return jsonify({'venues': [], 'message': 'No search term provided'}), 200
         
         # Search across multiple fields
         search_pattern = f'%{query_term}%'
-        venues = Venue.query.filter(
+        venues = shape.query(Venue.query).filter(
             and_(
                 Venue.is_active == True,
                 or_(
@@ -170,7 +242,7 @@ def search_venues():
         ).order_by(Venue.name).limit(50).all()
         
         return jsonify({
-            'venues': [venue.to_dict() for venue in venues],
+            'venues': shape.serialize_all(venues),
             'query': query_term,
             'results_count': len(venues)
         }), 200
@@ -201,6 +273,7 @@ def get_venue_types():
     }), 200
 
 @venues_bp.route('/counties', methods=['GET'])
+@cached(tags=('venues',), public=True)
 def get_counties():
     """Get list of counties with venue counts"""
     try:
@@ -228,6 +301,7 @@ def get_counties():
         return jsonify({'error': 'Failed to fetch counties', 'message': str(e)}), 500
 
 @venues_bp.route('/cities', methods=['GET'])
+@cached(tags=('venues',), public=True)
 def get_cities():
     """Get list of cities with venue counts"""
     try:
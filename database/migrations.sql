@@ -364,9 +364,319 @@ FOR EACH ROW EXECUTE FUNCTION check_content_for_moderation();
 
 COMMIT;
 
+-- Migration 008: Precomputed review helpfulness ranking
+-- =====================================================
+-- Run date: TBD
+-- Description: Keep up/down vote counters and a Wilson lower-bound score on each
+-- review, updated by the API in the same transaction as the vote, so sort=helpful
+-- listings are index scans and never COUNT review_votes on page views
+
+BEGIN;
+
+ALTER TABLE band_reviews
+ADD COLUMN unhelpful_votes INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN helpfulness_score DOUBLE PRECISION NOT NULL DEFAULT 0;
+
+ALTER TABLE venue_reviews_by_bands
+ADD COLUMN unhelpful_votes INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN helpfulness_score DOUBLE PRECISION NOT NULL DEFAULT 0;
+
+CREATE INDEX idx_band_reviews_helpfulness
+ON band_reviews(band_id, helpfulness_score DESC, created_at DESC);
+
+CREATE INDEX idx_venue_reviews_by_bands_helpfulness
+ON venue_reviews_by_bands(venue_id, helpfulness_score DESC, created_at DESC);
+
+-- The API now maintains the counters incrementally; the recounting trigger would
+-- overwrite them with a full COUNT on every vote
+DROP TRIGGER IF EXISTS update_review_votes_count ON review_votes;
+
+-- Backfill counters from existing votes (schema.sql vocabulary: review_type 'band_review' /
+-- 'venue_review' and is_helpful, which backend/review_votes.py also writes)
+UPDATE band_reviews br SET
+    helpful_votes = v.up,
+    unhelpful_votes = v.down
+FROM (
+    SELECT review_id,
+           COUNT(*) FILTER (WHERE is_helpful) AS up,
+           COUNT(*) FILTER (WHERE NOT is_helpful) AS down
+    FROM review_votes WHERE review_type = 'band_review' GROUP BY review_id
+) v
+WHERE br.id = v.review_id;
+
+UPDATE venue_reviews_by_bands vr SET
+    helpful_votes = v.up,
+    unhelpful_votes = v.down
+FROM (
+    SELECT review_id,
+           COUNT(*) FILTER (WHERE is_helpful) AS up,
+           COUNT(*) FILTER (WHERE NOT is_helpful) AS down
+    FROM review_votes WHERE review_type = 'venue_review' GROUP BY review_id
+) v
+WHERE vr.id = v.review_id;
+
+-- Wilson lower bound (z = 1.96), matching backend/review_ranking.py
+UPDATE band_reviews SET helpfulness_score = (
+    (helpful_votes::float / (helpful_votes + unhelpful_votes) + 1.9208 / (helpful_votes + unhelpful_votes)
+     - 1.96 * SQRT(helpful_votes::float * unhelpful_votes / (helpful_votes + unhelpful_votes) + 0.9604)
+       / (helpful_votes + unhelpful_votes))
+    / (1 + 3.8416 / (helpful_votes + unhelpful_votes))
+) WHERE helpful_votes + unhelpful_votes > 0;
+
+UPDATE venue_reviews_by_bands SET helpfulness_score = (
+    (helpful_votes::float / (helpful_votes + unhelpful_votes) + 1.9208 / (helpful_votes + unhelpful_votes)
+     - 1.96 * SQRT(helpful_votes::float * unhelpful_votes / (helpful_votes + unhelpful_votes) + 0.9604)
+       / (helpful_votes + unhelpful_votes))
+    / (1 + 3.8416 / (helpful_votes + unhelpful_votes))
+) WHERE helpful_votes + unhelpful_votes > 0;
+
+COMMIT;
+
+-- Migration 009: Follower feed of upcoming gigs
+-- =====================================================
+-- Run date: TBD
+-- Description: Per-user feed entries written when a gig is created (fan-out on
+-- write) for bands up to follower_feed.FANOUT_MAX_FOLLOWERS followers; gigs of
+-- larger bands keep fanned_out = FALSE and are merged into /api/me/feed on read
+
+BEGIN;
+
+ALTER TABLE bands ADD COLUMN follower_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE bands b SET follower_count = f.total
+FROM (SELECT band_id, COUNT(*) AS total FROM band_followers GROUP BY band_id) f
+WHERE b.id = f.band_id;
+
+ALTER TABLE gigs ADD COLUMN fanned_out BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE INDEX idx_gigs_band_fanout ON gigs(band_id, fanned_out, gig_date);
+
+CREATE TABLE feed_entries (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    gig_id UUID NOT NULL REFERENCES gigs(id) ON DELETE CASCADE,
+    band_id UUID NOT NULL REFERENCES bands(id) ON DELETE CASCADE,
+    gig_date DATE NOT NULL, -- Copied from gigs for keyset paging
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(user_id, gig_id)
+);
+
+CREATE INDEX idx_feed_entries_user_date ON feed_entries(user_id, gig_date, gig_id);
+
+COMMIT;
+
+-- Migration 010: Queued gig notifications
+-- =====================================================
+-- Run date: TBD
+-- Description: create_gig records one event; backend/notification_worker.py
+-- expands it to followers with new_gigs enabled and sends digests
+
+BEGIN;
+
+CREATE TABLE notification_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(30) NOT NULL CHECK (event_type IN ('new_gig')),
+    band_id UUID NOT NULL REFERENCES bands(id) ON DELETE CASCADE,
+    gig_id UUID NOT NULL REFERENCES gigs(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'sent', 'failed')),
+    error_message TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX idx_notification_events_status ON notification_events(status, id);
+
+COMMIT;
+
+-- Migration 011: Background job queue
+-- =====================================================
+-- Run date: TBD
+-- Description: Durable jobs table consumed by backend/job_worker.py with
+-- SELECT ... FOR UPDATE SKIP LOCKED; at most one queued job per dedup_key
+
+BEGIN;
+
+CREATE TABLE jobs (
+    id BIGSERIAL PRIMARY KEY,
+    task VARCHAR(100) NOT NULL,
+    queue VARCHAR(50) NOT NULL DEFAULT 'default',
+    payload JSONB DEFAULT '{}',
+    dedup_key VARCHAR(200),
+    priority INTEGER NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc'),
+    locked_by VARCHAR(100),
+    last_error TEXT,
+    result VARCHAR(500),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    duration_ms INTEGER,
+    wait_ms INTEGER,
+    created_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc')
+);
+
+CREATE INDEX idx_jobs_claim ON jobs(status, queue, run_at);
+CREATE UNIQUE INDEX uq_jobs_queued_dedup ON jobs(dedup_key) WHERE status = 'queued';
+
+COMMIT;
+
+-- Migration 012: Incremental venue rating totals
+-- =====================================================
+-- Run date: TBD
+-- Description: Per-dimension rating sums on venues (database_schema.sql), kept
+-- by the API with SQL-side increments on review insert, edit and delete
+-- (Venue.apply_rating_delta); the trigger recounting every review is dropped
+
+BEGIN;
+
+ALTER TABLE venues
+ADD COLUMN sound_quality_sum INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN hospitality_sum INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN payment_promptness_sum INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN crowd_engagement_sum INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN facilities_rating_sum INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN overall_rating_sum INTEGER NOT NULL DEFAULT 0;
+
+-- The API now applies deltas itself; the triggers would recount on top of them
+DROP TRIGGER IF EXISTS trigger_update_venue_rating_insert ON reviews;
+DROP TRIGGER IF EXISTS trigger_update_venue_rating_update ON reviews;
+DROP TRIGGER IF EXISTS trigger_update_venue_rating_delete ON reviews;
+DROP FUNCTION IF EXISTS update_venue_rating();
+
+-- Backfill totals from existing reviews (as backend/recompute_venue_ratings.py does);
+-- venues without reviews keep the zero defaults
+UPDATE venues v SET
+    review_count = r.total,
+    sound_quality_sum = r.sound_quality,
+    hospitality_sum = r.hospitality,
+    payment_promptness_sum = r.payment_promptness,
+    crowd_engagement_sum = r.crowd_engagement,
+    facilities_rating_sum = r.facilities_rating,
+    overall_rating_sum = r.overall_rating,
+    average_rating = ROUND(r.overall_rating::numeric / r.total, 1)
+FROM (
+    SELECT venue_id,
+           COUNT(*) AS total,
+           SUM(sound_quality) AS sound_quality,
+           SUM(hospitality) AS hospitality,
+           SUM(payment_promptness) AS payment_promptness,
+           SUM(crowd_engagement) AS crowd_engagement,
+           SUM(facilities_rating) AS facilities_rating,
+           SUM(overall_rating) AS overall_rating
+    FROM reviews GROUP BY venue_id
+) r
+WHERE v.id = r.venue_id;
+
+COMMIT;
+
+-- Migration 013: Leased, resumable gig notification delivery
+-- =====================================================
+-- Run date: TBD
+-- Description: Events are leased (claimed_at) so a dead worker's claims are
+-- reclaimed, record the last follower covered (delivered_through) so retries
+-- skip digests already sent, and go back to pending on failure until
+-- gig_notifications.MAX_EVENT_ATTEMPTS
+
+BEGIN;
+
+ALTER TABLE notification_events
+ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN claimed_at TIMESTAMP WITH TIME ZONE,
+ADD COLUMN delivered_through VARCHAR(36);
+
+-- Events failed under the old worker were never retried
+UPDATE notification_events SET status = 'pending', attempts = 1 WHERE status = 'failed';
+
+-- Start a lease on in-flight claims so they're reclaimed if their worker is gone
+UPDATE notification_events SET claimed_at = CURRENT_TIMESTAMP WHERE status = 'processing';
+
+COMMIT;
+
+-- Migration 014: Job deadlines
+-- =====================================================
+-- Run date: TBD
+-- Description: A claimed job gets a deadline from its task's timeout; workers
+-- periodically retry (or fail) running jobs past it
+
+BEGIN;
+
+ALTER TABLE jobs ADD COLUMN deadline TIMESTAMP;
+
+-- Running jobs get the default timeout from when they started
+UPDATE jobs SET deadline = started_at + INTERVAL '30 minutes' WHERE status = 'running';
+
+COMMIT;
+
+-- Migration 015: Source ids for bulk-loaded bands and venues
+-- =====================================================
+-- Run date: TBD
+-- Description: backend/bulk_load.py records each document's Sanity _id and
+-- upserts on it instead of on slug, so a reload never takes over rows created
+-- through the API and documents keep their slugs when the file order changes.
+-- Rows loaded before this migration have no source_id; set it from the
+-- NDJSON _id (or delete them) before loading the same file again.
+
+BEGIN;
+
+ALTER TABLE bands ADD COLUMN source_id VARCHAR(200) UNIQUE;
+ALTER TABLE venues ADD COLUMN source_id VARCHAR(200) UNIQUE;
+
+COMMIT;
+
 -- Rollback scripts (use carefully!)
 -- ================================
 
+-- Rollback Migration 015
+-- ALTER TABLE venues DROP COLUMN IF EXISTS source_id;
+-- ALTER TABLE bands DROP COLUMN IF EXISTS source_id;
+
+-- Rollback Migration 014
+-- ALTER TABLE jobs DROP COLUMN IF EXISTS deadline;
+
+-- Rollback Migration 013
+-- ALTER TABLE notification_events DROP COLUMN IF EXISTS delivered_through,
+--     DROP COLUMN IF EXISTS claimed_at, DROP COLUMN IF EXISTS attempts;
+
+-- Rollback Migration 012
+-- ALTER TABLE venues DROP COLUMN IF EXISTS sound_quality_sum, DROP COLUMN IF EXISTS hospitality_sum,
+--     DROP COLUMN IF EXISTS payment_promptness_sum, DROP COLUMN IF EXISTS crowd_engagement_sum,
+--     DROP COLUMN IF EXISTS facilities_rating_sum, DROP COLUMN IF EXISTS overall_rating_sum;
+-- CREATE OR REPLACE FUNCTION update_venue_rating()
+-- RETURNS TRIGGER AS $$
+-- BEGIN
+--     UPDATE venues
+--     SET
+--         average_rating = (SELECT ROUND(AVG(overall_rating), 1) FROM reviews WHERE venue_id = COALESCE(NEW.venue_id, OLD.venue_id)),
+--         review_count = (SELECT COUNT(*) FROM reviews WHERE venue_id = COALESCE(NEW.venue_id, OLD.venue_id)),
+--         updated_at = NOW()
+--     WHERE id = COALESCE(NEW.venue_id, OLD.venue_id);
+--     RETURN COALESCE(NEW, OLD);
+-- END;
+-- $$ LANGUAGE plpgsql;
+-- CREATE TRIGGER trigger_update_venue_rating_insert AFTER INSERT ON reviews FOR EACH ROW EXECUTE FUNCTION update_venue_rating();
+-- CREATE TRIGGER trigger_update_venue_rating_update AFTER UPDATE ON reviews FOR EACH ROW EXECUTE FUNCTION update_venue_rating();
+-- CREATE TRIGGER trigger_update_venue_rating_delete AFTER DELETE ON reviews FOR EACH ROW EXECUTE FUNCTION update_venue_rating();
+
+-- Rollback Migration 011
+-- DROP TABLE IF EXISTS jobs;
+
+-- Rollback Migration 010
+-- DROP TABLE IF EXISTS notification_events;
+
+-- Rollback Migration 009
+-- DROP TABLE IF EXISTS feed_entries;
+-- DROP INDEX IF EXISTS idx_gigs_band_fanout;
+-- ALTER TABLE gigs DROP COLUMN IF EXISTS fanned_out;
+-- ALTER TABLE bands DROP COLUMN IF EXISTS follower_count;
+
+-- Rollback Migration 008
+-- DROP INDEX IF EXISTS idx_venue_reviews_by_bands_helpfulness;
+-- DROP INDEX IF EXISTS idx_band_reviews_helpfulness;
+-- ALTER TABLE venue_reviews_by_bands DROP COLUMN IF EXISTS helpfulness_score, DROP COLUMN IF EXISTS unhelpful_votes;
+-- ALTER TABLE band_reviews DROP COLUMN IF EXISTS helpfulness_score, DROP COLUMN IF EXISTS unhelpful_votes;
+
 -- Rollback Migration 007
 -- DROP TRIGGER IF EXISTS check_venue_review_moderation ON venue_reviews_by_bands;
 -- DROP TRIGGER IF EXISTS check_band_review_moderation ON band_reviews;
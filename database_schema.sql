@@ -58,6 +58,12 @@ CREATE TABLE venues (
     verified BOOLEAN DEFAULT FALSE,
     average_rating DECIMAL(3,1) DEFAULT 0.0,
     review_count INTEGER DEFAULT 0,
+    sound_quality_sum INTEGER NOT NULL DEFAULT 0,
+    hospitality_sum INTEGER NOT NULL DEFAULT 0,
+    payment_promptness_sum INTEGER NOT NULL DEFAULT 0,
+    crowd_engagement_sum INTEGER NOT NULL DEFAULT 0,
+    facilities_rating_sum INTEGER NOT NULL DEFAULT 0,
+    overall_rating_sum INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -90,6 +96,8 @@ CREATE TABLE reviews (
     recommended_for JSONB,
     verified_performance BOOLEAN DEFAULT FALSE,
     helpful_votes INTEGER DEFAULT 0,
+    unhelpful_votes INTEGER DEFAULT 0,
+    helpfulness_score DOUBLE PRECISION NOT NULL DEFAULT 0, -- Wilson lower bound of helpful share
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     UNIQUE(band_id, venue_id) -- Prevent duplicate reviews from same band
@@ -100,6 +108,18 @@ CREATE INDEX idx_reviews_venue_id ON reviews(venue_id);
 CREATE INDEX idx_reviews_band_id ON reviews(band_id);
 CREATE INDEX idx_reviews_performance_date ON reviews(performance_date);
 CREATE INDEX idx_reviews_overall_rating ON reviews(overall_rating);
+CREATE INDEX idx_reviews_venue_helpfulness ON reviews(venue_id, helpfulness_score DESC, created_at DESC);
+
+-- Review helpfulness votes (counters on reviews are maintained by the application)
+CREATE TABLE review_votes (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    review_id UUID NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
+    voter_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    is_helpful BOOLEAN NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT unique_review_vote UNIQUE (review_id, voter_id)
+);
 
 -- Genres table
 CREATE TABLE genres (
@@ -108,44 +128,10 @@ CREATE TABLE genres (
     description TEXT
 );
 
--- Create function to update venue ratings automatically
-CREATE OR REPLACE FUNCTION update_venue_rating()
-RETURNS TRIGGER AS $$
-BEGIN
-    UPDATE venues 
-    SET 
-        average_rating = (
-            SELECT ROUND(AVG(overall_rating), 1)
-            FROM reviews 
-            WHERE venue_id = COALESCE(NEW.venue_id, OLD.venue_id)
-        ),
-        review_count = (
-            SELECT COUNT(*)
-            FROM reviews 
-            WHERE venue_id = COALESCE(NEW.venue_id, OLD.venue_id)
-        ),
-        updated_at = NOW()
-    WHERE id = COALESCE(NEW.venue_id, OLD.venue_id);
-    
-    RETURN COALESCE(NEW, OLD);
-END;
-$$ LANGUAGE plpgsql;
-
--- Create triggers to update venue ratings
-CREATE TRIGGER trigger_update_venue_rating_insert
-    AFTER INSERT ON reviews
-    FOR EACH ROW
-    EXECUTE FUNCTION update_venue_rating();
-
-CREATE TRIGGER trigger_update_venue_rating_update
-    AFTER UPDATE ON reviews
-    FOR EACH ROW
-    EXECUTE FUNCTION update_venue_rating();
-
-CREATE TRIGGER trigger_update_venue_rating_delete
-    AFTER DELETE ON reviews
-    FOR EACH ROW
-    EXECUTE FUNCTION update_venue_rating();
+-- Venue rating totals (review_count, average_rating and the per-dimension *_sum
+-- columns) are maintained incrementally by the application on review insert, edit
+-- and delete (Venue.apply_rating_delta). Run backend/recompute_venue_ratings.py to
+-- rebuild them from the reviews table if they ever drift.
 
 -- Create function to update updated_at timestamps
 CREATE OR REPLACE FUNCTION update_updated_at_column()
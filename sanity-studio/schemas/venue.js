@@ -50,6 +50,11 @@ export default {
           title: 'Country',
           type: 'string',
           initialValue: 'Ireland'
+        },
+        {
+          name: 'eircode',
+          title: 'Eircode',
+          type: 'string'
         }
       ]
     },
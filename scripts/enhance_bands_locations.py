@@ -7,90 +7,69 @@ Uses multiple strategies to detect Irish locations for bands
 import json
 import sys
 import os
-import re
 from typing import Optional, List, Dict, Any
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from irish_locations import get_all_irish_counties, get_all_irish_cities_and_towns
+from location_matcher import detect_location, matcher_for
+from musicbrainz_client import MusicBrainzClient
+
+_musicbrainz = None
+
+def get_musicbrainz_client() -> MusicBrainzClient:
+    """Shared client, so name and area lookups are reused across bands"""
+    global _musicbrainz
+    if _musicbrainz is None:
+        _musicbrainz = MusicBrainzClient()
+    return _musicbrainz
 
 def detect_locations_in_text(text: str, irish_cities: List[str], irish_counties: List[str]) -> tuple[Optional[str], Optional[str]]:
     """Detect Irish locations mentioned in text"""
-    if not text:
-        return None, None
-    
-    text_lower = text.lower()
-    
-    # Look for city mentions
-    for city in irish_cities:
-        # Check for exact matches with word boundaries
-        if re.search(r'\b' + re.escape(city.lower()) + r'\b', text_lower):
-            return city, None
-    
-    # Look for county mentions
-    for county in irish_counties:
-        county_clean = county.lower().replace('county ', '')
-        if re.search(r'\b' + re.escape(county_clean) + r'\b', text_lower):
-            return None, county
-    
-    return None, None
+    # One whole-word pass per list; cities take precedence over counties
+    return detect_location(text, matcher_for(irish_cities), matcher_for(irish_counties))
 
 def get_musicbrainz_location_data(band_name: str) -> tuple[Optional[str], Optional[str]]:
-    """Try to get more detailed location data from MusicBrainz API"""
-    import requests
-    import time
+    """Try to get more detailed location data from MusicBrainz API
+
+    Returns (area name, county from the area hierarchy); answers come from
+    the batched name search when prefetch_musicbrainz_artists() ran first.
+    """
+    client = get_musicbrainz_client()
     
     try:
-        # Search for the band
-        search_url = "https://musicbrainz.org/ws/2/artist/"
-        params = {
-            'query': f'artist:"{band_name}" AND country:IE',
-            'fmt': 'json',
-            'limit': 1
-        }
-        
-        response = requests.get(search_url, params=params)
-        time.sleep(1)  # Rate limiting
-        
-        if response.status_code == 200:
-            data = response.json()
-            artists = data.get('artists', [])
-            
-            if artists:
-                artist = artists[0]
-                # Get detailed artist data
-                artist_id = artist.get('id')
-                detail_url = f"https://musicbrainz.org/ws/2/artist/{artist_id}"
-                detail_params = {'fmt': 'json', 'inc': 'area-rels'}
-                
-                detail_response = requests.get(detail_url, params=detail_params)
-                time.sleep(1)
-                
-                if detail_response.status_code == 200:
-                    detail_data = detail_response.json()
-                    
-                    # Check area information
-                    area = detail_data.get('area', {})
-                    if area:
-                        area_name = area.get('name', '')
-                        if area_name:
-                            return area_name, None
-                    
-                    # Check relations for location info
-                    relations = detail_data.get('relations', [])
-                    for relation in relations:
-                        if relation.get('type') in ['performance', 'recorded at']:
-                            target = relation.get('target', {})
-                            if isinstance(target, dict):
-                                place_name = target.get('name', '')
-                                if place_name:
-                                    return place_name, None
+        artist = client.find_irish_artist(band_name)
+        if artist:
+            area = artist.get('area') or artist.get('begin-area') or {}
+            _, county = client.irish_location(artist)
+            return area.get('name') or None, county
     
     except Exception as e:
         print(f"  Error fetching MusicBrainz data for {band_name}: {e}")
     
     return None, None
 
+def needs_musicbrainz_lookup(band: Dict[str, Any], irish_cities: List[str], irish_counties: List[str]) -> bool:
+    """True when strategies 1 and 2 find nothing and the band qualifies for strategy 3"""
+    if band.get('city') and band.get('city') in irish_cities:
+        return False
+    
+    band_name = band.get('name', '')
+    if len(band_name) <= 3 or band_name.startswith('The '):
+        return False
+    
+    for text in (band_name, band.get('description', '')):
+        if text and any(detect_locations_in_text(text, irish_cities, irish_counties)):
+            return False
+    return True
+
+def prefetch_musicbrainz_artists(bands_data: List[Dict[str, Any]], irish_cities: List[str], irish_counties: List[str]):
+    """Look up every band strategy 3 will need in batched name searches"""
+    names = [band.get('name', '') for band in bands_data if needs_musicbrainz_lookup(band, irish_cities, irish_counties)]
+    if names:
+        print(f"🎼 Looking up {len(names)} bands on MusicBrainz in batches...")
+        get_musicbrainz_client().find_irish_artists(names)
+
 def enhanced_location_detection(bands_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Enhanced location detection using multiple strategies"""
     irish_cities = get_all_irish_cities_and_towns()
@@ -98,6 +77,8 @@ def enhanced_location_detection(bands_data: List[Dict[str, Any]]) -> List[Dict[s
     
     print(f"🔍 Starting enhanced location detection for {len(bands_data)} bands...")
     
+    prefetch_musicbrainz_artists(bands_data, irish_cities, irish_counties)
+    
     updated_count = 0
     
     for i, band in enumerate(bands_data):
@@ -141,6 +122,8 @@ def enhanced_location_detection(bands_data: List[Dict[str, Any]]) -> List[Dict[s
                         found_city = matched_city
                     if matched_county:
                         found_county = matched_county
+                if mb_county and not found_county:
+                    found_county = mb_county
         
         # Strategy 4: Educated guesses based on band characteristics
         if not found_city:
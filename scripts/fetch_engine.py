@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Fetch Engine for the scrapers
+Concurrent fetching with a token bucket per host:
+- Each host is paced independently (MusicBrainz at 1 req/s while studio
+  websites and Google APIs proceed in parallel)
+- AIMD: the host's rate halves on 429/5xx and creeps back up on success
+- Retry-After headers are honoured before the next request to that host
+- Responses go through the on-disk cache in http_cache.py (see
+  SCRAPER_CACHE_MODE), so reruns and offline replays skip the network
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from http_cache import CacheMiss, HttpCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'BandVenueReview/1.0 (https://bandvenuereview.ie; contact@bandvenuereview.ie)'
+
+# Requests per second per host. Hosts not listed use default_rate.
+DEFAULT_HOST_RATES = {
+    'musicbrainz.org': 1.0,       # MusicBrainz requires 1 request per second
+    'maps.googleapis.com': 10.0,  # Places/Geocoding quota is per second, per key
+    'ws.audioscrobbler.com': 5.0,
+    'bandcamp.com': 2.0,
+    'api.spotify.com': 10.0
+}
+
+# Unknown hosts (studio/venue websites) get a polite 1 request every 2 seconds each
+DEFAULT_RATE = 0.5
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket with AIMD rate adjustment for one host"""
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent to this host"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def on_success(self):
+        """Additive increase back toward the configured rate"""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease, plus a hard pause when the server asked for one"""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date form)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class FetchEngine:
+    """Rate-limited, retrying HTTP client shared by the scrapers
+
+    get() is safe to call from many threads; map() runs a function over items
+    on the engine's thread pool so requests to different hosts overlap while
+    each host stays within its own rate.
+    """
+
+    def __init__(self, host_rates: Optional[Dict[str, float]] = None, default_rate: float = DEFAULT_RATE,
+                 max_workers: int = 8, user_agent: str = DEFAULT_USER_AGENT, timeout: float = 15,
+                 max_retries: int = 3, cache: Optional[HttpCache] = None, use_cache: bool = True):
+        self.host_rates = dict(DEFAULT_HOST_RATES)
+        self.host_rates.update(host_rates or {})
+        self.default_rate = default_rate
+        self.max_workers = max_workers
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.cache = cache if cache is not None else (HttpCache.from_env() if use_cache else None)
+
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.buckets_lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'errors': 0}
+        self.stats_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        """One requests.Session per thread (sessions are not thread-safe)"""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': self.user_agent})
+            self.local.session = session
+        return session
+
+    def _rate_for(self, host: str) -> float:
+        for pattern, rate in self.host_rates.items():
+            if host == pattern or host.endswith('.' + pattern):
+                return rate
+        return self.default_rate
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = (urlparse(url).hostname or '').lower()
+        with self.buckets_lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self._rate_for(host))
+            return self.buckets[host]
+
+    def _count(self, key: str):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def is_cached(self, url: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """True when get() would be answered from the cache without a request"""
+        if not self.cache:
+            return False
+        entry = self.cache.lookup(url, params)
+        return bool(entry) and (self.cache.offline or self.cache.is_fresh(entry))
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """GET through the cache, with per-host pacing and retries on 429/5xx
+
+        Returns the final response (callers still call raise_for_status());
+        raises the last connection error if every attempt failed, or CacheMiss
+        in offline mode when the request was never recorded.
+        """
+        entry = self.cache.lookup(url, params) if self.cache else None
+
+        if self.cache:
+            if entry and (self.cache.offline or self.cache.is_fresh(entry)):
+                try:
+                    response = self.cache.to_response(entry)
+                    self.cache.count('hits')
+                    return response
+                except OSError:
+                    entry = None
+            if self.cache.offline:
+                self.cache.count('misses')
+                raise CacheMiss(f"Not in cache (offline mode): {url}")
+            if entry:
+                kwargs['headers'] = {**self.cache.conditional_headers(entry), **kwargs.get('headers', {})}
+
+        response = self._fetch(url, params, **kwargs)
+
+        if self.cache:
+            if entry and response.status_code == 304:
+                self.cache.touch(url, params, entry)
+                self.cache.count('revalidated')
+                return self.cache.to_response(entry)
+            self.cache.count('misses')
+            self.cache.store(url, params, response)
+        return response
+
+    def _fetch(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """Network GET with per-host pacing and retries"""
+        bucket = self.bucket(url)
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            self._count('requests')
+            try:
+                response = self._session().get(url, params=params, **kwargs)
+            except requests.RequestException as e:
+                self._count('errors')
+                bucket.on_throttle()
+                if attempt == self.max_retries:
+                    raise
+                self._count('retries')
+                time.sleep(min(30, 2 ** attempt) * random.uniform(0.5, 1.0))
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                bucket.on_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self._count('throttled')
+            bucket.on_throttle(retry_after)
+            if attempt == self.max_retries:
+                return response
+
+            self._count('retries')
+            logger.warning(f"⏳ {response.status_code} from {urlparse(url).hostname}, "
+                           f"retrying (attempt {attempt + 1}/{self.max_retries})")
+
+        return response
+
+    def _safe(self, func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        def safe_call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                logger.error(f"Error fetching {item!r}: {e}")
+                return None
+        return safe_call
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """Apply func to every item concurrently, returning results in input order
+
+        An exception raised by func is logged and its result is None, so one
+        bad page never aborts a whole scrape.
+        """
+        safe_call = self._safe(func)
+        items = list(items)
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [safe_call(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(safe_call, items))
+
+    def imap(self, func: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+        """Streaming map(): yields results in input order as they complete
+
+        items is consumed lazily and at most 2 * max_workers calls are in
+        flight, so memory stays flat however long the input is.
+        """
+        safe_call = self._safe(func)
+        if self.max_workers <= 1:
+            for item in items:
+                yield safe_call(item)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = deque()
+            for item in items:
+                pending.append(pool.submit(safe_call, item))
+                if len(pending) >= self.max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def log_stats(self):
+        logger.info(f"📡 Fetch stats: {self.stats['requests']} requests, {self.stats['retries']} retries, "
+                    f"{self.stats['throttled']} throttled, {self.stats['errors']} connection errors")
+        if self.cache:
+            self.cache.log_stats()
@@ -12,36 +12,11 @@ from typing import Optional, List, Dict, Any
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from irish_locations import get_all_irish_counties, get_all_irish_cities_and_towns
+from location_matcher import match_location, matcher_for
 
 def match_irish_location(location_text: str, irish_cities: List[str], irish_counties: List[str]) -> tuple[Optional[str], Optional[str]]:
     """Match location text to standardized Irish city and county"""
-    if not location_text:
-        return None, None
-    
-    location_lower = location_text.lower().strip()
-    
-    # First try to match cities exactly
-    for city in irish_cities:
-        if city.lower() == location_lower:
-            return city, None
-    
-    # Then try partial matches for cities
-    for city in irish_cities:
-        if city.lower() in location_lower or location_lower in city.lower():
-            return city, None
-    
-    # Try to match counties exactly
-    for county in irish_counties:
-        if county.lower() == location_lower or county.lower().replace('county ', '') == location_lower:
-            return None, county
-    
-    # Try partial matches for counties
-    for county in irish_counties:
-        county_clean = county.lower().replace('county ', '')
-        if county_clean in location_lower or location_lower in county_clean:
-            return None, county
-    
-    return None, None
+    return match_location(location_text, matcher_for(irish_cities), matcher_for(irish_counties))
 
 def fix_band_locations(bands_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Fix location data for bands to match standardized format"""
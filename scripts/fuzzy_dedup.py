@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Shared Fuzzy Deduplication for bands, venues and studios
+Incremental similarity index used by the scrapers and Sanity importers in
+place of comparing every record with every earlier one:
+- 'sequence' mode matches difflib SequenceMatcher ratio > threshold, using a
+  character n-gram inverted index with a length window and a q-gram count
+  filter to pick candidates
+- 'token_jaccard' mode matches word-set Jaccard > threshold, using a token
+  inverted index with an overlap count filter
+
+Both filters are exact bounds, so the candidate sets never drop a pair the
+full O(n²) scan would have matched; only candidates are scored.
+"""
+
+import math
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Similarity thresholds per entity type and matching rule
+DEDUP_THRESHOLDS = {
+    'band': 0.85,           # IrishBandScraper.deduplicate_bands
+    'band_import': 0.90,    # sanity_band_importer
+    'venue': 0.85,          # sanity_venue_importer
+    'venue_words': 0.7,     # IrishVenueDirectoryScraper (word Jaccard)
+    'studio': 0.85          # sanity_importer
+}
+
+VENUE_STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'of', 'in', 'at', 'to', 'for', 'with'}
+
+def _ngrams(text: str, q: int) -> Counter:
+    padded = '\x02' * (q - 1) + text + '\x03' * (q - 1)
+    return Counter(padded[i:i + q] for i in range(len(padded) - q + 1))
+
+class SimilarityIndex:
+    """Names seen so far, searchable for the earliest one above a threshold
+
+    find() returns (matched_name, score) for the earliest-added name whose
+    similarity to the query exceeds the threshold, or None. Names are
+    compared exactly as given; callers normalise (e.g. lower()) beforehand.
+    """
+
+    def __init__(self, threshold: float, mode: str = 'sequence', q: int = 3,
+                 stop_words: Optional[Set[str]] = None):
+        if mode not in ('sequence', 'token_jaccard'):
+            raise ValueError(f"Unknown similarity mode: {mode}")
+        self.threshold = threshold
+        self.mode = mode
+        self.q = q
+        self.stop_words = stop_words or set()
+
+        self.names: List[str] = []
+        self.exact: Dict[str, int] = {}
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.by_length: Dict[int, List[int]] = defaultdict(list)
+        self.token_sets: List[Set[str]] = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def tokens(self, name: str) -> Set[str]:
+        return set(name.split()) - self.stop_words
+
+    def add(self, name: str):
+        idx = len(self.names)
+        self.names.append(name)
+        self.exact.setdefault(name, idx)
+
+        if self.mode == 'sequence':
+            self.by_length[len(name)].append(idx)
+            for gram, count in _ngrams(name, self.q).items():
+                self.postings[gram].append((idx, count))
+        else:
+            tokens = self.tokens(name)
+            self.token_sets.append(tokens)
+            for token in tokens:
+                self.postings[token].append((idx, 1))
+
+    def find(self, name: str) -> Optional[Tuple[str, float]]:
+        if self.mode == 'sequence':
+            return self._find_sequence(name)
+        return self._find_jaccard(name)
+
+    # ------------------------------------------------------------------
+    # SequenceMatcher ratio
+    # ------------------------------------------------------------------
+
+    def _required_shared(self, la: int, lb: int) -> int:
+        """Fewest shared q-grams two strings need to reach the threshold
+
+        ratio = 2M / (la + lb) and M <= LCS, so ratio > t implies an indel
+        distance below (1 - t)(la + lb); each indel destroys at most q of the
+        longer string's max(la, lb) + q - 1 padded q-grams.
+        """
+        max_indels = math.floor((1 - self.threshold) * (la + lb))
+        return max(la, lb) + self.q - 1 - self.q * max_indels
+
+    def _length_window(self, la: int) -> range:
+        # ratio <= 2 * min(la, lb) / (la + lb), which bounds lb either side of la
+        t = self.threshold
+        low = math.floor(la * t / (2 - t))
+        high = math.ceil(la * (2 - t) / t) if t > 0 else la * 10
+        return range(max(low, 0), high + 1)
+
+    def _find_sequence(self, name: str) -> Optional[Tuple[str, float]]:
+        la = len(name)
+        window = self._length_window(la)
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram, count in _ngrams(name, self.q).items():
+            for idx, other_count in self.postings.get(gram, ()):
+                shared[idx] += min(count, other_count)
+
+        candidates = {
+            idx for idx, overlap in shared.items()
+            if len(self.names[idx]) in window and overlap >= self._required_shared(la, len(self.names[idx]))
+        }
+
+        # Lengths where the count bound is vacuous must be scanned directly
+        for lb in window:
+            if self._required_shared(la, lb) <= 0:
+                candidates.update(self.by_length.get(lb, ()))
+
+        for idx in sorted(candidates):
+            matcher = SequenceMatcher(None, name, self.names[idx])
+            if matcher.real_quick_ratio() <= self.threshold or matcher.quick_ratio() <= self.threshold:
+                continue
+            score = matcher.ratio()
+            if score > self.threshold:
+                return self.names[idx], score
+        return None
+
+    # ------------------------------------------------------------------
+    # Word-set Jaccard
+    # ------------------------------------------------------------------
+
+    def _find_jaccard(self, name: str) -> Optional[Tuple[str, float]]:
+        if name in self.exact:
+            return name, 1.0
+
+        tokens = self.tokens(name)
+        if not tokens:
+            return None
+
+        shared: Dict[int, int] = defaultdict(int)
+        for token in tokens:
+            for idx, _ in self.postings.get(token, ()):
+                shared[idx] += 1
+
+        # Jaccard = I / |A ∪ B| and |A ∪ B| >= |A|, so I must exceed t * |A|
+        min_overlap = self.threshold * len(tokens)
+        for idx in sorted(i for i, overlap in shared.items() if overlap > min_overlap):
+            other = self.token_sets[idx]
+            overlap = shared[idx]
+            score = overlap / (len(tokens) + len(other) - overlap)
+            if score > self.threshold:
+                return self.names[idx], score
+        return None
+
+def find_duplicate_names(names: Iterable[str], threshold: float, mode: str = 'sequence',
+                         stop_words: Optional[Set[str]] = None) -> List[Optional[Tuple[str, float]]]:
+    """For each name, the earlier kept name it duplicates (or None if kept)"""
+    index = SimilarityIndex(threshold, mode, stop_words=stop_words)
+    results = []
+    for name in names:
+        match = index.find(name)
+        results.append(match)
+        if match is None:
+            index.add(name)
+    return results
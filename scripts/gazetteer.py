@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Offline Irish Gazetteer
+Resolves towns, counties and Eircodes locally instead of calling the Google
+Geocoding API:
+- Forward lookup: town name -> county and town-centre coordinates
+- Reverse lookup: coordinates -> nearest town through a grid spatial index
+  (only the grid cells around the point are scanned), falling back to the
+  nearest county centre away from any listed town
+- Eircode routing key (first three characters) -> county
+- resolve() combines them for a scraped address: Eircode first, then names
+  in the address, then coordinates. Street names ("Cork Street") are not
+  read as places, and when coordinates are known a name far from them is
+  ignored rather than trusted over the point
+
+Built from irish_locations.py once at import; lookups take microseconds.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from irish_locations import get_county_centroids, get_eircode_routing_keys, get_town_coordinates
+from location_matcher import IRISH_CITIES, IRISH_COUNTIES
+from places_planner import distance_m
+
+GRID_CELL_DEGREES = 0.2
+METRES_PER_DEGREE = 111195
+MAX_TOWN_DISTANCE_M = 15000  # beyond this a point is not "in" the nearest town
+MAX_CITY_MATCH_M = 30000  # a town named in the address must be this close to its coordinates
+MAX_COUNTY_MATCH_M = 90000  # same for a county's centre (every listed town is within 83km of its own)
+
+# Routing key (letter + 2 digits, or D6W) and 4-character unique identifier
+EIRCODE_PATTERN = re.compile(r'\b([AC-FHKNPRTV-Y]\d{2}|D6W)\s?([0-9AC-FHKNPRTV-Y]{4})\b', re.IGNORECASE)
+
+# Address parts naming a street, e.g. "Cork Street", "Kildare St.", "Dorset Street Upper"
+STREET_PATTERN = re.compile(
+    r'\b(?:street|st|road|rd|avenue|ave|lane|quay|terrace|place|square|row|parade|drive|crescent|'
+    r'way|walk|court|close|mall|gardens|hill)\.?(?:\s+(?:upper|lower|north|south|east|west|great|little))?$',
+    re.IGNORECASE
+)
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    county: str
+    lat: float
+    lng: float
+
+class Gazetteer:
+    """Town, county and Eircode lookups over in-memory tables"""
+
+    def __init__(self, towns: Dict[str, Tuple[str, float, float]], county_centroids: Dict[str, Tuple[float, float]],
+                 routing_keys: Dict[str, str], cell_degrees: float = GRID_CELL_DEGREES):
+        self.towns: Dict[str, Place] = {
+            name.lower(): Place(name, county, lat, lng) for name, (county, lat, lng) in towns.items()
+        }
+        self.counties: Dict[str, Place] = {
+            county.lower(): Place(county, county, lat, lng) for county, (lat, lng) in county_centroids.items()
+        }
+        self.routing_keys = {key.upper(): county for key, county in routing_keys.items()}
+        self.cell_degrees = cell_degrees
+
+        self.grid: Dict[Tuple[int, int], List[Place]] = {}
+        for place in self.towns.values():
+            self.grid.setdefault(self._cell(place.lat, place.lng), []).append(place)
+
+        rows = [row for row, _ in self.grid] or [0]
+        cols = [col for _, col in self.grid] or [0]
+        self.max_ring = max(max(rows) - min(rows), max(cols) - min(cols)) + 1
+
+        # Smallest ground width of a cell (longitude degrees shrink northwards)
+        northmost = max((abs(place.lat) for place in self.towns.values()), default=0)
+        self.cell_width_m = cell_degrees * METRES_PER_DEGREE * math.cos(math.radians(northmost))
+
+    @classmethod
+    def from_irish_locations(cls) -> 'Gazetteer':
+        return cls(get_town_coordinates(), get_county_centroids(), get_eircode_routing_keys())
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+
+    def _ring(self, row: int, col: int, ring: int) -> Iterable[Tuple[int, int]]:
+        """Grid cells exactly ring steps away from (row, col)"""
+        if ring == 0:
+            yield row, col
+            return
+        for d in range(-ring, ring + 1):
+            yield row - ring, col + d
+            yield row + ring, col + d
+        for d in range(-ring + 1, ring):
+            yield row + d, col - ring
+            yield row + d, col + ring
+
+    # Forward lookups
+
+    def town(self, name: str) -> Optional[Place]:
+        """Town with coordinates by name (case-insensitive)"""
+        if not name:
+            return None
+        return self.towns.get(name.strip().lower())
+
+    def county_of(self, name: str) -> Optional[str]:
+        """County for a town or county name"""
+        town = self.town(name)
+        if town:
+            return town.county
+        return IRISH_COUNTIES.exact(name) if name else None
+
+    def coordinates(self, name: str) -> Optional[Tuple[float, float]]:
+        """Town-centre (or county-centre) coordinates for a name"""
+        place = self.town(name) or (self.counties.get(name.strip().lower()) if name else None)
+        return (place.lat, place.lng) if place else None
+
+    # Reverse lookups
+
+    def nearest_town(self, lat: float, lng: float,
+                     max_distance: float = MAX_TOWN_DISTANCE_M) -> Optional[Place]:
+        """Closest listed town within max_distance metres, or None"""
+        row, col = self._cell(lat, lng)
+        best, best_distance = None, max_distance
+
+        for ring in range(self.max_ring + 1):
+            for cell in self._ring(row, col, ring):
+                for place in self.grid.get(cell, ()):
+                    distance = distance_m(lat, lng, place.lat, place.lng)
+                    if distance <= best_distance:
+                        best, best_distance = place, distance
+
+            # Anything in further rings is at least this far away
+            if ring * self.cell_width_m >= best_distance:
+                break
+
+        return best
+
+    def nearest_county_centre(self, lat: float, lng: float) -> Optional[str]:
+        if not self.counties:
+            return None
+        return min(self.counties.values(), key=lambda place: distance_m(lat, lng, place.lat, place.lng)).county
+
+    def county_at(self, lat: float, lng: float) -> Optional[str]:
+        """County for coordinates: the nearest town's, else the nearest county centre's"""
+        town = self.nearest_town(lat, lng)
+        return town.county if town else self.nearest_county_centre(lat, lng)
+
+    # Eircodes
+
+    def find_eircode(self, text: str) -> Optional[str]:
+        """First valid Eircode in text, normalised to "D02 X285" form"""
+        if not text:
+            return None
+        for match in EIRCODE_PATTERN.finditer(text):
+            routing_key = match.group(1).upper()
+            if routing_key in self.routing_keys:
+                return f"{routing_key} {match.group(2).upper()}"
+        return None
+
+    def county_for_eircode(self, eircode: str) -> Optional[str]:
+        """County of an Eircode (or any text containing one)"""
+        found = self.find_eircode(eircode)
+        return self.routing_keys[found[:3]] if found else None
+
+    # Address text
+
+    @staticmethod
+    def place_parts(address: Optional[str]) -> List[str]:
+        """Comma-separated parts of an address that aren't street names"""
+        parts = [part.strip() for part in (address or '').split(',')]
+        return [part for part in parts if part and not STREET_PATTERN.search(part)]
+
+    def _within(self, place: Optional[Place], lat: Optional[float], lng: Optional[float],
+                max_distance: float) -> bool:
+        """False only when both the place and the point are known and too far apart"""
+        if place is None or lat is None or lng is None:
+            return True
+        return distance_m(lat, lng, place.lat, place.lng) <= max_distance
+
+    def city_in_address(self, address: Optional[str], lat: Optional[float] = None,
+                        lng: Optional[float] = None, whole_words: bool = True) -> Optional[str]:
+        """First town named outside the street names, near the coordinates when given"""
+        for part in self.place_parts(address):
+            city = IRISH_CITIES.first(part, whole_words)
+            if city and self._within(self.town(city), lat, lng, MAX_CITY_MATCH_M):
+                return city
+        return None
+
+    def county_in_address(self, address: Optional[str], lat: Optional[float] = None,
+                          lng: Optional[float] = None, whole_words: bool = True) -> Optional[str]:
+        """County of the Eircode, else the first county named outside the street names
+        whose centre is near the coordinates when given"""
+        county = self.county_for_eircode(address)
+        if county:
+            return county
+        for part in self.place_parts(address):
+            county = IRISH_COUNTIES.first(part, whole_words)
+            if county and self._within(self.counties.get(county.lower()), lat, lng, MAX_COUNTY_MATCH_M):
+                return county
+        return None
+
+    # Combined
+
+    def resolve(self, address: Optional[str] = None, lat: Optional[float] = None,
+                lng: Optional[float] = None) -> Tuple[Optional[str], Optional[str]]:
+        """(city, county) for a scraped place
+
+        City precedence: town named in the address, nearest town to the
+        coordinates. County precedence: Eircode, county named in the address,
+        county of the city, coordinates; with coordinates the county of a
+        town named near them comes before a county name. Names far from the
+        coordinates are skipped.
+        """
+        has_coordinates = lat is not None and lng is not None
+        named_city = self.city_in_address(address, lat, lng)
+        nearest = self.nearest_town(lat, lng) if has_coordinates else None
+        city = named_city or (nearest.name if nearest else None)
+
+        named_city_county = self.county_of(named_city) if has_coordinates and named_city else None
+        county = (self.county_for_eircode(address)
+                  or named_city_county
+                  or self.county_in_address(address, lat, lng)
+                  or (self.county_of(city) if city else None))
+        if not county and has_coordinates:
+            county = self.nearest_county_centre(lat, lng)
+
+        return city, county
+
+IRISH_GAZETTEER = Gazetteer.from_irish_locations()
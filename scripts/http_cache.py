@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP Response Cache for the scrapers
+Content-addressed, gzip-compressed cache used by FetchEngine:
+- Entries are keyed by a hash of the normalized request (API keys stripped,
+  query parameters sorted); bodies are stored once per content hash
+- Each API has its own TTL; stale entries are revalidated with
+  If-None-Match / If-Modified-Since when the server sent validators
+- Offline mode serves only from the cache and fails on a miss, so a whole
+  run can be re-parsed with zero network calls
+
+Configure with environment variables:
+    SCRAPER_CACHE_MODE  normal (default) | refresh | offline | off
+    SCRAPER_CACHE_DIR   cache location (default: scripts/.http_cache)
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache')
+
+# Seconds a cached response is served without revalidation, by host
+DEFAULT_TTLS = {
+    'musicbrainz.org': 30 * 24 * 3600,      # Artist data changes rarely
+    'maps.googleapis.com': 7 * 24 * 3600,   # Paid quota; place details are stable for a week
+    'ws.audioscrobbler.com': 7 * 24 * 3600
+}
+DEFAULT_TTL = 3 * 24 * 3600  # Venue and studio websites
+
+# Query parameters that carry credentials: never part of the key, never stored
+SECRET_PARAMS = {'key', 'api_key', 'apikey', 'token', 'access_token', 'client_secret'}
+
+CACHEABLE_STATUSES = {200, 203, 301, 302, 404, 410}
+
+# Headers kept with a cached response
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Location', 'Content-Language')
+
+# Google APIs answer 200 with an error status in the body; never cache those
+TRANSIENT_API_STATUSES = {'OVER_QUERY_LIMIT', 'REQUEST_DENIED', 'UNKNOWN_ERROR', 'INVALID_REQUEST'}
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a request has no cached response"""
+
+def cache_mode() -> str:
+    return os.environ.get('SCRAPER_CACHE_MODE', 'normal').lower()
+
+def normalize_request(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Canonical form of a GET request: lowercased host, sorted params, no secrets"""
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)]
+    for k, v in (params or {}).items():
+        if v is None:
+            continue
+        values = v if isinstance(v, (list, tuple)) else [v]
+        query.extend((k, str(item)) for item in values)
+
+    query = sorted((k, v) for k, v in query if k.lower() not in SECRET_PARAMS)
+    return urlunparse((
+        parsed.scheme.lower(),
+        (parsed.hostname or '').lower() + (f":{parsed.port}" if parsed.port else ''),
+        parsed.path or '/',
+        '',
+        urlencode(query),
+        ''
+    ))
+
+class HttpCache:
+    """Request-keyed metadata entries pointing at content-addressed gzip bodies"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, mode: str = 'normal',
+                 ttls: Optional[Dict[str, int]] = None, default_ttl: int = DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0}
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.join(cache_dir, 'entries'), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, 'blobs'), exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional['HttpCache']:
+        """Cache configured by SCRAPER_CACHE_MODE / SCRAPER_CACHE_DIR, or None when off"""
+        mode = cache_mode()
+        if mode == 'off':
+            return None
+        if mode not in ('normal', 'refresh', 'offline'):
+            raise ValueError(f"Unknown SCRAPER_CACHE_MODE: {mode}")
+        return cls(os.environ.get('SCRAPER_CACHE_DIR', DEFAULT_CACHE_DIR), mode)
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == 'offline'
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def ttl_for(self, host: str) -> int:
+        for pattern, ttl in self.ttls.items():
+            if host == pattern or host.endswith('.' + pattern):
+                return ttl
+        return self.default_ttl
+
+    def _entry_path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, 'entries', digest[:2], digest + '.json')
+
+    def _blob_path(self, body_hash: str) -> str:
+        return os.path.join(self.cache_dir, 'blobs', body_hash[:2], body_hash + '.gz')
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Cached entry for the request (fresh or stale), or None"""
+        try:
+            with open(self._entry_path(normalize_request(url, params)), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        if self.mode == 'refresh':
+            return False
+        host = urlparse(entry['url']).hostname or ''
+        return time.time() - entry['fetched_at'] < self.ttl_for(host)
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    def to_response(self, entry: Dict[str, Any]) -> requests.Response:
+        """Rebuild a requests.Response from a cache entry"""
+        with gzip.open(self._blob_path(entry['body_sha256']), 'rb') as f:
+            body = f.read()
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = body
+        response.url = entry['url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        response.from_cache = True
+        return response
+
+    def should_store(self, response: requests.Response) -> bool:
+        if response.status_code not in CACHEABLE_STATUSES:
+            return False
+        if 'json' in response.headers.get('Content-Type', ''):
+            try:
+                status = response.json().get('status')
+            except (ValueError, AttributeError):
+                return True
+            return status not in TRANSIENT_API_STATUSES
+        return True
+
+    def store(self, url: str, params: Optional[Dict[str, Any]], response: requests.Response):
+        """Save a response; identical bodies share one compressed blob"""
+        if not self.should_store(response):
+            return
+
+        body = response.content or b''
+        body_hash = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(body_hash)
+        if not os.path.exists(blob_path):
+            self._write_atomic(blob_path, gzip.compress(body))
+
+        key = normalize_request(url, params)
+        entry = {
+            'url': key,
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            'body_sha256': body_hash,
+            'fetched_at': time.time()
+        }
+        self._write_atomic(self._entry_path(key), json.dumps(entry).encode())
+        self.count('stored')
+
+    def touch(self, url: str, params: Optional[Dict[str, Any]], entry: Dict[str, Any]):
+        """Restart an entry's TTL after a 304 Not Modified"""
+        entry['fetched_at'] = time.time()
+        self._write_atomic(self._entry_path(normalize_request(url, params)), json.dumps(entry).encode())
+
+    def log_stats(self):
+        logger.info(f"💾 Cache ({self.mode}): {self.stats['hits']} hits, {self.stats['revalidated']} revalidated, "
+                    f"{self.stats['misses']} misses, {self.stats['stored']} stored")
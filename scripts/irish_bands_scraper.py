@@ -8,14 +8,11 @@ Collects Irish band information using multiple APIs and sources:
 - Last.fm API for additional metadata
 """
 
-import requests
-import json
-import time
 import re
 import logging
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse, quote
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 import os
 import sys
 from dataclasses import dataclass, asdict
@@ -23,6 +20,11 @@ from dataclasses import dataclass, asdict
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from irish_locations import get_all_irish_counties, get_all_irish_cities_and_towns, get_irish_locations_list
+from fetch_engine import FetchEngine
+from fuzzy_dedup import SimilarityIndex, DEDUP_THRESHOLDS
+from location_matcher import IRISH_CITIES, IRISH_COUNTIES, IRISH_LOCATIONS, match_location
+from stream_output import NdjsonWriter, JsonArrayWriter, emit
+from musicbrainz_client import MusicBrainzClient
 from difflib import SequenceMatcher
 import unicodedata
 
@@ -33,6 +35,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MUSICBRAINZ_BAND_QUERY = 'country:IE AND type:group'
+
 @dataclass
 class BandData:
     name: str
@@ -72,22 +76,18 @@ class BandData:
             self.upcomingGigs = []
 
 class IrishBandScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'BandVenueReview/1.0 (https://bandvenuereview.ie; contact@bandvenuereview.ie)'
-        })
-        
-        # Rate limiting delays (seconds)
-        self.delays = {
-            'musicbrainz': 1.0,  # MusicBrainz requires 1 second between requests
-            'lastfm': 0.2,
-            'bandcamp': 0.5,
-            'spotify': 0.1
-        }
-        
-        # Last request times for rate limiting
-        self.last_requests = {}
+    def __init__(self, max_workers: int = 4):
+        # Per-host pacing: MusicBrainz is held to 1 req/s, other APIs run alongside
+        self.fetcher = FetchEngine(
+            host_rates={
+                'musicbrainz.org': 1.0,  # MusicBrainz requires 1 second between requests
+                'ws.audioscrobbler.com': 5.0,
+                'bandcamp.com': 2.0,
+                'api.spotify.com': 10.0
+            },
+            max_workers=max_workers
+        )
+        self.musicbrainz = MusicBrainzClient(self.fetcher)
         
         # Irish location indicators - use standardized list
         self.irish_locations = get_irish_locations_list()
@@ -96,43 +96,8 @@ class IrishBandScraper:
 
     def match_irish_location(self, location_text: str) -> tuple[Optional[str], Optional[str]]:
         """Match location text to standardized Irish city and county"""
-        if not location_text:
-            return None, None
-        
-        location_lower = location_text.lower().strip()
-        
-        # First try to match cities exactly
-        for city in self.irish_cities:
-            if city.lower() == location_lower:
-                return city, None
-        
-        # Then try partial matches for cities
-        for city in self.irish_cities:
-            if city.lower() in location_lower or location_lower in city.lower():
-                return city, None
-        
-        # Try to match counties exactly
-        for county in self.irish_counties:
-            if county.lower() == location_lower or county.lower().replace('county ', '') == location_lower:
-                return None, county
-        
-        # Try partial matches for counties
-        for county in self.irish_counties:
-            county_clean = county.lower().replace('county ', '')
-            if county_clean in location_lower or location_lower in county_clean:
-                return None, county
-        
-        return None, None
-
-    def rate_limit(self, api_name: str):
-        """Implement rate limiting for different APIs"""
-        if api_name in self.last_requests:
-            time_since_last = time.time() - self.last_requests[api_name]
-            delay_needed = self.delays.get(api_name, 0.5)
-            if time_since_last < delay_needed:
-                time.sleep(delay_needed - time_since_last)
-        
-        self.last_requests[api_name] = time.time()
+        # Exact city, partial city, exact county, partial county (precompiled matchers)
+        return match_location(location_text)
 
     def create_slug(self, name: str) -> str:
         """Create URL-friendly slug from band name"""
@@ -157,70 +122,22 @@ class IrishBandScraper:
 
     def search_musicbrainz_bands(self, limit: int = 100) -> List[Dict]:
         """Search MusicBrainz for Irish bands"""
+        return list(self.iter_musicbrainz_bands(limit))
+
+    def iter_musicbrainz_bands(self, limit: int = 100) -> Iterator[Dict]:
+        """Yield Irish band search results from MusicBrainz page by page"""
         logger.info("🎵 Searching MusicBrainz for Irish bands...")
         
-        all_bands = []
-        offset = 0
+        found = 0
+        for artist in self.musicbrainz.search_artists(MUSICBRAINZ_BAND_QUERY, limit):
+            found += 1
+            yield artist
         
-        while True:
-            self.rate_limit('musicbrainz')
-            
-            # Search for groups/bands from Ireland
-            url = "https://musicbrainz.org/ws/2/artist"
-            params = {
-                'query': 'country:IE AND type:group',
-                'fmt': 'json',
-                'limit': min(limit, 100),  # MusicBrainz max is 100
-                'offset': offset
-            }
-            
-            try:
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                artists = data.get('artists', [])
-                
-                if not artists:
-                    break
-                
-                logger.info(f"Found {len(artists)} bands from MusicBrainz (offset: {offset})")
-                all_bands.extend(artists)
-                
-                # Check if we've got all results
-                if len(artists) < 100:
-                    break
-                
-                offset += 100
-                
-                # Limit total results to avoid overwhelming
-                if len(all_bands) >= limit:
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error searching MusicBrainz: {e}")
-                break
-        
-        logger.info(f"✅ Total MusicBrainz bands found: {len(all_bands)}")
-        return all_bands
+        logger.info(f"✅ Total MusicBrainz bands found: {found}")
 
     def get_musicbrainz_band_details(self, mbid: str) -> Dict:
         """Get detailed band information from MusicBrainz"""
-        self.rate_limit('musicbrainz')
-        
-        url = f"https://musicbrainz.org/ws/2/artist/{mbid}"
-        params = {
-            'fmt': 'json',
-            'inc': 'genres+tags+relationships+url-rels+recording-rels'
-        }
-        
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error getting MusicBrainz details for {mbid}: {e}")
-            return {}
+        return self.musicbrainz.lookup_artist(mbid) or {}
 
     def search_lastfm_bands(self, band_name: str) -> Dict:
         """Search Last.fm for additional band data"""
@@ -243,8 +160,6 @@ class IrishBandScraper:
         
         for term in search_terms:
             try:
-                self.rate_limit('bandcamp')
-                
                 # This is a simplified approach - in practice you'd need to scrape
                 # Bandcamp's search results or use their undocumented API
                 logger.info(f"Searching Bandcamp for: {term}")
@@ -266,8 +181,11 @@ class IrishBandScraper:
             
             mbid = band_data.get('id', '')
             
-            # Get detailed information
-            detailed_data = self.get_musicbrainz_band_details(mbid) if mbid else band_data
+            # Discovery results already carry URL relations; only bare search hits need a lookup
+            if 'relations' in band_data or not mbid:
+                detailed_data = band_data
+            else:
+                detailed_data = self.get_musicbrainz_band_details(mbid)
             
             band = BandData(
                 name=name,
@@ -288,6 +206,9 @@ class IrishBandScraper:
                 if area_name:
                     # Use standardized location matching
                     matched_city, matched_county = self.match_irish_location(area_name)
+                    if not matched_city and not matched_county:
+                        # Suburbs, townlands or plain "Ireland": use begin-area and the area hierarchy
+                        matched_city, matched_county = self.musicbrainz.irish_location(detailed_data)
                     if matched_city:
                         band.city = matched_city
                     if matched_county:
@@ -388,91 +309,93 @@ class IrishBandScraper:
 
     def deduplicate_bands(self, bands: List[BandData]) -> List[BandData]:
         """Remove duplicate bands using fuzzy matching"""
+        return list(self.iter_unique_bands(bands))
+
+    def iter_unique_bands(self, bands: Iterable[BandData]) -> Iterator[BandData]:
+        """Streaming dedup: yield each band not similar to one already yielded"""
         logger.info("🔍 Deduplicating bands...")
         
-        unique_bands = []
-        seen_names = []
+        seen_names = SimilarityIndex(DEDUP_THRESHOLDS['band'])
         duplicates_found = 0
         
         for band in bands:
-            is_duplicate = False
-            
-            # Check against existing bands
-            for seen_name in seen_names:
-                similarity = self.similarity(band.name, seen_name)
-                if similarity > 0.85:  # 85% similarity threshold
-                    is_duplicate = True
-                    duplicates_found += 1
-                    logger.debug(f"Duplicate found: {band.name} (similar to {seen_name})")
-                    break
+            # Only names sharing enough character trigrams are compared
+            match = seen_names.find(band.name.lower())
+            if match:
+                duplicates_found += 1
+                logger.debug(f"Duplicate found: {band.name} (similar to {match[0]})")
+                continue
             
-            if not is_duplicate:
-                unique_bands.append(band)
-                seen_names.append(band.name)
+            seen_names.add(band.name.lower())
+            yield band
         
-        logger.info(f"✅ Removed {duplicates_found} duplicates. {len(unique_bands)} unique bands remain.")
-        return unique_bands
+        logger.info(f"✅ Removed {duplicates_found} duplicates. {len(seen_names)} unique bands remain.")
+
+    def is_irish_band(self, band: BandData) -> bool:
+        """Check country, location and description for Irish indicators"""
+        # Check country field
+        if band.country and 'ireland' in band.country.lower():
+            return True
+        
+        # Check city/county for Irish locations using standardized matching
+        if (band.city and band.city in IRISH_CITIES) or (band.county and band.county in IRISH_COUNTIES):
+            return True
+        
+        if band.county and IRISH_LOCATIONS.mentions(band.county):
+            return True
+        
+        # Check description for Irish indicators (whole words, one pass)
+        return bool(band.description and IRISH_LOCATIONS.mentions(band.description))
 
     def filter_irish_bands(self, bands: List[BandData]) -> List[BandData]:
         """Filter to ensure bands are actually Irish"""
-        irish_bands = []
-        
+        irish_bands = list(self.iter_irish_bands(bands))
+        logger.info(f"✅ Filtered to {len(irish_bands)} confirmed Irish bands")
+        return irish_bands
+
+    def iter_irish_bands(self, bands: Iterable[BandData]) -> Iterator[BandData]:
         for band in bands:
-            is_irish = False
-            
-            # Check country field
-            if band.country and 'ireland' in band.country.lower():
-                is_irish = True
-            
-            # Check city/county for Irish locations using standardized matching
-            if (band.city and band.city in self.irish_cities) or (band.county and band.county in self.irish_counties):
-                is_irish = True
-            
-            if band.county and any(loc in band.county.lower() for loc in self.irish_locations):
-                is_irish = True
-            
-            # Check description for Irish indicators
-            if band.description and any(loc in band.description.lower() for loc in self.irish_locations):
-                is_irish = True
-            
-            if is_irish:
-                irish_bands.append(band)
+            if self.is_irish_band(band):
+                yield band
             else:
                 logger.debug(f"Filtered out non-Irish band: {band.name}")
+
+    def mark_band_activity(self, band: BandData) -> BandData:
+        """Mark one band as active based on recent activity"""
+        current_year = datetime.now().year
         
-        logger.info(f"✅ Filtered to {len(irish_bands)} confirmed Irish bands")
-        return irish_bands
+        # Basic activity heuristics
+        activity_indicators = 0
+        
+        # Recent formation
+        if band.formedYear and current_year - band.formedYear <= 3:
+            activity_indicators += 1
+        
+        # Has social media presence
+        if band.facebook or band.instagram or band.twitter:
+            activity_indicators += 1
+        
+        # Has streaming presence
+        if band.spotify or band.bandcamp or band.youtube:
+            activity_indicators += 1
+        
+        # Has website
+        if band.website:
+            activity_indicators += 1
+        
+        # Mark as having recent activity if multiple indicators
+        band.hasRecentActivity = activity_indicators >= 2
+        
+        # Assume active unless proven otherwise (end date in MusicBrainz)
+        if not hasattr(band, 'isActive'):
+            band.isActive = True
+        
+        return band
 
     def mark_active_bands(self, bands: List[BandData]) -> List[BandData]:
         """Mark bands as active based on recent activity"""
-        current_year = datetime.now().year
-        
         for band in bands:
-            # Basic activity heuristics
-            activity_indicators = 0
-            
-            # Recent formation
-            if band.formedYear and current_year - band.formedYear <= 3:
-                activity_indicators += 1
-            
-            # Has social media presence
-            if band.facebook or band.instagram or band.twitter:
-                activity_indicators += 1
-            
-            # Has streaming presence
-            if band.spotify or band.bandcamp or band.youtube:
-                activity_indicators += 1
-            
-            # Has website
-            if band.website:
-                activity_indicators += 1
-            
-            # Mark as having recent activity if multiple indicators
-            band.hasRecentActivity = activity_indicators >= 2
-            
-            # Assume active unless proven otherwise (end date in MusicBrainz)
-            if not hasattr(band, 'isActive'):
-                band.isActive = True
+            self.mark_band_activity(band)
         
         active_count = len([b for b in bands if b.hasRecentActivity])
         logger.info(f"✅ Marked {active_count} bands as having recent activity")
@@ -481,174 +404,175 @@ class IrishBandScraper:
 
     def scrape_all_bands(self, limit: int = 500) -> List[BandData]:
         """Main method to scrape bands from all sources"""
+        return list(self.iter_bands(limit))
+
+    def iter_bands(self, limit: int = 500) -> Iterator[BandData]:
+        """Streaming scrape: fetch, parse, filter, dedup, enrich
+
+        Each stage is a generator, so a band is yielded (and can be written)
+        as soon as its details arrive; only the dedup index grows with the run.
+        """
         logger.info("🎵 Starting Irish bands scraping...")
         
-        all_bands = []
-        
-        # 1. Search MusicBrainz for official bands
+        # 1. Search MusicBrainz for official bands, with URL relations from area browses/lookups (fetch)
         logger.info("📀 Fetching from MusicBrainz...")
-        mb_bands_data = self.search_musicbrainz_bands(limit)
+        mb_bands_data = self.musicbrainz.iter_detailed_artists(MUSICBRAINZ_BAND_QUERY, limit)
         
-        for band_data in mb_bands_data:
-            band = self.process_musicbrainz_band(band_data)
-            if band:
-                all_bands.append(band)
-                logger.info(f"✅ Added: {band.name} (formed: {band.formedYear or 'unknown'})")
+        # 2. Parse in order; area hierarchy lookups go through the same client (parse)
+        parsed = (band for band in self.fetcher.imap(self.process_musicbrainz_band, mb_bands_data) if band)
         
-        # 2. Search Bandcamp (placeholder implementation)
-        logger.info("🎸 Fetching from Bandcamp...")
-        bandcamp_bands = self.search_bandcamp_irish_bands()
-        # Process Bandcamp bands (implementation would go here)
+        # Bandcamp is a placeholder source and contributes no bands yet
         
-        # 3. Filter for Irish bands
-        logger.info("🇮🇪 Filtering for Irish bands...")
-        irish_bands = self.filter_irish_bands(all_bands)
+        # 3. Filter for Irish bands (normalize)
+        irish_bands = self.iter_irish_bands(parsed)
         
         # 4. Deduplicate
-        logger.info("🔄 Removing duplicates...")
-        unique_bands = self.deduplicate_bands(irish_bands)
+        unique_bands = self.iter_unique_bands(irish_bands)
         
-        # 5. Enhance with additional data
-        logger.info("📈 Enhancing with additional data...")
+        # 5. Enhance with additional data and mark active bands (enrich)
+        count = 0
         for band in unique_bands:
             self.enhance_with_additional_sources(band)
+            self.mark_band_activity(band)
+            count += 1
+            logger.info(f"✅ Added: {band.name} (formed: {band.formedYear or 'unknown'})")
+            yield band
         
-        # 6. Mark active bands
-        logger.info("🎯 Marking active bands...")
-        final_bands = self.mark_active_bands(unique_bands)
-        
-        logger.info(f"✅ Total Irish bands collected: {len(final_bands)}")
-        return final_bands
+        self.fetcher.log_stats()
+        logger.info(f"✅ Total Irish bands collected: {count}")
 
     def save_to_json(self, bands: List[BandData], filename: str = 'irish_bands_data.json'):
         """Save bands to JSON file"""
-        bands_data = [asdict(band) for band in bands]
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(bands_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Saved {len(bands_data)} bands to {filename}")
+        with JsonArrayWriter(filename) as writer:
+            for band in bands:
+                writer.write(asdict(band))
 
     def create_sanity_cms_format(self, bands: List[BandData], filename: str = 'bands_for_sanity.json'):
         """Convert bands to Sanity CMS format"""
-        sanity_bands = []
+        with JsonArrayWriter(filename) as writer:
+            for band in bands:
+                writer.write(self.to_sanity_document(band))
         
-        for band in bands:
-            sanity_band = {
-                "_id": band.slug,
-                "_type": "band",
-                "name": band.name,
-                "slug": {"_type": "slug", "current": band.slug},
-                "description": band.description,
-                "location": {
-                    "_type": "location",
-                    "city": band.city,
-                    "county": band.county,
-                    "country": band.country
-                },
-                "contact": {
-                    "_type": "contact",
-                    "email": band.email,
-                    "website": band.website,
-                    "facebook": band.facebook,
-                    "instagram": band.instagram,
-                    "twitter": band.twitter
-                },
-                "musicDetails": {
-                    "_type": "musicDetails",
-                    "genres": band.musicGenres,
-                    "bandType": band.bandType,
-                    "formedYear": band.formedYear,
-                    "memberCount": band.memberCount,
-                    "recordLabel": band.recordLabel
-                },
-                "streamingLinks": {
-                    "_type": "streamingLinks",
-                    "spotify": band.spotify,
-                    "bandcamp": band.bandcamp,
-                    "youtube": band.youtube
-                },
-                "stats": {
-                    "_type": "stats",
-                    "lastfmListeners": band.lastfmListeners,
-                    "spotifyFollowers": band.spotifyFollowers
-                },
-                "isActive": band.isActive,
-                "hasRecentActivity": band.hasRecentActivity,
-                "verified": False,
-                "featured": False,
-                "musicbrainzId": band.musicbrainzId
-            }
-            
-            # Remove None values and empty objects
-            def clean_dict(d):
-                if isinstance(d, dict):
-                    return {k: clean_dict(v) for k, v in d.items() 
-                           if v is not None and v != {} and v != []}
-                return d
-            
-            sanity_band = clean_dict(sanity_band)
-            sanity_bands.append(sanity_band)
+        logger.info(f"Created Sanity CMS format file: {filename}")
+
+    def to_sanity_document(self, band: BandData) -> Dict[str, Any]:
+        """Convert one band to a Sanity CMS document"""
+        sanity_band = {
+            "_id": band.slug,
+            "_type": "band",
+            "name": band.name,
+            "slug": {"_type": "slug", "current": band.slug},
+            "description": band.description,
+            "location": {
+                "_type": "location",
+                "city": band.city,
+                "county": band.county,
+                "country": band.country
+            },
+            "contact": {
+                "_type": "contact",
+                "email": band.email,
+                "website": band.website,
+                "facebook": band.facebook,
+                "instagram": band.instagram,
+                "twitter": band.twitter
+            },
+            "musicDetails": {
+                "_type": "musicDetails",
+                "genres": band.musicGenres,
+                "bandType": band.bandType,
+                "formedYear": band.formedYear,
+                "memberCount": band.memberCount,
+                "recordLabel": band.recordLabel
+            },
+            "streamingLinks": {
+                "_type": "streamingLinks",
+                "spotify": band.spotify,
+                "bandcamp": band.bandcamp,
+                "youtube": band.youtube
+            },
+            "stats": {
+                "_type": "stats",
+                "lastfmListeners": band.lastfmListeners,
+                "spotifyFollowers": band.spotifyFollowers
+            },
+            "isActive": band.isActive,
+            "hasRecentActivity": band.hasRecentActivity,
+            "verified": False,
+            "featured": False,
+            "musicbrainzId": band.musicbrainzId
+        }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(sanity_bands, f, indent=2, ensure_ascii=False)
+        # Remove None values and empty objects
+        def clean_dict(d):
+            if isinstance(d, dict):
+                return {k: clean_dict(v) for k, v in d.items() 
+                       if v is not None and v != {} and v != []}
+            return d
         
-        logger.info(f"Created Sanity CMS format file: {filename}")
+        return clean_dict(sanity_band)
 
 def main():
     """Main execution function"""
     scraper = IrishBandScraper()
     
     try:
-        # Scrape all bands
-        bands = scraper.scrape_all_bands(limit=1000)  # Adjust limit as needed
+        # Stream bands to disk as they clear the pipeline
+        outputs = [
+            (NdjsonWriter('irish_bands_data.ndjson'), asdict),
+            (NdjsonWriter('bands_import.ndjson'), scraper.to_sanity_document),
+            (JsonArrayWriter('irish_bands_data.json'), asdict),
+            (JsonArrayWriter('bands_for_sanity.json'), scraper.to_sanity_document)
+        ]
         
-        # Save results
-        scraper.save_to_json(bands)
-        scraper.create_sanity_cms_format(bands)
+        # Statistics are counted on the way past; the band list is never held in memory
+        total = 0
+        active_bands = 0
+        recent_activity = 0
+        with_genres = 0
+        with_social = 0
+        city_counts = {}
+        genre_counts = {}
+        decades = {}
+        
+        try:
+            for band in emit(scraper.iter_bands(limit=1000), outputs):  # Adjust limit as needed
+                total += 1
+                active_bands += bool(band.isActive)
+                recent_activity += bool(band.hasRecentActivity)
+                with_genres += bool(band.musicGenres)
+                with_social += bool(band.facebook or band.instagram or band.twitter)
+                
+                city = band.city or 'Unknown'
+                city_counts[city] = city_counts.get(city, 0) + 1
+                
+                for genre in band.musicGenres:
+                    genre_counts[genre] = genre_counts.get(genre, 0) + 1
+                
+                if band.formedYear:
+                    decade = (band.formedYear // 10) * 10
+                    decades[decade] = decades.get(decade, 0) + 1
+        finally:
+            for writer, _ in outputs:
+                writer.close()
         
         # Print summary
         print(f"\n📊 IRISH BANDS SCRAPING SUMMARY:")
-        print(f"Total bands found: {len(bands)}")
-        
-        # Statistics
-        active_bands = [b for b in bands if b.isActive]
-        recent_activity = [b for b in bands if b.hasRecentActivity]
-        with_genres = [b for b in bands if b.musicGenres]
-        with_social = [b for b in bands if b.facebook or b.instagram or b.twitter]
+        print(f"Total bands found: {total}")
         
-        print(f"Active bands: {len(active_bands)}")
-        print(f"Bands with recent activity: {len(recent_activity)}")
-        print(f"Bands with genres: {len(with_genres)}")
-        print(f"Bands with social media: {len(with_social)}")
-        
-        # City breakdown
-        city_counts = {}
-        for band in bands:
-            city = band.city or 'Unknown'
-            city_counts[city] = city_counts.get(city, 0) + 1
+        print(f"Active bands: {active_bands}")
+        print(f"Bands with recent activity: {recent_activity}")
+        print(f"Bands with genres: {with_genres}")
+        print(f"Bands with social media: {with_social}")
         
         print(f"\n🏙️ By City:")
         for city, count in sorted(city_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
             print(f"  {city}: {count}")
         
-        # Genre breakdown
-        genre_counts = {}
-        for band in bands:
-            for genre in band.musicGenres:
-                genre_counts[genre] = genre_counts.get(genre, 0) + 1
-        
         print(f"\n🎭 Top Genres:")
         for genre, count in sorted(genre_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
             print(f"  {genre}: {count}")
         
-        # Formation years
-        decades = {}
-        for band in bands:
-            if band.formedYear:
-                decade = (band.formedYear // 10) * 10
-                decades[decade] = decades.get(decade, 0) + 1
-        
         print(f"\n📅 By Formation Decade:")
         for decade, count in sorted(decades.items()):
             print(f"  {decade}s: {count}")
@@ -657,6 +581,8 @@ def main():
         print(f"📁 Files saved:")
         print(f"  - irish_bands_data.json")
         print(f"  - bands_for_sanity.json")
+        print(f"  - irish_bands_data.ndjson")
+        print(f"  - bands_import.ndjson (Sanity CLI import)")
         
     except Exception as e:
         logger.error(f"❌ Scraping failed: {e}")
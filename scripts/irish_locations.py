@@ -175,3 +175,268 @@ def get_irish_locations_list():
     counties = [county.lower() for county in get_all_irish_counties()]
     cities = [city.lower() for city in get_all_irish_cities_and_towns()]
     return counties + cities + ['ireland', 'éire', 'northern ireland']
+
+def get_town_coordinates():
+    """Get town centre coordinates and county for cities and towns (name -> (county, lat, lng))
+
+    Town centres are approximate (within a few km); enough to pick the
+    nearest town or county for a venue or studio.
+    """
+    return {
+        # Major cities
+        "Dublin": ("Dublin", 53.3498, -6.2603),
+        "Cork": ("Cork", 51.8979, -8.4706),
+        "Belfast": ("Antrim", 54.5973, -5.9301),
+        "Galway": ("Galway", 53.2707, -9.0568),
+        "Limerick": ("Limerick", 52.6638, -8.6267),
+        "Waterford": ("Waterford", 52.2593, -7.1101),
+        "Derry": ("Derry", 54.9966, -7.3086),
+
+        # County towns and large towns
+        "Kilkenny": ("Kilkenny", 52.6541, -7.2448),
+        "Wexford": ("Wexford", 52.3369, -6.4633),
+        "Sligo": ("Sligo", 54.2698, -8.4694),
+        "Dundalk": ("Louth", 54.0019, -6.4052),
+        "Drogheda": ("Louth", 53.7189, -6.3478),
+        "Tralee": ("Kerry", 52.2713, -9.7016),
+        "Athlone": ("Westmeath", 53.4222, -7.9372),
+        "Ennis": ("Clare", 52.8438, -8.9864),
+        "Letterkenny": ("Donegal", 54.9503, -7.7353),
+        "Carlow": ("Carlow", 52.8417, -6.9264),
+        "Naas": ("Kildare", 53.2158, -6.6686),
+        "Portlaoise": ("Laois", 53.0344, -7.2985),
+        "Mullingar": ("Westmeath", 53.5239, -7.3398),
+        "Tullamore": ("Offaly", 53.2736, -7.4881),
+        "Navan": ("Meath", 53.6538, -6.6802),
+        "Bray": ("Wicklow", 53.2026, -6.1114),
+        "Wicklow": ("Wicklow", 52.9808, -6.0431),
+        "Arklow": ("Wicklow", 52.7919, -6.1536),
+        "Roscommon": ("Roscommon", 53.6278, -8.1861),
+        "Longford": ("Longford", 53.7278, -7.7933),
+        "Cavan": ("Cavan", 53.9906, -7.3606),
+        "Monaghan": ("Monaghan", 54.2489, -6.9683),
+        "Carrick-on-Shannon": ("Leitrim", 53.9472, -8.0958),
+        "Castlebar": ("Mayo", 53.8561, -9.2985),
+        "Donegal": ("Donegal", 54.6539, -8.1100),
+        "Clonmel": ("Tipperary", 52.3553, -7.7044),
+        "Nenagh": ("Tipperary", 52.8619, -8.1967),
+
+        # Northern Ireland
+        "Newry": ("Down", 54.1751, -6.3402),
+        "Armagh": ("Armagh", 54.3503, -6.6528),
+        "Omagh": ("Tyrone", 54.6017, -7.3073),
+        "Enniskillen": ("Fermanagh", 54.3445, -7.6362),
+        "Ballymena": ("Antrim", 54.8642, -6.2736),
+        "Coleraine": ("Derry", 55.1344, -6.6681),
+        "Lisburn": ("Antrim", 54.5162, -6.0581),
+        "Bangor": ("Down", 54.6536, -5.6683),
+        "Newtownabbey": ("Antrim", 54.6598, -5.9099),
+        "Larne": ("Antrim", 54.8578, -5.8236),
+        "Antrim": ("Antrim", 54.7167, -6.2167),
+        "Carrickfergus": ("Antrim", 54.7158, -5.8058),
+        "Portrush": ("Antrim", 55.2042, -6.6528),
+        "Downpatrick": ("Down", 54.3283, -5.7153),
+        "Newtownards": ("Down", 54.5925, -5.6919),
+        "Banbridge": ("Down", 54.3481, -6.2703),
+        "Lurgan": ("Armagh", 54.4675, -6.3350),
+        "Portadown": ("Armagh", 54.4231, -6.4436),
+        "Dungannon": ("Tyrone", 54.5036, -6.7700),
+        "Cookstown": ("Tyrone", 54.6439, -6.7456),
+        "Strabane": ("Tyrone", 54.8267, -7.4633),
+        "Aughnacloy": ("Tyrone", 54.4172, -6.9678),
+        "Limavady": ("Derry", 55.0519, -6.9461),
+        "Magherafelt": ("Derry", 54.7556, -6.6078),
+        "Lisnaskea": ("Fermanagh", 54.2500, -7.4417),
+        "Irvinestown": ("Fermanagh", 54.4731, -7.6314),
+
+        # Dublin suburbs and county towns
+        "Swords": ("Dublin", 53.4597, -6.2181),
+        "Malahide": ("Dublin", 53.4508, -6.1544),
+        "Howth": ("Dublin", 53.3786, -6.0656),
+        "Balbriggan": ("Dublin", 53.6128, -6.1819),
+        "Skerries": ("Dublin", 53.5828, -6.1083),
+        "Tallaght": ("Dublin", 53.2859, -6.3733),
+        "Lucan": ("Dublin", 53.3572, -6.4486),
+        "Clondalkin": ("Dublin", 53.3203, -6.3944),
+        "Blanchardstown": ("Dublin", 53.3881, -6.3775),
+        "Dun Laoghaire": ("Dublin", 53.2940, -6.1349),
+        "Rathmines": ("Dublin", 53.3219, -6.2650),
+
+        # Leinster
+        "Greystones": ("Wicklow", 53.1440, -6.0722),
+        "Blessington": ("Wicklow", 53.1700, -6.5333),
+        "Baltinglass": ("Wicklow", 52.9411, -6.7092),
+        "Rathdrum": ("Wicklow", 52.9297, -6.2303),
+        "Leixlip": ("Kildare", 53.3659, -6.4956),
+        "Celbridge": ("Kildare", 53.3399, -6.5383),
+        "Maynooth": ("Kildare", 53.3813, -6.5918),
+        "Athy": ("Kildare", 52.9914, -6.9867),
+        "Newbridge": ("Kildare", 53.1819, -6.7967),
+        "Kildare": ("Kildare", 53.1589, -6.9096),
+        "Trim": ("Meath", 53.5550, -6.7917),
+        "Kells": ("Meath", 53.7264, -6.8792),
+        "Ashbourne": ("Meath", 53.5111, -6.3975),
+        "Dunboyne": ("Meath", 53.4194, -6.4739),
+        "Laytown": ("Meath", 53.6797, -6.2392),
+        "Oldcastle": ("Meath", 53.7706, -7.1622),
+        "Ardee": ("Louth", 53.8597, -6.5386),
+        "Callan": ("Kilkenny", 52.5447, -7.3906),
+        "Thomastown": ("Kilkenny", 52.5267, -7.1367),
+        "Castlecomer": ("Kilkenny", 52.8064, -7.2106),
+        "Bagenalstown": ("Carlow", 52.7003, -6.9603),
+        "Tullow": ("Carlow", 52.8003, -6.7369),
+        "New Ross": ("Wexford", 52.3967, -6.9419),
+        "Enniscorthy": ("Wexford", 52.5019, -6.5581),
+        "Gorey": ("Wexford", 52.6756, -6.2947),
+        "Portarlington": ("Laois", 53.1622, -7.1911),
+        "Mountmellick": ("Laois", 53.1136, -7.3203),
+        "Abbeyleix": ("Laois", 52.9150, -7.3478),
+        "Birr": ("Offaly", 53.0914, -7.9133),
+        "Edenderry": ("Offaly", 53.3453, -7.0492),
+        "Banagher": ("Offaly", 53.1897, -7.9856),
+        "Moate": ("Westmeath", 53.3969, -7.7197),
+        "Kilbeggan": ("Westmeath", 53.3686, -7.5031),
+        "Castlepollard": ("Westmeath", 53.6808, -7.2969),
+        "Granard": ("Longford", 53.7778, -7.4942),
+        "Edgeworthstown": ("Longford", 53.6981, -7.6081),
+        "Ballymahon": ("Longford", 53.5650, -7.7650),
+
+        # Munster
+        "Clonakilty": ("Cork", 51.6231, -8.8706),
+        "Charleville": ("Cork", 52.3556, -8.6836),
+        "Mallow": ("Cork", 52.1345, -8.6450),
+        "Fermoy": ("Cork", 52.1383, -8.2750),
+        "Midleton": ("Cork", 51.9153, -8.1754),
+        "Cobh": ("Cork", 51.8503, -8.2967),
+        "Youghal": ("Cork", 51.9536, -7.8506),
+        "Kinsale": ("Cork", 51.7059, -8.5222),
+        "Bandon": ("Cork", 51.7461, -8.7425),
+        "Skibbereen": ("Cork", 51.5500, -9.2667),
+        "Bantry": ("Cork", 51.6800, -9.4528),
+        "Macroom": ("Cork", 51.9044, -8.9569),
+        "Ballincollig": ("Cork", 51.8878, -8.5886),
+        "Carrigaline": ("Cork", 51.8117, -8.3986),
+        "Mitchelstown": ("Cork", 52.2656, -8.2683),
+        "Killarney": ("Kerry", 52.0599, -9.5044),
+        "Kenmare": ("Kerry", 51.8831, -9.5844),
+        "Dingle": ("Kerry", 52.1406, -10.2681),
+        "Listowel": ("Kerry", 52.4464, -9.4850),
+        "Ballybunion": ("Kerry", 52.5111, -9.6714),
+        "Cahersiveen": ("Kerry", 51.9486, -10.2222),
+        "Castleisland": ("Kerry", 52.2325, -9.4625),
+        "Abbeyfeale": ("Limerick", 52.3858, -9.3006),
+        "Newcastle West": ("Limerick", 52.4492, -9.0611),
+        "Adare": ("Limerick", 52.5644, -8.7900),
+        "Kilmallock": ("Limerick", 52.4000, -8.5772),
+        "Shannon": ("Clare", 52.7038, -8.8642),
+        "Kilrush": ("Clare", 52.6397, -9.4833),
+        "Kilkee": ("Clare", 52.6819, -9.6403),
+        "Lahinch": ("Clare", 52.9336, -9.3447),
+        "Ennistymon": ("Clare", 52.9403, -9.2931),
+        "Thurles": ("Tipperary", 52.6811, -7.8119),
+        "Tipperary": ("Tipperary", 52.4733, -8.1567),
+        "Cahir": ("Tipperary", 52.3775, -7.9194),
+        "Cashel": ("Tipperary", 52.5158, -7.8858),
+        "Roscrea": ("Tipperary", 52.9511, -7.8017),
+        "Carrick-on-Suir": ("Tipperary", 52.3492, -7.4131),
+        "Dungarvan": ("Waterford", 52.0883, -7.6264),
+        "Lismore": ("Waterford", 52.1358, -7.9364),
+        "Tramore": ("Waterford", 52.1622, -7.1522),
+
+        # Connacht and Ulster (Republic)
+        "Salthill": ("Galway", 53.2610, -9.0767),
+        "Oranmore": ("Galway", 53.2683, -8.9269),
+        "Ballinasloe": ("Galway", 53.3275, -8.2194),
+        "Tuam": ("Galway", 53.5144, -8.8511),
+        "Gort": ("Galway", 53.0656, -8.8194),
+        "Loughrea": ("Galway", 53.1969, -8.5669),
+        "Portumna": ("Galway", 53.0886, -8.2186),
+        "Clifden": ("Galway", 53.4889, -10.0206),
+        "Westport": ("Mayo", 53.8008, -9.5182),
+        "Ballina": ("Mayo", 54.1133, -9.1561),
+        "Claremorris": ("Mayo", 53.7217, -8.9969),
+        "Ballinrobe": ("Mayo", 53.6331, -9.2297),
+        "Swinford": ("Mayo", 53.9436, -8.9506),
+        "Ballyhaunis": ("Mayo", 53.7631, -8.7647),
+        "Belmullet": ("Mayo", 54.2247, -9.9903),
+        "Knock": ("Mayo", 53.7925, -8.9186),
+        "Achill Sound": ("Mayo", 53.9311, -9.9317),
+        "Boyle": ("Roscommon", 53.9733, -8.3014),
+        "Castlerea": ("Roscommon", 53.7683, -8.4928),
+        "Strokestown": ("Roscommon", 53.7764, -8.1033),
+        "Ballaghaderreen": ("Roscommon", 53.9011, -8.5781),
+        "Ballymote": ("Sligo", 54.0900, -8.5158),
+        "Tubbercurry": ("Sligo", 54.0556, -8.7286),
+        "Enniscrone": ("Sligo", 54.2147, -9.0953),
+        "Manorhamilton": ("Leitrim", 54.3006, -8.1764),
+        "Bundoran": ("Donegal", 54.4778, -8.2806),
+        "Ballyshannon": ("Donegal", 54.5036, -8.1894),
+        "Buncrana": ("Donegal", 55.1333, -7.4500),
+        "Lifford": ("Donegal", 54.8336, -7.4803),
+        "Carrickmacross": ("Monaghan", 53.9772, -6.7189),
+        "Castleblayney": ("Monaghan", 54.1200, -6.7375),
+        "Clones": ("Monaghan", 54.1797, -7.2306),
+        "Belturbet": ("Cavan", 54.1019, -7.4486),
+        "Bailieborough": ("Cavan", 53.9147, -6.9686),
+        "Cootehill": ("Cavan", 54.0733, -7.0828),
+        "Virginia": ("Cavan", 53.8339, -7.0781),
+        "Kingscourt": ("Cavan", 53.9069, -6.8053),
+        "Ballyjamesduff": ("Cavan", 53.8644, -7.2036)
+    }
+
+def get_county_centroids():
+    """Get approximate geographic centre of each of the 32 counties (county -> (lat, lng))"""
+    return {
+        "Antrim": (54.87, -6.23), "Armagh": (54.30, -6.60), "Carlow": (52.72, -6.83),
+        "Cavan": (53.98, -7.30), "Clare": (52.86, -9.00), "Cork": (51.97, -8.74),
+        "Derry": (54.93, -6.88), "Donegal": (54.92, -8.00), "Down": (54.35, -5.95),
+        "Dublin": (53.38, -6.27), "Fermanagh": (54.35, -7.65), "Galway": (53.36, -8.80),
+        "Kerry": (52.13, -9.65), "Kildare": (53.20, -6.78), "Kilkenny": (52.58, -7.22),
+        "Laois": (52.99, -7.35), "Leitrim": (54.12, -8.00), "Limerick": (52.50, -8.77),
+        "Longford": (53.73, -7.73), "Louth": (53.92, -6.49), "Mayo": (53.90, -9.30),
+        "Meath": (53.61, -6.66), "Monaghan": (54.15, -6.93), "Offaly": (53.23, -7.60),
+        "Roscommon": (53.76, -8.27), "Sligo": (54.12, -8.60), "Tipperary": (52.67, -7.85),
+        "Tyrone": (54.60, -7.10), "Waterford": (52.18, -7.57), "Westmeath": (53.53, -7.47),
+        "Wexford": (52.47, -6.58), "Wicklow": (52.98, -6.37)
+    }
+
+def get_eircode_routing_keys():
+    """Get the county of each Eircode routing key (first 3 characters of an Eircode)
+
+    A few routing areas cross a county boundary; the county of the routing
+    key's principal post town is used.
+    """
+    routing_keys = {
+        "A41": "Dublin", "A42": "Dublin", "A45": "Dublin", "A63": "Wicklow", "A67": "Wicklow",
+        "A75": "Monaghan", "A81": "Monaghan", "A82": "Meath", "A83": "Meath", "A84": "Meath",
+        "A85": "Meath", "A86": "Meath", "A91": "Louth", "A92": "Louth", "A94": "Dublin",
+        "A96": "Dublin", "A98": "Wicklow", "C15": "Meath",
+        "E21": "Tipperary", "E25": "Tipperary", "E32": "Tipperary", "E34": "Tipperary",
+        "E41": "Tipperary", "E45": "Tipperary", "E53": "Tipperary", "E91": "Tipperary",
+        "F12": "Mayo", "F23": "Mayo", "F26": "Mayo", "F28": "Mayo", "F31": "Mayo", "F35": "Mayo",
+        "F42": "Roscommon", "F45": "Roscommon", "F52": "Roscommon", "F56": "Sligo", "F91": "Sligo",
+        "F92": "Donegal", "F93": "Donegal", "F94": "Donegal",
+        "H12": "Cavan", "H14": "Cavan", "H16": "Cavan", "H18": "Monaghan", "H23": "Monaghan",
+        "H53": "Galway", "H54": "Galway", "H62": "Galway", "H65": "Galway", "H71": "Galway", "H91": "Galway",
+        "K32": "Dublin", "K34": "Dublin", "K36": "Dublin", "K45": "Dublin", "K56": "Dublin",
+        "K67": "Dublin", "K78": "Dublin",
+        "N37": "Westmeath", "N39": "Longford", "N41": "Leitrim", "N91": "Westmeath",
+        "P12": "Cork", "P14": "Cork", "P17": "Cork", "P24": "Cork", "P25": "Cork", "P31": "Cork",
+        "P32": "Cork", "P36": "Cork", "P43": "Cork", "P47": "Cork", "P51": "Cork", "P56": "Cork",
+        "P61": "Cork", "P67": "Cork", "P72": "Cork", "P75": "Cork", "P81": "Cork", "P85": "Cork",
+        "R14": "Kildare", "R21": "Carlow", "R32": "Laois", "R35": "Offaly", "R42": "Offaly",
+        "R45": "Offaly", "R51": "Kildare", "R56": "Kildare", "R93": "Carlow", "R95": "Kilkenny",
+        "T12": "Cork", "T23": "Cork", "T34": "Cork", "T45": "Cork", "T56": "Cork",
+        "V14": "Clare", "V15": "Clare", "V23": "Kerry", "V31": "Kerry", "V35": "Limerick",
+        "V42": "Limerick", "V92": "Kerry", "V93": "Kerry", "V94": "Limerick", "V95": "Clare",
+        "W12": "Kildare", "W23": "Kildare", "W34": "Kildare", "W91": "Kildare",
+        "X35": "Waterford", "X42": "Waterford", "X91": "Waterford",
+        "Y14": "Wicklow", "Y21": "Wexford", "Y25": "Wexford", "Y34": "Wexford", "Y35": "Wexford"
+    }
+
+    # Dublin postal districts
+    for district in list(range(1, 19)) + [20, 22, 24]:
+        routing_keys[f"D{district:02d}"] = "Dublin"
+    routing_keys["D6W"] = "Dublin"
+
+    return routing_keys
@@ -4,9 +4,8 @@ Irish Music Studios Directory Scraper
 Scrapes specific Irish music directories and websites for studio information
 """
 
-import requests
+import argparse
 import json
-import time
 import re
 import logging
 from datetime import datetime
@@ -16,6 +15,12 @@ import os
 from dataclasses import dataclass, asdict
 from dotenv import load_dotenv
 
+from fetch_engine import FetchEngine
+from gazetteer import IRISH_GAZETTEER
+from http_cache import cache_mode
+from scrape_journal import ScrapeJournal
+from studio_enrichment import keyword_matcher
+
 # Load environment variables
 load_dotenv()
 
@@ -56,12 +61,12 @@ class StudioData:
             self.genresSupported = []
 
 class IrishStudioDirectoryScraper:
-    def __init__(self, google_api_key: str):
+    def __init__(self, google_api_key: str, max_workers: int = 8):
         self.google_api_key = google_api_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        self.fetcher = FetchEngine(
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            max_workers=max_workers
+        )
         
         # Expanded Irish music studios (manually curated list)
         self.known_studios = [
@@ -285,9 +290,18 @@ class IrishStudioDirectoryScraper:
         return contact
 
     def geocode_address(self, address: str) -> Optional[Dict[str, float]]:
-        """Get coordinates for an address using Google Geocoding API"""
+        """Get coordinates for an address
+
+        Addresses ending in a listed town resolve offline to the town centre;
+        only the rest go to the Google Geocoding API.
+        """
         if not address:
             return None
+        
+        for part in reversed(address.split(',')):
+            coordinates = IRISH_GAZETTEER.coordinates(part)
+            if coordinates:
+                return {'lat': coordinates[0], 'lng': coordinates[1]}
             
         url = "https://maps.googleapis.com/maps/api/geocode/json"
         params = {
@@ -296,7 +310,7 @@ class IrishStudioDirectoryScraper:
         }
         
         try:
-            response = self.session.get(url, params=params)
+            response = self.fetcher.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -311,45 +325,51 @@ class IrishStudioDirectoryScraper:
         
         return None
 
-    def search_google_places_for_studios(self, city: str) -> List[Dict]:
-        """Search Google Places for recording studios in a city"""
-        search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        
-        search_terms = [
+    def get_studio_search_terms(self, city: str) -> List[str]:
+        """Google Places text searches for studios in a city"""
+        return [
             f"recording studio {city} Ireland",
             f"music studio {city} Ireland", 
             f"sound studio {city} Ireland",
             f"audio recording {city} Ireland"
         ]
+
+    def search_google_places_text(self, term: str) -> Optional[List[Dict]]:
+        """Run one Google Places text search (None if the search failed)"""
+        search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
         
+        try:
+            logger.info(f"Searching Google Places: {term}")
+            
+            params = {
+                'query': term,
+                'key': self.google_api_key,
+                'type': 'establishment'
+            }
+            
+            response = self.fetcher.get(search_url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            if data.get('status') == 'OK':
+                return data.get('results', [])
+            return []
+            
+        except Exception as e:
+            logger.error(f"Error searching Google Places for {term}: {e}")
+            return None
+
+    def search_google_places_for_studios(self, city: str) -> List[Dict]:
+        """Search Google Places for recording studios in a city"""
         all_places = []
         seen_place_ids = set()
         
-        for term in search_terms:
-            try:
-                logger.info(f"Searching Google Places: {term}")
-                
-                params = {
-                    'query': term,
-                    'key': self.google_api_key,
-                    'type': 'establishment'
-                }
-                
-                response = self.session.get(search_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                if data.get('status') == 'OK':
-                    for place in data.get('results', []):
-                        place_id = place.get('place_id')
-                        if place_id and place_id not in seen_place_ids:
-                            seen_place_ids.add(place_id)
-                            all_places.append(place)
-                
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                logger.error(f"Error searching Google Places for {term}: {e}")
+        for term in self.get_studio_search_terms(city):
+            for place in self.search_google_places_text(term) or []:
+                place_id = place.get('place_id')
+                if place_id and place_id not in seen_place_ids:
+                    seen_place_ids.add(place_id)
+                    all_places.append(place)
         
         return all_places
 
@@ -368,7 +388,7 @@ class IrishStudioDirectoryScraper:
                 'key': self.google_api_key
             }
             
-            response = self.session.get(details_url, params=params)
+            response = self.fetcher.get(details_url, params=params)
             response.raise_for_status()
             
             details_data = response.json()
@@ -377,9 +397,12 @@ class IrishStudioDirectoryScraper:
             
             details = details_data.get('result', {})
             
+            location = details.get('geometry', {}).get('location', {})
+            lat, lng = location.get('lat'), location.get('lng')
+            
             # Extract city from address
             address = details.get('formatted_address', '')
-            city = self.extract_city_from_address(address)
+            city = self.extract_city_from_address(address, lat, lng)
             
             studio = StudioData(
                 name=name,
@@ -392,21 +415,18 @@ class IrishStudioDirectoryScraper:
             )
             
             # Add location if available
-            geometry = details.get('geometry', {})
-            location = geometry.get('location', {})
             if location:
-                studio.latitude = location.get('lat')
-                studio.longitude = location.get('lng')
+                studio.latitude = lat
+                studio.longitude = lng
             
             # Parse address
             if address:
                 address_parts = [part.strip() for part in address.split(',')]
                 if len(address_parts) >= 2:
                     studio.street = address_parts[0]
-                    for part in address_parts:
-                        if 'Co.' in part or 'County' in part:
-                            studio.county = part.strip()
-                            break
+            
+            # County from the Eircode, the address or the coordinates
+            _, studio.county = IRISH_GAZETTEER.resolve(address, lat, lng)
             
             return studio
             
@@ -414,25 +434,20 @@ class IrishStudioDirectoryScraper:
             logger.error(f"Error processing Google Place {place.get('name', 'Unknown')}: {e}")
             return None
 
-    def extract_city_from_address(self, address: str) -> str:
-        """Extract city name from formatted address"""
-        if not address:
-            return "Ireland"
-        
-        # Split by commas and look for known Irish cities
-        parts = [part.strip() for part in address.split(',')]
+    def extract_city_from_address(self, address: str, lat: Optional[float] = None,
+                                  lng: Optional[float] = None) -> str:
+        """Extract city name from formatted address, or the nearest town to the coordinates"""
+        parts = [part.strip() for part in (address or '').split(',')]
         
-        irish_cities = [
-            "Dublin", "Cork", "Belfast", "Galway", "Limerick", "Waterford",
-            "Drogheda", "Kilkenny", "Wexford", "Sligo", "Dundalk", "Bray",
-            "Navan", "Ennis", "Tralee", "Carlow", "Naas", "Athlone",
-            "Portlaoise", "Mullingar", "Clonakilty", "Moate"
-        ]
+        # A town named outside the street names, and near the coordinates when given
+        city = IRISH_GAZETTEER.city_in_address(address, lat, lng, whole_words=False)
+        if city:
+            return city
         
-        for part in parts:
-            for city in irish_cities:
-                if city.lower() in part.lower():
-                    return city
+        if lat is not None and lng is not None:
+            town = IRISH_GAZETTEER.nearest_town(lat, lng)
+            if town:
+                return town.name
         
         # If no known city found, use the second-to-last part (before country)
         if len(parts) >= 2:
@@ -448,7 +463,7 @@ class IrishStudioDirectoryScraper:
         }
         
         try:
-            response = self.session.get(search_url, params=search_params)
+            response = self.fetcher.get(search_url, params=search_params)
             response.raise_for_status()
             
             data = response.json()
@@ -463,7 +478,7 @@ class IrishStudioDirectoryScraper:
                     'key': self.google_api_key
                 }
                 
-                details_response = self.session.get(details_url, params=details_params)
+                details_response = self.fetcher.get(details_url, params=details_params)
                 details_response.raise_for_status()
                 
                 details_data = details_response.json()
@@ -481,7 +496,7 @@ class IrishStudioDirectoryScraper:
                     }
                     
                     # This returns a redirect, get the final URL
-                    photo_response = self.session.get(photo_url, params=photo_params, allow_redirects=False)
+                    photo_response = self.fetcher.get(photo_url, params=photo_params, allow_redirects=False)
                     if photo_response.status_code == 302:
                         return photo_response.headers.get('Location')
                         
@@ -502,6 +517,7 @@ class IrishStudioDirectoryScraper:
             name=name,
             slug=self.create_slug(name),
             city=city,
+            county=IRISH_GAZETTEER.county_of(city),
             description=studio_info.get('description', ''),
             website=website,
             studioType="professional"
@@ -509,8 +525,8 @@ class IrishStudioDirectoryScraper:
         
         if website:
             try:
-                time.sleep(2)  # Be respectful
-                response = self.session.get(website, timeout=10)
+                # Politeness is per host: the fetch engine paces each studio's site separately
+                response = self.fetcher.get(website, timeout=10)
                 response.raise_for_status()
                 
                 text_content = response.text.lower()
@@ -541,11 +557,9 @@ class IrishStudioDirectoryScraper:
                     'vocal booth', 'live room', 'control room', 'mastering'
                 ]
                 
-                for keyword in equipment_keywords:
-                    if keyword in text_content:
-                        if studio.amenities is None:
-                            studio.amenities = []
-                        studio.amenities.append(keyword.replace(' ', '_'))
+                amenities = [keyword.replace(' ', '_') for keyword in keyword_matcher(equipment_keywords).find(text_content)]
+                if amenities:
+                    studio.amenities = (studio.amenities or []) + amenities
                 
                 # Look for pricing
                 price_matches = re.findall(r'[€]\s*(\d+)', response.text)
@@ -560,11 +574,9 @@ class IrishStudioDirectoryScraper:
                     'folk', 'country', 'blues', 'metal', 'indie', 'alternative'
                 ]
                 
-                for genre in genre_keywords:
-                    if genre in text_content:
-                        if studio.genresSupported is None:
-                            studio.genresSupported = []
-                        studio.genresSupported.append(genre)
+                genres = keyword_matcher(genre_keywords).find(text_content)
+                if genres:
+                    studio.genresSupported = (studio.genresSupported or []) + genres
                 
             except Exception as e:
                 logger.error(f"Error scraping {website}: {e}")
@@ -584,87 +596,101 @@ class IrishStudioDirectoryScraper:
         
         return studio
 
-    def scrape_all_studios(self) -> List[StudioData]:
-        """Scrape all known studios + discover new ones via Google Places"""
+    def scrape_all_studios(self, journal: Optional[ScrapeJournal] = None) -> List[StudioData]:
+        """Scrape all known studios + discover new ones via Google Places
+
+        With a journal, each finished studio website, search and place is
+        checkpointed and a resumed run only does the units that are missing.
+        """
+        journal = journal or ScrapeJournal()
         studios = []
         seen_names = set()  # Track duplicates by name
         seen_websites = set()  # Track duplicates by website
         
         logger.info("🎵 Phase 1: Processing known studios...")
         
-        # Process manually curated studios first
-        for studio_info in self.known_studios:
-            try:
-                studio = self.scrape_studio_website(studio_info)
-                
-                # Check for duplicates
-                name_key = studio.name.lower().strip()
-                website_key = studio.website.lower().strip() if studio.website else None
-                
-                if name_key in seen_names:
-                    logger.warning(f"⚠️  Duplicate name detected: {studio.name}")
-                    continue
-                
-                if website_key and website_key in seen_websites:
-                    logger.warning(f"⚠️  Duplicate website detected: {studio.website}")
-                    continue
-                
-                studios.append(studio)
-                seen_names.add(name_key)
-                if website_key:
-                    seen_websites.add(website_key)
-                
-                logger.info(f"✓ Processed: {studio.name}")
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                logger.error(f"Failed to process {studio_info['name']}: {e}")
+        # Website and geocoding fetches run concurrently; duplicates are resolved in list order
+        known_results = self.fetcher.map(
+            lambda info: journal.run(('known', info['name']), self.scrape_studio_website, info,
+                                     encode=asdict, decode=lambda data: StudioData(**data)),
+            self.known_studios
+        )
+        
+        for studio_info, studio in zip(self.known_studios, known_results):
+            if studio is None:
+                logger.error(f"Failed to process {studio_info['name']}")
+                continue
+            
+            # Check for duplicates
+            name_key = studio.name.lower().strip()
+            website_key = studio.website.lower().strip() if studio.website else None
+            
+            if name_key in seen_names:
+                logger.warning(f"⚠️  Duplicate name detected: {studio.name}")
+                continue
+            
+            if website_key and website_key in seen_websites:
+                logger.warning(f"⚠️  Duplicate website detected: {studio.website}")
+                continue
+            
+            studios.append(studio)
+            seen_names.add(name_key)
+            if website_key:
+                seen_websites.add(website_key)
+            
+            logger.info(f"✓ Processed: {studio.name}")
         
         logger.info(f"🎵 Phase 2: Discovering additional studios via Google Places...")
         
         # Search Google Places for additional studios
         major_cities = ["Dublin", "Cork", "Belfast", "Galway", "Limerick", "Waterford"]
         
-        for city in major_cities:
-            try:
-                logger.info(f"🔍 Searching Google Places in {city}...")
-                places = self.search_google_places_for_studios(city)
-                
-                for place in places:
-                    try:
-                        studio = self.process_google_place_to_studio(place)
-                        if not studio:
-                            continue
-                        
-                        # Check for duplicates
-                        name_key = studio.name.lower().strip()
-                        website_key = studio.website.lower().strip() if studio.website else None
-                        
-                        if name_key in seen_names:
-                            logger.info(f"⚠️  Skipping duplicate: {studio.name}")
-                            continue
-                        
-                        if website_key and website_key in seen_websites:
-                            logger.info(f"⚠️  Skipping duplicate website: {studio.website}")
-                            continue
-                        
-                        # Additional validation
-                        if self.is_valid_studio(studio):
-                            studios.append(studio)
-                            seen_names.add(name_key)
-                            if website_key:
-                                seen_websites.add(website_key)
-                            
-                            logger.info(f"🆕 Found new studio: {studio.name} in {studio.city}")
-                        
-                        time.sleep(0.5)  # Rate limiting
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing place {place.get('name', 'Unknown')}: {e}")
+        searches = [(city, term) for city in major_cities for term in self.get_studio_search_terms(city)]
+        logger.info(f"🔍 Running {len(searches)} Google Places searches in {len(major_cities)} cities...")
+        places = []
+        seen_place_ids = set()
+        results = self.fetcher.map(
+            lambda search: journal.run(('search',) + search, self.search_google_places_text, search[1]),
+            searches
+        )
+        for found in results:
+            for place in found or []:
+                place_id = place.get('place_id')
+                if place_id and place_id not in seen_place_ids:
+                    seen_place_ids.add(place_id)
+                    places.append(place)
+        
+        discovered = self.fetcher.map(
+            lambda place: journal.run(('place', place['place_id']), self.process_google_place_to_studio, place,
+                                      encode=asdict, decode=lambda data: StudioData(**data)),
+            places
+        )
+        for studio in discovered:
+            if not studio:
+                continue
+            
+            # Check for duplicates
+            name_key = studio.name.lower().strip()
+            website_key = studio.website.lower().strip() if studio.website else None
+            
+            if name_key in seen_names:
+                logger.info(f"⚠️  Skipping duplicate: {studio.name}")
+                continue
+            
+            if website_key and website_key in seen_websites:
+                logger.info(f"⚠️  Skipping duplicate website: {studio.website}")
+                continue
+            
+            # Additional validation
+            if self.is_valid_studio(studio):
+                studios.append(studio)
+                seen_names.add(name_key)
+                if website_key:
+                    seen_websites.add(website_key)
                 
-            except Exception as e:
-                logger.error(f"Error searching {city}: {e}")
+                logger.info(f"🆕 Found new studio: {studio.name} in {studio.city}")
         
+        self.fetcher.log_stats()
         logger.info(f"✅ Total studios collected: {len(studios)}")
         return studios
 
@@ -769,10 +795,16 @@ class IrishStudioDirectoryScraper:
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Collect Irish recording studio data')
+    parser.add_argument('--resume', action='store_true', help='Skip studios, searches and places already in the journal')
+    parser.add_argument('--journal', default='irish_studios_data.journal.jsonl', help='Checkpoint journal path')
+    args = parser.parse_args()
+    
     # Load Google Maps API key from environment
     GOOGLE_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
     
-    if not GOOGLE_API_KEY:
+    # Offline replays are served from the HTTP cache and need no key
+    if not GOOGLE_API_KEY and cache_mode() != 'offline':
         logger.error("GOOGLE_MAPS_API_KEY environment variable not found!")
         logger.error("Please set your Google Maps API key in a .env file or environment variable")
         return
@@ -781,8 +813,15 @@ def main():
     
     print("🎵 Starting Irish Music Studios Data Collection...")
     
-    # Scrape all studios
-    studios = scraper.scrape_all_studios()
+    # Scrape all studios, checkpointing each unit of work
+    journal = ScrapeJournal(args.journal, resume=args.resume)
+    try:
+        studios = scraper.scrape_all_studios(journal)
+    except KeyboardInterrupt:
+        logger.warning(f"⏹️  Interrupted. Progress is saved in {args.journal}; rerun with --resume to continue")
+        return
+    finally:
+        journal.close()
     
     print(f"\n📊 COLLECTION SUMMARY:")
     print(f"Total studios processed: {len(studios)}")
@@ -5,14 +5,13 @@ Searches for live music venues across Ireland using Google Places API
 Covers major cities and regional areas with venue-specific keywords
 """
 
-import requests
-import json
+import argparse
 import time
 import re
 import logging
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Union
 import os
 import sys
 from dataclasses import dataclass, asdict
@@ -24,7 +23,14 @@ load_dotenv()
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from irish_locations import get_all_irish_cities_and_towns, get_all_irish_counties, get_search_areas_with_coordinates
+from irish_locations import get_search_areas_with_coordinates
+from fetch_engine import FetchEngine
+from http_cache import cache_mode
+from fuzzy_dedup import SimilarityIndex, DEDUP_THRESHOLDS, VENUE_STOP_WORDS
+from gazetteer import IRISH_GAZETTEER
+from scrape_journal import ScrapeJournal
+from stream_output import NdjsonWriter, JsonArrayWriter, emit
+from places_planner import QuadtreePlanner, RequestBudget, root_cells, estimate, log_estimate
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +48,7 @@ class VenueData:
     city: Optional[str] = None
     county: Optional[str] = None
     country: str = "Ireland"
+    eircode: Optional[str] = None
     phone: Optional[str] = None
     email: Optional[str] = None
     website: Optional[str] = None
@@ -73,12 +80,13 @@ class VenueData:
             self.musicGenres = []
 
 class IrishVenueDirectoryScraper:
-    def __init__(self, google_api_key: str):
+    def __init__(self, google_api_key: str, max_workers: int = 8, budget: Optional[RequestBudget] = None):
         self.google_api_key = google_api_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        self.fetcher = FetchEngine(
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            max_workers=max_workers
+        )
+        self.budget = budget or RequestBudget()
         
         # Known prominent Irish venues (manually curated seed list)
         self.known_venues = [
@@ -166,6 +174,19 @@ class IrishVenueDirectoryScraper:
         """Define search areas covering Ireland comprehensively"""
         return get_search_areas_with_coordinates()
 
+    def get_search_cells(self):
+        """Root quadtree cells: the grid cells touching any search area"""
+        return root_cells(self.get_irish_search_areas())
+
+    def estimate_search_plan(self) -> Dict[str, Any]:
+        """Dry-run request/cost figures for the root search plan"""
+        return estimate(self.get_search_cells(), self.get_venue_search_terms(),
+                        legacy_areas=self.get_irish_search_areas())
+
+    def can_request(self, kind: str, url: str, params: Dict[str, Any]) -> bool:
+        """Cached responses are free; anything else is charged to the budget"""
+        return self.fetcher.is_cached(url, params) or self.budget.spend(kind)
+
     def get_venue_search_terms(self) -> List[str]:
         """Get comprehensive list of venue search terms"""
         return [
@@ -188,8 +209,8 @@ class IrishVenueDirectoryScraper:
             "cultural center music"
         ]
 
-    def search_google_places_for_venues(self, area: Dict[str, Any], search_term: str) -> List[Dict]:
-        """Search Google Places for music venues in a specific area"""
+    def search_google_places_for_venues(self, area: Dict[str, Any], search_term: str) -> Optional[List[Dict]]:
+        """Search Google Places for music venues in a specific area (None if the search failed)"""
         url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
         
         params = {
@@ -203,7 +224,10 @@ class IrishVenueDirectoryScraper:
         all_places = []
         
         try:
-            response = self.session.get(url, params=params)
+            if not self.can_request('nearby_search', url, params):
+                return None
+            
+            response = self.fetcher.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -214,14 +238,19 @@ class IrishVenueDirectoryScraper:
                 
                 # Handle pagination
                 while data.get('next_page_token'):
-                    time.sleep(2)  # Required delay for next_page_token
                     params['pagetoken'] = data['next_page_token']
                     params.pop('location', None)  # Remove location when using page token
                     params.pop('radius', None)
                     params.pop('keyword', None)
                     params.pop('type', None)
                     
-                    response = self.session.get(url, params=params)
+                    if not self.fetcher.is_cached(url, params):
+                        # A partial result would hide a saturated cell; retry the whole search later
+                        if not self.budget.spend('nearby_search'):
+                            return None
+                        time.sleep(2)  # next_page_token only becomes valid after a short delay
+                    
+                    response = self.fetcher.get(url, params=params)
                     response.raise_for_status()
                     
                     data = response.json()
@@ -234,10 +263,9 @@ class IrishVenueDirectoryScraper:
             else:
                 logger.warning(f"Google Places search failed for {search_term}: {data.get('status')}")
             
-            time.sleep(1)  # Rate limiting
-            
         except Exception as e:
             logger.error(f"Error searching Google Places for {search_term} in {area['name']}: {e}")
+            return None
         
         return all_places
 
@@ -251,7 +279,10 @@ class IrishVenueDirectoryScraper:
         }
         
         try:
-            response = self.session.get(url, params=params)
+            if not self.can_request('place_details', url, params):
+                return {}
+            
+            response = self.fetcher.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -276,9 +307,13 @@ class IrishVenueDirectoryScraper:
             if not details:
                 return None
             
+            # Coordinates, when available, place the venue if the address doesn't
+            location = details.get('geometry', {}).get('location', {})
+            lat, lng = location.get('lat'), location.get('lng')
+            
             # Extract city from address
             address = details.get('formatted_address', '')
-            city = self.extract_city_from_address(address)
+            city = self.extract_city_from_address(address, lat, lng)
             
             # Determine venue type based on name and types
             venue_type = self.determine_venue_type(name, place.get('types', []))
@@ -298,18 +333,17 @@ class IrishVenueDirectoryScraper:
             )
             
             # Add location if available
-            geometry = details.get('geometry', {})
-            location = geometry.get('location', {})
             if location:
-                venue.latitude = location.get('lat')
-                venue.longitude = location.get('lng')
+                venue.latitude = lat
+                venue.longitude = lng
             
             # Parse address
             if address:
                 address_parts = [part.strip() for part in address.split(',')]
                 if len(address_parts) >= 2:
                     venue.street = address_parts[0]
-                    venue.county = self.extract_county_from_address(address)
+                venue.eircode = IRISH_GAZETTEER.find_eircode(address)
+            venue.county = self.extract_county_from_address(address, lat, lng)
             
             # Set venue characteristics based on type
             self.set_venue_characteristics(venue)
@@ -383,20 +417,21 @@ class IrishVenueDirectoryScraper:
             venue.isAccessible = True
             venue.allowsAllAges = True
 
-    def extract_city_from_address(self, address: str) -> str:
-        """Extract city from Google Places address"""
-        if not address:
-            return "Ireland"
-        
-        parts = [part.strip() for part in address.split(',')]
-        
-        # Get standardized list of Irish cities
-        irish_cities = get_all_irish_cities_and_towns()
-        
-        for part in parts:
-            for city in irish_cities:
-                if city.lower() in part.lower():
-                    return city
+    def extract_city_from_address(self, address: str, lat: Optional[float] = None,
+                                  lng: Optional[float] = None) -> str:
+        """Extract city from Google Places address, or the nearest town to the coordinates"""
+        parts = [part.strip() for part in (address or '').split(',')]
+        
+        # A town named outside the street names, and near the coordinates when given
+        city = IRISH_GAZETTEER.city_in_address(address, lat, lng, whole_words=False)
+        if city:
+            return city
+        
+        # Offline reverse lookup before guessing from the address layout
+        if lat is not None and lng is not None:
+            town = IRISH_GAZETTEER.nearest_town(lat, lng)
+            if town:
+                return town.name
         
         # If no known city found, use the second-to-last part (before country)
         if len(parts) >= 2:
@@ -404,16 +439,11 @@ class IrishVenueDirectoryScraper:
         
         return "Ireland"
 
-    def extract_county_from_address(self, address: str) -> Optional[str]:
-        """Extract county from address"""
-        irish_counties = get_all_irish_counties()
-        
-        address_lower = address.lower()
-        for county in irish_counties:
-            if county.lower() in address_lower:
-                return county
-        
-        return None
+    def extract_county_from_address(self, address: str, lat: Optional[float] = None,
+                                    lng: Optional[float] = None) -> Optional[str]:
+        """Extract county from the address's Eircode or text, else from the coordinates"""
+        _, county = IRISH_GAZETTEER.resolve(address, lat, lng)
+        return county
 
     def create_slug(self, name: str) -> str:
         """Create URL-friendly slug from venue name"""
@@ -463,34 +493,34 @@ class IrishVenueDirectoryScraper:
 
     def deduplicate_venues(self, venues: List[VenueData]) -> List[VenueData]:
         """Remove duplicate venues based on Google Place ID and name similarity"""
+        return list(self.iter_unique_venues(venues))
+
+    def iter_unique_venues(self, venues: Iterable[VenueData]) -> Iterator[VenueData]:
+        """Streaming dedup: yield each venue not already seen by Place ID or similar name"""
         seen_place_ids = set()
-        seen_names = set()
-        unique_venues = []
+        seen_names = SimilarityIndex(DEDUP_THRESHOLDS['venue_words'], mode='token_jaccard',
+                                     stop_words=VENUE_STOP_WORDS)
+        total = 0
         
         for venue in venues:
+            total += 1
             # Skip if we've seen this Place ID
             if venue.googlePlaceId and venue.googlePlaceId in seen_place_ids:
                 logger.info(f"🔄 Skipping duplicate Place ID: {venue.name}")
                 continue
             
-            # Check for name similarity (simple approach)
+            # Check for name similarity (same rule as are_names_similar, via a word index)
             normalized_name = venue.name.lower().strip()
-            is_duplicate = False
-            
-            for seen_name in seen_names:
-                if self.are_names_similar(normalized_name, seen_name):
-                    logger.info(f"🔄 Skipping similar name: {venue.name}")
-                    is_duplicate = True
-                    break
+            if seen_names.find(normalized_name):
+                logger.info(f"🔄 Skipping similar name: {venue.name}")
+                continue
             
-            if not is_duplicate:
-                unique_venues.append(venue)
-                if venue.googlePlaceId:
-                    seen_place_ids.add(venue.googlePlaceId)
-                seen_names.add(normalized_name)
-        
-        logger.info(f"✅ Deduplication: {len(venues)} → {len(unique_venues)} venues")
-        return unique_venues
+            if venue.googlePlaceId:
+                seen_place_ids.add(venue.googlePlaceId)
+            seen_names.add(normalized_name)
+            yield venue
+        
+        logger.info(f"✅ Deduplication: {total} → {len(seen_names)} venues")
 
     def are_names_similar(self, name1: str, name2: str) -> bool:
         """Check if two venue names are similar enough to be duplicates"""
@@ -499,160 +529,182 @@ class IrishVenueDirectoryScraper:
             return True
         
         # Remove common words
-        common_words = {'the', 'a', 'an', 'and', 'or', 'of', 'in', 'at', 'to', 'for', 'with'}
-        words1 = set(name1.split()) - common_words
-        words2 = set(name2.split()) - common_words
+        words1 = set(name1.split()) - VENUE_STOP_WORDS
+        words2 = set(name2.split()) - VENUE_STOP_WORDS
         
         # If most words match, consider it similar
         if words1 and words2:
             intersection = len(words1.intersection(words2))
             union = len(words1.union(words2))
             similarity = intersection / union
-            return similarity > 0.7
+            return similarity > DEDUP_THRESHOLDS['venue_words']
         
         return False
 
-    def scrape_all_venues(self) -> List[VenueData]:
+    def scrape_all_venues(self, journal: Optional[ScrapeJournal] = None) -> List[VenueData]:
         """Main method to scrape venues from all sources"""
+        return list(self.iter_venues(journal))
+
+    def iter_venues(self, journal: Optional[ScrapeJournal] = None) -> Iterator[VenueData]:
+        """Streaming scrape: search, place details, validation, dedup
+
+        Each stage is a generator, so a venue is yielded (and can be written)
+        as soon as its details arrive. With a journal, each finished search and
+        place is checkpointed and a resumed run only does the missing units.
+        """
         logger.info("🎵 Starting Irish music venues scraping...")
-        
-        all_venues = []
-        search_areas = self.get_irish_search_areas()
-        search_terms = self.get_venue_search_terms()
-        
-        # Search each area with each search term
-        for area in search_areas:
-            logger.info(f"🏙️ Searching area: {area['name']}")
-            
-            for term in search_terms:
-                try:
-                    logger.info(f"🔍 Searching for '{term}' in {area['name']}...")
-                    places = self.search_google_places_for_venues(area, term)
-                    
-                    for place in places:
-                        venue = self.process_google_place_to_venue(place)
-                        if venue and self.is_valid_venue(venue):
-                            all_venues.append(venue)
-                            logger.info(f"✅ Added venue: {venue.name} ({venue.city})")
-                        
-                        time.sleep(0.5)  # Rate limiting
-                        
-                except Exception as e:
-                    logger.error(f"Error searching {area['name']} for {term}: {e}")
-            
-            time.sleep(2)  # Longer pause between areas
-        
-        # Deduplicate
-        unique_venues = self.deduplicate_venues(all_venues)
-        
-        logger.info(f"✅ Total unique venues collected: {len(unique_venues)}")
-        return unique_venues
+        journal = journal or ScrapeJournal()
+        
+        # Search grid cells, splitting a cell only where a term hits the Places result cap;
+        # the planner yields each place_id once, so details are fetched once per place
+        cells = self.get_search_cells()
+        planner = QuadtreePlanner(
+            lambda area, term: journal.run(('search', area['name'], term), self.search_google_places_for_venues, area, term),
+            self.get_venue_search_terms()
+        )
+        logger.info(f"🔍 Searching {len(cells)} map cells...")
+        unique_places = planner.iter_places(cells, self.fetcher.imap)
+        
+        venues = self.fetcher.imap(
+            lambda place: journal.run(('place', place['place_id']), self.process_google_place_to_venue, place,
+                                      encode=asdict, decode=lambda data: VenueData(**data)),
+            unique_places
+        )
+        valid_venues = (venue for venue in venues if venue and self.is_valid_venue(venue))
+        
+        count = 0
+        for venue in self.iter_unique_venues(valid_venues):
+            count += 1
+            logger.info(f"✅ Added venue: {venue.name} ({venue.city})")
+            yield venue
+        
+        self.fetcher.log_stats()
+        logger.info(f"💸 Places usage: {self.budget.summary()}")
+        logger.info(f"✅ Total unique venues collected: {count}")
 
     def save_to_json(self, venues: List[VenueData], filename: str = 'irish_venues_data.json'):
         """Save venues to JSON file"""
-        venues_data = [asdict(venue) for venue in venues]
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(venues_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Saved {len(venues_data)} venues to {filename}")
+        with JsonArrayWriter(filename) as writer:
+            for venue in venues:
+                writer.write(asdict(venue))
 
     def create_sanity_cms_format(self, venues: List[VenueData], filename: str = 'venues_for_sanity.json'):
         """Convert venues to Sanity CMS format"""
-        sanity_venues = []
-        
-        for venue in venues:
-            sanity_venue = {
-                "_id": venue.slug,
-                "_type": "venue",
-                "name": venue.name,
-                "slug": {"_type": "slug", "current": venue.slug},
-                "description": venue.description,
-                "address": {
-                    "_type": "address",
-                    "street": venue.street,
-                    "city": venue.city,
-                    "county": venue.county,
-                    "country": venue.country
-                },
-                "contact": {
-                    "_type": "contact",
-                    "phone": venue.phone,
-                    "email": venue.email,
-                    "website": venue.website,
-                    "facebook": venue.facebook,
-                    "instagram": venue.instagram,
-                    "twitter": venue.twitter
-                },
-                "venueDetails": {
-                    "_type": "venueDetails",
-                    "capacity": venue.capacity,
-                    "venueType": venue.venueType,
-                    "hasStage": venue.hasStage,
-                    "hasPA": venue.hasPA,
-                    "hasLighting": venue.hasLighting,
-                    "hasParking": venue.hasParking,
-                    "isAccessible": venue.isAccessible,
-                    "allowsAllAges": venue.allowsAllAges,
-                    "servesFood": venue.servesFood,
-                    "servesAlcohol": venue.servesAlcohol
-                },
-                "musicGenres": venue.musicGenres,
-                "location": {
-                    "_type": "geopoint",
-                    "lat": venue.latitude,
-                    "lng": venue.longitude
-                } if venue.latitude and venue.longitude else None,
-                "googleData": {
-                    "_type": "googleData",
-                    "placeId": venue.googlePlaceId,
-                    "rating": venue.rating,
-                    "totalReviews": venue.totalReviews,
-                    "priceLevel": venue.priceLevel
-                },
-                "bandFriendly": venue.bandFriendly,
-                "verified": False,
-                "featured": False
-            }
-            
-            # Remove None values
-            sanity_venue = {k: v for k, v in sanity_venue.items() if v is not None}
-            sanity_venues.append(sanity_venue)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(sanity_venues, f, indent=2, ensure_ascii=False)
+        with JsonArrayWriter(filename) as writer:
+            for venue in venues:
+                writer.write(self.to_sanity_document(venue))
         
         logger.info(f"Created Sanity CMS format file: {filename}")
 
+    def to_sanity_document(self, venue: VenueData) -> Dict[str, Any]:
+        """Convert one venue to a Sanity CMS document"""
+        sanity_venue = {
+            "_id": venue.slug,
+            "_type": "venue",
+            "name": venue.name,
+            "slug": {"_type": "slug", "current": venue.slug},
+            "description": venue.description,
+            "address": {
+                "_type": "address",
+                "street": venue.street,
+                "city": venue.city,
+                "county": venue.county,
+                "country": venue.country,
+                "eircode": venue.eircode
+            },
+            "contact": {
+                "_type": "contact",
+                "phone": venue.phone,
+                "email": venue.email,
+                "website": venue.website,
+                "facebook": venue.facebook,
+                "instagram": venue.instagram,
+                "twitter": venue.twitter
+            },
+            "venueDetails": {
+                "_type": "venueDetails",
+                "capacity": venue.capacity,
+                "venueType": venue.venueType,
+                "hasStage": venue.hasStage,
+                "hasPA": venue.hasPA,
+                "hasLighting": venue.hasLighting,
+                "hasParking": venue.hasParking,
+                "isAccessible": venue.isAccessible,
+                "allowsAllAges": venue.allowsAllAges,
+                "servesFood": venue.servesFood,
+                "servesAlcohol": venue.servesAlcohol
+            },
+            "musicGenres": venue.musicGenres,
+            "location": {
+                "_type": "geopoint",
+                "lat": venue.latitude,
+                "lng": venue.longitude
+            } if venue.latitude and venue.longitude else None,
+            "googleData": {
+                "_type": "googleData",
+                "placeId": venue.googlePlaceId,
+                "rating": venue.rating,
+                "totalReviews": venue.totalReviews,
+                "priceLevel": venue.priceLevel
+            },
+            "bandFriendly": venue.bandFriendly,
+            "verified": False,
+            "featured": False
+        }
+        
+        # Remove None values
+        return {k: v for k, v in sanity_venue.items() if v is not None}
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Scrape Irish music venues from Google Places')
+    parser.add_argument('--resume', action='store_true', help='Skip searches and places already in the journal')
+    parser.add_argument('--journal', default='irish_venues_data.journal.jsonl', help='Checkpoint journal path')
+    parser.add_argument('--max-requests', type=int, help='Stop after this many paid Places requests')
+    parser.add_argument('--max-cost', type=float, help='Stop at this estimated Places spend (USD)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the search plan and cost estimate, then exit')
+    args = parser.parse_args()
+    
+    budget = RequestBudget(args.max_requests, args.max_cost)
+    if args.dry_run:
+        log_estimate(IrishVenueDirectoryScraper(None, budget=budget).estimate_search_plan())
+        return
+    
     # Get Google API key from environment
     api_key = os.getenv('GOOGLE_MAPS_API_KEY')
-    if not api_key:
+    if not api_key and cache_mode() != 'offline':
         logger.error("GOOGLE_MAPS_API_KEY environment variable not found!")
         logger.error("Please set your Google Maps API key in a .env file or environment variable")
         return
     
-    scraper = IrishVenueDirectoryScraper(api_key)
+    scraper = IrishVenueDirectoryScraper(api_key, budget=budget)
+    journal = ScrapeJournal(args.journal, resume=args.resume)
     
     try:
-        # Scrape all venues
-        venues = scraper.scrape_all_venues()
-        
-        # Save results
-        scraper.save_to_json(venues)
-        scraper.create_sanity_cms_format(venues)
-        
-        # Print summary
-        print(f"\n📊 SCRAPING SUMMARY:")
-        print(f"Total venues found: {len(venues)}")
+        # Stream venues to disk as they clear the pipeline, checkpointing each unit of work
+        outputs = [
+            (NdjsonWriter('irish_venues_data.ndjson'), asdict),
+            (NdjsonWriter('venues_import.ndjson'), scraper.to_sanity_document),
+            (JsonArrayWriter('irish_venues_data.json'), asdict),
+            (JsonArrayWriter('venues_for_sanity.json'), scraper.to_sanity_document)
+        ]
         
+        total = 0
         city_counts = {}
         type_counts = {}
         
-        for venue in venues:
-            city_counts[venue.city] = city_counts.get(venue.city, 0) + 1
-            type_counts[venue.venueType] = type_counts.get(venue.venueType, 0) + 1
+        try:
+            for venue in emit(scraper.iter_venues(journal), outputs):
+                total += 1
+                city_counts[venue.city] = city_counts.get(venue.city, 0) + 1
+                type_counts[venue.venueType] = type_counts.get(venue.venueType, 0) + 1
+        finally:
+            for writer, _ in outputs:
+                writer.close()
+        
+        # Print summary
+        print(f"\n📊 SCRAPING SUMMARY:")
+        print(f"Total venues found: {total}")
         
         print(f"\n🏙️ By City:")
         for city, count in sorted(city_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
@@ -666,10 +718,17 @@ def main():
         print(f"📁 Files saved:")
         print(f"  - irish_venues_data.json")
         print(f"  - venues_for_sanity.json")
+        print(f"  - irish_venues_data.ndjson")
+        print(f"  - venues_import.ndjson (Sanity CLI import)")
         
+    except KeyboardInterrupt:
+        logger.warning(f"⏹️  Interrupted. Progress is saved in {args.journal}; rerun with --resume to continue")
     except Exception as e:
         logger.error(f"❌ Scraping failed: {e}")
+        logger.error(f"Progress is saved in {args.journal}; rerun with --resume to continue")
         raise
+    finally:
+        journal.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Compiled Irish Location Matcher
+Finds gazetteer names (irish_locations.py) in text in a single pass:
+- The names are built into a character trie and compiled into one regex, so
+  the scan runs in the C regex engine instead of one search per city
+- Matches are leftmost-longest ("Achill Sound" wins over "Achill",
+  "Enniskillen" over "Ennis"), optionally on word boundaries
+- When several names match, the one earliest in the gazetteer wins, which
+  keeps the major cities listed first ahead of small towns
+
+Matchers for the standard lists are built once at import.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from irish_locations import get_all_irish_counties, get_all_irish_cities_and_towns, get_irish_locations_list
+
+def trie_pattern(names: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie of names; optional tails are greedy"""
+    trie: Dict = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+class LocationMatcher:
+    """Precompiled matcher over one list of place names (case-insensitive)"""
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = []
+        self.rank: Dict[str, int] = {}
+        for name in names:
+            key = name.lower()
+            if key and key not in self.rank:
+                self.rank[key] = len(self.names)
+                self.names.append(name)
+
+        keys = [name.lower() for name in self.names]
+        pattern = trie_pattern(keys) if keys else r'(?!)'
+        self.substring_regex = re.compile(pattern)
+        self.word_regex = re.compile(r'\b(?:' + pattern + r')\b')
+
+        # All names joined, for finding which name contains a fragment
+        self.joined = '\x00'.join(keys)
+        self.offsets = []
+        position = 0
+        for key in keys:
+            self.offsets.append(position)
+            position += len(key) + 1
+
+    def exact(self, text: str) -> Optional[str]:
+        rank = self.rank.get(text.lower().strip())
+        return None if rank is None else self.names[rank]
+
+    def find_all(self, text: str, whole_words: bool = True) -> List[str]:
+        """Every name in text, in order of appearance (non-overlapping)"""
+        regex = self.word_regex if whole_words else self.substring_regex
+        return [self.names[self.rank[m.group(0)]] for m in regex.finditer(text.lower())]
+
+    def _best_rank(self, text: str, whole_words: bool) -> Optional[int]:
+        regex = self.word_regex if whole_words else self.substring_regex
+        ranks = [self.rank[m.group(0)] for m in regex.finditer(text.lower())]
+        return min(ranks) if ranks else None
+
+    def mentions(self, text: str, whole_words: bool = True) -> bool:
+        """True if any name appears in text (stops at the first hit)"""
+        regex = self.word_regex if whole_words else self.substring_regex
+        return regex.search(text.lower()) is not None
+
+    def first(self, text: str, whole_words: bool = True) -> Optional[str]:
+        """The earliest-listed name appearing in text"""
+        rank = self._best_rank(text, whole_words)
+        return None if rank is None else self.names[rank]
+
+    def containing(self, fragment: str) -> Optional[str]:
+        """The earliest-listed name that contains fragment"""
+        fragment = fragment.lower()
+        if not fragment or '\x00' in fragment:
+            return None
+        position = self.joined.find(fragment)
+        if position < 0:
+            return None
+        return self.names[bisect_right(self.offsets, position) - 1]
+
+    def partial(self, text: str) -> Optional[str]:
+        """Earliest-listed name found in text or containing text (substring match)"""
+        text = text.lower()
+        ranks = [rank for rank in (
+            self._best_rank(text, whole_words=False),
+            self.rank.get((self.containing(text) or '').lower())
+        ) if rank is not None]
+        return self.names[min(ranks)] if ranks else None
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.rank
+
+_MATCHERS: Dict[Tuple[str, ...], LocationMatcher] = {}
+
+def matcher_for(names: Iterable[str]) -> LocationMatcher:
+    """Shared matcher for a name list, compiled on first use"""
+    key = tuple(names)
+    if key not in _MATCHERS:
+        _MATCHERS[key] = LocationMatcher(key)
+    return _MATCHERS[key]
+
+IRISH_CITIES = matcher_for(get_all_irish_cities_and_towns())
+IRISH_COUNTIES = matcher_for(get_all_irish_counties())
+IRISH_LOCATIONS = matcher_for(get_irish_locations_list())
+
+def match_location(location_text: str, cities: Optional[LocationMatcher] = None,
+                   counties: Optional[LocationMatcher] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Standardise a location field to (city, None) or (None, county)
+
+    Precedence: exact city, city in/containing the text, exact county,
+    county in/containing the text.
+    """
+    if not location_text or not location_text.strip():
+        return None, None
+
+    cities = cities or IRISH_CITIES
+    counties = counties or IRISH_COUNTIES
+    location_lower = location_text.lower().strip()
+
+    city = cities.exact(location_lower) or cities.partial(location_lower)
+    if city:
+        return city, None
+
+    county = counties.exact(location_lower) or counties.partial(location_lower)
+    if county:
+        return None, county
+
+    return None, None
+
+def detect_location(text: str, cities: Optional[LocationMatcher] = None,
+                    counties: Optional[LocationMatcher] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Find a city (preferred) or county mentioned as whole words in free text"""
+    if not text:
+        return None, None
+
+    city = (cities or IRISH_CITIES).first(text)
+    if city:
+        return city, None
+
+    county = (counties or IRISH_COUNTIES).first(text)
+    if county:
+        return None, county
+
+    return None, None
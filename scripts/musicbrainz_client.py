@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Request-minimizing MusicBrainz Client for band discovery
+MusicBrainz allows 1 request per second, so every call saved is a second:
+- Search pages (100 artists each) already carry area, begin-area, life-span,
+  type and tags; only URL relations need more requests
+- URL relations come from area browse pages (100 artists with inc=url-rels
+  per request) when that is cheaper than one lookup per artist, otherwise
+  from single lookups
+- Band name lookups are batched into one OR search per 20 names
+- Area hierarchies (town -> county) are memoized in a JSON file across runs
+- Repeated or concurrent requests for the same artist, area or name share
+  one in-flight request and its result
+
+All requests go through the fetch engine, so pacing and the HTTP cache apply.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from fetch_engine import FetchEngine
+from location_matcher import IRISH_CITIES, IRISH_COUNTIES
+
+logger = logging.getLogger(__name__)
+
+MB_API = 'https://musicbrainz.org/ws/2'
+ARTIST_INCLUDES = 'genres+tags+url-rels'
+PAGE_SIZE = 100  # search/browse maximum
+NAME_BATCH_SIZE = 20
+
+# Area types that stand for an Irish county in the hierarchy
+COUNTY_AREA_TYPES = {'Subdivision', 'County'}
+MAX_AREA_DEPTH = 8
+
+DEFAULT_AREA_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.musicbrainz_areas.json')
+
+def lucene_phrase(text: str) -> str:
+    """Quote text as a Lucene phrase for the search API"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+class AreaCache:
+    """Area ID -> {name, type, parent}, persisted between runs"""
+
+    def __init__(self, path: Optional[str] = DEFAULT_AREA_CACHE):
+        self.path = path
+        self.areas: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.areas = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  Ignoring unreadable area cache {path}: {e}")
+
+    def get(self, area_id: str) -> Optional[Dict[str, Any]]:
+        return self.areas.get(area_id)
+
+    def put(self, area_id: str, entry: Dict[str, Any]):
+        with self.lock:
+            self.areas[area_id] = entry
+            if self.path:
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.areas, f, indent=2, ensure_ascii=False, sort_keys=True)
+                os.replace(tmp_path, self.path)
+
+class MusicBrainzClient:
+    """MusicBrainz web service client built around the 1 req/s limit"""
+
+    def __init__(self, fetcher: Optional[FetchEngine] = None, area_cache: Optional[AreaCache] = None):
+        self.fetcher = fetcher or FetchEngine()
+        self.area_cache = area_cache if area_cache is not None else AreaCache()
+        self.memo: Dict[Tuple, Any] = {}
+        self.inflight: Dict[Tuple, Future] = {}
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'shared': 0, 'browsed': 0, 'looked_up': 0}
+
+    def _count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """JSON response for path, or None on error"""
+        self._count('requests')
+        try:
+            response = self.fetcher.get(f"{MB_API}{path}", params={**(params or {}), 'fmt': 'json'})
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error fetching MusicBrainz {path}: {e}")
+            return None
+
+    def _shared(self, key: Tuple, func: Callable[[], Any]) -> Any:
+        """func() once per key: later and concurrent callers get the same result
+
+        None results (errors) are not kept, so the next call tries again.
+        """
+        with self.lock:
+            if key in self.memo:
+                self.stats['shared'] += 1
+                return self.memo[key]
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+            else:
+                self.stats['shared'] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            with self.lock:
+                self.inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            if result is not None:
+                self.memo[key] = result
+            self.inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    # Artists
+
+    def search_artists(self, query: str, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Search results page by page, up to limit artists"""
+        offset = 0
+        while offset < limit:
+            data = self._get('/artist', {'query': query, 'limit': min(PAGE_SIZE, limit - offset), 'offset': offset})
+            artists = (data or {}).get('artists', [])
+            if not artists:
+                break
+
+            logger.info(f"Found {len(artists)} artists from MusicBrainz (offset: {offset})")
+            yield from artists
+            offset += len(artists)
+            if offset >= data.get('count', 0):
+                break
+
+    def lookup_artist(self, mbid: str) -> Optional[Dict[str, Any]]:
+        """Artist with tags, genres and URL relations"""
+        def fetch():
+            self._count('looked_up')
+            return self._get(f"/artist/{mbid}", {'inc': ARTIST_INCLUDES})
+        return self._shared(('artist', mbid), fetch)
+
+    def browse_area_artists(self, area_id: str, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """One page of artists in an area, with tags, genres and URL relations"""
+        def fetch():
+            self._count('browsed')
+            return self._get('/artist', {'area': area_id, 'inc': ARTIST_INCLUDES,
+                                         'limit': PAGE_SIZE, 'offset': offset})
+        return self._shared(('browse', area_id, offset), fetch)
+
+    def _browse_for(self, area_id: str, wanted: Set[str], details: Dict[str, Dict]):
+        """Fill details for wanted artists from area browse pages while cheaper than lookups"""
+        offset = 0
+        while len(wanted) > 1:
+            page = self.browse_area_artists(area_id, offset)
+            artists = (page or {}).get('artists', [])
+            if not artists:
+                return
+
+            for artist in artists:
+                # A browse page without relations can't replace a lookup
+                if artist.get('id') in wanted and 'relations' in artist:
+                    details[artist['id']] = artist
+                    wanted.discard(artist['id'])
+
+            offset += len(artists)
+            remaining_pages = math.ceil(max(0, page.get('artist-count', 0) - offset) / PAGE_SIZE)
+            if remaining_pages == 0 or remaining_pages >= len(wanted):
+                return
+
+    def iter_detailed_artists(self, query: str, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Search results with URL relations, in search order
+
+        Artists sharing an area are resolved together: the area is browsed
+        while each page is expected to save requests, and the rest are looked
+        up one at a time as they are reached.
+        """
+        results = list(self.search_artists(query, limit))
+
+        by_area: Dict[str, Set[str]] = {}
+        for artist in results:
+            area_id = (artist.get('area') or {}).get('id')
+            if area_id and artist.get('id'):
+                by_area.setdefault(area_id, set()).add(artist['id'])
+
+        details: Dict[str, Dict] = {}
+        browsed_areas = set()
+        for artist in results:
+            mbid = artist.get('id')
+            if not mbid:
+                continue
+
+            area_id = (artist.get('area') or {}).get('id')
+            if mbid not in details and area_id and area_id not in browsed_areas:
+                browsed_areas.add(area_id)
+                self._browse_for(area_id, by_area[area_id] - set(details), details)
+
+            detailed = details.pop(mbid, None) or self.lookup_artist(mbid)
+            # Keep search-only fields (score, begin-area) the lookup may not carry
+            yield {**artist, **detailed} if detailed else artist
+
+        logger.info(f"🎼 MusicBrainz: {len(results)} artists in {self.stats['requests']} requests "
+                    f"({self.stats['browsed']} browse pages, {self.stats['looked_up']} lookups, "
+                    f"{self.stats['shared']} shared)")
+
+    def find_irish_artists(self, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Name -> best Irish artist match (name or alias, case-insensitive) or None
+
+        Names are searched 20 at a time in a single OR query; answers are kept
+        for later calls with the same name.
+        """
+        names = list(dict.fromkeys(name for name in names if name and name.strip()))
+        pending = [name for name in names if ('name', name.casefold()) not in self.memo]
+
+        for start in range(0, len(pending), NAME_BATCH_SIZE):
+            batch = pending[start:start + NAME_BATCH_SIZE]
+            query = 'country:IE AND (' + ' OR '.join(f"artist:{lucene_phrase(name)}" for name in batch) + ')'
+            data = self._get('/artist', {'query': query, 'limit': PAGE_SIZE})
+            if data is None:
+                continue
+
+            matches: Dict[str, Dict] = {}
+            for artist in data.get('artists', []):
+                keys = [artist.get('name', '')] + [alias.get('name', '') for alias in artist.get('aliases', [])]
+                for key in keys:
+                    matches.setdefault(key.casefold(), artist)
+
+            # A full page may have pushed some names' matches off it; search those alone
+            saturated = len(data.get('artists', [])) >= PAGE_SIZE
+            for name in batch:
+                match = matches.get(name.casefold())
+                if match is None and saturated:
+                    single = self._get('/artist', {'query': f"artist:{lucene_phrase(name)} AND country:IE", 'limit': 5})
+                    match = next((a for a in (single or {}).get('artists', [])
+                                  if a.get('name', '').casefold() == name.casefold()), None)
+                with self.lock:
+                    self.memo[('name', name.casefold())] = match
+
+        return {name: self.memo.get(('name', name.casefold())) for name in names}
+
+    def find_irish_artist(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.find_irish_artists([name]).get(name)
+
+    # Areas
+
+    def area(self, area_id: str) -> Optional[Dict[str, Any]]:
+        """{name, type, parent} for an area, from the area cache when known"""
+        cached = self.area_cache.get(area_id)
+        if cached is not None:
+            return cached
+
+        def fetch():
+            data = self._get(f"/area/{area_id}", {'inc': 'area-rels'})
+            if data is None:
+                return None
+            parent = next((relation['area'] for relation in data.get('relations', [])
+                           if relation.get('type') == 'part of' and relation.get('direction') == 'backward'
+                           and relation.get('area')), None)
+            entry = {'name': data.get('name'), 'type': data.get('type'),
+                     'parent': parent.get('id') if parent else None}
+            self.area_cache.put(area_id, entry)
+            return entry
+        return self._shared(('area', area_id), fetch)
+
+    def area_chain(self, area_id: str) -> List[Dict[str, Any]]:
+        """The area and its ancestors, most specific first"""
+        chain = []
+        seen = set()
+        while area_id and area_id not in seen and len(chain) < MAX_AREA_DEPTH:
+            seen.add(area_id)
+            entry = self.area(area_id)
+            if not entry:
+                break
+            chain.append(entry)
+            if entry.get('type') == 'Country':
+                break
+            area_id = entry.get('parent')
+        return chain
+
+    def irish_location(self, artist: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """(city, county) from an artist's area or begin-area
+
+        Names on the standard lists are used directly; otherwise the area
+        hierarchy is walked up to the nearest listed town and county.
+        """
+        for key in ('area', 'begin-area'):
+            area = artist.get(key) or {}
+            name = area.get('name') or ''
+            if not name or area.get('type') == 'Country':
+                continue
+
+            city = IRISH_CITIES.exact(name)
+            county = None if city else IRISH_COUNTIES.exact(name)
+            if city or county:
+                return city, county
+
+            if not area.get('id'):
+                continue
+            for entry in self.area_chain(area['id']):
+                entry_name = entry.get('name') or ''
+                if not city:
+                    city = IRISH_CITIES.exact(entry_name)
+                if not county and entry.get('type') in COUNTY_AREA_TYPES:
+                    county = IRISH_COUNTIES.first(entry_name)
+            if city or county:
+                return city, county
+
+        return None, None
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Adaptive Quadtree Search Planner for Google Places
+Plans venue discovery searches over non-overlapping map cells instead of
+fixed, overlapping circles:
+- Ireland is covered by a coarse grid of cells, keeping only cells that touch
+  one of the existing search areas (irish_locations.py)
+- Each cell is searched with the circle that circumscribes it; when a search
+  comes back with the full 60-result cap the cell is split into four and
+  only that term is searched again in the children
+- Place IDs are deduplicated across cells and terms before any details call
+- A RequestBudget caps the paid requests (or their estimated cost), and
+  estimate() gives a dry-run figure before anything is spent
+
+Cells are named by their bounds, so journal units stay stable across runs.
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Nearby Search returns at most 3 pages of 20
+PLACES_RESULT_CAP = 60
+PLACES_MAX_PAGES = 3
+PLACES_MAX_RADIUS = 50000
+
+# Approximate USD list price per request
+PLACES_COSTS = {
+    'nearby_search': 0.032,
+    'place_details': 0.025
+}
+
+# south, west, north, east
+IRELAND_BOUNDS = (51.35, -10.75, 55.45, -5.35)
+ROOT_CELL_SIZE = (0.5, 0.75)  # degrees lat, lng (roughly 55 x 50 km)
+
+EARTH_RADIUS_M = 6371000
+
+def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+@dataclass(frozen=True)
+class SearchCell:
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def name(self) -> str:
+        return f"cell {self.south:.4f},{self.west:.4f},{self.north:.4f},{self.east:.4f}"
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def radius(self) -> int:
+        """Radius in metres of the circle through the cell's corners"""
+        lat, lng = self.center
+        return math.ceil(max(distance_m(lat, lng, corner_lat, corner_lng)
+                             for corner_lat in (self.south, self.north)
+                             for corner_lng in (self.west, self.east)))
+
+    def split(self) -> List['SearchCell']:
+        lat, lng = self.center
+        depth = self.depth + 1
+        return [
+            SearchCell(self.south, self.west, lat, lng, depth),
+            SearchCell(self.south, lng, lat, self.east, depth),
+            SearchCell(lat, self.west, self.north, lng, depth),
+            SearchCell(lat, lng, self.north, self.east, depth)
+        ]
+
+    def touches_circle(self, lat: float, lng: float, radius: float) -> bool:
+        nearest_lat = min(max(lat, self.south), self.north)
+        nearest_lng = min(max(lng, self.west), self.east)
+        return distance_m(lat, lng, nearest_lat, nearest_lng) <= radius
+
+    def as_area(self) -> Dict[str, Any]:
+        """Search area dict in the shape the scrapers' Places searches take"""
+        lat, lng = self.center
+        return {'name': self.name, 'lat': round(lat, 6), 'lng': round(lng, 6),
+                'radius': min(self.radius, PLACES_MAX_RADIUS)}
+
+def root_cells(areas: Iterable[Dict[str, Any]], bounds: Tuple[float, float, float, float] = IRELAND_BOUNDS,
+               cell_size: Tuple[float, float] = ROOT_CELL_SIZE) -> List[SearchCell]:
+    """Grid cells over bounds that touch at least one area circle"""
+    areas = list(areas)
+    south, west, north, east = bounds
+    rows = math.ceil((north - south) / cell_size[0])
+    cols = math.ceil((east - west) / cell_size[1])
+
+    cells = []
+    for row in range(rows):
+        for col in range(cols):
+            cell = SearchCell(
+                round(south + row * cell_size[0], 6),
+                round(west + col * cell_size[1], 6),
+                round(south + (row + 1) * cell_size[0], 6),
+                round(west + (col + 1) * cell_size[1], 6)
+            )
+            if any(cell.touches_circle(area['lat'], area['lng'], area['radius']) for area in areas):
+                cells.append(cell)
+    return cells
+
+class RequestBudget:
+    """Thread-safe cap on paid Places requests; None means unlimited"""
+
+    def __init__(self, max_requests: Optional[int] = None, max_cost: Optional[float] = None):
+        self.max_requests = max_requests
+        self.max_cost = max_cost
+        self.requests: Dict[str, int] = {kind: 0 for kind in PLACES_COSTS}
+        self.refused = 0
+        self.lock = threading.Lock()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    @property
+    def cost(self) -> float:
+        return sum(PLACES_COSTS[kind] * count for kind, count in self.requests.items())
+
+    def spend(self, kind: str) -> bool:
+        """Reserve one request of kind; False once the budget would be exceeded"""
+        with self.lock:
+            over_requests = self.max_requests is not None and self.total_requests + 1 > self.max_requests
+            over_cost = self.max_cost is not None and self.cost + PLACES_COSTS[kind] > self.max_cost
+            if over_requests or over_cost:
+                if self.refused == 0:
+                    logger.warning("💸 Places request budget exhausted; remaining requests are skipped")
+                self.refused += 1
+                return False
+            self.requests[kind] += 1
+            return True
+
+    def summary(self) -> str:
+        parts = ', '.join(f"{count} {kind}" for kind, count in self.requests.items())
+        text = f"{self.total_requests} paid requests ({parts}), ~${self.cost:.2f}"
+        if self.refused:
+            text += f", {self.refused} refused by budget"
+        return text
+
+class QuadtreePlanner:
+    """Runs searches cell by cell, subdividing only saturated (cell, term) pairs
+
+    search(area, term) returns the list of places found, or None on failure.
+    map_func(func, items) runs searches (e.g. FetchEngine.imap) and must yield
+    results in input order.
+    """
+
+    def __init__(self, search: Callable[[Dict[str, Any], str], Optional[List[Dict]]],
+                 terms: List[str], max_depth: int = 4, min_radius: int = 1000):
+        self.search = search
+        self.terms = terms
+        self.max_depth = max_depth
+        self.min_radius = min_radius
+        self.stats = {'searches': 0, 'failed': 0, 'subdivided': 0, 'capped': 0, 'places': 0}
+
+    def can_split(self, cell: SearchCell) -> bool:
+        return cell.depth < self.max_depth and cell.radius / 2 >= self.min_radius
+
+    def iter_places(self, cells: List[SearchCell],
+                    map_func: Callable[[Callable, Iterable], Iterable] = map) -> Iterator[Dict]:
+        """Unique places (by place_id), streamed as each search completes"""
+        seen_place_ids = set()
+        level = [(cell, term) for cell in cells for term in self.terms]
+
+        while level:
+            logger.info(f"🗺️  Searching {len(level)} cell/term pairs at depth {level[0][0].depth}...")
+            next_level = []
+            results = map_func(lambda pair: self.search(pair[0].as_area(), pair[1]), level)
+
+            for (cell, term), places in zip(level, results):
+                self.stats['searches'] += 1
+                if places is None:
+                    self.stats['failed'] += 1
+                    continue
+
+                if len(places) >= PLACES_RESULT_CAP:
+                    if self.can_split(cell):
+                        self.stats['subdivided'] += 1
+                        next_level.extend((child, term) for child in cell.split())
+                    else:
+                        self.stats['capped'] += 1
+
+                for place in places:
+                    place_id = place.get('place_id')
+                    if place_id and place_id not in seen_place_ids:
+                        seen_place_ids.add(place_id)
+                        self.stats['places'] += 1
+                        yield place
+
+            level = next_level
+
+        if self.stats['capped']:
+            logger.warning(f"⚠️  {self.stats['capped']} searches still hit the result cap at the smallest cell size")
+        logger.info(f"🗺️  Planner: {self.stats['searches']} searches ({self.stats['failed']} failed), "
+                    f"{self.stats['subdivided']} subdivisions, {self.stats['places']} unique places")
+
+def estimate(cells: List[SearchCell], terms: List[str], legacy_areas: Optional[List[Dict[str, Any]]] = None,
+             expected_places: Optional[int] = None) -> Dict[str, Any]:
+    """Dry-run request and cost figures for the root level of a plan
+
+    Every search costs 1 to PLACES_MAX_PAGES page requests; each subdivision
+    adds up to 4 searches more. Cached responses cost nothing and are not
+    accounted for here.
+    """
+    searches = len(cells) * len(terms)
+    plan = {
+        'cells': len(cells),
+        'terms': len(terms),
+        'searches': searches,
+        'search_requests': (searches, searches * PLACES_MAX_PAGES),
+        'search_cost': (searches * PLACES_COSTS['nearby_search'],
+                        searches * PLACES_MAX_PAGES * PLACES_COSTS['nearby_search']),
+        'per_subdivision_requests': (4, 4 * PLACES_MAX_PAGES)
+    }
+    if expected_places is not None:
+        plan['details_requests'] = expected_places
+        plan['details_cost'] = expected_places * PLACES_COSTS['place_details']
+    if legacy_areas is not None:
+        legacy_searches = len(legacy_areas) * len(terms)
+        plan['legacy_searches'] = legacy_searches
+        plan['legacy_search_requests'] = (legacy_searches, legacy_searches * PLACES_MAX_PAGES)
+    return plan
+
+def log_estimate(plan: Dict[str, Any]):
+    low, high = plan['search_requests']
+    low_cost, high_cost = plan['search_cost']
+    logger.info(f"📐 Plan: {plan['cells']} cells x {plan['terms']} terms = {plan['searches']} searches")
+    logger.info(f"   {low}-{high} search requests (~${low_cost:.2f}-${high_cost:.2f}) before subdivision")
+    logger.info(f"   each saturated search adds {plan['per_subdivision_requests'][0]}-"
+                f"{plan['per_subdivision_requests'][1]} requests")
+    if 'details_requests' in plan:
+        logger.info(f"   {plan['details_requests']} place details requests (~${plan['details_cost']:.2f})")
+    if 'legacy_searches' in plan:
+        legacy_low, legacy_high = plan['legacy_search_requests']
+        logger.info(f"   fixed-circle plan: {plan['legacy_searches']} searches, {legacy_low}-{legacy_high} requests")
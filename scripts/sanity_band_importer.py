@@ -5,6 +5,7 @@ Converts scraped band data into Sanity import format
 """
 
 import json
+import os
 import re
 import sys
 import requests
@@ -12,6 +13,10 @@ from datetime import datetime
 from typing import List, Dict, Set
 from difflib import SequenceMatcher
 
+# Add the scripts directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fuzzy_dedup import SimilarityIndex, DEDUP_THRESHOLDS
+
 def similarity(a: str, b: str) -> float:
     """Calculate similarity between two strings"""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
@@ -19,6 +24,7 @@ def similarity(a: str, b: str) -> float:
 def detect_duplicates(bands: List[Dict]) -> List[Dict]:
     """Detect and handle duplicate bands"""
     seen_names: Set[str] = set()
+    similar_names = SimilarityIndex(DEDUP_THRESHOLDS['band_import'])
     seen_mbids: Set[str] = set()
     
     filtered_bands = []
@@ -42,12 +48,9 @@ def detect_duplicates(bands: List[Dict]) -> List[Dict]:
             duplicate_reason = "exact name match"
         
         # Check for similar names (90% similarity threshold for bands)
-        else:
-            for seen_name in seen_names:
-                if similarity(name, seen_name) > 0.90:
-                    is_duplicate = True
-                    duplicate_reason = f"similar name to existing band"
-                    break
+        elif similar_names.find(name):
+            is_duplicate = True
+            duplicate_reason = f"similar name to existing band"
         
         if is_duplicate:
             duplicates_found.append({
@@ -58,6 +61,7 @@ def detect_duplicates(bands: List[Dict]) -> List[Dict]:
         else:
             filtered_bands.append(band)
             seen_names.add(name)
+            similar_names.add(name)
             if mbid:
                 seen_mbids.add(mbid)
     
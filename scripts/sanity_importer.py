@@ -5,6 +5,7 @@ Converts scraped studio data into Sanity import format
 """
 
 import json
+import os
 import re
 import sys
 import requests
@@ -12,6 +13,10 @@ from datetime import datetime
 from typing import List, Dict, Set
 from difflib import SequenceMatcher
 
+# Add the scripts directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fuzzy_dedup import SimilarityIndex, DEDUP_THRESHOLDS
+
 def similarity(a: str, b: str) -> float:
     """Calculate similarity between two strings"""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
@@ -19,6 +24,7 @@ def similarity(a: str, b: str) -> float:
 def detect_duplicates(studios: List[Dict]) -> List[Dict]:
     """Detect and handle duplicate studios"""
     seen_names: Set[str] = set()
+    similar_names = SimilarityIndex(DEDUP_THRESHOLDS['studio'])
     seen_websites: Set[str] = set()
     seen_locations: Set[tuple] = set()
     
@@ -47,11 +53,10 @@ def detect_duplicates(studios: List[Dict]) -> List[Dict]:
             duplicate_reason = "exact name match"
         
         # Check for similar names (85% similarity threshold)
-        for seen_name in seen_names:
-            if similarity(name, seen_name) > 0.85:
-                is_duplicate = True
-                duplicate_reason = f"similar name to '{seen_name}'"
-                break
+        match = similar_names.find(name)
+        if match:
+            is_duplicate = True
+            duplicate_reason = f"similar name to '{match[0]}'"
         
         # Check for exact website match
         if website and website in seen_websites:
@@ -73,6 +78,7 @@ def detect_duplicates(studios: List[Dict]) -> List[Dict]:
         else:
             filtered_studios.append(studio)
             seen_names.add(name)
+            similar_names.add(name)
             if website:
                 seen_websites.add(website)
             if location:
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Incremental Sanity CMS Sync
+Pushes only the documents that changed since the last sync:
+- A local manifest records each synced document ID with a hash of its
+  content, per project and dataset
+- Each run converts the scraped data with the existing importer, diffs it
+  against the manifest and sends the create/update/delete change set as
+  batched Mutations API requests on a few threads, retrying 429/5xx
+- The manifest is saved after every acknowledged batch, so an interrupted
+  sync resumes where it stopped
+
+Usage:
+    python sanity_sync.py bands --dry-run      # show the change set
+    python sanity_sync.py venues               # push creates and updates
+    python sanity_sync.py studios --prune      # also delete documents no longer scraped
+    python sanity_sync.py bands --bootstrap    # first run: hash what is already in Sanity
+
+Configure with environment variables:
+    SANITY_PROJECT_ID   (default: sy7ko2cx)
+    SANITY_DATASET      (default: production)
+    SANITY_API_TOKEN    write token, required unless --dry-run
+    SANITY_API_URL      API base URL override (e.g. a local stand-in)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+# Add the scripts directory to the Python path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(SCRIPT_DIR)
+from fetch_engine import parse_retry_after
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SANITY_API_VERSION = 'v2021-10-21'
+DEFAULT_PROJECT_ID = 'sy7ko2cx'
+DEFAULT_DATASET = 'production'
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WORKERS = 4
+
+# Fields Sanity maintains itself; never part of the content hash
+SYSTEM_FIELDS = {'_rev', '_createdAt', '_updatedAt'}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# entity -> (importer module, scraped data file, Sanity document type)
+ENTITIES = {
+    'bands': ('sanity_band_importer', 'irish_bands_data.json', 'band'),
+    'venues': ('sanity_venue_importer', 'irish_venues_data.json', 'venue'),
+    'studios': ('sanity_importer', 'irish_studios_data.json', 'soundStudio')
+}
+
+class SanityError(Exception):
+    """A Sanity API request failed after all retries"""
+
+def content_hash(doc: Dict[str, Any]) -> str:
+    """Stable hash of a document's content (key order and system fields ignored)"""
+    content = {k: v for k, v in doc.items() if k not in SYSTEM_FIELDS}
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class SyncManifest:
+    """Document ID -> {type, hash} of what Sanity is known to hold"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('documents', {})
+
+    def ids_for_type(self, doc_type: str) -> List[str]:
+        return [doc_id for doc_id, entry in self.entries.items() if entry['type'] == doc_type]
+
+    def record(self, doc_id: str, doc_type: str, doc_hash: str):
+        with self.lock:
+            self.entries[doc_id] = {'type': doc_type, 'hash': doc_hash}
+
+    def forget(self, doc_id: str):
+        with self.lock:
+            self.entries.pop(doc_id, None)
+
+    def save(self):
+        with self.lock:
+            data = json.dumps({'documents': self.entries, 'saved_at': time.time()}, indent=2, sort_keys=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+
+@dataclass
+class ChangeSet:
+    doc_type: str
+    creates: List[Dict[str, Any]] = field(default_factory=list)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __len__(self):
+        return len(self.creates) + len(self.updates) + len(self.deletes)
+
+    def summary(self) -> str:
+        return (f"{len(self.creates)} to create, {len(self.updates)} to update, "
+                f"{len(self.deletes)} to delete, {self.unchanged} unchanged")
+
+def compute_changes(docs: List[Dict[str, Any]], manifest: SyncManifest, doc_type: str) -> ChangeSet:
+    """Diff converted documents against the manifest
+
+    Deletes are manifest entries of this type that are no longer in docs;
+    documents created by hand in the Studio are never in the manifest, so
+    they are never deleted.
+    """
+    changes = ChangeSet(doc_type)
+    current_ids = set()
+
+    for doc in docs:
+        doc_id = doc['_id']
+        if doc_id in current_ids:
+            continue
+        current_ids.add(doc_id)
+
+        entry = manifest.entries.get(doc_id)
+        if entry is None:
+            changes.creates.append(doc)
+        elif entry['hash'] != content_hash(doc):
+            changes.updates.append(doc)
+        else:
+            changes.unchanged += 1
+
+    changes.deletes = [doc_id for doc_id in manifest.ids_for_type(doc_type) if doc_id not in current_ids]
+    return changes
+
+class SanityClient:
+    """Minimal Sanity HTTP API client: GROQ queries and batched mutations"""
+
+    def __init__(self, project_id: str, dataset: str, token: Optional[str] = None,
+                 base_url: Optional[str] = None, timeout: float = 30, max_retries: int = 4):
+        self.project_id = project_id
+        self.dataset = dataset
+        self.token = token
+        self.base_url = (base_url or f"https://{project_id}.api.sanity.io").rstrip('/') + f"/{SANITY_API_VERSION}"
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.local = threading.local()
+
+    @classmethod
+    def from_env(cls) -> 'SanityClient':
+        return cls(
+            os.environ.get('SANITY_PROJECT_ID', DEFAULT_PROJECT_ID),
+            os.environ.get('SANITY_DATASET', DEFAULT_DATASET),
+            os.environ.get('SANITY_API_TOKEN'),
+            os.environ.get('SANITY_API_URL')
+        )
+
+    def _session(self) -> requests.Session:
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            if self.token:
+                session.headers['Authorization'] = f"Bearer {self.token}"
+            self.local.session = session
+        return session
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._session().request(method, url, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    raise SanityError(f"{method} {path} failed: {e}")
+                time.sleep(min(30, 2 ** attempt) * random.uniform(0.5, 1.0))
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                if response.status_code >= 400:
+                    raise SanityError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+                return response.json()
+
+            if attempt == self.max_retries:
+                raise SanityError(f"{method} {path} still failing with {response.status_code}")
+
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+            if delay is None:
+                delay = min(30, 2 ** attempt) * random.uniform(0.5, 1.0)
+            logger.warning(f"⏳ Sanity returned {response.status_code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def query(self, groq: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        query_params = {'query': groq}
+        for name, value in (params or {}).items():
+            query_params[f"${name}"] = json.dumps(value)
+        return self._request('GET', f"/data/query/{self.dataset}", params=query_params).get('result')
+
+    def mutate(self, mutations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply mutations in one transaction"""
+        return self._request(
+            'POST',
+            f"/data/mutate/{self.dataset}",
+            params={'returnIds': 'false', 'visibility': 'async'},
+            json={'mutations': mutations}
+        )
+
+def bootstrap_manifest(client: SanityClient, manifest: SyncManifest, doc_type: str) -> int:
+    """Seed the manifest from documents already in Sanity (one query per type)"""
+    docs = client.query('*[_type == $type]', {'type': doc_type}) or []
+    for doc in docs:
+        manifest.record(doc['_id'], doc_type, content_hash(doc))
+    manifest.save()
+    return len(docs)
+
+def push_changes(client: SanityClient, changes: ChangeSet, manifest: SyncManifest, prune: bool = False,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_workers: int = DEFAULT_WORKERS) -> Dict[str, int]:
+    """Send the change set as concurrent mutation batches; returns counts"""
+    operations: List[Tuple[str, Any]] = [('upsert', doc) for doc in changes.creates + changes.updates]
+    if prune:
+        operations += [('delete', doc_id) for doc_id in changes.deletes]
+
+    batches = [operations[i:i + batch_size] for i in range(0, len(operations), batch_size)]
+    stats = {'sent': 0, 'failed': 0, 'batches': len(batches)}
+    stats_lock = threading.Lock()
+
+    def send(batch):
+        mutations = [
+            {'createOrReplace': payload} if op == 'upsert' else {'delete': {'id': payload}}
+            for op, payload in batch
+        ]
+        client.mutate(mutations)
+
+        # Only acknowledged batches reach the manifest
+        for op, payload in batch:
+            if op == 'upsert':
+                manifest.record(payload['_id'], changes.doc_type, content_hash(payload))
+            else:
+                manifest.forget(payload)
+        manifest.save()
+        return len(batch)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(send, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            try:
+                sent = future.result()
+                with stats_lock:
+                    stats['sent'] += sent
+            except SanityError as e:
+                logger.error(f"❌ Batch of {len(futures[future])} mutations failed: {e}")
+                with stats_lock:
+                    stats['failed'] += len(futures[future])
+
+    return stats
+
+def load_documents(entity: str) -> List[Dict[str, Any]]:
+    """Scraped data run through the entity's importer (dedup + Sanity format)"""
+    module_name, data_file, _ = ENTITIES[entity]
+    importer = __import__(module_name)
+
+    with open(os.path.join(SCRIPT_DIR, data_file), 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    logger.info(f"✅ Loaded {len(raw)} scraped {entity} from {data_file}")
+
+    return importer.convert_to_sanity_format(importer.detect_duplicates(raw))
+
+def manifest_path(client: SanityClient) -> str:
+    return os.path.join(SCRIPT_DIR, f".sanity_manifest.{client.project_id}.{client.dataset}.json")
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally sync scraped data into Sanity')
+    parser.add_argument('entity', choices=sorted(ENTITIES), help='Which documents to sync')
+    parser.add_argument('--dry-run', action='store_true', help='Show the change set without sending it')
+    parser.add_argument('--prune', action='store_true', help='Delete previously synced documents no longer scraped')
+    parser.add_argument('--bootstrap', action='store_true', help='Seed the manifest from documents already in Sanity')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Mutations per request')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent mutation requests')
+    parser.add_argument('--manifest', help='Manifest path (default: per project and dataset in scripts/)')
+    args = parser.parse_args()
+
+    client = SanityClient.from_env()
+    if not client.token and not args.dry_run:
+        logger.error("SANITY_API_TOKEN environment variable not found!")
+        logger.error("A write token is needed to push changes (use --dry-run to preview)")
+        sys.exit(1)
+
+    doc_type = ENTITIES[args.entity][2]
+    manifest = SyncManifest(args.manifest or manifest_path(client))
+
+    if args.bootstrap:
+        count = bootstrap_manifest(client, manifest, doc_type)
+        logger.info(f"📋 Seeded manifest with {count} existing {doc_type} documents")
+
+    docs = load_documents(args.entity)
+    changes = compute_changes(docs, manifest, doc_type)
+    logger.info(f"🔄 {args.entity}: {changes.summary()}")
+    if changes.deletes and not args.prune:
+        logger.info(f"   {len(changes.deletes)} deletions skipped (pass --prune to apply)")
+
+    if args.dry_run:
+        for label, items in (('create', changes.creates), ('update', changes.updates)):
+            for doc in items[:20]:
+                print(f"   {label}: {doc['_id']}")
+        for doc_id in changes.deletes[:20]:
+            print(f"   delete: {doc_id}")
+        return
+
+    if not changes.creates and not changes.updates and not (args.prune and changes.deletes):
+        logger.info("✅ Sanity is up to date")
+        return
+
+    stats = push_changes(client, changes, manifest, args.prune, args.batch_size, args.workers)
+    logger.info(f"✅ Sent {stats['sent']} mutations in {stats['batches']} batches ({stats['failed']} failed)")
+    if stats['failed']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Converts scraped venue data into Sanity import format
 """
 
 import json
+import os
 import re
 import sys
 import requests
@@ -12,6 +13,10 @@ from datetime import datetime
 from typing import List, Dict, Set
 from difflib import SequenceMatcher
 
+# Add the scripts directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fuzzy_dedup import SimilarityIndex, DEDUP_THRESHOLDS
+
 def similarity(a: str, b: str) -> float:
     """Calculate similarity between two strings"""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
@@ -19,6 +24,7 @@ def similarity(a: str, b: str) -> float:
 def detect_duplicates(venues: List[Dict]) -> List[Dict]:
     """Detect and handle duplicate venues"""
     seen_names: Set[str] = set()
+    similar_names = SimilarityIndex(DEDUP_THRESHOLDS['venue'])
     seen_place_ids: Set[str] = set()
     seen_locations: Set[tuple] = set()
     
@@ -51,12 +57,9 @@ def detect_duplicates(venues: List[Dict]) -> List[Dict]:
             duplicate_reason = "exact name match"
         
         # Check for similar names (85% similarity threshold)
-        else:
-            for seen_name in seen_names:
-                if similarity(name, seen_name) > 0.85:
-                    is_duplicate = True
-                    duplicate_reason = f"similar name to existing venue"
-                    break
+        elif similar_names.find(name):
+            is_duplicate = True
+            duplicate_reason = f"similar name to existing venue"
         
         # Check for same location (different names but same place)
         if not is_duplicate and location and location in seen_locations:
@@ -73,6 +76,7 @@ def detect_duplicates(venues: List[Dict]) -> List[Dict]:
         else:
             filtered_venues.append(venue)
             seen_names.add(name)
+            similar_names.add(name)
             if place_id:
                 seen_place_ids.add(place_id)
             if location:
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Journal for long scraping runs
+Append-only JSON Lines file recording each finished unit of work (one
+search, one place) together with its result:
+- Every line is flushed and fsynced as the unit completes, so a crash or
+  Ctrl-C loses at most the units still in flight
+- A resumed run loads the journal, skips finished units and feeds their
+  recorded results back into the normal aggregation (dedup, validation)
+- Units whose result is None (errors, nothing found) are not recorded and
+  are retried on resume; the HTTP cache makes that cheap
+
+A torn last line from a crash mid-write is cut off on load.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ScrapeJournal:
+    """Thread-safe journal of unit key -> JSON result; path=None keeps nothing"""
+
+    def __init__(self, path: Optional[str] = None, resume: bool = False):
+        self.path = path
+        self.results: Dict[str, Any] = {}
+        self.stats = {'skipped': 0, 'recorded': 0}
+        self.lock = threading.Lock()
+        self.file = None
+
+        if not path:
+            return
+
+        if resume and os.path.exists(path):
+            self._load()
+            logger.info(f"📒 Resuming from {path}: {len(self.results)} units already done")
+        elif resume:
+            logger.info(f"📒 No journal at {path}, starting a fresh run")
+
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    @staticmethod
+    def unit_key(unit: Tuple) -> str:
+        return json.dumps(list(unit), ensure_ascii=False, separators=(',', ':'))
+
+    def _load(self):
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    logger.warning(f"⚠️  Dropping unreadable journal line {line_number} (interrupted write?)")
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                self.results[record['unit']] = record['result']
+                valid_bytes += len(line)
+
+        # Cut off a torn tail so new records start on a fresh line
+        if valid_bytes < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def done(self, *unit) -> bool:
+        return self.unit_key(unit) in self.results
+
+    def record(self, unit: Tuple, result: Any):
+        key = self.unit_key(unit)
+        line = json.dumps({'unit': key, 'result': result, 'at': time.time()}, ensure_ascii=False)
+        with self.lock:
+            self.results[key] = result
+            self.stats['recorded'] += 1
+            if self.file:
+                self.file.write(line + '\n')
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+    def run(self, unit: Tuple, func: Callable[..., Any], *args,
+            encode: Optional[Callable[[Any], Any]] = None,
+            decode: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Result of func(*args) for unit, from the journal when already done
+
+        encode/decode convert results (e.g. dataclasses) to and from JSON.
+        """
+        key = self.unit_key(unit)
+        if key in self.results:
+            with self.lock:
+                self.stats['skipped'] += 1
+            stored = self.results[key]
+            return decode(stored) if decode and stored is not None else stored
+
+        result = func(*args)
+        if result is not None:
+            self.record(unit, encode(result) if encode else result)
+        return result
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        if self.path:
+            logger.info(f"📒 Journal {self.path}: {self.stats['recorded']} units recorded, "
+                        f"{self.stats['skipped']} resumed")
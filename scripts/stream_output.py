@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Streaming Output for the scraper pipelines
+Records are written one at a time as they leave the last pipeline stage:
+- NdjsonWriter: one JSON document per line (Sanity CLI import format)
+- JsonArrayWriter: the existing pretty-printed JSON array files, written
+  incrementally, byte-identical to json.dump(records, f, indent=2)
+- emit(): pipeline stage that writes each record to every output and
+  passes it on, so summaries can be counted without keeping the list
+
+Each record is flushed as it is written, so the first results are on disk
+while the scrape is still running.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class NdjsonWriter:
+    """Newline-delimited JSON file writer"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.count = 0
+        self.file = open(filename, 'w', encoding='utf-8')
+
+    def write(self, record: Any):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            logger.info(f"Saved {self.count} records to {self.filename}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JsonArrayWriter(NdjsonWriter):
+    """Incremental writer for an indent=2 JSON array file"""
+
+    def write(self, record: Any):
+        body = json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        self.file.write(('[\n  ' if self.count == 0 else ',\n  ') + body)
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        if self.file:
+            self.file.write('\n]' if self.count else '[]')
+        super().close()
+
+def emit(records: Iterable[Any], outputs: List[Tuple[NdjsonWriter, Callable[[Any], Any]]]) -> Iterator[Any]:
+    """Write each record to every (writer, transform) output, then yield it"""
+    for record in records:
+        for writer, transform in outputs:
+            writer.write(transform(record))
+        yield record
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Studio Website Enrichment Engine
+Fetches studio websites and extracts contact details, equipment, genres and
+prices:
+- robots.txt is fetched and parsed once per host; concurrent checks for the
+  same host share one fetch
+- Pages are fetched through the fetch engine, many hosts at a time, each
+  host paced on its own
+- HTML is parsed with lxml when installed (html.parser otherwise), and the
+  equipment and genre keyword lists are each matched in one regex pass
+- Emails, phones and prices are read from the visible text and mailto:/tel:
+  links instead of the raw markup
+- parse_studio_page() is a plain function, so CPU-bound parsing can run in
+  a process pool (SCRAPER_PARSE_PROCESSES=4)
+"""
+
+import logging
+import os
+import re
+import threading
+import urllib.robotparser
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, Tag
+
+from fetch_engine import FetchEngine
+from location_matcher import trie_pattern
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+EQUIPMENT_KEYWORDS = [
+    'pro tools', 'logic pro', 'cubase', 'reaper', 'ableton',
+    'mixing console', 'ssl', 'neve', 'api', 'focusrite',
+    'microphone', 'neumann', 'akg', 'shure', 'rode',
+    'monitors', 'yamaha', 'genelec', 'krk', 'adam',
+    'piano', 'grand piano', 'keyboard', 'synthesizer',
+    'guitar amp', 'bass amp', 'drum kit', 'percussion',
+    'vocal booth', 'live room', 'control room', 'isolation booth',
+    'mastering', 'mixing', 'tracking', 'overdubbing'
+]
+
+GENRE_KEYWORDS = [
+    'rock', 'pop', 'jazz', 'classical', 'electronic', 'hip hop',
+    'folk', 'country', 'blues', 'metal', 'punk', 'indie',
+    'alternative', 'reggae', 'funk', 'r&b', 'soul'
+]
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(?:\+353|0)\s*\d{1,2}\s*\d{3,4}\s*\d{4}')
+PRICE_PATTERN = re.compile(r'[€£$]\s*(\d+)')
+MAX_PRICE = 1000  # anything above is not an hourly rate
+
+SOCIAL_HOSTS = {
+    'facebook.com': 'facebook',
+    'instagram.com': 'instagram',
+    'twitter.com': 'twitter'
+}
+
+class KeywordMatcher:
+    """Whole-word matching of a keyword list in one regex pass
+
+    A keyword that is part of a longer one ("piano" in "grand piano") is
+    reported whenever the longer one is found.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self.order = {keyword: index for index, keyword in enumerate(self.keywords)}
+        pattern = trie_pattern(self.keywords) if self.keywords else r'(?!)'
+        # Without boundary checks the regex engine can skip ahead on the first letters;
+        # the exact whole-word pattern is only tried where a candidate starts
+        self.candidates = re.compile(pattern)
+        self.exact = re.compile(r'(?<!\w)(?:' + pattern + r')(?!\w)')
+        self.implied = {
+            keyword: [other for other in self.keywords
+                      if other != keyword and re.search(r'(?<!\w)' + re.escape(other) + r'(?!\w)', keyword)]
+            for keyword in self.keywords
+        }
+
+    def find(self, text: str) -> List[str]:
+        """Keywords present in text (already lowercased), in list order"""
+        found = set()
+        position = 0
+        while True:
+            candidate = self.candidates.search(text, position)
+            if not candidate:
+                break
+            match = self.exact.match(text, candidate.start())
+            if not match:
+                position = candidate.start() + 1
+                continue
+            keyword = match.group(0)
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self.implied[keyword])
+            position = match.end()
+        return sorted(found, key=self.order.__getitem__)
+
+_MATCHERS: Dict[Tuple[str, ...], KeywordMatcher] = {}
+
+def keyword_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """Shared matcher for a keyword list, compiled on first use (per process)"""
+    key = tuple(keywords)
+    if key not in _MATCHERS:
+        _MATCHERS[key] = KeywordMatcher(key)
+    return _MATCHERS[key]
+
+def parse_studio_page(html: str, equipment_keywords: Tuple[str, ...] = tuple(EQUIPMENT_KEYWORDS),
+                      genre_keywords: Tuple[str, ...] = tuple(GENRE_KEYWORDS)) -> Dict[str, Any]:
+    """Details from one studio web page (pure function; safe for a process pool)"""
+    details = {
+        'contact': {},
+        'amenities': [],
+        'pricing': {},
+        'description': None,
+        'genres': [],
+        'features': []
+    }
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    # Links: social profiles, mailto: and tel:
+    link_emails = []
+    link_phones = []
+    for link in soup.find_all('a', href=True):
+        href = link['href'].strip()
+        lowered = href.lower()
+        if lowered.startswith('mailto:'):
+            link_emails.append(href[7:].split('?')[0])
+        elif lowered.startswith('tel:'):
+            link_phones.append(href[4:])
+        else:
+            for host, field in SOCIAL_HOSTS.items():
+                if host in lowered:
+                    details['contact'][field] = href
+                    break
+
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc and isinstance(meta_desc, Tag):
+        content = meta_desc.get('content')
+        if content:
+            details['description'] = str(content).strip()
+
+    # Visible text only: scripts and styles are full of false keyword hits
+    for tag in soup(['script', 'style', 'noscript', 'template']):
+        tag.decompose()
+    text = soup.get_text(' ')
+
+    emails = EMAIL_PATTERN.findall(text) or [email for email in link_emails if EMAIL_PATTERN.fullmatch(email)]
+    if emails:
+        details['contact']['email'] = emails[0]
+
+    phone = PHONE_PATTERN.search(text) or next(filter(None, (PHONE_PATTERN.search(p) for p in link_phones)), None)
+    if phone:
+        details['contact']['phone'] = phone.group(0)
+
+    prices = [int(price) for price in PRICE_PATTERN.findall(text) if int(price) < MAX_PRICE]
+    if prices:
+        details['pricing']['hourlyRate'] = min(prices)  # Take the lowest as likely hourly rate
+
+    text = text.lower()
+    details['amenities'] = [keyword.replace(' ', '_') for keyword in keyword_matcher(equipment_keywords).find(text)]
+    details['genres'] = keyword_matcher(genre_keywords).find(text)
+
+    return details
+
+class RobotsCache:
+    """robots.txt rules per host, fetched once and shared between threads"""
+
+    ALLOW_ALL = 'allow'
+    DENY_ALL = 'deny'
+
+    def __init__(self, fetcher: FetchEngine, user_agent: str = '*'):
+        self.fetcher = fetcher
+        self.user_agent = user_agent
+        self.rules: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+    def _load(self, origin: str):
+        try:
+            response = self.fetcher.get(f"{origin}/robots.txt", timeout=10)
+            if response.status_code in (401, 403):
+                return self.DENY_ALL
+            if response.status_code >= 400:
+                return self.ALLOW_ALL
+
+            parser = urllib.robotparser.RobotFileParser()
+            parser.parse(response.text.splitlines())
+            return parser
+        except Exception as e:
+            logger.warning(f"Could not check robots.txt for {origin}: {e}")
+            return self.ALLOW_ALL  # Default to allowing if we can't check
+
+    def allowed(self, url: str) -> bool:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}".lower()
+
+        with self.lock:
+            future = self.rules.get(origin)
+            owner = future is None
+            if owner:
+                future = self.rules[origin] = Future()
+
+        if owner:
+            future.set_result(self._load(origin))
+
+        rules = future.result()
+        if rules == self.ALLOW_ALL:
+            return True
+        if rules == self.DENY_ALL:
+            return False
+        return rules.can_fetch(self.user_agent, url)
+
+class StudioEnricher:
+    """Robots-aware, concurrent website enrichment for studios"""
+
+    def __init__(self, fetcher: FetchEngine, process_workers: Optional[int] = None,
+                 equipment_keywords: Iterable[str] = EQUIPMENT_KEYWORDS,
+                 genre_keywords: Iterable[str] = GENRE_KEYWORDS):
+        self.fetcher = fetcher
+        self.robots = RobotsCache(fetcher)
+        self.keyword_lists = (tuple(equipment_keywords), tuple(genre_keywords))
+        if process_workers is None:
+            process_workers = int(os.getenv('SCRAPER_PARSE_PROCESSES', '0'))
+        self.pool = ProcessPoolExecutor(max_workers=process_workers) if process_workers > 0 else None
+
+    def parse(self, html: str) -> Dict[str, Any]:
+        if self.pool:
+            return self.pool.submit(parse_studio_page, html, *self.keyword_lists).result()
+        return parse_studio_page(html, *self.keyword_lists)
+
+    def enrich(self, website_url: str) -> Dict[str, Any]:
+        """Details scraped from a studio website ({} if disallowed or failed)"""
+        if not website_url or not self.robots.allowed(website_url):
+            return {}
+
+        try:
+            logger.info(f"Scraping website: {website_url}")
+            response = self.fetcher.get(website_url, timeout=10)
+            response.raise_for_status()
+            return self.parse(response.text)
+        except Exception as e:
+            logger.error(f"Error scraping website {website_url}: {e}")
+            return {}
+
+    def enrich_many(self, website_urls: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """enrich() over many sites concurrently, results in input order"""
+        for details in self.fetcher.imap(self.enrich, website_urls):
+            yield details or {}
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
@@ -4,19 +4,15 @@ Music Studios Data Scraper for Ireland
 Collects studio information using Google Maps API and website scraping
 """
 
-import requests
 import json
-import time
 import re
 import logging
 from datetime import datetime
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 from typing import Dict, List, Optional, Any
 import os
 import sys
 from dataclasses import dataclass, asdict
-from bs4 import BeautifulSoup, Tag
-import urllib.robotparser
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -25,6 +21,10 @@ load_dotenv()
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from irish_locations import get_all_irish_cities_and_towns, get_search_areas_with_coordinates
+from fetch_engine import FetchEngine
+from http_cache import cache_mode
+from studio_enrichment import StudioEnricher
+from gazetteer import IRISH_GAZETTEER
 
 # Configure logging
 logging.basicConfig(
@@ -99,13 +99,14 @@ class SoundStudio:
             self.features = []
 
 class MusicStudioScraper:
-    def __init__(self, google_api_key: str):
+    def __init__(self, google_api_key: str, max_workers: int = 8):
         self.google_api_key = google_api_key
         self.base_url = "https://maps.googleapis.com/maps/api"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.fetcher = FetchEngine(
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            max_workers=max_workers
+        )
+        self.enricher = StudioEnricher(self.fetcher)
         self.scraped_studios = []
         
         # Common search terms for music studios
@@ -123,19 +124,8 @@ class MusicStudioScraper:
         self.irish_cities = get_all_irish_cities_and_towns()
 
     def check_robots_txt(self, url: str) -> bool:
-        """Check if scraping is allowed by robots.txt"""
-        try:
-            parsed_url = urlparse(url)
-            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-            
-            rp = urllib.robotparser.RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            
-            return rp.can_fetch('*', url)
-        except Exception as e:
-            logger.warning(f"Could not check robots.txt for {url}: {e}")
-            return True  # Default to allowing if we can't check
+        """Check if scraping is allowed by robots.txt (fetched once per host)"""
+        return self.enricher.robots.allowed(url)
 
     def create_slug(self, name: str) -> str:
         """Create URL-friendly slug from studio name"""
@@ -156,7 +146,7 @@ class MusicStudioScraper:
         
         try:
             logger.info(f"Searching Google Places for: {query} in {location}")
-            response = self.session.get(url, params=params)
+            response = self.fetcher.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -181,7 +171,7 @@ class MusicStudioScraper:
         }
         
         try:
-            response = self.session.get(url, params=params)
+            response = self.fetcher.get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -209,7 +199,7 @@ class MusicStudioScraper:
         
         # This returns a redirect, so we get the final URL
         try:
-            response = self.session.get(url, params=params, allow_redirects=False)
+            response = self.fetcher.get(url, params=params, allow_redirects=False)
             if response.status_code == 302:
                 return response.headers.get('Location')
         except Exception as e:
@@ -217,15 +207,25 @@ class MusicStudioScraper:
         
         return None
 
-    def parse_address(self, formatted_address: str) -> StudioAddress:
-        """Parse Google's formatted address into components"""
+    def parse_address(self, formatted_address: str, lat: Optional[float] = None,
+                      lng: Optional[float] = None) -> StudioAddress:
+        """Parse Google's formatted address into components
+
+        The Eircode is taken out before the city is picked; a county missing
+        from the address comes from the Eircode or the coordinates.
+        """
         if not formatted_address:
             return StudioAddress()
         
-        # Split by commas and clean up
-        parts = [part.strip() for part in formatted_address.split(',')]
-        
         address = StudioAddress()
+        address.eircode = IRISH_GAZETTEER.find_eircode(formatted_address)
+        
+        # Split by commas and clean up, dropping the Eircode
+        address_text = formatted_address
+        if address.eircode:
+            eircode_pattern = re.compile(r'\b' + address.eircode.replace(' ', r'\s?') + r'\b', re.IGNORECASE)
+            address_text = eircode_pattern.sub('', address_text)
+        parts = [part.strip() for part in address_text.split(',') if part.strip()]
         
         # Last part should be country
         if parts and parts[-1].lower() in ['ireland', 'northern ireland']:
@@ -250,102 +250,61 @@ class MusicStudioScraper:
         if parts:
             address.street = ', '.join(parts).strip()
         
+        if not address.county:
+            _, address.county = IRISH_GAZETTEER.resolve(formatted_address, lat, lng)
+        
         return address
 
     def scrape_website_details(self, website_url: str) -> Dict[str, Any]:
         """Scrape additional details from studio website"""
-        if not website_url or not self.check_robots_txt(website_url):
-            return {}
+        return self.enricher.enrich(website_url)
+
+    def apply_website_details(self, studio: SoundStudio, website_details: Dict[str, Any]) -> SoundStudio:
+        """Merge details scraped from the studio's website into the studio"""
+        # Update contact info
+        contact_info = website_details.get('contact', {})
+        if contact_info.get('email'):
+            studio.contact.email = contact_info['email']
+        if contact_info.get('facebook'):
+            studio.contact.facebook = contact_info['facebook']
+        if contact_info.get('instagram'):
+            studio.contact.instagram = contact_info['instagram']
+        if contact_info.get('twitter'):
+            studio.contact.twitter = contact_info['twitter']
         
-        details = {
-            'contact': {},
-            'amenities': [],
-            'pricing': {},
-            'description': None,
-            'genres': [],
-            'features': []
-        }
+        # Update other details
+        if website_details.get('description'):
+            studio.description = website_details['description']
         
-        try:
-            logger.info(f"Scraping website: {website_url}")
-            time.sleep(2)  # Be respectful
-            
-            response = self.session.get(website_url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract email addresses
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, response.text)
-            if emails:
-                details['contact']['email'] = emails[0]
-            
-            # Extract phone numbers (Irish format)
-            phone_pattern = r'(\+353|0)\s*\d{1,2}\s*\d{3,4}\s*\d{4}'
-            phones = re.findall(phone_pattern, response.text)
-            if phones:
-                details['contact']['phone'] = phones[0]
-            
-            # Look for social media links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if 'facebook.com' in href:
-                    details['contact']['facebook'] = href
-                elif 'instagram.com' in href:
-                    details['contact']['instagram'] = href
-                elif 'twitter.com' in href:
-                    details['contact']['twitter'] = href
-            
-            # Extract description from meta tags or about sections
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc and isinstance(meta_desc, Tag):
-                content = meta_desc.get('content')
-                if content:
-                    details['description'] = str(content).strip()
-            
-            # Look for equipment/amenities keywords
-            text_content = soup.get_text().lower()
-            
-            equipment_keywords = [
-                'pro tools', 'logic pro', 'cubase', 'reaper', 'ableton',
-                'mixing console', 'ssl', 'neve', 'api', 'focusrite',
-                'microphone', 'neumann', 'akg', 'shure', 'rode',
-                'monitors', 'yamaha', 'genelec', 'krk', 'adam',
-                'piano', 'grand piano', 'keyboard', 'synthesizer',
-                'guitar amp', 'bass amp', 'drum kit', 'percussion',
-                'vocal booth', 'live room', 'control room', 'isolation booth',
-                'mastering', 'mixing', 'tracking', 'overdubbing'
-            ]
-            
-            for keyword in equipment_keywords:
-                if keyword in text_content:
-                    details['amenities'].append(keyword.replace(' ', '_'))
-            
-            # Look for pricing information
-            price_pattern = r'[€£$]\s*(\d+)'
-            prices = re.findall(price_pattern, response.text)
-            if prices:
-                # Try to categorize prices (this is basic and may need refinement)
-                price_values = [int(p) for p in prices if int(p) < 1000]  # Filter out unrealistic prices
-                if price_values:
-                    details['pricing']['hourlyRate'] = min(price_values)  # Take the lowest as likely hourly rate
-            
-            # Look for genre keywords
-            genre_keywords = [
-                'rock', 'pop', 'jazz', 'classical', 'electronic', 'hip hop',
-                'folk', 'country', 'blues', 'metal', 'punk', 'indie',
-                'alternative', 'reggae', 'funk', 'r&b', 'soul'
-            ]
-            
-            for genre in genre_keywords:
-                if genre in text_content:
-                    details['genres'].append(genre)
-            
-        except Exception as e:
-            logger.error(f"Error scraping website {website_url}: {e}")
+        if website_details.get('amenities'):
+            if studio.amenities is None:
+                studio.amenities = []
+            studio.amenities.extend(website_details['amenities'])
+        
+        if website_details.get('genres'):
+            if studio.genresSupported is None:
+                studio.genresSupported = []
+            studio.genresSupported.extend(website_details['genres'])
+        
+        # Set pricing if found
+        pricing_info = website_details.get('pricing', {})
+        if pricing_info:
+            studio.pricing = StudioPricing()
+            if pricing_info.get('hourlyRate'):
+                studio.pricing.hourlyRate = pricing_info['hourlyRate']
+        
+        return studio
+
+    def enrich_studios(self, studios: List[SoundStudio]) -> List[SoundStudio]:
+        """Enrichment stage: scrape every studio website, many hosts at a time"""
+        with_websites = [studio for studio in studios if studio.contact and studio.contact.website]
+        logger.info(f"Enriching {len(with_websites)} studios from their websites...")
         
-        return details
+        websites = (studio.contact.website for studio in with_websites)
+        for studio, website_details in zip(with_websites, self.enricher.enrich_many(websites)):
+            self.apply_website_details(studio, website_details)
+        
+        return studios
 
     def process_google_place(self, place_data: Dict) -> Optional[SoundStudio]:
         """Convert Google Places data to SoundStudio object"""
@@ -368,10 +327,6 @@ class MusicStudioScraper:
                 google_reviews_count=place_details.get('user_ratings_total')
             )
             
-            # Parse address
-            formatted_address = place_details.get('formatted_address', '')
-            studio.address = self.parse_address(formatted_address)
-            
             # Extract location coordinates
             geometry = place_details.get('geometry', {})
             location = geometry.get('location', {})
@@ -381,6 +336,10 @@ class MusicStudioScraper:
                     'lng': location.get('lng')
                 }
             
+            # Parse address
+            formatted_address = place_details.get('formatted_address', '')
+            studio.address = self.parse_address(formatted_address, location.get('lat'), location.get('lng'))
+            
             # Set contact information
             studio.contact = StudioContact()
             if place_details.get('formatted_phone_number'):
@@ -395,42 +354,6 @@ class MusicStudioScraper:
                 if photo_ref:
                     studio.profileImage = self.get_place_photo_url(photo_ref)
             
-            # Try to scrape additional details from website
-            if studio.contact.website:
-                website_details = self.scrape_website_details(studio.contact.website)
-                
-                # Update contact info
-                contact_info = website_details.get('contact', {})
-                if contact_info.get('email'):
-                    studio.contact.email = contact_info['email']
-                if contact_info.get('facebook'):
-                    studio.contact.facebook = contact_info['facebook']
-                if contact_info.get('instagram'):
-                    studio.contact.instagram = contact_info['instagram']
-                if contact_info.get('twitter'):
-                    studio.contact.twitter = contact_info['twitter']
-                
-                # Update other details
-                if website_details.get('description'):
-                    studio.description = website_details['description']
-                
-                if website_details.get('amenities'):
-                    if studio.amenities is None:
-                        studio.amenities = []
-                    studio.amenities.extend(website_details['amenities'])
-                
-                if website_details.get('genres'):
-                    if studio.genresSupported is None:
-                        studio.genresSupported = []
-                    studio.genresSupported.extend(website_details['genres'])
-                
-                # Set pricing if found
-                pricing_info = website_details.get('pricing', {})
-                if pricing_info:
-                    studio.pricing = StudioPricing()
-                    if pricing_info.get('hourlyRate'):
-                        studio.pricing.hourlyRate = pricing_info['hourlyRate']
-            
             return studio
             
         except Exception as e:
@@ -442,32 +365,31 @@ class MusicStudioScraper:
         all_studios = []
         seen_place_ids = set()
         
-        for area in self.search_areas:
-            logger.info(f"Searching in {area['name']}...")
-            
-            for search_term in self.search_terms:
-                try:
-                    places = self.search_google_places(search_term, area['name'])
-                    
-                    for place in places:
-                        place_id = place.get('place_id')
-                        if place_id in seen_place_ids:
-                            continue
-                        
-                        seen_place_ids.add(place_id)
-                        
-                        studio = self.process_google_place(place)
-                        if studio:
-                            all_studios.append(studio)
-                            logger.info(f"Found studio: {studio.name} in {studio.address.city if studio.address else 'Unknown'}")
-                    
-                    # Rate limiting
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error searching {search_term} in {area['name']}: {e}")
+        # All area/term searches run concurrently; Google is paced by the fetch engine
+        searches = [(search_term, area['name']) for area in self.search_areas for search_term in self.search_terms]
+        logger.info(f"Running {len(searches)} searches across {len(self.search_areas)} areas...")
+        results = self.fetcher.map(lambda search: self.search_google_places(*search), searches)
+        
+        places = []
+        for found in results:
+            for place in found or []:
+                place_id = place.get('place_id')
+                if place_id in seen_place_ids:
                     continue
+                
+                seen_place_ids.add(place_id)
+                places.append(place)
+        
+        # Details and photos for each place, several at a time
+        for studio in self.fetcher.map(self.process_google_place, places):
+            if studio:
+                all_studios.append(studio)
+                logger.info(f"Found studio: {studio.name} in {studio.address.city if studio.address else 'Unknown'}")
+        
+        # Studio websites, concurrently across hosts with robots.txt checked once per host
+        self.enrich_studios(all_studios)
         
+        self.fetcher.log_stats()
         return all_studios
 
     def save_to_json(self, studios: List[SoundStudio], filename: str = 'irish_music_studios.json'):
@@ -528,7 +450,8 @@ def main():
     # Load Google Maps API key from environment
     GOOGLE_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
     
-    if not GOOGLE_API_KEY:
+    # Offline replays are served from the HTTP cache and need no key
+    if not GOOGLE_API_KEY and cache_mode() != 'offline':
         logger.error("GOOGLE_MAPS_API_KEY environment variable not found!")
         logger.error("Please set your Google Maps API key in a .env file or environment variable")
         return
@@ -538,7 +461,10 @@ def main():
     logger.info("Starting music studios data collection...")
     
     # Search for studios
-    studios = scraper.search_all_studios()
+    try:
+        studios = scraper.search_all_studios()
+    finally:
+        scraper.enricher.close()
     
     logger.info(f"Found {len(studios)} studios total")
     
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared fetch engine: token bucket back-off and recovery,
+Retry-After handling, and replaying a run from the cache in offline mode.
+No network access: responses come from a fake session.
+
+Run with pytest, or directly: python test_fetch_engine.py
+"""
+
+import tempfile
+import time
+
+import requests
+
+from fetch_engine import FetchEngine, TokenBucket, parse_retry_after
+from http_cache import CacheMiss, HttpCache
+
+HOST = 'api.example.ie'
+URL = f'https://{HOST}/venues'
+
+def make_response(status=200, body=b'{"venues": []}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update({'Content-Type': 'application/json', **(headers or {})})
+    response.url = URL
+    return response
+
+class FakeSession:
+    """Answers get() with queued responses and records the calls"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, **kwargs):
+        self.calls.append((url, params, time.monotonic()))
+        if not self.responses:
+            raise AssertionError(f"Unexpected request: {url}")
+        return self.responses.pop(0)
+
+def engine_with(session, cache=None):
+    """Engine with a fast rate for HOST, sending through session"""
+    engine = FetchEngine(host_rates={HOST: 100.0}, max_workers=1, cache=cache, use_cache=cache is not None)
+    engine.local.session = session
+    return engine
+
+def test_back_off():
+    """Each throttle halves the rate down to the floor and empties the bucket"""
+    bucket = TokenBucket(8.0, burst=2)
+    bucket.on_throttle()
+    assert bucket.rate == 4.0
+    assert bucket.tokens == 0
+    for _ in range(10):
+        bucket.on_throttle()
+    assert bucket.rate == bucket.min_rate == 0.5
+    print("✅ Rate halves on throttling, never below max_rate / 16")
+
+def test_recovery():
+    """Successes add a tenth of the configured rate back, up to the configured rate"""
+    bucket = TokenBucket(10.0)
+    bucket.on_throttle()
+    bucket.on_throttle()
+    assert bucket.rate == 2.5
+    bucket.on_success()
+    assert bucket.rate == 3.5
+    for _ in range(20):
+        bucket.on_success()
+    assert bucket.rate == 10.0
+    print("✅ Rate creeps back up to the configured rate")
+
+def test_retry_after():
+    """Retry-After in either form blocks the host for that long"""
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0  # Already past
+    assert 55 < parse_retry_after(time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 60))) <= 60
+
+    bucket = TokenBucket(100.0)
+    bucket.on_throttle(retry_after=0.3)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.29
+
+    session = FakeSession(make_response(429, b'', {'Retry-After': '0.3'}), make_response())
+    engine = engine_with(session)
+    response = engine.get(URL)
+    (_, _, first), (_, _, second) = session.calls
+    assert response.status_code == 200
+    assert second - first >= 0.29
+    assert engine.stats['throttled'] == engine.stats['retries'] == 1
+    assert engine.bucket(URL).rate < 100.0
+    print(f"✅ Retried {second - first:.2f}s after a 429 asking for 0.3s")
+
+def test_offline_replay():
+    """A cached run replays offline with no requests; unrecorded requests raise CacheMiss"""
+    cache_dir = tempfile.mkdtemp()
+    session = FakeSession(make_response(body=b'{"venues": ["Whelans"]}'))
+    engine_with(session, HttpCache(cache_dir)).get(URL, params={'county': 'Dublin', 'key': 'secret'})
+    assert len(session.calls) == 1
+
+    offline = engine_with(FakeSession(), HttpCache(cache_dir, mode='offline'))
+    assert offline.is_cached(URL, {'key': 'another-secret', 'county': 'Dublin'})
+    response = offline.get(URL, params={'county': 'Dublin', 'key': 'another-secret'})
+    assert response.from_cache
+    assert response.json() == {'venues': ['Whelans']}
+
+    try:
+        offline.get(URL, params={'county': 'Cork'})
+    except CacheMiss:
+        pass
+    else:
+        raise AssertionError('Offline miss went to the network')
+    assert not offline.is_cached(URL, {'county': 'Cork'})
+    assert offline.cache.stats['hits'] == offline.cache.stats['misses'] == 1
+    assert offline.stats['requests'] == 0
+    print("✅ Offline mode served the recorded response without a request")
+
+def main():
+    """Run all tests"""
+    print("📡 Fetch Engine - Testing Suite\n")
+    test_back_off()
+    test_recovery()
+    test_retry_after()
+    test_offline_replay()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline gazetteer's address resolution: street names
+that are also places, and text that disagrees with the coordinates
+
+Run with pytest, or directly: python test_gazetteer.py
+"""
+
+from gazetteer import IRISH_GAZETTEER
+
+DUBLIN_8 = (53.3372, -6.2811)
+DUBLIN_2 = (53.3405, -6.2551)
+
+def test_street_named_after_a_place():
+    """'Cork Street', 'Kildare Street' and 'Clare Street' are streets, not places"""
+    assert IRISH_GAZETTEER.resolve('Cork Street, Dublin 8', *DUBLIN_8) == ('Dublin', 'Dublin')
+    assert IRISH_GAZETTEER.resolve('Kildare Street, Dublin 2', *DUBLIN_2) == ('Dublin', 'Dublin')
+    assert IRISH_GAZETTEER.resolve('Clare Street, Limerick') == ('Limerick', 'Limerick')
+    print("✅ Street names ignored when finding the city and county")
+
+def test_text_far_from_coordinates():
+    """A place named in the address but far from the point loses to the point"""
+    assert IRISH_GAZETTEER.resolve('Cork, Ireland', *DUBLIN_8) == ('Dublin', 'Dublin')
+    assert IRISH_GAZETTEER.city_in_address('Galway', *DUBLIN_2) is None
+    assert IRISH_GAZETTEER.county_in_address('Co. Kerry', *DUBLIN_2) is None
+    print("✅ Far-away names rejected in favour of the coordinates")
+
+def test_text_without_coordinates():
+    """Without coordinates the address text is all there is"""
+    assert IRISH_GAZETTEER.resolve('Main Street, Ennis, Co. Clare') == ('Ennis', 'Clare')
+    assert IRISH_GAZETTEER.resolve('The Quays, Galway') == ('Galway', 'Galway')
+    print("✅ Town and county read from the address")
+
+def main():
+    """Run all tests"""
+    print("🗺️  Offline Gazetteer - Testing Suite\n")
+    test_street_named_after_a_place()
+    test_text_far_from_coordinates()
+    test_text_without_coordinates()
+
+if __name__ == "__main__":
+    main()
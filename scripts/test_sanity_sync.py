@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental Sanity sync against a local stand-in server
+
+Run with pytest, or directly: python test_sanity_sync.py
+"""
+
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from sanity_sync import SanityClient, SyncManifest, bootstrap_manifest, compute_changes, push_changes
+
+class FakeSanity(BaseHTTPRequestHandler):
+    """Stores documents in memory; fails the first N mutate calls with 429"""
+
+    documents = {}
+    mutate_calls = []
+    throttle = 0
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        doc_type = json.loads(params['$type'][0])
+        result = [doc for doc in FakeSanity.documents.values() if doc['_type'] == doc_type]
+        self.reply(200, {'result': result})
+
+    def do_POST(self):
+        if FakeSanity.throttle:
+            FakeSanity.throttle -= 1
+            self.reply(429, {'error': 'rate limited'}, {'Retry-After': '0'})
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        FakeSanity.mutate_calls.append(body['mutations'])
+        for mutation in body['mutations']:
+            if 'createOrReplace' in mutation:
+                doc = dict(mutation['createOrReplace'], _rev='r1', _updatedAt='2026-01-01T00:00:00Z')
+                FakeSanity.documents[doc['_id']] = doc
+            else:
+                FakeSanity.documents.pop(mutation['delete']['id'], None)
+        self.reply(200, {'transactionId': 'tx'})
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeSanity)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def reset_fake_sanity():
+    FakeSanity.documents.clear()
+    FakeSanity.mutate_calls.clear()
+    FakeSanity.throttle = 0
+
+@pytest.fixture(scope='module')
+def server():
+    server = start_server()
+    yield server
+    server.shutdown()
+
+@pytest.fixture
+def client(server):
+    """Client for an empty stand-in Sanity"""
+    reset_fake_sanity()
+    return SanityClient('test', 'production', 'token', f"http://127.0.0.1:{server.server_port}")
+
+@pytest.fixture
+def manifest_file(tmp_path):
+    return str(tmp_path / 'manifest.json')
+
+def make_bands(count):
+    return [{'_id': f"band-{i}", '_type': 'band', 'name': f"Band {i}", 'genres': ['rock']} for i in range(count)]
+
+def sent_ids():
+    ids = []
+    for mutations in FakeSanity.mutate_calls:
+        for mutation in mutations:
+            ids.append(mutation['createOrReplace']['_id'] if 'createOrReplace' in mutation else mutation['delete']['id'])
+    FakeSanity.mutate_calls.clear()
+    return sorted(ids)
+
+def run_sync(client, manifest, docs, prune=False):
+    changes = compute_changes(docs, manifest, 'band')
+    push_changes(client, changes, manifest, prune=prune, batch_size=10, max_workers=3)
+    return changes
+
+def test_incremental_sync(client, manifest_file):
+    """First run sends everything, the next runs only what changed"""
+    manifest = SyncManifest(manifest_file)
+    bands = make_bands(25)
+
+    changes = run_sync(client, manifest, bands)
+    assert len(changes.creates) == 25 and len(sent_ids()) == 25
+    print("✅ First sync created all 25 documents in 3 batches")
+
+    changes = run_sync(client, SyncManifest(manifest_file), bands)
+    assert len(changes) == 0 and changes.unchanged == 25 and sent_ids() == []
+    print("✅ Re-sync of unchanged data sent nothing")
+
+    bands[3]['genres'] = ['folk']
+    bands.append({'_id': 'band-new', '_type': 'band', 'name': 'New Band'})
+    changes = run_sync(client, SyncManifest(manifest_file), bands)
+    assert sent_ids() == ['band-3', 'band-new'] and len(changes.updates) == 1
+    print("✅ Only the changed and the new document were sent")
+
+    removed = bands.pop()
+    changes = run_sync(client, SyncManifest(manifest_file), bands)
+    assert changes.deletes == [removed['_id']] and sent_ids() == []
+    changes = run_sync(client, SyncManifest(manifest_file), bands, prune=True)
+    assert sent_ids() == [removed['_id']] and removed['_id'] not in FakeSanity.documents
+    print("✅ Deletions are only sent with prune")
+
+def test_retry_after(client, manifest_file):
+    """429 responses are retried"""
+    FakeSanity.throttle = 2
+    manifest = SyncManifest(manifest_file)
+    changes = compute_changes(make_bands(5), manifest, 'band')
+    stats = push_changes(client, changes, manifest, batch_size=10)
+    assert stats['failed'] == 0 and len(sent_ids()) == 5
+    print("✅ Throttled batch retried and applied")
+
+def test_bootstrap(client, manifest_file):
+    """Documents already in Sanity are recognised as unchanged"""
+    run_sync(client, SyncManifest(f"{manifest_file}.seed"), make_bands(5))
+    sent_ids()
+
+    manifest = SyncManifest(manifest_file)
+    assert bootstrap_manifest(client, manifest, 'band') == len(FakeSanity.documents)
+    changes = compute_changes(make_bands(5), manifest, 'band')
+    assert len(changes.creates) == 0 and len(changes.updates) == 0 and changes.unchanged == 5
+    print("✅ Bootstrap ignored Sanity system fields when hashing")
+
+def main():
+    """Run all tests"""
+    print("🔄 Incremental Sanity Sync - Testing Suite\n")
+
+    server = start_server()
+    client = SanityClient('test', 'production', 'token', f"http://127.0.0.1:{server.server_port}")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for test, name in [(test_incremental_sync, 'manifest.json'),
+                               (test_retry_after, 'retry.json'),
+                               (test_bootstrap, 'bootstrap.json')]:
+                reset_fake_sanity()
+                test(client, os.path.join(tmp, name))
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()